@@ -7,10 +7,11 @@ All database collections follow the CollectionModule foolproof pattern:
 - Auto-registration with central registry
 - Idempotent initialization
 
-Collections (37/37 - 100% COMPLETE):
-P0 (3):
+Collections (38/38 - 100% COMPLETE):
+P0 (4):
 - guild_configuration.py - Guild-specific settings and configuration
 - chat_sessions.py - User conversation sessions
+- chat_session_interactions.py - Bucketed session history (50 exchanges per document)
 - economy.py - User balance tracking and transactions
 
 P1 (3):
@@ -64,6 +65,7 @@ P5 (3) - Engagement Collections:
 # P0 Collections
 from abby_core.database.collections.guild_configuration import GuildConfiguration
 from abby_core.database.collections.chat_sessions import ChatSessions
+from abby_core.database.collections.chat_session_interactions import ChatSessionInteractions
 from abby_core.database.collections.economy import Economy
 
 # P1 Collections
@@ -112,6 +114,7 @@ __all__ = [
     # P0
     "GuildConfiguration",
     "ChatSessions", 
+    "ChatSessionInteractions",
     "Economy",
     # P1
     "Users",
@@ -0,0 +1,291 @@
+"""
+Chat Session Interactions Collection Module
+
+Purpose: Full conversation history of chat sessions, in fixed-size buckets
+Schema: {session_id, bucket, user_id, guild_id, messages[], exchange_count,
+         first_at, last_at, session_created_at}
+Indexes: session_id+bucket (unique), user_id+guild_id, guild_id+last_at,
+         session_created_at (TTL, expires with the parent session)
+
+Sessions used to $push every exchange into chat_sessions.interactions, so
+long sessions grew toward the 16MB document limit and every session read
+carried the whole history. Exchanges now go to bucket documents of
+INTERACTIONS_PER_BUCKET exchanges each:
+
+    chat_sessions                      chat_session_interactions
+    ─────────────                      ─────────────────────────
+    exchange_count, message_count      {session_id, bucket: 0, messages: [...50 exchanges]}
+    interactions: last RECENT_...      {session_id, bucket: 1, messages: [...]}
+    interactions_layout: "bucketed"
+
+Exchange n (0-based) lives in bucket n // INTERACTIONS_PER_BUCKET. Sessions
+written before bucketing are converted by bucket_session(), lazily on their
+next exchange or in bulk by migrations/bucket_session_interactions.py.
+"""
+
+from typing import Optional, Dict, Any, Iterator, List, Tuple, TYPE_CHECKING
+from datetime import datetime
+
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
+
+from abby_core.database.base import CollectionModule
+from abby_core.database.collections.chat_sessions import SESSION_MAX_AGE_SECONDS, SESSION_RETENTION_SECONDS
+from abby_core.database.mongodb import get_database, get_sessions_collection
+from tdos_intelligence.observability import logging
+
+logger = logging.getLogger(__name__)
+
+# Exchanges (user message + reply) per bucket document
+INTERACTIONS_PER_BUCKET = 50
+
+# Messages kept on the parent session (burst checks, quick previews)
+RECENT_INTERACTIONS = 20
+
+# chat_sessions.interactions_layout once history lives in buckets
+INTERACTIONS_LAYOUT = "bucketed"
+
+
+# ═══════════════════════════════════════════════════════════════
+# COLLECTION ACCESS (Singleton Pattern)
+# ═══════════════════════════════════════════════════════════════
+
+def get_collection() -> "Collection[Dict[str, Any]]":
+    """Get chat_session_interactions collection (singleton)."""
+    if not get_database:
+        raise RuntimeError("MongoDB connection not available")
+    db = get_database()
+    return db["chat_session_interactions"]
+
+
+# ═══════════════════════════════════════════════════════════════
+# INDEXES
+# ═══════════════════════════════════════════════════════════════
+
+def ensure_indexes():
+    """Create indexes for chat_session_interactions collection."""
+    try:
+        collection = get_collection()
+
+        # Primary queries
+        collection.create_index([("session_id", 1), ("bucket", 1)], unique=True)
+        collection.create_index([("user_id", 1), ("guild_id", 1)])
+        collection.create_index([("guild_id", 1), ("last_at", -1)])
+
+        # TTL index: Buckets outlive their session's latest possible deletion
+        collection.create_index(
+            [("session_created_at", 1)],
+            expireAfterSeconds=SESSION_MAX_AGE_SECONDS + SESSION_RETENTION_SECONDS,
+        )
+
+        logger.debug("[chat_session_interactions] Indexes created (with TTL)")
+
+    except Exception as e:
+        logger.warning(f"[chat_session_interactions] Error creating indexes: {e}")
+
+
+# ═══════════════════════════════════════════════════════════════
+# DEFAULTS / SEEDING
+# ═══════════════════════════════════════════════════════════════
+
+def seed_defaults() -> bool:
+    """Seed default data if needed."""
+    logger.debug("[chat_session_interactions] No defaults to seed (written per exchange)")
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════
+# INITIALIZATION
+# ═══════════════════════════════════════════════════════════════
+
+def initialize_collection() -> bool:
+    """
+    Initialize chat_session_interactions collection.
+
+    Called automatically at platform startup.
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        ensure_indexes()
+        seed_defaults()
+
+        logger.debug("[chat_session_interactions] Collection initialized")
+        return True
+
+    except Exception as e:
+        logger.error(f"[chat_session_interactions] Error initializing: {e}")
+        return False
+
+
+# ═══════════════════════════════════════════════════════════════
+# WRITES
+# ═══════════════════════════════════════════════════════════════
+
+def bucket_for(exchange_index: int) -> int:
+    """Bucket number holding the exchange at a 0-based index."""
+    return exchange_index // INTERACTIONS_PER_BUCKET
+
+
+def append_exchange(
+    session: Dict[str, Any],
+    exchange_index: int,
+    messages: List[Dict[str, Any]],
+) -> None:
+    """Append one exchange to its bucket, creating the bucket if needed.
+
+    Args:
+        session: Parent session (session_id, user_id, guild_id, created_at)
+        exchange_index: 0-based exchange number within the session
+        messages: The exchange's messages (user message, optional reply)
+    """
+    timestamp = messages[-1].get("timestamp") if messages else None
+    get_collection().update_one(
+        {"session_id": session["session_id"], "bucket": bucket_for(exchange_index)},
+        {
+            "$push": {"messages": {"$each": messages}},
+            "$inc": {"exchange_count": 1},
+            "$set": {"last_at": timestamp},
+            "$setOnInsert": {
+                "user_id": session.get("user_id"),
+                "guild_id": session.get("guild_id"),
+                "session_created_at": session.get("created_at"),
+                "first_at": messages[0].get("timestamp") if messages else None,
+            },
+        },
+        upsert=True,
+    )
+
+
+def split_exchanges(messages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Group a flat message list into exchanges (each starts at a user message)."""
+    exchanges: List[List[Dict[str, Any]]] = []
+    for message in messages:
+        if not exchanges or message.get("role") == "user":
+            exchanges.append([])
+        exchanges[-1].append(message)
+    return exchanges
+
+
+def bucket_session(session: Dict[str, Any]) -> Optional[int]:
+    """Move a pre-bucketing session's interactions array into buckets.
+
+    Idempotent: buckets are overwritten, and the parent is only rewritten if
+    its interactions array has not grown since it was read.
+
+    Returns:
+        Number of exchanges moved, or None if the session changed
+        concurrently (caller re-reads and retries)
+    """
+    session_id = session["session_id"]
+    interactions = [i for i in session.get("interactions") or [] if isinstance(i, dict)]
+    exchanges = split_exchanges(interactions)
+
+    collection = get_collection()
+    for start in range(0, len(exchanges), INTERACTIONS_PER_BUCKET):
+        chunk = exchanges[start:start + INTERACTIONS_PER_BUCKET]
+        messages = [m for exchange in chunk for m in exchange]
+        collection.update_one(
+            {"session_id": session_id, "bucket": bucket_for(start)},
+            {"$set": {
+                "messages": messages,
+                "exchange_count": len(chunk),
+                "user_id": session.get("user_id"),
+                "guild_id": session.get("guild_id"),
+                "session_created_at": session.get("created_at"),
+                "first_at": messages[0].get("timestamp"),
+                "last_at": messages[-1].get("timestamp"),
+            }},
+            upsert=True,
+        )
+
+    result = get_sessions_collection().update_one(
+        {
+            "session_id": session_id,
+            "interactions_layout": {"$ne": INTERACTIONS_LAYOUT},
+            "interactions": {"$size": len(session.get("interactions") or [])},
+        },
+        {"$set": {
+            "interactions_layout": INTERACTIONS_LAYOUT,
+            "exchange_count": len(exchanges),
+            "message_count": len(interactions),
+            "interactions": interactions[-RECENT_INTERACTIONS:],
+        }},
+    )
+    if result.matched_count == 0:
+        return None
+
+    logger.debug(
+        f"[chat_session_interactions] Bucketed session {session_id[:8]}... "
+        f"({len(exchanges)} exchanges)"
+    )
+    return len(exchanges)
+
+
+def delete_interactions(query: Dict[str, Any]) -> int:
+    """Delete buckets matching a user_id/guild_id/session_id query (privacy clears)."""
+    return get_collection().delete_many(query).deleted_count
+
+
+# ═══════════════════════════════════════════════════════════════
+# PAGED READERS
+# ═══════════════════════════════════════════════════════════════
+
+def get_interaction_page(session_id: str, bucket: int = 0) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """One bucket of a session's history.
+
+    Returns:
+        (messages, next_bucket); next_bucket is None on the last page
+    """
+    doc = get_collection().find_one({"session_id": session_id, "bucket": bucket})
+    if not doc:
+        return [], None
+    has_next = get_collection().find_one(
+        {"session_id": session_id, "bucket": bucket + 1}, {"_id": 1}
+    )
+    return doc.get("messages", []), (bucket + 1 if has_next else None)
+
+
+def iter_session_interactions(session_id: str) -> Iterator[Dict[str, Any]]:
+    """Stream a session's full history, oldest first, one bucket at a time."""
+    cursor = get_collection().find(
+        {"session_id": session_id}, {"messages": 1, "bucket": 1}
+    ).sort("bucket", 1).batch_size(1)
+    for doc in cursor:
+        yield from doc.get("messages", [])
+
+
+# ═══════════════════════════════════════════════════════════════
+# COLLECTION MODULE PATTERN (Foolproof)
+# ═══════════════════════════════════════════════════════════════
+
+class ChatSessionInteractions(CollectionModule):
+    """Collection module for chat_session_interactions - follows foolproof pattern."""
+
+    collection_name = "chat_session_interactions"
+
+    @staticmethod
+    def get_collection() -> "Collection[Dict[str, Any]]":
+        """Get chat_session_interactions collection."""
+        if not get_database:
+            raise RuntimeError("MongoDB connection not available")
+        if not ChatSessionInteractions.collection_name:
+            raise RuntimeError("collection_name not set for ChatSessionInteractions")
+        db = get_database()
+        return db[ChatSessionInteractions.collection_name]
+
+    @staticmethod
+    def ensure_indexes():
+        """Create all indexes for efficient querying."""
+        ensure_indexes()
+
+    @staticmethod
+    def seed_defaults() -> bool:
+        """Seed default data if needed."""
+        return seed_defaults()
+
+    @staticmethod
+    def initialize_collection() -> bool:
+        """Orchestrate initialization."""
+        return initialize_collection()
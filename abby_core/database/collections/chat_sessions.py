@@ -3,17 +3,25 @@ Chat Sessions Collection Module
 
 Purpose: Store user conversation sessions with auto-cleanup
 Schema: See schemas.py (ChatSessionSchema)
-Indexes: session_id (unique), user_id+guild_id, created_at (TTL)
+Indexes: session_id (unique), user_id+guild_id, status+expires_at,
+         expires_at (TTL, SESSION_RETENTION_SECONDS after expiry)
 
 Manages:
 - Conversation history
 - Session metadata
 - User message context
-- Auto-expiration after 7 days
+- Auto-expiration via expires_at
+
+expires_at is when a session stops being usable: SESSION_MAX_AGE_SECONDS
+after creation for active sessions, the close time once closed. Sessions
+nearing it are finalized (summary, status "expired") from an indexed
+status+expires_at queue, and the TTL index deletes the document
+SESSION_RETENTION_SECONDS later - nothing scans the collection.
 """
 
+import os
 from typing import Optional, Dict, Any, List, TYPE_CHECKING
-from datetime import datetime
+from datetime import datetime, timezone
 
 if TYPE_CHECKING:
     from pymongo.collection import Collection
@@ -24,6 +32,19 @@ from tdos_intelligence.observability import logging
 
 logger = logging.getLogger(__name__)
 
+# Active sessions expire this long after creation (default 24h)
+SESSION_MAX_AGE_SECONDS = int(os.getenv("SESSION_MAX_AGE_SECONDS", "86400"))
+
+# Expired/closed sessions are kept this long for summaries and exports (default 7 days)
+SESSION_RETENTION_SECONDS = int(os.getenv("SESSION_RETENTION_SECONDS", "604800"))
+
+# $set fields that end a session's lease (see services/session_state_cache.py);
+# every close/expire write includes them so the leasing process stops serving it
+RELEASED_LEASE: Dict[str, Any] = {
+    "lease_owner": None,
+    "lease_until": datetime(1970, 1, 1, tzinfo=timezone.utc),
+}
+
 
 # ═══════════════════════════════════════════════════════════════
 # COLLECTION ACCESS (Singleton Pattern)
@@ -51,10 +72,21 @@ def ensure_indexes():
         collection.create_index([("user_id", 1), ("guild_id", 1), ("status", 1)])
         collection.create_index([("user_id", 1), ("created_at", -1)])
 
-        # TTL index: Auto-delete sessions after 7 days
-        collection.create_index([("created_at", 1)], expireAfterSeconds=604800)
+        # Expiry queue: active sessions ordered by expiry
+        collection.create_index([("status", 1), ("expires_at", 1)])
+
+        # Replace the old created_at TTL, and the expires_at TTL if retention changed
+        existing = collection.index_information()
+        if "expireAfterSeconds" in existing.get("created_at_1", {}):
+            collection.drop_index("created_at_1")
+        ttl_index = existing.get("expires_at_1")
+        if ttl_index and ttl_index.get("expireAfterSeconds") != SESSION_RETENTION_SECONDS:
+            collection.drop_index("expires_at_1")
+
+        # TTL index: Auto-delete sessions SESSION_RETENTION_SECONDS after expiry
+        collection.create_index([("expires_at", 1)], expireAfterSeconds=SESSION_RETENTION_SECONDS)
 
-        logger.debug("[chat_sessions] Indexes created (with 7-day TTL)")
+        logger.debug("[chat_sessions] Indexes created (with expires_at TTL)")
 
     except Exception as e:
         logger.warning(f"[chat_sessions] Error creating indexes: {e}")
@@ -187,7 +219,7 @@ def close_session(session_id: str) -> bool:
         
         result = collection.update_one(
             {"session_id": session_id},
-            {"$set": {"status": "closed", "metadata.updated_at": datetime.utcnow()}}
+            {"$set": {"status": "closed", "metadata.updated_at": datetime.utcnow(), **RELEASED_LEASE}}
         )
         
         if result.matched_count == 0:
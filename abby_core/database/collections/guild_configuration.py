@@ -254,7 +254,10 @@ DEFAULT_SETTINGS = {
     # Conversation behavior
     "conversation": {
         "default_chat_mode": "multi_turn",
-        "summon_mode": "both"
+        "summon_mode": "both",
+        # Semantic response cache for informational questions: off | shadow | on
+        # (shadow logs would-have-hit answers without serving them)
+        "response_cache": "off"
     },
     # Context limits (how much context is injected)
     "context_limits": {
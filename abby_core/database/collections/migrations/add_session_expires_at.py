@@ -0,0 +1,167 @@
+"""
+Migration Script: Backfill expires_at on chat sessions
+
+PURPOSE: Give every chat session the expires_at field that drives expiry:
+- Active/cooldown sessions: created_at + SESSION_MAX_AGE_SECONDS
+- Closed/expired sessions: closed_at (or created_at if never recorded)
+
+BACKGROUND:
+Sessions used to be deleted by a TTL index on created_at, 7 days after
+creation whether or not they were still in use, and expiring active
+sessions needed a scan. expires_at is now the single expiry timestamp:
+the session_expiry job finalizes sessions from the status+expires_at
+index and the TTL index on expires_at deletes them after
+SESSION_RETENTION_SECONDS. Sessions without the field are neither
+finalized nor deleted until this migration runs. The old created_at TTL
+index is dropped by chat_sessions.ensure_indexes().
+
+MIGRATION STRATEGY:
+- Only sessions without expires_at are touched, so the migration is
+  idempotent and can be interrupted and re-run
+- Sessions are processed in batches of `batch_size`, oldest first
+- Each update is conditioned on expires_at still being absent, so a
+  session closed meanwhile keeps the value written by the close
+
+RUN THIS MIGRATION:
+1. In Python shell or script:
+   from abby_core.database.collections.migrations.add_session_expires_at import run_migration
+   result = run_migration()
+   print(result)
+
+2. Or from command line:
+   python -c "from abby_core.database.collections.migrations.add_session_expires_at import run_migration; print(run_migration())"
+"""
+
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+
+from abby_core.database.collections.chat_sessions import SESSION_MAX_AGE_SECONDS
+from abby_core.database.mongodb import get_sessions_collection
+from tdos_intelligence.observability import logging
+
+logger = logging.getLogger(__name__)
+
+# Sessions written before expires_at existed
+MISSING_EXPIRY = {"expires_at": {"$exists": False}}
+
+# Statuses that can still take turns
+OPEN_STATUSES = ("active", "cooldown")
+
+
+def expiry_for(session: Dict[str, Any]) -> Optional[datetime]:
+    """The expires_at a session would have been given when it was written."""
+    created_at = session.get("created_at")
+    if session.get("status") in OPEN_STATUSES:
+        return created_at + timedelta(seconds=SESSION_MAX_AGE_SECONDS) if created_at else None
+    return session.get("closed_at") or created_at
+
+
+def run_migration(batch_size: int = 500) -> Dict[str, Any]:
+    """
+    Backfill expires_at on every session missing it.
+
+    Args:
+        batch_size: Sessions read per query
+
+    Returns:
+        Migration report with counts
+    """
+    collection = get_sessions_collection()
+
+    report = {
+        "status": "running",
+        "timestamp": datetime.utcnow().isoformat(),
+        "sessions_updated": 0,
+        "sessions_without_timestamps": 0,
+        "errors": [],
+    }
+
+    try:
+        last_id = None
+        while True:
+            query: Dict[str, Any] = dict(MISSING_EXPIRY)
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            batch = list(
+                collection.find(query, {"status": 1, "created_at": 1, "closed_at": 1})
+                .sort("_id", 1)
+                .limit(batch_size)
+            )
+            if not batch:
+                break
+
+            for session in batch:
+                last_id = session["_id"]
+                expires_at = expiry_for(session)
+                if expires_at is None:
+                    # No timestamps at all: expire now so retention still applies
+                    expires_at = datetime.now(timezone.utc)
+                    report["sessions_without_timestamps"] += 1
+                try:
+                    result = collection.update_one(
+                        {"_id": session["_id"], **MISSING_EXPIRY},
+                        {"$set": {"expires_at": expires_at}},
+                    )
+                    report["sessions_updated"] += result.modified_count
+                except Exception as e:
+                    report["errors"].append(f"{session.get('_id')}: {e}")
+
+            logger.debug(f"[Migration] Backfilled expires_at on {report['sessions_updated']} sessions so far")
+
+        report["status"] = "error" if report["errors"] else "success"
+        logger.info(
+            f"[Migration] Complete: {report['sessions_updated']} sessions given expires_at "
+            f"({report['sessions_without_timestamps']} without timestamps expired immediately)"
+        )
+
+    except Exception as e:
+        report["status"] = "error"
+        report["errors"].append(str(e))
+        logger.error(f"[Migration] Error running migration: {e}")
+
+    return report
+
+
+def verify_migration() -> Dict[str, Any]:
+    """
+    Verify that every session has expires_at.
+
+    Returns:
+        Verification report
+    """
+    collection = get_sessions_collection()
+
+    report = {
+        "status": "checking",
+        "timestamp": datetime.utcnow().isoformat(),
+        "total_sessions": 0,
+        "missing_expires_at": 0,
+    }
+
+    try:
+        report["total_sessions"] = collection.count_documents({})
+        report["missing_expires_at"] = collection.count_documents(MISSING_EXPIRY)
+
+        report["status"] = "verified"
+        logger.info(
+            f"[Verification] {report['total_sessions'] - report['missing_expires_at']}/"
+            f"{report['total_sessions']} sessions have expires_at"
+        )
+
+    except Exception as e:
+        report["status"] = "error"
+        report["error"] = str(e)
+        logger.error(f"[Verification] Error checking migration: {e}")
+
+    return report
+
+
+if __name__ == "__main__":
+    # Run migration if executed directly
+    print("Running migration: Backfill session expires_at...")
+    result = run_migration()
+    print(f"Migration result: {result}")
+
+    print("\nVerifying migration...")
+    verification = verify_migration()
+    print(f"Verification result: {verification}")
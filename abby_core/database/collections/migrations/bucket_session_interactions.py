@@ -0,0 +1,159 @@
+"""
+Migration Script: Move session interactions into bucketed documents
+
+PURPOSE: Convert chat sessions that still store their whole history in the
+chat_sessions.interactions array to the bucketed layout:
+- Exchanges move to chat_session_interactions, 50 per bucket document
+- The session keeps exchange_count, message_count and the last 20 messages
+- The session is marked interactions_layout: "bucketed"
+
+BACKGROUND:
+Every exchange used to be $push'ed into one array, so long sessions grew
+toward Mongo's 16MB document limit and every session read carried the
+whole history. record_exchange now writes buckets, and converts an old
+session lazily on its next exchange; this migration converts the rest
+(closed and expired sessions kept for the 7-day retention window).
+
+MIGRATION STRATEGY:
+- Sessions are processed in batches of `batch_size`, oldest first
+- Buckets are overwritten and the session is only rewritten if its
+  interactions array did not change meanwhile, so the migration can be
+  re-run or interrupted safely
+- Sessions that changed mid-migration are counted and left for the next run
+
+RUN THIS MIGRATION:
+1. In Python shell or script:
+   from abby_core.database.collections.migrations.bucket_session_interactions import run_migration
+   result = run_migration()
+   print(result)
+
+2. Or from command line:
+   python -c "from abby_core.database.collections.migrations.bucket_session_interactions import run_migration; print(run_migration())"
+"""
+
+from typing import Dict, Any
+from datetime import datetime
+
+from abby_core.database.collections.chat_session_interactions import (
+    INTERACTIONS_LAYOUT,
+    bucket_session,
+)
+from abby_core.database.mongodb import get_sessions_collection
+from tdos_intelligence.observability import logging
+
+logger = logging.getLogger(__name__)
+
+# Sessions still on the single-array layout
+UNMIGRATED = {"interactions_layout": {"$ne": INTERACTIONS_LAYOUT}}
+
+
+def run_migration(batch_size: int = 100) -> Dict[str, Any]:
+    """
+    Bucket the interactions of every unmigrated session.
+
+    Args:
+        batch_size: Sessions read per query
+
+    Returns:
+        Migration report with counts
+    """
+    collection = get_sessions_collection()
+
+    report = {
+        "status": "running",
+        "timestamp": datetime.utcnow().isoformat(),
+        "sessions_migrated": 0,
+        "exchanges_moved": 0,
+        "sessions_changed": 0,
+        "errors": [],
+    }
+
+    try:
+        last_id = None
+        while True:
+            query = dict(UNMIGRATED)
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            batch = list(collection.find(query).sort("_id", 1).limit(batch_size))
+            if not batch:
+                break
+
+            for session in batch:
+                last_id = session["_id"]
+                try:
+                    moved = bucket_session(session)
+                except Exception as e:
+                    report["errors"].append(f"{session.get('session_id')}: {e}")
+                    continue
+
+                if moved is None:
+                    report["sessions_changed"] += 1
+                    continue
+                report["sessions_migrated"] += 1
+                report["exchanges_moved"] += moved
+
+            logger.debug(
+                f"[Migration] Bucketed {report['sessions_migrated']} sessions so far "
+                f"({report['exchanges_moved']} exchanges)"
+            )
+
+        report["status"] = "error" if report["errors"] else "success"
+        logger.info(
+            f"[Migration] Complete: {report['sessions_migrated']} sessions bucketed, "
+            f"{report['exchanges_moved']} exchanges moved, "
+            f"{report['sessions_changed']} changed during migration"
+        )
+
+    except Exception as e:
+        report["status"] = "error"
+        report["errors"].append(str(e))
+        logger.error(f"[Migration] Error running migration: {e}")
+
+    return report
+
+
+def verify_migration() -> Dict[str, Any]:
+    """
+    Verify that every session uses the bucketed layout.
+
+    Returns:
+        Verification report
+    """
+    collection = get_sessions_collection()
+
+    report = {
+        "status": "checking",
+        "timestamp": datetime.utcnow().isoformat(),
+        "total_sessions": 0,
+        "bucketed_sessions": 0,
+        "unmigrated_sessions": 0,
+    }
+
+    try:
+        report["total_sessions"] = collection.count_documents({})
+        report["unmigrated_sessions"] = collection.count_documents(UNMIGRATED)
+        report["bucketed_sessions"] = report["total_sessions"] - report["unmigrated_sessions"]
+
+        report["status"] = "verified"
+        logger.info(
+            f"[Verification] {report['bucketed_sessions']}/{report['total_sessions']} "
+            f"sessions use bucketed interactions"
+        )
+
+    except Exception as e:
+        report["status"] = "error"
+        report["error"] = str(e)
+        logger.error(f"[Verification] Error checking migration: {e}")
+
+    return report
+
+
+if __name__ == "__main__":
+    # Run migration if executed directly
+    print("Running migration: Bucket session interactions...")
+    result = run_migration()
+    print(f"Migration result: {result}")
+
+    print("\nVerifying migration...")
+    verification = verify_migration()
+    print(f"Verification result: {verification}")
@@ -12,8 +12,9 @@ Manages:
 - Source tracking
 """
 
-from typing import Optional, Dict, Any, List, TYPE_CHECKING
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Iterator, Set, TYPE_CHECKING
+from datetime import datetime, timezone
+from pymongo import UpdateOne
 
 if TYPE_CHECKING:
     from pymongo.collection import Collection
@@ -43,6 +44,9 @@ def ensure_indexes():
         collection.create_index([("created_at", -1)])
         collection.create_index([("updated_at", -1)])
         collection.create_index([("source", 1)])
+        # Sync reconciliation: incremental scans by indexed_at, paged scans by guild
+        collection.create_index([("indexed_at", 1)])
+        collection.create_index([("guild_id", 1), ("_id", 1)])
 
         logger.debug("[rag_documents] Indexes created")
 
@@ -300,6 +304,106 @@ def delete_documents_by_id(document_id: str) -> int:
         return 0
 
 
+def count_chunks(guild_id: Optional[str] = None) -> int:
+    """Count RAG chunks, optionally scoped to a guild."""
+    try:
+        collection = get_collection()
+        query: Dict[str, Any] = {"guild_id": guild_id} if guild_id else {}
+        return collection.count_documents(query)
+    except Exception as e:
+        logger.error(f"[rag_documents] Error counting chunks: {e}")
+        return 0
+
+
+def iter_chunk_pages(
+    guild_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    page_size: int = 500,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield pages of chunk sync fields ordered by _id (range pagination).
+
+    Only ``_id``, ``content_checksum`` and ``indexed_at`` are projected so a page
+    stays small regardless of chunk size. When ``since`` is given, only chunks
+    indexed after it (or never stamped with a checksum) are returned.
+    """
+    collection = get_collection()
+
+    query: Dict[str, Any] = {}
+    if guild_id:
+        query["guild_id"] = guild_id
+    if since is not None:
+        query["$or"] = [
+            {"indexed_at": {"$gt": since}},
+            {"indexed_at": {"$exists": False}},
+            {"content_checksum": {"$exists": False}},
+        ]
+
+    projection = {"_id": 1, "content_checksum": 1, "indexed_at": 1}
+    last_id = None
+    while True:
+        page_query = dict(query)
+        if last_id is not None:
+            page_query["_id"] = {"$gt": last_id}
+        page = list(
+            collection.find(page_query, projection).sort("_id", 1).limit(page_size)
+        )
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]["_id"]
+
+
+def get_chunks_by_ids(chunk_ids: List[str]) -> List[Dict[str, Any]]:
+    """Get full chunk documents for a list of chunk IDs."""
+    if not chunk_ids:
+        return []
+    try:
+        collection = get_collection()
+        return list(collection.find({"_id": {"$in": chunk_ids}}))
+    except Exception as e:
+        logger.error(f"[rag_documents] Error getting chunks by ID: {e}")
+        return []
+
+
+def find_existing_chunk_ids(chunk_ids: List[str]) -> Set[str]:
+    """Return the subset of chunk_ids that exist in MongoDB."""
+    if not chunk_ids:
+        return set()
+    collection = get_collection()
+    return {
+        str(doc["_id"])
+        for doc in collection.find({"_id": {"$in": chunk_ids}}, {"_id": 1})
+    }
+
+
+def mark_chunks_indexed(
+    checksums: Dict[str, str],
+    indexed_at: Optional[datetime] = None,
+) -> int:
+    """Stamp content_checksum and indexed_at on chunks after (re)indexing."""
+    if not checksums:
+        return 0
+    try:
+        collection = get_collection()
+        indexed_at = indexed_at or datetime.now(timezone.utc)
+        result = collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": chunk_id},
+                    {"$set": {"content_checksum": checksum, "indexed_at": indexed_at}},
+                )
+                for chunk_id, checksum in checksums.items()
+            ],
+            ordered=False,
+        )
+        return result.modified_count
+    except Exception as e:
+        logger.error(f"[rag_documents] Error marking chunks indexed: {e}")
+        return 0
+
+
 # ═══════════════════════════════════════════════════════════════
 # COLLECTION MODULE PATTERN (Foolproof)
 # ═══════════════════════════════════════════════════════════════
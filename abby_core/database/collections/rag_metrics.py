@@ -63,6 +63,52 @@ def initialize_collection() -> bool:
         return False
 
 
+# ═══════════════════════════════════════════════════════════════
+# SYNC CHECKPOINTS (for rag/handler.sync_check)
+# ═══════════════════════════════════════════════════════════════
+# Checkpoints use updated_at rather than created_at so the TTL index never
+# expires them.
+
+def _sync_checkpoint_id(guild_id: Optional[str]) -> str:
+    return f"sync_checkpoint::{guild_id or 'all'}"
+
+
+def get_sync_checkpoint(guild_id: Optional[str] = None) -> Optional[datetime]:
+    """Get the time of the last clean Mongo/vector-store sync check."""
+    try:
+        doc = get_collection().find_one({"_id": _sync_checkpoint_id(guild_id)})
+        return doc.get("checked_at") if doc else None
+    except Exception as e:
+        logger.error(f"[rag_metrics] Error reading sync checkpoint: {e}")
+        return None
+
+
+def save_sync_checkpoint(
+    checked_at: datetime,
+    guild_id: Optional[str] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """Record a clean sync check so the next one only scans newer chunks."""
+    try:
+        get_collection().update_one(
+            {"_id": _sync_checkpoint_id(guild_id)},
+            {
+                "$set": {
+                    "type": "sync_checkpoint",
+                    "guild_id": guild_id,
+                    "checked_at": checked_at,
+                    "stats": stats or {},
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+            upsert=True,
+        )
+        return True
+    except Exception as e:
+        logger.error(f"[rag_metrics] Error saving sync checkpoint: {e}")
+        return False
+
+
 class RAGMetrics(CollectionModule):
     collection_name = "rag_metrics"
     
@@ -13,7 +13,7 @@ Manages:
 """
 
 from typing import Optional, Dict, Any, TYPE_CHECKING, List
-from datetime import datetime
+from datetime import datetime, timedelta
 
 if TYPE_CHECKING:
     from pymongo.collection import Collection
@@ -226,6 +226,42 @@ def get_active_states(
         return []
 
 
+def get_next_transition(
+    now: Optional[datetime] = None,
+    scope: str = "global"
+) -> Optional[datetime]:
+    """Get the next instant get_active_states(now, scope) can change.
+
+    That is the earliest upcoming start_at, or the instant just after the
+    earliest end_at, among activated states that have not ended yet.
+    Unlike the other helpers this raises on database errors, so callers
+    caching on the result never cache a failed read.
+
+    Args:
+        now: Timestamp to look ahead from (default: now)
+        scope: State scope filter (default: global)
+
+    Returns:
+        Next transition instant, or None if no boundary is scheduled
+    """
+    collection = get_collection()
+    ts = now or datetime.utcnow()
+
+    boundaries = []
+    for doc in collection.find(
+        {"active": True, "scope": scope, "end_at": {"$gte": ts}},
+        {"start_at": 1, "end_at": 1},
+    ):
+        start_at, end_at = doc.get("start_at"), doc.get("end_at")
+        if isinstance(start_at, datetime) and start_at > ts:
+            boundaries.append(start_at)
+        if isinstance(end_at, datetime):
+            # end_at is inclusive; the state drops out just after it
+            boundaries.append(end_at + timedelta(microseconds=1))
+
+    return min(boundaries) if boundaries else None
+
+
 def get_states_by_ids(state_ids: List[str]) -> Dict[str, Dict[str, Any]]:
     """Get state definitions by IDs.
     
@@ -609,6 +609,13 @@ def get_canon_persona_identity_collection():
     return db["persona_identity"]
 
 
+def get_canon_persona_overlays_collection():
+    """Resolved persona overlays, one document per persona key (materialized view)."""
+    client = connect_to_mongodb()
+    db = client[_get_db_name()]
+    return db["persona_overlays_resolved"]
+
+
 def get_canon_frontmatter_collection():
     """Canonical book/frontmatter documents (append-only)."""
     client = connect_to_mongodb()
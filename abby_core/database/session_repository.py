@@ -18,11 +18,13 @@ New Architecture (Decoupled):
     conversation_service.py ↗
 """
 
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
 import logging
 
 from abby_core.database.mongodb import get_sessions_collection
+from abby_core.database.collections.chat_session_interactions import INTERACTIONS_LAYOUT
+from abby_core.database.collections.chat_sessions import RELEASED_LEASE, SESSION_MAX_AGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -103,55 +105,65 @@ def count_active_sessions(user_id: int | str, guild_id: Optional[int | str] = No
         return 0
 
 
-def find_expired_sessions(before: datetime, limit: int = 100) -> List[Dict[str, Any]]:
-    """Find sessions that expired before a given timestamp.
+def claim_expiring_session(horizon: datetime, stale_after: timedelta = timedelta(minutes=10)) -> Optional[Dict[str, Any]]:
+    """Pop the next session expiring before `horizon` off the expiry queue.
+    
+    The queue is the status+expires_at index: one conditional update marks the
+    earliest due session "expiring" so exactly one worker finalizes it. Claims
+    left behind by a crashed worker become claimable again after `stale_after`.
     
     Args:
-        before: Timestamp threshold (sessions updated before this are expired)
-        limit: Maximum sessions to return
+        horizon: Claim sessions whose expires_at is at or before this time
+        stale_after: Age after which an unfinished claim is retried
         
     Returns:
-        List of expired session documents
+        The claimed session document, or None if nothing is due
     """
     try:
         collection = get_sessions_collection()
-        query = {
-            "status": "active",
-            "last_interaction_at": {"$lt": before}
-        }
-        return list(collection.find(query).limit(limit))
+        now = datetime.now(timezone.utc)
+        return collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "active", "expires_at": {"$lte": horizon}},
+                    {"status": "expiring", "expiring_since": {"$lt": now - stale_after}},
+                ]
+            },
+            # Revokes any lease so the owning process stops serving it from memory
+            {"$set": {"status": "expiring", "expiring_since": now, **RELEASED_LEASE}},
+            sort=[("expires_at", 1)],
+            return_document=True,
+        )
     except Exception as exc:
-        logger.error(f"[session_repo] Error finding expired sessions: {exc}")
-        return []
+        logger.error(f"[session_repo] Error claiming expiring session: {exc}")
+        return None
 
 
-def update_session(session_id: str, updates: Dict[str, Any]) -> bool:
-    """Update session fields.
+def update_session(
+    session_id: str,
+    updates: Dict[str, Any],
+    expected: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Update session fields in one conditional round-trip.
     
     Args:
         session_id: Session identifier
         updates: Dictionary of fields to update
+        expected: Optional field values the session must still have
+            (e.g. {"status": "active"}); no update happens otherwise
         
     Returns:
-        True if updated successfully, False otherwise
+        The updated session document, or None if no session matched
     """
     try:
         collection = get_sessions_collection()
-        logger.debug(f"[session_repo] Using collection: {collection.name} in database: {collection.database.name}")
-        query = {"session_id": session_id}
-        logger.debug(f"[session_repo] Attempting update with query: {query}")
-        
-        exists = collection.find_one(query)
-        logger.debug(f"[session_repo] Session exists before update: {'yes' if exists else 'NO'}")
-        if exists:
-            logger.debug(f"[session_repo] Existing session_id in DB: {exists.get('session_id')}")
-        
-        result = collection.update_one(query, {"$set": updates})
-        logger.debug(f"[session_repo] Updated session {session_id}: matched={result.matched_count}, modified={result.modified_count}, updates={updates}")
-        return result.modified_count > 0
+        query = {"session_id": session_id, **(expected or {})}
+        session = collection.find_one_and_update(query, {"$set": updates}, return_document=True)
+        logger.debug(f"[session_repo] Updated session {session_id}: matched={session is not None}, updates={updates}")
+        return session
     except Exception as exc:
         logger.error(f"[session_repo] Error updating session {session_id}: {exc}")
-        return False
+        return None
 
 
 def create_session(session_doc: Dict[str, Any]) -> bool:
@@ -165,7 +177,16 @@ def create_session(session_doc: Dict[str, Any]) -> bool:
     """
     try:
         collection = get_sessions_collection()
-        collection.insert_one(session_doc)
+        created_at = session_doc.get("created_at") or datetime.now(timezone.utc)
+        # History is bucketed from the first exchange (see chat_session_interactions)
+        collection.insert_one({
+            "interactions": [],
+            "interactions_layout": INTERACTIONS_LAYOUT,
+            "exchange_count": 0,
+            "message_count": 0,
+            "expires_at": created_at + timedelta(seconds=SESSION_MAX_AGE_SECONDS),
+            **session_doc,
+        })
         return True
     except Exception as exc:
         logger.error(f"[session_repo] Error creating session: {exc}")
@@ -190,7 +211,10 @@ def close_session(session_id: str, close_reason: str = "normal") -> bool:
                 "$set": {
                     "status": "closed",
                     "closed_at": datetime.utcnow(),
-                    "close_reason": close_reason
+                    "close_reason": close_reason,
+                    # Retention countdown (TTL) starts at close
+                    "expires_at": datetime.now(timezone.utc),
+                    **RELEASED_LEASE,
                 }
             }
         )
@@ -536,6 +536,36 @@ class DLQRetryJobHandler(JobHandler):
             return {"status": "error", "error": str(e)}
 
 
+class SessionExpiryJobHandler(JobHandler):
+    """Finalize chat sessions reaching their expires_at.
+
+    Claims sessions from the status+expires_at index, writes their summary
+    and marks them expired. Deleting them afterwards is left to the
+    expires_at TTL index.
+
+    Platform-agnostic: Uses ConversationService.
+    """
+
+    async def execute(self, job_config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute session expiry tick.
+
+        Returns:
+            {"status": "ok", "finalized": int}
+            {"status": "error", "error": str} on failure
+        """
+        try:
+            from abby_core.services.conversation_service import get_conversation_service
+
+            finalized, error = await get_conversation_service().finalize_expiring_sessions()
+            if error:
+                return {"status": "error", "error": error}
+            return {"status": "ok", "finalized": finalized}
+
+        except Exception as e:
+            logger.error(f"[⏰] Session expiry job failed: {e}", exc_info=True)
+            return {"status": "error", "error": str(e)}
+
+
 # ════════════════════════════════════════════════════════════════════════════════
 # DISCORD-SPECIFIC JOB HANDLERS
 # ════════════════════════════════════════════════════════════════════════════════
@@ -763,6 +793,9 @@ def register_scheduler_jobs(bot: Any) -> None:
     # DLQ retry processor - retries failed announcements
     scheduler.register_handler("dlq_retry", DLQRetryJobHandler(bot))
 
+    # Session expiry: finalize sessions reaching expires_at (TTL index deletes them later)
+    scheduler.register_handler("session_expiry", SessionExpiryJobHandler())
+
     # Seed default jobs if missing
     _ensure_job(
         "heartbeat",
@@ -818,4 +851,11 @@ def register_scheduler_jobs(bot: Any) -> None:
         scope="system",
     )
 
+    # Session expiry: every 1 minute (summarizes and closes sessions reaching expires_at)
+    _ensure_job(
+        "session_expiry",
+        ScheduleConfig(schedule_type="interval", every_minutes=1, enabled=True),
+        scope="system",
+    )
+
     logger.debug("[⏰] Scheduler jobs registered for Discord adapter")
@@ -18,6 +18,7 @@ from typing import Optional, Any, Dict, List
 import os
 import asyncio
 
+from abby_core.services.memory_envelope_cache import get_memory_envelope_cache
 from abby_core.services.memory_service_factory import create_discord_memory_service
 
 get_db: Any = None
@@ -2832,7 +2833,18 @@ class OperatorPanel(commands.Cog):
             value=f"👥 Profiles: {total_profiles:,}\n🧠 Total Memories: {total_facts:,}",
             inline=False
         )
-        
+
+        cache_stats = get_memory_envelope_cache().stats()
+        embed.add_field(
+            name="⚡ Envelope Cache",
+            value=(
+                f"Hit rate: {cache_stats['hit_rate']:.0%} "
+                f"({cache_stats['hits']:,} hits / {cache_stats['misses']:,} misses)\n"
+                f"Cached: {cache_stats['size']:,} • Invalidations: {cache_stats['invalidations']:,}"
+            ),
+            inline=False
+        )
+
         embed.add_field(
             name="Available Actions",
             value=(
@@ -3518,6 +3530,7 @@ class OperatorPanel(commands.Cog):
                 return
 
             result = run_maintenance()
+            get_memory_envelope_cache().clear(reason="operator_memory_maintenance")
             
             embed = discord.Embed(
                 title="🔧 Memory Maintenance Complete",
@@ -15,11 +15,17 @@ from abby_core.personality.manager import get_personality_manager
 from abby_core.llm.context_factory import build_conversation_context
 from abby_core.llm.intent import classify_intent, route_intent_to_action
 from abby_core.llm.intent_tools import execute_tool
+from abby_core.llm.history_compaction import HistoryCompactor
+from abby_core.llm.token_budget import MESSAGE_OVERHEAD_TOKENS, count_exchange_tokens, count_tokens
+from abby_core.llm.system_state_resolver import resolve_system_state
 from abby_core.discord.adapters.intent import build_intent_context
+from abby_core.services.memory_envelope_cache import get_memory_envelope_cache
+from abby_core.services.turn_prefetch import TurnPrefetcher
 
 # Import platform-agnostic services (lift Discord dependencies)
 from abby_core.services.conversation_service import get_conversation_service
 from abby_core.services.usage_gate_service import get_usage_gate_service
+from abby_core.services.user_service import get_user_service
 
 # Import unified MongoDB client for session management
 # sys.path already configured in launch.py
@@ -62,9 +68,23 @@ class Chatbot(commands.Cog):
         self.user_channel = {}      # Track the channel of each user's chat
         self.active_instances = []  # Track active chatbot instances
         
-        # Static prompt cache: {session_id: static_prompt_string}
-        # Caches persona core + guild context + boundaries per session
-        self._static_prompt_cache = {}
+        # Next-turn reads started while waiting for the user's reply
+        self.turn_prefetcher = TurnPrefetcher({
+            "session": lambda user_id, guild_id: get_conversation_service().get_active_session(
+                int(user_id), int(guild_id) if guild_id else None
+            ),
+            "guild_config": lambda user_id, guild_id: get_memory_settings(int(guild_id) if guild_id else 0),
+            "memory_envelope": lambda user_id, guild_id: self._get_memory_envelope(user_id, guild_id),
+            "system_state": lambda user_id, guild_id: resolve_system_state(scope="global"),
+            "persona_name": lambda user_id, guild_id: self._warm_active_persona(),
+        })
+        
+        # Running summary of turns that fell out of the recent history window
+        self.history_compactor = HistoryCompactor(
+            persist=lambda user_id, session_id, summary, compacted_turns: (
+                get_conversation_service().save_running_summary(user_id, session_id, summary, compacted_turns)
+            )
+        )
         
         logger.debug(
             "[💬] Chatbot initialized (adapter=discord, memory=mongodb, RAG via Orchestrator)",
@@ -76,6 +96,24 @@ class Chatbot(commands.Cog):
             }
         )
     
+    async def cog_unload(self):
+        self.turn_prefetcher.cancel_all()
+    
+    def _get_memory_envelope(self, user_id, guild_id):
+        """Memory envelope for (user, guild), served from the envelope cache between memory writes."""
+        guild_key = str(guild_id) if guild_id else None
+        return get_memory_envelope_cache().get_or_load(
+            user_id,
+            guild_key,
+            lambda: self.memory_service.get_memory_envelope(user_id, guild_key, force_refresh=False),
+        )
+    
+    def _warm_active_persona(self) -> str:
+        """Resolve the active persona and load its effective schema into the manager cache."""
+        persona_name = self.personality_manager.get_active_persona_name()
+        self.personality_manager.get_persona(persona_name)
+        return persona_name
+    
     @property
     def memory_store(self) -> MemoryStore:
         """Lazy initialization of MongoDB memory store."""
@@ -143,6 +181,8 @@ class Chatbot(commands.Cog):
         if user_id in self.active_instances:
             self.active_instances.remove(user_id)   # Remove the user from active instances
         self.user_channel.pop(user_id, None)        # Reset user channel after conversation ends
+        self.turn_prefetcher.cancel(user_id)        # Stop reads for a turn that will not come
+        self.history_compactor.discard(user_id)     # Drop the running summary with the conversation
     
     def end_cleanup(self,user,start_time):
         end_time = time.perf_counter()
@@ -237,6 +277,7 @@ class Chatbot(commands.Cog):
         
         # Invalidate memory cache immediately so next conversation gets fresh data
         invalidate_cache(user_id, guild_id, source_id="discord")
+        get_memory_envelope_cache().invalidate(user_id, reason="session_closed")
         logger.info(
             "memory_cache_invalidated",
             extra={"user_id": user_id, "guild_id": guild_id, "reason": "session_closed", "source_id": "discord"}
@@ -299,6 +340,8 @@ class Chatbot(commands.Cog):
                     )
                     if success:
                         facts_stored_count += 1
+                        # Tag the stored fact with its scoring features
+                        get_user_service().index_memory(user_id, fact_text, guild_id)
                         logger.info(
                             "fact_stored",
                             extra={
@@ -485,6 +528,7 @@ class Chatbot(commands.Cog):
                 # NOTE: Decay is already applied by envelope.py at read-time, so we don't apply it here
                 # (applying it twice would double-penalize facts)
                 invalidate_cache(user_id, guild_id, source_id="discord")
+                get_memory_envelope_cache().invalidate(user_id, reason="memory_extraction")
 
             except Exception as e:
                 logger.error(
@@ -501,7 +545,7 @@ class Chatbot(commands.Cog):
                 exc_info=True
             )
     
-    async def user_chat_mode(self, user_id, chat_history, user_input, session_id=None, persona_name=None, is_final_turn=False, memory_envelope=None):
+    async def user_chat_mode(self, user_id, chat_history, user_input, session_id=None, persona_name=None, is_final_turn=False, memory_envelope=None, system_state=None):
         """Generate chatbot response with optional RAG context injection.
         
         Args:
@@ -512,6 +556,7 @@ class Chatbot(commands.Cog):
             persona_name: Optional persona override
             is_final_turn: If True, instructs LLM to naturally close conversation
             memory_envelope: Raw TDOS memory envelope (will be formatted with budget + relevance)
+            system_state: Prefetched global system state (resolved by the context factory if None)
         """
         content = user_input.content
         
@@ -522,11 +567,7 @@ class Chatbot(commands.Cog):
                 guild_id_for_memory = str(user_input.guild.id)
             
             try:
-                memory_envelope = self.memory_service.get_memory_envelope(
-                    user_id, 
-                    guild_id_for_memory, 
-                    force_refresh=False
-                )
+                memory_envelope = self._get_memory_envelope(user_id, guild_id_for_memory)
             except (ValueError, ConnectionError) as e:
                 logger.warning(
                     "memory_envelope_error_in_chat_mode",
@@ -551,6 +592,9 @@ class Chatbot(commands.Cog):
         else:
             history_for_llm = chat_history
 
+        # Long sessions: older turns are sent as a running summary instead
+        conversation_summary, history_for_llm = self.history_compactor.view(user_id, session_id, history_for_llm)
+
         # Derive guild-level flags
         guild = getattr(user_input, 'guild', None)
         member = guild.get_member(int(user_id)) if guild else None
@@ -593,9 +637,6 @@ class Chatbot(commands.Cog):
         if hasattr(user_input, 'author') and user_input.author:
             display_name = getattr(user_input.author, 'display_name', None) or getattr(user_input.author, 'name', None)
 
-        # Lookup cached static prompt for this session
-        cached_static_prompt = self._static_prompt_cache.get(session_id) if session_id else None
-        
         # Calculate turn number (1-based) from chat history length
         turn_number = len(chat_history) + 1 if chat_history else 1
 
@@ -658,12 +699,14 @@ class Chatbot(commands.Cog):
             is_final_turn=is_final_turn,  # Pass final turn flag to system prompt builder
             user_role=user_role,  # Pass role for role-based farewells
             is_bot_creator=is_bot_creator,  # Pass bot creator status
-            static_prompt_cache=cached_static_prompt,  # Pass cached static prompt
             turn_number=turn_number,  # Pass turn number for conditional guild context
             user_message=content,  # Pass for conditional memory injection heuristics
             intent=user_intent.value,  # Pass classified intent as string for memory injection decision
-            max_memory_tokens=300,  # Token budget for memory (300 tokens = ~1200 chars)
+            max_memory_tokens=300,  # Token budget for memory (upper bound within the shared budget)
             session_id=session_id,  # Pass session_id for audit logging
+            max_context_tokens=2000,  # Shared budget: persona > memory > RAG > history
+            system_state=system_state,  # Prefetched while waiting for this message, if fresh
+            conversation_summary=conversation_summary,  # Compacted older turns, if any
         )
 
         # Apply hard context ceiling guard before LLM call
@@ -686,17 +729,10 @@ class Chatbot(commands.Cog):
         Returns:
             Modified context if over ceiling, otherwise original
         """
-        # Rough token estimation: 1 token ~= 4 chars
-        def estimate_tokens(text: str) -> int:
-            return len(text) // 4
-        
-        system_tokens = estimate_tokens(context.persona.system_message or "")
-        user_tokens = estimate_tokens(user_content)
-        history_tokens = sum(
-            estimate_tokens(str(msg.get("input", ""))) + 
-            estimate_tokens(str(msg.get("response", ""))) 
-            for msg in (context.chat_history or [])
-        )
+        # Real token counts (tiktoken or offline estimate, see llm/token_budget.py)
+        system_tokens = count_tokens(context.persona.system_message) + MESSAGE_OVERHEAD_TOKENS
+        user_tokens = count_tokens(user_content) + MESSAGE_OVERHEAD_TOKENS
+        history_tokens = sum(count_exchange_tokens(msg) for msg in (context.chat_history or []))
         
         total_estimated = system_tokens + user_tokens + history_tokens
         
@@ -724,9 +760,7 @@ class Chatbot(commands.Cog):
             while messages_to_keep > 0 and overage > 0:
                 messages_to_keep -= 1
                 dropped_msg = context.chat_history[0] if context.chat_history else {}
-                dropped_tokens = estimate_tokens(str(dropped_msg.get("input", ""))) + \
-                                estimate_tokens(str(dropped_msg.get("response", "")))
-                overage -= dropped_tokens
+                overage -= count_exchange_tokens(dropped_msg)
                 if context.chat_history:
                     context.chat_history = context.chat_history[1:]
             
@@ -762,6 +796,10 @@ class Chatbot(commands.Cog):
             "chat_history_updated",
             extra={"user_id": user_id, "session_id": session_id}
         )
+        
+        # Fold turns that left the recent window into the running summary (background)
+        turns = [item for item in chat_history if "Memory Context" not in item.get("input", "")]
+        self.history_compactor.maybe_compact(user_id, session_id, turns)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -809,10 +847,10 @@ class Chatbot(commands.Cog):
         # Initialize chat history with memory envelope context
         chat_history = []
         
-        # Get or build memory envelope (cached 15min)
+        # Get or build memory envelope (envelope cache, invalidated on memory writes)
         # Uses MemoryService with source_id for multi-adapter isolation
         try:
-            envelope = self.memory_service.get_memory_envelope(user_id, str(guild_id) if guild_id else None, force_refresh=False)
+            envelope = self._get_memory_envelope(user_id, guild_id)
             
             # Log envelope loaded (formatting now happens in context_factory with token budget)
             if envelope:
@@ -933,35 +971,6 @@ class Chatbot(commands.Cog):
             # Initialize the user's chat history
             chat_history, envelope = self.initalize_user(user_id, session_id, message)
 
-            # Build and cache static prompt for this session (one-time cost)
-            guild = message.guild
-            member = guild.get_member(int(user_id)) if guild else None
-            is_owner = bool(guild and getattr(guild, 'owner_id', None) == int(user_id))
-            user_role = "member"
-            if is_owner:
-                user_role = "owner"
-            elif member and hasattr(member, 'guild_permissions'):
-                if member.guild_permissions.administrator:
-                    user_role = "admin"
-                elif member.guild_permissions.manage_messages or member.guild_permissions.manage_channels:
-                    user_role = "moderator"
-            
-            persona = self.personality_manager.get_persona(
-                self.personality_manager.get_active_persona_name()
-            )
-            if persona:
-                static_prompt = self.personality_manager.build_static_prompt(
-                    persona=persona,
-                    guild_name=guild.name if guild else "the server",
-                    user_level="owner" if is_owner else "member",
-                    is_owner=is_owner,
-                    user_mention=message.author.mention,
-                    max_response_length=1200,
-                    user_role=user_role
-                )
-                self._static_prompt_cache[session_id] = static_prompt
-                logger.debug(f"[StaticPromptCache] Cached for session {session_id[:8]}")
-
             # Extract user input after summon word (if any)
             message_lower = message.content.lower()
             user_input_text = message.content
@@ -1070,6 +1079,9 @@ class Chatbot(commands.Cog):
         is_tool_only = False  # Initialize for farewell logic
         while True:
             try:
+                # Start next-turn reads while the user is typing
+                self.turn_prefetcher.start(user_id, user_id, guild_id)
+
                 # Wait for user input
                 user_input = await client.wait_for(
                     "message", 
@@ -1077,15 +1089,20 @@ class Chatbot(commands.Cog):
                     check=lambda m: m.author == user and not m.content.startswith('!') and m.channel == self.user_channel[user_id]
                 )
 
-                # Track exchange count
+                # Reads prefetched during the wait (empty if stale or unavailable)
+                prefetched = await self.turn_prefetcher.take(user_id)
                 
                 # --- USAGE GATE: Atomic turn limit check-and-increment ---
                 usage_gate_service = get_usage_gate_service()
                 conversation_service = get_conversation_service()
-                session_obj, error_msg = conversation_service.get_active_session(
+                load_session = lambda: conversation_service.get_active_session(
                     int(user.id),
                     int(guild_id) if guild_id else None
                 )
+                session_obj, error_msg = prefetched.get_or_load("session", load_session)
+                if not session_obj and prefetched.has("session"):
+                    # Never act on a prefetched miss; confirm against the store
+                    session_obj, error_msg = load_session()
                 
                 if not session_obj:
                     logger.error(f"[usage_gate] No session found for user {user_id} (guild={guild_id}) - error: {error_msg}")
@@ -1095,7 +1112,10 @@ class Chatbot(commands.Cog):
                     break
                 
                 # Get config to determine max turns
-                guild_config = get_memory_settings(int(guild_id) if guild_id else 0)
+                guild_config = prefetched.get_or_load(
+                    "guild_config",
+                    lambda: get_memory_settings(int(guild_id) if guild_id else 0)
+                )
                 usage_limits = guild_config.get("usage_limits", {})
                 conv_limits = usage_limits.get("conversation", {})
                 max_turns = conv_limits.get("max_turns_per_session", 3)
@@ -1198,8 +1218,10 @@ class Chatbot(commands.Cog):
                         chat_history, 
                         user_input,
                         session_id=session_id,
-                        persona_name=persona_name,
-                        is_final_turn=gate_result.is_final_turn
+                        persona_name=persona_name or prefetched.get("persona_name"),
+                        is_final_turn=gate_result.is_final_turn,
+                        memory_envelope=prefetched.get("memory_envelope"),
+                        system_state=prefetched.get("system_state")
                     )
 
                 # Handle tool responses with embeds or text
@@ -488,8 +488,8 @@ class PrivacyPanel(commands.Cog):
 
             for i, session in enumerate(sessions[:5], 1):
                 created_at = session.get("created_at", datetime.utcnow())
-                # interactions array contains user+assistant exchanges
-                message_count = len(session.get("interactions", []))
+                # Bucketed sessions keep a counter; older ones the full interactions array
+                message_count = session.get("message_count", len(session.get("interactions", [])))
 
                 time_str = created_at.strftime("%Y-%m-%d %H:%M") if hasattr(created_at, "strftime") else "unknown"
 
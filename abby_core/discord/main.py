@@ -283,6 +283,13 @@ class Abby(commands.Bot):
             except Exception as e:
                 logger.debug(f"[⏰] Error stopping scheduler: {e}")
             
+            # Flush buffered LLM generation audit records
+            try:
+                from abby_core.services.generation_audit_service import get_generation_audit_service
+                get_generation_audit_service().shutdown()
+            except Exception as e:
+                logger.debug(f"[GenerationAudit] Error flushing audit records: {e}")
+            
             # Call parent close
             await super().close()
             logger.info("[🐰] Shutdown complete")
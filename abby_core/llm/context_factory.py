@@ -20,8 +20,15 @@ from abby_core.llm.context import (
     PersonalityConfig as LLMPersonalityConfig,
     UserProfile as LLMUserProfile,
 )
+from abby_core.llm.prompt_builder import ContextFitter
 from abby_core.llm.system_state_resolver import resolve_system_state
-from abby_core.rag.memory_formatter import format_memory_for_llm, DOMAIN_KEYWORDS
+from abby_core.llm.token_budget import (
+    MESSAGE_OVERHEAD_TOKENS,
+    TokenBudget,
+    count_exchange_tokens,
+    count_tokens,
+)
+from abby_core.rag.memory_formatter import format_memory_for_llm, DOMAIN_KEYWORDS, _sanitize_rag_fact
 from abby_core.personality.manager import get_personality_manager
 from abby_core.personality.schema import PersonaSchema
 
@@ -244,6 +251,9 @@ def build_conversation_context(
     max_memory_tokens: int = 300,
     operator_id: Optional[str] = None,
     session_id: Optional[str] = None,
+    max_context_tokens: Optional[int] = None,
+    system_state: Optional[Dict[str, Any]] = None,
+    conversation_summary: Optional[str] = None,
 ):
     """Build a ConversationContext using current or provided persona.
     
@@ -267,13 +277,25 @@ def build_conversation_context(
         is_final_turn: If True, instructs persona to wrap up conversation naturally
         user_role: User's role level ("owner", "admin", "moderator", "member")
         is_bot_creator: Whether user is the bot creator/developer
-        static_prompt_cache: Optional pre-built static prompt (cached per session)
+        static_prompt_cache: Optional pre-built static prompt; bypasses the shared
+            static prefix cache (see abby_core/llm/prompt_cache.py), so new callers should omit it
         turn_number: Current turn number in conversation (1-indexed)
         user_message: Current user message (for memory injection heuristics)
         intent: Optional intent classification (for memory injection heuristics)
         max_memory_tokens: Token budget for memory context (default 300)
         operator_id: Optional operator ID for audit trail (devlog injection accountability)
         session_id: Optional session ID for tracking
+        max_context_tokens: Optional total token budget for system prompt, user
+            message and history. When set, the budget is spent in priority order
+            (persona/system + user message, memory, RAG, newest history) and
+            lower-priority sections are trimmed to fit (see llm/token_budget.py)
+        system_state: Optional already-resolved global system state (e.g. read
+            ahead by the chatbot's turn prefetcher); resolved here when None
+        conversation_summary: Optional running summary of turns no longer in
+            chat_history (see llm/history_compaction.py). It paraphrases
+            user-authored text, so it passes the security gate and the RAG
+            fact sanitizer before entering the system prompt. Budgeted right
+            after the required sections, ahead of memory
     
     Returns:
         ConversationContext ready for LLM ingestion (all fields sanitized)
@@ -343,36 +365,22 @@ def build_conversation_context(
     ctx.user_level = user_level
     ctx.is_owner = is_owner
     ctx.session_id = session_id  # Track session for audit logging
+    if intent:
+        ctx.intent_info = {"intent": intent}
     
-    # Format memory with token budget + relevance IF envelope provided
-    memory_context_formatted = None
-    if memory_envelope:
-        # First check if we should inject memory at all (domain-driven heuristics)
-        should_inject = _should_inject_memory(
-            user_message=user_message or "",
-            memory_context=memory_envelope,  # Pass envelope as truthy check
-            turn_number=turn_number,
-            intent=intent,
-            is_final_turn=is_final_turn,
+    # The running summary is an LLM paraphrase of user turns: treat it like
+    # any other user-controlled text before it gets system-prompt placement
+    if conversation_summary:
+        summary_safe, checked_summary = security_gate.sanitize_field(
+            conversation_summary, "conversation_summary", audit_context
         )
-        
-        if should_inject:
-            # Format memory with token budget and relevance scoring
-            # NOTE: Now using format_memory_for_llm from abby_core/rag/memory_formatter.py
-            memory_context_formatted = format_memory_for_llm(
-                envelope=memory_envelope,
-                user_message=user_message or "",
-                max_tokens=max_memory_tokens,
-                intent=intent,
-                min_relevance_score=20,  # Require domain match OR multiple keyword overlaps
-            )
-            
-            if memory_context_formatted:
-                logger.info(f"[context_factory] Memory formatted and injected (turn={turn_number})")
-            else:
-                logger.info(f"[context_factory] Memory formatting returned None (no relevant facts within budget)")
+        if summary_safe:
+            conversation_summary = _sanitize_rag_fact(checked_summary, max_chars=2000) or None
         else:
-            logger.info(f"[context_factory] Memory skipped for turn {turn_number} (casual query, no domain match)")
+            logger.warning(
+                f"[context_factory] Dropped conversation summary (injection detected) session={session_id}"
+            )
+            conversation_summary = None
     
     # Inject devlog context ONLY on META_SYSTEM intent
     devlog_context = None
@@ -397,37 +405,107 @@ def build_conversation_context(
         except Exception as exc:
             logger.warning(f"[context_factory] Failed to fetch devlog: {exc}")
     
-    # Store formatted memory and devlog in context
-    ctx.memory_context = memory_context_formatted
-    ctx.rag_context = rag_context  # RAG is formal knowledge, always inject
-    ctx.system_state = resolve_system_state(scope="global")
+    ctx.system_state = system_state if system_state is not None else resolve_system_state(scope="global")
     
-    # Build the full system prompt with memory, RAG, devlog, and is_final_turn
     # Build chat history string for template injection (legacy parameter, no longer used in template)
     history_str = ""  # Removed: LLM gets conversation context from actual message history
 
     turn_phase = _infer_turn_phase(user_message or "", ctx.chat_history)
     
-    # Use manager to build full system prompt with all context
-    ctx.persona.system_message = manager.build_system_prompt(
-        persona=persona_schema,
-        guild_name=guild_name or "the server",
-        user_level=user_level,
-        is_owner=is_owner,
-        user_mention=user_name or "@user",
-        available_tools=[],
-        chat_history=history_str,
-        memory_context=ctx.memory_context,  # Use filtered memory
-        rag_context=rag_context,
-        max_response_length=1200,
-        is_final_turn=is_final_turn,
-        user_role=user_role,
-        is_bot_creator=is_bot_creator,
-        static_prompt=static_prompt_cache,
-        turn_number=turn_number,
-        turn_phase=turn_phase,
-        system_state=ctx.system_state,
-        devlog_context=devlog_context,
-    )
+    def _build_prompt(
+        memory_context: Optional[str],
+        rag: Optional[str],
+        summary: Optional[str] = None,
+        fit_context: Optional[ContextFitter] = None,
+    ) -> str:
+        # Use manager to build full system prompt with all context
+        return manager.build_system_prompt(
+            persona=persona_schema,
+            guild_name=guild_name or "the server",
+            user_level=user_level,
+            is_owner=is_owner,
+            user_mention=user_name or "@user",
+            available_tools=[],
+            chat_history=history_str,
+            memory_context=memory_context,  # Use filtered memory
+            rag_context=rag,
+            max_response_length=1200,
+            is_final_turn=is_final_turn,
+            user_role=user_role,
+            is_bot_creator=is_bot_creator,
+            static_prompt=static_prompt_cache,
+            turn_number=turn_number,
+            turn_phase=turn_phase,
+            system_state=ctx.system_state,
+            devlog_context=devlog_context,
+            guild_id=ctx.guild_id,
+            conversation_summary=summary,
+            fit_context=fit_context,
+        )
+    
+    def _format_memory(max_tokens: int) -> Optional[str]:
+        # Format memory with token budget + relevance IF envelope provided
+        if not memory_envelope or max_tokens <= 0:
+            return None
+        # First check if we should inject memory at all (domain-driven heuristics)
+        should_inject = _should_inject_memory(
+            user_message=user_message or "",
+            memory_context=memory_envelope,  # Pass envelope as truthy check
+            turn_number=turn_number,
+            intent=intent,
+            is_final_turn=is_final_turn,
+        )
+        if not should_inject:
+            logger.info(f"[context_factory] Memory skipped for turn {turn_number} (casual query, no domain match)")
+            return None
+        
+        # Format memory with token budget and relevance scoring
+        # NOTE: Now using format_memory_for_llm from abby_core/rag/memory_formatter.py
+        formatted = format_memory_for_llm(
+            envelope=memory_envelope,
+            user_message=user_message or "",
+            max_tokens=max_tokens,
+            intent=intent,
+            min_relevance_score=20,  # Require domain match OR multiple keyword overlaps
+        )
+        if formatted:
+            logger.info(f"[context_factory] Memory formatted and injected (turn={turn_number})")
+        else:
+            logger.info(f"[context_factory] Memory formatting returned None (no relevant facts within budget)")
+        return formatted
+    
+    # Shared token budget: persona/system and the user message are required,
+    # then memory, RAG and history get what is left, in that order
+    budget = TokenBudget(max_context_tokens) if max_context_tokens else None
+    user_tokens = count_tokens(user_message) + MESSAGE_OVERHEAD_TOKENS
+    
+    if budget:
+        def _fit_context(base_prompt: str):
+            # Called once by the prompt builder with the prompt minus these sections
+            budget.reserve("system", base_prompt, overhead=MESSAGE_OVERHEAD_TOKENS)
+            budget.reserve("user", user_message, overhead=MESSAGE_OVERHEAD_TOKENS)
+            summary = budget.fit_text("summary", conversation_summary)
+            ctx.memory_context = budget.fit_text("memory", _format_memory(budget.allowance(max_memory_tokens)))
+            ctx.rag_context = budget.fit_text("rag", rag_context)
+            return ctx.memory_context, ctx.rag_context, summary
+        
+        ctx.persona.system_message = _build_prompt(None, None, fit_context=_fit_context)
+    else:
+        ctx.memory_context = _format_memory(max_memory_tokens)
+        ctx.rag_context = rag_context  # RAG is formal knowledge, always inject
+        # Build the full system prompt with memory, RAG, devlog, and is_final_turn
+        ctx.persona.system_message = _build_prompt(ctx.memory_context, ctx.rag_context, conversation_summary)
+    
+    if budget:
+        # History gets the exact remainder of the assembled prompt, newest first
+        prompt_tokens = count_tokens(ctx.persona.system_message) + MESSAGE_OVERHEAD_TOKENS
+        ctx.chat_history = budget.take(
+            "history",
+            ctx.chat_history,
+            cost=count_exchange_tokens,
+            max_tokens=max_context_tokens - prompt_tokens - user_tokens,
+            newest_first=True,
+        )
+        logger.info(f"[context_factory] Token budget {budget.summary()}")
     
     return ctx
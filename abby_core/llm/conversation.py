@@ -25,6 +25,7 @@ Responsibilities:
 - Log conversation flow
 """
 
+import asyncio
 import os
 import time
 import uuid
@@ -33,6 +34,8 @@ from typing import List, Dict, Optional
 from tdos_intelligence.llm import LLMClient
 from abby_core.personality.manager import get_personality_manager
 from abby_core.llm.context import ConversationContext
+from abby_core.llm.response_cache import get_response_cache
+from abby_core.llm.token_budget import count_tokens
 from abby_core.observability.logging import setup_logging, logging
 from abby_core.services.generation_audit_service import get_generation_audit_service
 
@@ -40,6 +43,9 @@ setup_logging()
 logger = logging.getLogger(__name__)
 PROMPT_VERBOSE = os.getenv("PROMPT_VERBOSE", "0") in {"1", "true", "True"}
 
+# Returned by summarize() when every attempt failed
+SUMMARY_UNAVAILABLE = "Unable to generate summary at this time."
+
 # LLM client singleton
 _llm_client: Optional[LLMClient] = None
 
@@ -52,6 +58,43 @@ def get_llm_client() -> LLMClient:
     return _llm_client
 
 
+def _log_generation_audit(
+    context: ConversationContext,
+    *,
+    provider: str,
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    latency_ms: int,
+    system_prompt: Optional[str],
+    user_message: str,
+    response: str,
+) -> None:
+    """Record a generation (LLM call or cache hit) for cost tracking and observability."""
+    try:
+        audit_service = get_generation_audit_service()
+        # Generate audit ID from session and timestamp
+        audit_id = f"{context.session_id or 'no-session'}_{uuid.uuid4().hex[:8]}"
+        audit_service.log_generation(
+            audit_id=audit_id,
+            provider=provider,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_ms=latency_ms,
+            session_id=context.session_id,
+            user_id=str(context.user_id),
+            guild_id=context.guild_id,
+            intent=context.intent_info.get("intent") if context.intent_info else None,
+            system_prompt=system_prompt[:500] if system_prompt else None,
+            user_message=user_message[:500],
+            response=response[:500],
+        )
+    except Exception as audit_error:
+        # Don't fail the request if audit logging fails
+        logger.warning(f"[⚠️] Generation audit logging failed: {audit_error}")
+
+
 async def respond(
     user_message: str,
     context: ConversationContext,
@@ -94,6 +137,31 @@ async def respond(
             }
     """
     try:
+        # Informational questions in opted-in guilds may be answered from the
+        # semantic response cache (shadow mode only logs would-be hits). The
+        # lookup reads guild settings and runs the embedding model, so it is
+        # kept off the event loop.
+        response_cache = get_response_cache()
+        start_time = time.time()
+        cache_check = await asyncio.to_thread(response_cache.check, user_message, context)
+        if cache_check.response is not None:
+            logger.info(
+                f"[💬] Served cached response (guild={context.guild_id}, "
+                f"similarity={cache_check.similarity:.3f})"
+            )
+            _log_generation_audit(
+                context,
+                provider="response_cache",
+                model="semantic_response_cache",
+                input_tokens=0,
+                output_tokens=count_tokens(cache_check.response),
+                latency_ms=int((time.time() - start_time) * 1000),
+                system_prompt=context.persona.system_message,
+                user_message=user_message,
+                response=cache_check.response,
+            )
+            return cache_check.response
+        
         llm = get_llm_client()
         
         # NOTE: persona_schema already obtained in build_conversation_context()
@@ -119,7 +187,7 @@ async def respond(
         system_prompt = context.persona.system_message
 
         system_len = len(system_prompt)
-        approx_tokens = int(system_len / 4)  # rough token estimate
+        approx_tokens = count_tokens(system_prompt)
         if PROMPT_VERBOSE:
             logger.debug(
                 f"[Prompt] System prompt size: {system_len} chars (~{approx_tokens} tokens) | "
@@ -174,34 +242,20 @@ async def respond(
                 logger.debug(f"[✅] Chat response generated ({len(response)} chars)")
                 
                 # Audit logging for cost tracking and observability
-                try:
-                    audit_service = get_generation_audit_service()
-                    # Estimate tokens (rough: 1 token ≈ 4 chars)
-                    input_tokens = sum(len(m.get("content", "")) for m in messages) // 4
-                    output_tokens = len(response) // 4
-                    
-                    # Generate audit ID from session and timestamp
-                    audit_id = f"{context.session_id or 'no-session'}_{uuid.uuid4().hex[:8]}"
-                    
-                    audit_service.log_generation(
-                        audit_id=audit_id,
-                        provider="openai",  # LLM client determines actual provider
-                        model=llm.openai_model,
-                        input_tokens=input_tokens,
-                        output_tokens=output_tokens,
-                        latency_ms=latency_ms,
-                        session_id=context.session_id,
-                        user_id=str(context.user_id),
-                        guild_id=context.guild_id,
-                        intent=context.intent_info.get("intent") if context.intent_info else None,
-                        system_prompt=system_prompt[:500] if system_prompt else None,
-                        user_message=content[:500],
-                        response=response[:500],
-                    )
-                except Exception as audit_error:
-                    # Don't fail the request if audit logging fails
-                    logger.warning(f"[⚠️] Generation audit logging failed: {audit_error}")
+                # Token counts from the shared tokenizer (see llm/token_budget.py)
+                _log_generation_audit(
+                    context,
+                    provider="openai",  # LLM client determines actual provider
+                    model=llm.openai_model,
+                    input_tokens=sum(count_tokens(m.get("content", "")) for m in messages),
+                    output_tokens=count_tokens(response),
+                    latency_ms=latency_ms,
+                    system_prompt=system_prompt,
+                    user_message=content,
+                    response=response,
+                )
                 
+                response_cache.record(cache_check, response)
                 return response
             
             except Exception as e:
@@ -224,6 +278,15 @@ async def respond(
 
 
 
+def format_exchanges(chat_session: List[Dict]) -> str:
+    """Render {input, response} exchanges as a User/Abby transcript."""
+    return "\n\n".join([
+        f"User: {item.get('input', '')}\nAbby: {item.get('response', '')}"
+        for item in chat_session
+        if isinstance(item, dict) and (item.get('input') or item.get('response'))
+    ])
+
+
 async def summarize(
     chat_session: List[Dict] | str,
     max_tokens: int = 300,
@@ -247,11 +310,7 @@ async def summarize(
         
         # Convert to text if needed
         if isinstance(chat_session, list):
-            formatted_text = "\n\n".join([
-                f"User: {item.get('input', '')}\nAbby: {item.get('response', '')}"
-                for item in chat_session
-                if isinstance(item, dict) and (item.get('input') or item.get('response'))
-            ])
+            formatted_text = format_exchanges(chat_session)
             chat_text = formatted_text if formatted_text else str(chat_session)
         else:
             chat_text = str(chat_session)
@@ -271,8 +330,8 @@ async def summarize(
                 # Audit logging for summarization
                 try:
                     audit_service = get_generation_audit_service()
-                    input_tokens = len(chat_text) // 4  # Rough estimate
-                    output_tokens = len(response) // 4
+                    input_tokens = count_tokens(chat_text)
+                    output_tokens = count_tokens(response)
                     
                     # Generate audit ID
                     audit_id = f"summarize_{uuid.uuid4().hex[:8]}"
@@ -303,11 +362,11 @@ async def summarize(
                     time.sleep(1)
         
         logger.error("[❌] Summarize failed after all retries")
-        return "Unable to generate summary at this time."
+        return SUMMARY_UNAVAILABLE
     
     except Exception as e:
         logger.error(f"[❌] Unexpected error in summarize(): {str(e)}")
-        return "Unable to generate summary at this time."
+        return SUMMARY_UNAVAILABLE
 
 
 
@@ -0,0 +1,171 @@
+"""Rolling compaction of long chat sessions.
+
+Without compaction a long session keeps resending its growing raw history
+until the context ceiling drops the oldest turns, so every turn costs more
+and the start of the conversation is lost outright. HistoryCompactor keeps a
+running summary per conversation instead:
+
+    turns:   [ t1  t2  t3  t4  t5 | t6  t7 ]
+               running summary      last K turns, sent raw
+
+Once a session has more than COMPACTION_TRIGGER_TURNS exchanges, every turn
+that falls out of the last COMPACTION_KEEP_TURNS is folded into the summary
+by a background summarize() call (previous summary + the newly evicted
+turns), so the reply path never waits on it. Until a fold lands, view()
+keeps serving the previous summary and the turns after it, so nothing is
+dropped in between. Prompt size per turn is then bounded by the summary
+budget plus K turns rather than growing with session length.
+
+The summary is also written to the session document (running_summary,
+compacted_turns) through the persist callback.
+
+Compaction only engages once a session outlives COMPACTION_TRIGGER_TURNS.
+The default guild limit (usage_limits.conversation.max_turns_per_session = 3)
+closes sessions well before that, so with defaults nothing is ever folded;
+it matters for guilds that raise the turn limit past the trigger. Lowering
+the trigger below the turn limit makes little sense: with K kept turns there
+is almost nothing left to summarize in a 3-turn session.
+
+Configuration (env):
+    COMPACTION_ENABLED               true | false (default true)
+    COMPACTION_TRIGGER_TURNS         exchanges before compaction starts (default 6)
+    COMPACTION_KEEP_TURNS            most recent exchanges kept verbatim (default 2)
+    COMPACTION_SUMMARY_MAX_TOKENS    summary length cap (default 200)
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from abby_core.llm.token_budget import count_tokens
+from abby_core.observability.logging import logging
+
+logger = logging.getLogger(__name__)
+
+Summarizer = Callable[..., Awaitable[str]]
+# persist(key, session_id, summary, compacted_turns)
+Persist = Callable[[str, Optional[str], str, int], Any]
+
+
+@dataclass
+class CompactionState:
+    """Running summary of one conversation."""
+    session_id: Optional[str]
+    summary: Optional[str] = None
+    compacted_turns: int = 0
+    task: Optional[asyncio.Task] = None
+
+
+async def _default_summarize(text: str, max_tokens: int) -> Optional[str]:
+    from abby_core.llm.conversation import SUMMARY_UNAVAILABLE, summarize
+
+    summary = await summarize(text, max_tokens=max_tokens, max_retries=1)
+    return None if summary == SUMMARY_UNAVAILABLE else summary
+
+
+class HistoryCompactor:
+    """Folds the oldest turns of long conversations into a running summary.
+
+    State is keyed by conversation (the chatbot uses the user id) and reset
+    when the session id changes. Must be used from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        summarize: Optional[Summarizer] = None,
+        persist: Optional[Persist] = None,
+        trigger_turns: Optional[int] = None,
+        keep_turns: Optional[int] = None,
+        summary_max_tokens: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self._summarize = summarize or _default_summarize
+        self._persist = persist
+        self.trigger_turns = (
+            int(os.getenv("COMPACTION_TRIGGER_TURNS", "6")) if trigger_turns is None else trigger_turns
+        )
+        self.keep_turns = max(1, int(os.getenv("COMPACTION_KEEP_TURNS", "2")) if keep_turns is None else keep_turns)
+        self.summary_max_tokens = (
+            int(os.getenv("COMPACTION_SUMMARY_MAX_TOKENS", "200")) if summary_max_tokens is None
+            else summary_max_tokens
+        )
+        self.enabled = (
+            os.getenv("COMPACTION_ENABLED", "true").lower() == "true" if enabled is None else enabled
+        )
+        self._states: Dict[str, CompactionState] = {}
+        self._stats = {"folds": 0, "folded_turns": 0, "failures": 0}
+
+    def view(self, key: str, session_id: Optional[str], history: List[Dict[str, Any]]) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """Running summary and the turns it does not cover yet.
+
+        Returns (None, history) until the first fold has landed.
+        """
+        state = self._states.get(key)
+        if not state or state.session_id != session_id or not state.summary:
+            return None, history
+        return state.summary, history[state.compacted_turns:]
+
+    def maybe_compact(self, key: str, session_id: Optional[str], history: List[Dict[str, Any]]) -> Optional[asyncio.Task]:
+        """Schedule a background fold if turns fell out of the kept window.
+
+        One fold runs per conversation at a time; turns evicted meanwhile are
+        picked up by the next call. Returns the scheduled task, if any.
+        """
+        if not self.enabled or len(history) <= self.trigger_turns:
+            return None
+        state = self._states.get(key)
+        if state is None or state.session_id != session_id:
+            self.discard(key)
+            state = self._states[key] = CompactionState(session_id=session_id)
+        if state.task and not state.task.done():
+            return None
+
+        end = len(history) - self.keep_turns
+        if end <= state.compacted_turns:
+            return None
+        evicted = list(history[state.compacted_turns:end])
+        state.task = asyncio.get_running_loop().create_task(self._fold(key, state, evicted, end))
+        return state.task
+
+    def discard(self, key: str) -> None:
+        """Forget a conversation's summary and cancel its fold in flight."""
+        state = self._states.pop(key, None)
+        if state and state.task and not state.task.done():
+            state.task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "conversations": len(self._states)}
+
+    async def _fold(self, key: str, state: CompactionState, evicted: List[Dict[str, Any]], end: int) -> None:
+        from abby_core.llm.conversation import format_exchanges
+
+        text = format_exchanges(evicted)
+        if state.summary:
+            text = f"Summary of the conversation so far:\n{state.summary}\n\nWhat was said next:\n{text}"
+        try:
+            # summarize() calls the LLM synchronously; keep it off the event loop
+            summary = await asyncio.to_thread(
+                asyncio.run, self._summarize(text, max_tokens=self.summary_max_tokens)
+            )
+        except Exception as exc:
+            summary = None
+            logger.warning(f"[history_compaction] Fold failed for {key}: {exc}")
+        if not summary:
+            # Keep the raw turns; the next turn retries the fold
+            self._stats["failures"] += 1
+            return
+
+        state.summary = summary.strip()
+        state.compacted_turns = end
+        self._stats["folds"] += 1
+        self._stats["folded_turns"] += len(evicted)
+        logger.info(
+            f"[history_compaction] Folded {len(evicted)} turn(s) into running summary "
+            f"({end} compacted, {count_tokens(state.summary)} tokens) session={state.session_id}"
+        )
+        if self._persist:
+            try:
+                await asyncio.to_thread(self._persist, key, state.session_id, state.summary, end)
+            except Exception as exc:
+                logger.warning(f"[history_compaction] Could not store running summary: {exc}")
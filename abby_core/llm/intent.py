@@ -13,7 +13,8 @@ abstractions instead of importing discord types, enabling reuse across adapters.
 """
 
 from enum import Enum
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, FrozenSet, List, Pattern, Set, Tuple
 import re
 import logging
 
@@ -84,31 +85,98 @@ INTENT_PRIORITY = [
 ]
 
 
-def classify_intent(
-    user_message: str,
-    chat_history: Optional[list] = None,
-    context: Optional[Dict[str, Any]] = None,
-) -> Intent:
-    """Classify user intent using rule-based patterns.
-    
-    Args:
-        user_message: The user's current message
-        chat_history: Optional conversation history for context
-        context: Optional additional context (guild info, user role, etc.)
-    
-    Returns:
-        Classified intent enum
+# ---------------------------------------------------------------------------
+# Compiled matcher
+#
+# classify_intent runs on every chat turn, so INTENT_PATTERNS is compiled once
+# at import. Most patterns are ``\b(word|phrase|...)\b`` alternations of plain
+# literals; those literals go into a keyword table looked up during a single
+# pass over the message's words. Only alternatives with regex syntax (and
+# patterns of any other shape) remain as compiled regexes, and each of those is
+# searched only if the keyword pass has not already matched its pattern.
+# Each pattern still contributes at most 1 to its intent's score, so labels
+# are identical to searching every pattern (see _reference_scores).
+# ---------------------------------------------------------------------------
+
+_PATTERN_LIST: List[Tuple[Intent, str]] = [
+    (intent, pattern) for intent, patterns in INTENT_PATTERNS.items() for pattern in patterns
+]
+
+_ALTERNATION_SHAPE = re.compile(r"^\\b\((?!\?)(.*)\)\\b$")
+_LITERAL_ALTERNATIVE = re.compile(r"^[a-z]+(?: [a-z]+)*$")
+_WORD = re.compile(r"\w+")
+
+
+def _split_alternatives(body: str) -> Optional[List[str]]:
+    """Top-level ``|`` split of a group body, or None if it nests groups."""
+    if any(ch in body for ch in "()[]"):
+        return None
+    return body.split("|")
+
+
+def _compile_patterns() -> Tuple[Dict[str, List[Tuple[str, int]]], List[Tuple[int, Pattern]]]:
+    # first word -> [(literal, pattern index)]
+    keywords: Dict[str, List[Tuple[str, int]]] = {}
+    residual: List[Tuple[int, Pattern]] = []
+    for index, (_, pattern) in enumerate(_PATTERN_LIST):
+        shape = _ALTERNATION_SHAPE.match(pattern)
+        alternatives = _split_alternatives(shape.group(1)) if shape else None
+        if alternatives is None:
+            residual.append((index, re.compile(pattern, re.IGNORECASE)))
+            continue
+        regex_alternatives = []
+        for alternative in alternatives:
+            if _LITERAL_ALTERNATIVE.match(alternative):
+                keywords.setdefault(alternative.split(" ", 1)[0], []).append((alternative, index))
+            else:
+                regex_alternatives.append(alternative)
+        if regex_alternatives:
+            residual.append(
+                (index, re.compile(r"\b(?:" + "|".join(regex_alternatives) + r")\b", re.IGNORECASE))
+            )
+    return keywords, residual
+
+
+_KEYWORDS, _RESIDUAL_PATTERNS = _compile_patterns()
+
+
+def _matched_patterns(message_lower: str) -> Set[int]:
+    """Indexes into _PATTERN_LIST of the patterns found in the message."""
+    matched: Set[int] = set()
+    for word in _WORD.finditer(message_lower):
+        candidates = _KEYWORDS.get(word.group())
+        if not candidates:
+            continue
+        start = word.start()
+        for literal, index in candidates:
+            if index in matched:
+                continue
+            end = start + len(literal)
+            # \b after the literal: end of text or a non-word character
+            if message_lower.startswith(literal, start) and (
+                end == len(message_lower) or not _WORD.match(message_lower[end])
+            ):
+                matched.add(index)
+    for index, pattern in _RESIDUAL_PATTERNS:
+        if index not in matched and pattern.search(message_lower):
+            matched.add(index)
+    return matched
+
+
+def _reference_scores(message_lower: str) -> Dict[Intent, int]:
+    """Scores from searching every raw pattern (the original algorithm).
+
+    Kept as the parity oracle for tests and scripts/bench_intent.py.
     """
-    message_lower = user_message.lower().strip()
-    
-    # Check each intent's patterns
-    intent_scores = {intent: 0 for intent in Intent}
-    
+    scores = {intent: 0 for intent in Intent}
     for intent, patterns in INTENT_PATTERNS.items():
         for pattern in patterns:
             if re.search(pattern, message_lower, re.IGNORECASE):
-                intent_scores[intent] += 1
-    
+                scores[intent] += 1
+    return scores
+
+
+def _pick_intent(intent_scores: Dict[Intent, int]) -> Intent:
     # Return intent with highest score; break ties by priority order
     max_score = max(intent_scores.values())
     if max_score == 0:
@@ -124,6 +192,70 @@ def classify_intent(
     return Intent.CASUAL_CHAT
 
 
+@lru_cache(maxsize=1024)
+def _classify_normalized(message_lower: str) -> Intent:
+    intent_scores = {intent: 0 for intent in Intent}
+    for index in _matched_patterns(message_lower):
+        intent_scores[_PATTERN_LIST[index][0]] += 1
+    return _pick_intent(intent_scores)
+
+
+def classify_intent(
+    user_message: str,
+    chat_history: Optional[list] = None,
+    context: Optional[Dict[str, Any]] = None,
+) -> Intent:
+    """Classify user intent using rule-based patterns.
+    
+    Classification depends only on the message text, so results are memoized
+    per normalized message: the repeat classification of the same turn (chat
+    cog, then response cache) is a dict lookup.
+    
+    Args:
+        user_message: The user's current message
+        chat_history: Optional conversation history for context
+        context: Optional additional context (guild info, user role, etc.)
+    
+    Returns:
+        Classified intent enum
+    """
+    return _classify_normalized(user_message.lower().strip())
+
+
+# Intents whose answers can be informational (FAQ-style questions about the
+# community or Abby herself) rather than personal or creative work.
+INFORMATIONAL_INTENTS = {Intent.CASUAL_CHAT, Intent.META_SYSTEM}
+
+_QUESTION_PATTERN = re.compile(
+    r"\?\s*$|^(what|what'?s|when|where|who|which|how|why|is|are|does|do|can|will)\b"
+)
+_PERSONAL_PATTERN = re.compile(r"\b(my|mine|me|myself|i'?m|i'?ve|i am|i have)\b")
+
+
+_GREETING_PATTERN_INDEXES: FrozenSet[int] = frozenset(
+    index for index, (intent, pattern) in enumerate(_PATTERN_LIST)
+    if intent == Intent.CASUAL_CHAT and pattern in INTENT_PATTERNS[Intent.CASUAL_CHAT][:2]
+)
+
+
+def is_informational(user_message: str, intent: Intent) -> bool:
+    """Whether a message is an informational question whose answer does not
+    depend on who asks (e.g. "when is game night?").
+
+    Greetings, thanks and questions about the user themselves ("what's my
+    level?") are excluded even when the intent is informational.
+    """
+    if intent not in INFORMATIONAL_INTENTS:
+        return False
+    message_lower = user_message.lower().strip()
+    if not _QUESTION_PATTERN.search(message_lower):
+        return False
+    if _PERSONAL_PATTERN.search(message_lower):
+        return False
+    # Greetings/thanks: the first two CASUAL_CHAT patterns
+    return not (_matched_patterns(message_lower) & _GREETING_PATTERN_INDEXES)
+
+
 def should_use_llm(intent: Intent) -> bool:
     """Determine if LLM is needed for this intent.
     
@@ -0,0 +1,122 @@
+"""Static system-prompt prefix cache.
+
+build_conversation_context runs on every chat turn, and most of the system
+prompt it assembles (persona core, style, behavioral boundaries, guild
+context) only changes when the persona, its canon or the persona config
+changes. The prompt is therefore split into:
+
+    static prefix   persona template minus user-specific sections, rendered
+                    once per (guild, persona, canon version, config version)
+    dynamic suffix  user context, memory, RAG, platform state, turn state
+
+The prefix is always emitted first and byte-identical for every user and
+turn in a guild, so provider-side prompt caching (which matches on a shared
+leading span) can hit. Version bumps change the key, so stale prefixes are
+never matched again and age out of the LRU.
+
+Configuration (env):
+    PROMPT_PREFIX_CACHE_SIZE   max cached prefixes (default 256, 0 disables)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class PromptPrefixCache:
+    """Thread-safe LRU of rendered static prefixes plus assembly metrics."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reused_chars = 0
+        self.assemblies = 0
+        self.assembly_ms_total = 0.0
+        self.assembly_ms_max = 0.0
+        self.prefix_chars_total = 0
+        self.prompt_chars_total = 0
+
+    @staticmethod
+    def make_key(
+        guild_id: Optional[str],
+        persona_name: str,
+        canon_version: int,
+        config_version: int,
+    ) -> Hashable:
+        return (str(guild_id) if guild_id else None, persona_name, canon_version, config_version)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], str]) -> str:
+        """Return the cached prefix for key, rendering it with build() on a miss."""
+        with self._lock:
+            prefix = self._entries.get(key)
+            if prefix is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.reused_chars += len(prefix)
+                return prefix
+            self.misses += 1
+
+        # Render outside the lock; a concurrent miss renders the same text
+        prefix = build()
+        if self.max_entries:
+            with self._lock:
+                self._entries[key] = prefix
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return prefix
+
+    def record_assembly(self, elapsed_ms: float, prefix_chars: int, prompt_chars: int) -> None:
+        """Record one full system-prompt assembly."""
+        with self._lock:
+            self.assemblies += 1
+            self.assembly_ms_total += elapsed_ms
+            self.assembly_ms_max = max(self.assembly_ms_max, elapsed_ms)
+            self.prefix_chars_total += prefix_chars
+            self.prompt_chars_total += prompt_chars
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.reused_chars = 0
+            self.assemblies = self.prefix_chars_total = self.prompt_chars_total = 0
+            self.assembly_ms_total = self.assembly_ms_max = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.max_entries > 0,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "reused_chars": self.reused_chars,
+                "assemblies": self.assemblies,
+                "avg_assembly_ms": round(self.assembly_ms_total / self.assemblies, 3) if self.assemblies else 0.0,
+                "max_assembly_ms": round(self.assembly_ms_max, 3),
+                # Share of prompt text covered by the cacheable prefix
+                "prefix_share": (
+                    self.prefix_chars_total / self.prompt_chars_total if self.prompt_chars_total else 0.0
+                ),
+            }
+
+
+_prefix_cache: Optional[PromptPrefixCache] = None
+_prefix_cache_lock = threading.Lock()
+
+
+def get_prompt_prefix_cache() -> PromptPrefixCache:
+    """Process-wide prefix cache (configured from env on first use)."""
+    global _prefix_cache
+    if _prefix_cache is None:
+        with _prefix_cache_lock:
+            if _prefix_cache is None:
+                _prefix_cache = PromptPrefixCache(
+                    max_entries=int(os.getenv("PROMPT_PREFIX_CACHE_SIZE", "256")),
+                )
+    return _prefix_cache
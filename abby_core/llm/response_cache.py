@@ -0,0 +1,316 @@
+"""Semantic response cache for informational questions.
+
+Many chat turns are near-identical FAQ-style questions inside a guild
+("when is game night?", "when's game night"). Each one otherwise pays full
+LLM latency. This cache lets conversation.respond serve a previous answer
+when a new message embeds close enough to an earlier one.
+
+Scope and safety:
+    - Per guild and opt-in: ``conversation.response_cache`` in the guild's
+      configuration is ``off`` (default), ``shadow`` or ``on``.
+    - Only first-turn messages that llm/intent.is_informational() accepts and
+      that carry no injected memory are eligible (low personalization).
+    - Entries are keyed by the embedding of the normalized message plus the
+      persona version (name, persona config version, canon version) and the
+      system-state version (hash of the state summary the prompt sees).
+      A persona or state change makes old entries unmatchable; they are
+      pruned lazily. Entries also expire after a TTL.
+    - Answers are stored with the asking user's identity (their mention and
+      profile name, which the system prompt carries) replaced by
+      placeholders, and filled in for the user a hit is served to.
+
+Shadow mode is the offline evaluation mode: lookups run and would-have-hit
+cases are logged (with similarity and both answers) but never served, so a
+threshold can be tuned against real traffic before turning a guild on.
+
+Configuration (env):
+    RESPONSE_CACHE_THRESHOLD   cosine similarity needed to match (default 0.92)
+    RESPONSE_CACHE_TTL         seconds an answer stays valid (default 3600)
+    RESPONSE_CACHE_SIZE        entries kept per guild (default 200)
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from abby_core.llm.context import ConversationContext
+from abby_core.llm.intent import Intent, classify_intent, is_informational
+from abby_core.observability.logging import logging
+from abby_core.rag.query_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_MODES = ("off", "shadow", "on")
+
+# Guild settings are read from Mongo; re-read at most this often per guild
+_MODE_REFRESH_SECONDS = 60.0
+
+# Placeholders for the per-user values in stored answers
+_MENTION_SLOT = "{{user_mention}}"
+_NAME_SLOT = "{{user_name}}"
+
+
+@dataclass
+class _Entry:
+    vector: np.ndarray
+    version: Tuple[str, str]
+    text: str
+    response: str  # With _MENTION_SLOT/_NAME_SLOT in place of the asker's identity
+    stored_at: float
+
+
+@dataclass
+class CacheCheck:
+    """Result of a lookup, handed back to record() once the LLM answered."""
+
+    mode: str = "off"
+    eligible: bool = False
+    response: Optional[str] = None  # Set only when a hit may be served
+    similarity: float = 0.0
+    matched_text: Optional[str] = None
+    shadow_response: Optional[str] = None
+    guild_id: Optional[str] = None
+    text: str = ""
+    vector: Optional[np.ndarray] = field(default=None, repr=False)
+    version: Tuple[str, str] = ("", "")
+    user_id: str = ""
+    user_name: Optional[str] = None
+
+
+def _load_guild_mode(guild_id: str) -> str:
+    from abby_core.database.collections.guild_configuration import get_memory_settings
+
+    conversation = get_memory_settings(int(guild_id)).get("conversation") or {}
+    return conversation.get("response_cache", "off")
+
+
+def _persona_version(context: ConversationContext) -> str:
+    try:
+        from abby_core.personality.canon_service import get_canon_version
+        from abby_core.personality.manager import get_personality_manager
+
+        return f"{context.persona.name}:{get_personality_manager().config_version}:{get_canon_version()}"
+    except Exception:
+        return f"{context.persona.name}:?"
+
+
+def _state_version(context: ConversationContext) -> str:
+    from abby_core.llm.system_state_resolver import summarize_state_for_prompt
+
+    try:
+        summary = summarize_state_for_prompt(context.system_state) or ""
+    except Exception:
+        summary = repr(context.system_state)
+    return hashlib.sha1(summary.encode("utf-8")).hexdigest()[:16]
+
+
+def _depersonalize(response: str, user_id: str, user_name: Optional[str]) -> str:
+    """Replace the asking user's mention and name with placeholders."""
+    if user_id:
+        response = re.sub(rf"<@!?{re.escape(user_id)}>", _MENTION_SLOT, response)
+    if user_name and len(user_name) > 1:
+        response = re.sub(rf"(?<!\w){re.escape(user_name)}(?!\w)", _NAME_SLOT, response, flags=re.IGNORECASE)
+    return response
+
+
+def _personalize(response: str, user_id: str, user_name: Optional[str]) -> Optional[str]:
+    """Fill placeholders for the current user; None if a needed value is missing."""
+    if _MENTION_SLOT in response:
+        if not user_id:
+            return None
+        response = response.replace(_MENTION_SLOT, f"<@{user_id}>")
+    if _NAME_SLOT in response:
+        if not user_name:
+            return None
+        response = response.replace(_NAME_SLOT, user_name)
+    return response
+
+
+class SemanticResponseCache:
+    """Per-guild nearest-neighbour cache of LLM answers."""
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        ttl_seconds: float = 3600.0,
+        max_entries_per_guild: int = 200,
+        embed: Optional[Callable[[List[str]], Any]] = None,
+        guild_mode: Optional[Callable[[str], str]] = None,
+    ) -> None:
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_guild = max(0, max_entries_per_guild)
+        self._embed = embed
+        self._guild_mode = guild_mode or _load_guild_mode
+        self._entries: Dict[str, List[_Entry]] = {}
+        self._modes: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._embedder_failed = False
+        self.hits = 0
+        self.misses = 0
+        self.shadow_hits = 0
+        self.ineligible = 0
+
+    def _encode(self, text: str) -> Optional[np.ndarray]:
+        if self._embedder_failed:
+            return None
+        try:
+            if self._embed is None:
+                from abby_core.rag.embeddings import Embeddings
+
+                self._embed = Embeddings().encode
+            vector = np.asarray(self._embed([text]), dtype=np.float32)[0]
+        except Exception as exc:
+            # Missing model weights etc.: disable rather than retry every turn
+            logger.warning(f"[response_cache] Embeddings unavailable, cache disabled: {exc}")
+            self._embedder_failed = True
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def mode_for(self, guild_id: Optional[str]) -> str:
+        if not guild_id:
+            return "off"
+        now = time.monotonic()
+        cached = self._modes.get(guild_id)
+        if cached and now - cached[1] < _MODE_REFRESH_SECONDS:
+            return cached[0]
+        try:
+            mode = self._guild_mode(guild_id)
+        except Exception as exc:
+            logger.debug(f"[response_cache] Could not read mode for guild {guild_id}: {exc}")
+            mode = "off"
+        if mode not in RESPONSE_CACHE_MODES:
+            mode = "off"
+        self._modes[guild_id] = (mode, now)
+        return mode
+
+    def check(self, user_message: str, context: ConversationContext) -> CacheCheck:
+        """Look up a cached answer for this turn.
+
+        ``response`` is only set in ``on`` mode; in ``shadow`` mode a match
+        is recorded on the check and logged by record().
+        """
+        guild_id = context.guild_id
+        mode = self.mode_for(guild_id)
+        check = CacheCheck(
+            mode=mode,
+            guild_id=guild_id,
+            user_id=str(context.user_id or ""),
+            user_name=context.user_profile.name if context.user_profile else None,
+        )
+        if mode == "off":
+            return check
+
+        intent_name = (context.intent_info or {}).get("intent")
+        try:
+            intent = Intent(intent_name) if intent_name else classify_intent(user_message)
+        except ValueError:
+            intent = classify_intent(user_message)
+
+        if context.chat_history or context.memory_context or not is_informational(user_message, intent):
+            self.ineligible += 1
+            return check
+
+        check.text = normalize_query(user_message)
+        check.vector = self._encode(check.text)
+        if check.vector is None:
+            return check
+        check.eligible = True
+        check.version = (_persona_version(context), _state_version(context))
+
+        now = time.monotonic()
+        with self._lock:
+            entries = self._entries.get(guild_id, [])
+            # Lazy pruning of expired or superseded (persona/state changed) entries
+            entries = [
+                e for e in entries
+                if now - e.stored_at <= self.ttl_seconds and e.version == check.version
+            ]
+            self._entries[guild_id] = entries
+            if entries:
+                scores = np.stack([e.vector for e in entries]) @ check.vector
+                best = int(np.argmax(scores))
+                response = _personalize(entries[best].response, check.user_id, check.user_name)
+                if scores[best] >= self.threshold and response is not None:
+                    check.similarity = float(scores[best])
+                    check.matched_text = entries[best].text
+                    if mode == "on":
+                        self.hits += 1
+                        check.response = response
+                    else:
+                        self.shadow_hits += 1
+                        check.shadow_response = response
+                    return check
+            self.misses += 1
+        return check
+
+    def record(self, check: CacheCheck, response: str) -> None:
+        """Store a freshly generated answer for an eligible turn."""
+        if not check.eligible or check.vector is None or not response:
+            return
+
+        if check.shadow_response is not None:
+            logger.info(
+                f"[response_cache] Shadow hit guild={check.guild_id} "
+                f"similarity={check.similarity:.3f} query='{check.text[:80]}' "
+                f"matched='{(check.matched_text or '')[:80]}' "
+                f"cached_answer='{check.shadow_response[:120]}' fresh_answer='{response[:120]}'"
+            )
+            return
+        if not self.max_entries_per_guild:
+            return
+
+        template = _depersonalize(response, check.user_id, check.user_name)
+        with self._lock:
+            entries = self._entries.setdefault(check.guild_id, [])
+            entries.append(_Entry(check.vector, check.version, check.text, template, time.monotonic()))
+            if len(entries) > self.max_entries_per_guild:
+                del entries[: len(entries) - self.max_entries_per_guild]
+
+    def invalidate(self, guild_id: Optional[str] = None) -> None:
+        """Drop cached answers for one guild, or all guilds."""
+        with self._lock:
+            if guild_id:
+                self._entries.pop(str(guild_id), None)
+                self._modes.pop(str(guild_id), None)
+            else:
+                self._entries.clear()
+                self._modes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.shadow_hits
+            return {
+                "guilds": len(self._entries),
+                "entries": sum(len(e) for e in self._entries.values()),
+                "hits": self.hits,
+                "shadow_hits": self.shadow_hits,
+                "misses": self.misses,
+                "ineligible": self.ineligible,
+                "hit_rate": (self.hits + self.shadow_hits) / lookups if lookups else 0.0,
+            }
+
+
+_response_cache: Optional[SemanticResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> SemanticResponseCache:
+    """Process-wide response cache (configured from env on first use)."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = SemanticResponseCache(
+                    threshold=float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.92")),
+                    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+                    max_entries_per_guild=int(os.getenv("RESPONSE_CACHE_SIZE", "200")),
+                )
+    return _response_cache
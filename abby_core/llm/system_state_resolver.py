@@ -9,6 +9,8 @@ Architecture Refactoring:
 - Effects merging extracted to abby_core/system/effects_merger.py
 - State resolver focuses on fetching/normalization
 - Effects merge logic reusable for testing, validation
+- Resolutions for "now" cached until the next state boundary or transition
+  (abby_core/system/state_cache.py)
 """
 
 from __future__ import annotations
@@ -22,10 +24,13 @@ from pymongo.write_concern import WriteConcern
 from abby_core.database.mongodb import get_database
 from abby_core.database.collections.system_state import (
     get_active_states as query_active_states,
+    get_next_transition as query_next_transition,
     get_states_by_ids,
 )
 from abby_core.system.system_state import get_system_state_collection
-from abby_core.system.effects_merger import merge_effects
+from abby_core.system.state_cache import get_system_state_cache
+from abby_core.system.state_registry import get_event_calendar
+from abby_core.system.effects_merger import compile_effects
 from abby_core.observability.logging import logging
 
 logger = logging.getLogger(__name__)
@@ -89,6 +94,21 @@ def _fallback_active_states(now: datetime) -> List[Dict[str, Any]]:
         return []
 
 
+def _fetch_next_transition(now: datetime, scope: str) -> Optional[datetime]:
+    """Next start_at/end_at boundary after `now` (raises on database errors).
+
+    Earliest of the activated states' boundaries and the precomputed season /
+    event calendar, so a templated window expires cached resolutions even
+    before the event lifecycle job has activated it.
+    """
+    candidates = [
+        query_next_transition(now=now, scope=scope),
+        get_event_calendar(now).next_transition(now),
+    ]
+    candidates = [c for c in candidates if c is not None]
+    return min(candidates) if candidates else None
+
+
 # _merge_effects moved to abby_core/system/effects_merger.py
 # This resolver now delegates to the extracted module for better testability
 # and reusability across testing/validation/simulation scenarios.
@@ -97,19 +117,43 @@ def _fallback_active_states(now: datetime) -> List[Dict[str, Any]]:
 def resolve_system_state(now: Optional[datetime] = None, scope: str = "global") -> Dict[str, Any]:
     """Resolve active system state stack and merged effects.
     
-    Uses MongoDB snapshot read concern to ensure deterministic resolution
-    during concurrent state transitions. All reads within this function
-    see a consistent view of the database.
+    Resolutions for "now" are served from the system state cache until the
+    next start_at/end_at boundary or state transition, so steady-state turns
+    do no database reads. An explicit `now` always reads the database.
 
     Args:
         now: Timestamp to resolve against (defaults to UTC now)
         scope: State scope (global by default)
 
     Returns:
-        Dict with timestamp, scope, active_states, and merged effects.
+        Dict with timestamp, scope, active_states, merged effects, and the
+        compiled effects_table (EffectsTable) for O(1) effect lookups.
     """
-    ts = now or datetime.utcnow()
+    if now is not None:
+        return _resolve_at(now, scope)
+
+    cache = get_system_state_cache()
+
+    def load(ts: datetime):
+        next_transition = _fetch_next_transition(ts, scope)
+        return _resolve_at(ts, scope), next_transition
 
+    try:
+        resolved = cache.get_or_load(("resolved", scope), load)
+    except Exception as exc:
+        # Boundary lookup failed; serve an uncached resolution
+        logger.warning(f"[state_resolver] Not caching resolution: {exc}")
+        return _resolve_at(cache.clock(), scope)
+    return {**resolved, "timestamp": cache.clock()}
+
+
+def _resolve_at(ts: datetime, scope: str) -> Dict[str, Any]:
+    """Resolve from the database at `ts`.
+
+    Uses MongoDB snapshot read concern to ensure deterministic resolution
+    during concurrent state transitions. All reads within this function
+    see a consistent view of the database.
+    """
     # Use snapshot isolation for deterministic concurrent reads
     # This ensures all queries see a consistent view of active states
     try:
@@ -137,22 +181,23 @@ def resolve_system_state(now: Optional[datetime] = None, scope: str = "global")
                     # Fallback to legacy collection (single active flag)
                     active_states = _fallback_active_states(ts)
 
-                # Use extracted merger from system layer
-                effects = merge_effects(active_states)
+                # Use extracted merger from system layer (memoized per state set)
+                effects_table = compile_effects(active_states)
                 
                 # Commit transaction (read-only, but completes snapshot)
                 session.commit_transaction()
                 
                 logger.debug(
                     f"[state_resolver] Resolved {len(active_states)} active states "
-                    f"with {len(effects)} merged effects (snapshot isolation)"
+                    f"with {len(effects_table)} merged effects (snapshot isolation)"
                 )
                 
                 return {
                     "timestamp": ts,
                     "scope": scope,
                     "active_states": active_states,
-                    "effects": effects,
+                    "effects": effects_table.as_dict(),
+                    "effects_table": effects_table,
                 }
                 
             except Exception as e:
@@ -180,13 +225,14 @@ def resolve_system_state(now: Optional[datetime] = None, scope: str = "global")
         else:
             active_states = _fallback_active_states(ts)
         
-        effects = merge_effects(active_states)
+        effects_table = compile_effects(active_states)
         
         return {
             "timestamp": ts,
             "scope": scope,
             "active_states": active_states,
-            "effects": effects,
+            "effects": effects_table.as_dict(),
+            "effects_table": effects_table,
         }
 
 
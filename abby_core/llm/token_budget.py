@@ -0,0 +1,262 @@
+"""Token counting and prompt budget allocation.
+
+Context budgets used to be enforced with ``len(text) / 4``. That ratio holds
+for plain English but badly undercounts emoji-heavy and non-Latin messages
+(an emoji is 1 character and often 2-3 tokens; CJK is roughly a token per
+character), so prompts overflowed, while long ASCII words were overcounted
+and useful memory was truncated.
+
+Counting backends, picked once per process:
+
+    tiktoken   exact BPE counts (the default; tiktoken is pinned in
+               requirements.txt and the Docker image bakes the vocab into
+               TIKTOKEN_CACHE_DIR at build time, so no network is needed).
+    estimate   a Unicode-aware approximation of BPE (word pieces, digit
+               groups, punctuation runs, per-character CJK/emoji costs);
+               a fallback for hosts where tiktoken or its vocab cannot load.
+
+Counts are memoized per text in an LRU, since the same persona prefix and
+history messages are re-counted on every turn.
+
+TokenBudget shares one fixed budget across prompt sections. Callers spend it
+in priority order (context_factory: persona/system + user message, then
+memory, then RAG, then history newest-first), so lower-priority sections get
+whatever is left instead of each section having its own fixed cap.
+
+Configuration (env):
+    TOKENIZER_ENCODING       tiktoken encoding name (default cl100k_base)
+    TOKENIZER_BACKEND        auto | tiktoken | estimate (default auto)
+    TOKEN_COUNT_CACHE_SIZE   memoized text counts (default 4096)
+"""
+
+import math
+import os
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from abby_core.observability.logging import logging
+
+logger = logging.getLogger(__name__)
+
+# Chat-format framing per message (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_PIECE_PATTERN = re.compile(
+    r"[A-Za-z]+"               # ASCII words
+    r"|\d+"                    # digit runs (BPE groups up to 3 digits)
+    r"|\s+"                    # whitespace runs
+    r"|[!-/:-@\[-`{-~]+"       # ASCII punctuation runs
+    r"|[^\x00-\x7f]"           # any other character, costed individually
+)
+
+_encoder: Optional[Any] = None
+_backend: Optional[str] = None
+_backend_lock = threading.Lock()
+
+
+def _char_cost(char: str) -> float:
+    """Approximate BPE cost of one non-ASCII character."""
+    if unicodedata.east_asian_width(char) in ("W", "F"):
+        # CJK ideographs/kana/hangul and wide emoji
+        return 2.0 if unicodedata.category(char) == "So" else 1.0
+    category = unicodedata.category(char)
+    if category in ("So", "Sk", "Sm", "Sc"):
+        return 2.0
+    if category in ("Mn", "Cf"):
+        # Combining marks, ZWJ and variation selectors in emoji sequences
+        return 1.0
+    # Accented Latin, Cyrillic, Greek, Arabic, ...: ~2 characters per token
+    return 0.5
+
+
+def estimate_tokens(text: str) -> int:
+    """Backend-free token estimate (see module docstring)."""
+    if not text:
+        return 0
+    tokens = 0.0
+    for piece in _PIECE_PATTERN.findall(text):
+        first = piece[0]
+        if first.isascii() and first.isalpha():
+            # Common words are one token; long words split every ~6 chars
+            tokens += 1 + (len(piece) - 1) // 6
+        elif first.isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif first.isspace():
+            # A single space merges into the next word piece
+            tokens += 0 if piece == " " else 1
+        elif first.isascii():
+            tokens += math.ceil(len(piece) / 2)
+        else:
+            tokens += _char_cost(first)
+    return max(1, math.ceil(tokens))
+
+
+def _load_backend() -> None:
+    global _encoder, _backend
+    with _backend_lock:
+        if _backend is not None:
+            return
+        requested = os.getenv("TOKENIZER_BACKEND", "auto").lower()
+        if requested != "estimate":
+            encoding = os.getenv("TOKENIZER_ENCODING", "cl100k_base")
+            try:
+                import tiktoken
+
+                _encoder = tiktoken.get_encoding(encoding)
+                _backend = "tiktoken"
+                logger.info(f"[token_budget] Using tiktoken encoding {encoding}")
+                return
+            except Exception as exc:
+                # Not installed, or vocab not cached and no network
+                log = logger.warning if requested == "tiktoken" else logger.info
+                log(f"[token_budget] tiktoken unavailable ({exc}); using offline estimate")
+        _backend = "estimate"
+
+
+def get_tokenizer_backend() -> str:
+    """Name of the active counting backend ("tiktoken" or "estimate")."""
+    if _backend is None:
+        _load_backend()
+    return _backend
+
+
+def _count(text: str) -> int:
+    if _backend is None:
+        _load_backend()
+    if _encoder is not None:
+        return len(_encoder.encode_ordinary(text))
+    return estimate_tokens(text)
+
+
+_count_cached = lru_cache(maxsize=int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "4096")))(_count)
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Token count of text using the process tokenizer (memoized)."""
+    if not text:
+        return 0
+    return _count_cached(text)
+
+
+def count_exchange_tokens(exchange: Dict[str, Any]) -> int:
+    """Tokens for one {input, response} history exchange, framing included."""
+    return (
+        count_tokens(str(exchange.get("input", "")))
+        + count_tokens(str(exchange.get("response", "")))
+        + 2 * MESSAGE_OVERHEAD_TOKENS
+    )
+
+
+def token_count_cache_stats() -> Dict[str, Any]:
+    info = _count_cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "backend": get_tokenizer_backend(),
+        "entries": info.currsize,
+        "max_entries": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
+
+
+class TokenBudget:
+    """A fixed token budget spent by prompt sections in priority order.
+
+    Sections are charged in the order the caller spends them, so call order
+    is the priority order. Required sections are always charged (and may
+    overdraw); optional ones only get what is left.
+    """
+
+    def __init__(self, total: int, counter: Callable[[str], int] = count_tokens) -> None:
+        self.total = max(0, total)
+        self._count = counter
+        self.spent = 0
+        self.used: Dict[str, int] = {}
+        self.dropped: Dict[str, int] = {}
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.total - self.spent)
+
+    def _charge(self, name: str, tokens: int) -> int:
+        self.spent += tokens
+        self.used[name] = self.used.get(name, 0) + tokens
+        return tokens
+
+    def reserve(self, name: str, text: Optional[str], overhead: int = 0) -> int:
+        """Charge a required section in full, even past the budget."""
+        return self._charge(name, (self._count(text) if text else 0) + overhead)
+
+    def allowance(self, max_tokens: Optional[int] = None) -> int:
+        """Tokens the next section may use, capped at max_tokens."""
+        return self.remaining if max_tokens is None else min(self.remaining, max(0, max_tokens))
+
+    def fit_text(self, name: str, text: Optional[str], max_tokens: Optional[int] = None) -> Optional[str]:
+        """Charge text if it fits, else keep its leading lines that do.
+
+        Sections such as RAG results are ordered most relevant first, so a
+        line-prefix keeps the best material. Returns None if nothing fits.
+        """
+        if not text:
+            return None
+        allowance = self.allowance(max_tokens)
+        tokens = self._count(text)
+        if tokens <= allowance:
+            self._charge(name, tokens)
+            return text
+        kept: List[str] = []
+        kept_tokens = 0
+        for line in text.split("\n"):
+            # +1 for the newline joining it to the previous line
+            line_tokens = self._count(line) + (1 if kept else 0)
+            if kept_tokens + line_tokens > allowance:
+                break
+            kept.append(line)
+            kept_tokens += line_tokens
+        self.dropped[name] = self.dropped.get(name, 0) + tokens - kept_tokens
+        if not kept or not "".join(kept).strip():
+            return None
+        self._charge(name, kept_tokens)
+        return "\n".join(kept)
+
+    def take(
+        self,
+        name: str,
+        units: Sequence[Any],
+        cost: Callable[[Any], int],
+        max_tokens: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> List[Any]:
+        """Keep a contiguous run of units that fits, preserving their order.
+
+        With newest_first the run is taken from the end (chat history), so
+        the oldest units are the ones dropped.
+        """
+        allowance = self.allowance(max_tokens)
+        ordered = list(reversed(units)) if newest_first else list(units)
+        kept: List[Any] = []
+        kept_tokens = 0
+        for unit in ordered:
+            unit_tokens = cost(unit)
+            if kept_tokens + unit_tokens > allowance:
+                break
+            kept.append(unit)
+            kept_tokens += unit_tokens
+        if len(kept) < len(ordered):
+            dropped = sum(cost(unit) for unit in ordered[len(kept):])
+            self.dropped[name] = self.dropped.get(name, 0) + dropped
+        self._charge(name, kept_tokens)
+        return list(reversed(kept)) if newest_first else kept
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "spent": self.spent,
+            "remaining": self.remaining,
+            "used": dict(self.used),
+            "dropped": dict(self.dropped),
+        }
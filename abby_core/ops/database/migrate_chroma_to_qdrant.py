@@ -1,6 +1,6 @@
 import os
 import sys
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List
 
 from abby_core.observability.logging import setup_logging, logging
 setup_logging()
@@ -13,59 +13,60 @@ try:
 except Exception:
     chromadb = None
 
-from abby_core.rag.qdrant_client import QdrantWrapper
+from abby_core.rag.qdrant_client import QdrantVectorStore
 
+PAGE_SIZE = int(os.getenv("MIGRATE_PAGE_SIZE", "256"))
 
-def fetch_chroma_items(collection_name: str) -> List[Dict[str, Any]]:
+
+def iter_chroma_pages(collection_name: str, page_size: int = PAGE_SIZE) -> Iterator[Dict[str, List[Any]]]:
+    """Yield pages of ids/embeddings/metadatas/documents from Chroma."""
     if chromadb is None:
         raise RuntimeError("chromadb not installed.")
     client = chromadb.PersistentClient(path=os.getenv("CHROMA_PERSIST_DIR", "./chroma"))
     col = client.get_or_create_collection(name=collection_name)
-    # SDK returns mixed fields; standardize to id, vector, payload
-    items = []
-    results = col.get()
-    for i, _id in enumerate(results.get("ids", [])):
-        # Extract metadata - handle None case
-        meta = results.get("metadatas", [])[i] if results.get("metadatas") else {}
-        doc_text = results.get("documents", [])[i] if results.get("documents") else ""
-        
-        items.append({
-            "id": _id,
-            "vector": results.get("embeddings", [])[i],
-            "payload": {
-                "content": doc_text or "",  # Clean chunk content (no TITLE/SCOPE headers)
-                "metadata": meta or {},  # {document_id, document_type, scope, chunk_index, ...}
-                "document_id": meta.get("document_id", "") if meta else "",  # Indexed for filtering
-                "document_type": meta.get("document_type", "") if meta else "",
-            }
-        })
-    logger.info(f"Fetched {len(items)} items from Chroma collection '{collection_name}'")
-    return items
+    offset = 0
+    while True:
+        page = col.get(
+            limit=page_size,
+            offset=offset,
+            include=["embeddings", "metadatas", "documents"],
+        )
+        ids = page.get("ids", [])
+        if not ids:
+            return
+        yield {
+            "ids": ids,
+            "embeddings": [list(vector) for vector in page.get("embeddings")],
+            # Metadata may be None for legacy rows
+            "metadatas": [meta or {} for meta in (page.get("metadatas") or [{}] * len(ids))],
+            "documents": [doc or "" for doc in (page.get("documents") or [""] * len(ids))],
+        }
+        offset += len(ids)
 
 
-def migrate(collection_name: str, vector_size: int):
+def migrate(collection_name: str):
     logger.info(f"Starting migration from Chroma -> Qdrant for collection '{collection_name}'")
-    qdrant = QdrantWrapper()
-    qdrant.ensure_collection(collection_name, vector_size)
-    items = fetch_chroma_items(collection_name)
-    logger.info(f"Fetched {len(items)} items from Chroma.")
+    # Same payload layout the RAG handler reads when VECTOR_STORE=qdrant
+    qdrant = QdrantVectorStore(collection_name=collection_name)
+    total = 0
+    for page in iter_chroma_pages(collection_name):
+        total += len(page["ids"])
+        if DRY_RUN:
+            continue
+        qdrant.upsert(
+            ids=page["ids"],
+            embeddings=page["embeddings"],
+            metadatas=page["metadatas"],
+            documents=page["documents"],
+        )
     if DRY_RUN:
-        logger.info("Dry run enabled — not writing to Qdrant.")
+        logger.info(f"Dry run enabled — {total} items read, nothing written to Qdrant.")
         return
-    # Batch upserts to avoid large payloads
-    batch = []
-    for p in items:
-        batch.append(p)
-        if len(batch) >= 128:
-            qdrant.upsert(collection_name, batch)
-            batch = []
-    if batch:
-        qdrant.upsert(collection_name, batch)
-    logger.info("Migration complete.")
+    logger.info(f"Migration complete: {total} items upserted, Qdrant count={qdrant.count()}.")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python scripts/migrate_chroma_to_qdrant.py <collection_name> <vector_size>")
+    if len(sys.argv) < 2:
+        print("Usage: python -m abby_core.ops.database.migrate_chroma_to_qdrant <collection_name>")
         sys.exit(1)
-    migrate(sys.argv[1], int(sys.argv[2]))
+    migrate(sys.argv[1])
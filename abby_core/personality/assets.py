@@ -0,0 +1,200 @@
+"""Load-once registry for persona and emoji asset files.
+
+Persona JSON, the personas registry, guild phrases, dismiss words and
+emoji.json used to be opened and parsed wherever they were needed -
+inject_emojis() re-read emoji.json on every bot reply. AssetRegistry parses
+each file once and hands out the cached document; derived artifacts (such as
+the compiled emoji substitution table) are built once per file version.
+
+A file is re-read only when its (mtime, size) stamp changes or on an
+explicit reload(). Stamps are checked by poll(), at most once per
+ASSET_CHECK_INTERVAL_SECONDS for the whole process, so the per-reply path
+normally touches no files at all. Documents returned by load_json() are
+shared and must be treated as read-only.
+
+Configuration (env):
+    ASSET_CHECK_INTERVAL_SECONDS   seconds between file stamp checks (default 30,
+                                   0 disables automatic checks; reload() still works)
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from abby_core.observability.logging import logging
+
+logger = logging.getLogger(__name__)
+
+Stamp = Tuple[int, int]
+
+EMOJI_PLACEHOLDER = re.compile(r'\{emoji:([^}]+)\}')
+
+
+@dataclass
+class _Asset:
+    """One parsed file and what was derived from it."""
+    data: Any
+    stamp: Stamp
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+
+def _stamp(path: Path) -> Stamp:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class EmojiTable:
+    """Precompiled ``{emoji:...}`` substitution table for one emoji.json.
+
+    Resolves placeholders exactly as the per-call lookup did: a
+    ``category.key`` path first, then the bare key across categories in file
+    order (first match wins). Unknown placeholders are left unchanged.
+    """
+
+    def __init__(self, emoji_data: Any):
+        quick: Dict[str, str] = {}
+        paths: Dict[str, str] = {}
+        if isinstance(emoji_data, dict):
+            for category, entries in emoji_data.items():
+                if not isinstance(entries, dict):
+                    continue
+                for key, value in entries.items():
+                    if not isinstance(value, str):
+                        continue
+                    quick.setdefault(key, value)
+                    # Empty values fell through to the quick lookup
+                    if value and "." not in category:
+                        paths[f"{category}.{key}"] = value
+        self._lookup = {**quick, **paths}
+
+    def __len__(self) -> int:
+        return len(self._lookup)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._lookup.get(key)
+
+    def substitute(self, text: str) -> str:
+        if not text or "{emoji:" not in text:
+            return text
+        lookup = self._lookup
+        return EMOJI_PLACEHOLDER.sub(lambda match: lookup.get(match.group(1), match.group(0)), text)
+
+
+class AssetRegistry:
+    """Process-wide cache of parsed asset files with change detection."""
+
+    def __init__(self, check_interval: Optional[float] = None):
+        self.check_interval = (
+            float(os.getenv("ASSET_CHECK_INTERVAL_SECONDS", "30")) if check_interval is None
+            else check_interval
+        )
+        self._assets: Dict[Path, _Asset] = {}
+        self._lock = threading.RLock()
+        self._last_check = time.monotonic()
+        # Bumped whenever a tracked file is re-read
+        self._version = 0
+        self._stats = {"loads": 0, "hits": 0, "checks": 0, "reloads": 0}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def load_json(self, path: Path) -> Any:
+        """Parsed contents of ``path``, read from disk only on first use.
+
+        Raises FileNotFoundError / json.JSONDecodeError like json.load would.
+        """
+        path = Path(path)
+        asset = self._assets.get(path)
+        if asset is not None:
+            self._stats["hits"] += 1
+            return asset.data
+        with self._lock:
+            asset = self._assets.get(path)
+            if asset is None:
+                asset = self._read(path)
+            return asset.data
+
+    def derived(self, path: Path, name: str, build: Callable[[Any], Any]) -> Any:
+        """Artifact built from ``path``'s document, rebuilt when the file changes."""
+        path = Path(path)
+        self.load_json(path)
+        asset = self._assets[path]
+        value = asset.derived.get(name)
+        if value is None:
+            value = asset.derived[name] = build(asset.data)
+        return value
+
+    def emoji_table(self, path: Path) -> EmojiTable:
+        return self.derived(path, "emoji_table", EmojiTable)
+
+    def poll(self) -> int:
+        """Re-read tracked files whose stamp changed, if a check is due.
+
+        Cheap when no check is due (no filesystem access). Returns the
+        registry version so callers can tell whether anything was re-read.
+        """
+        if self.check_interval <= 0 or time.monotonic() - self._last_check < self.check_interval:
+            return self._version
+        self.refresh()
+        return self._version
+
+    def refresh(self) -> List[Path]:
+        """Check every tracked file now; re-read the ones that changed."""
+        changed = []
+        with self._lock:
+            self._last_check = time.monotonic()
+            self._stats["checks"] += 1
+            for path, asset in list(self._assets.items()):
+                try:
+                    if _stamp(path) == asset.stamp:
+                        continue
+                    self._read(path)
+                except (OSError, ValueError) as exc:
+                    # Keep serving the last good copy until the file is fixed
+                    logger.warning(f"[assets] Could not re-read {path.name}: {exc}")
+                    continue
+                changed.append(path)
+            if changed:
+                self._version += 1
+                self._stats["reloads"] += len(changed)
+                logger.info(f"[assets] Reloaded changed file(s): {', '.join(p.name for p in changed)}")
+        return changed
+
+    def reload(self) -> None:
+        """Drop every cached file; the next access reads from disk."""
+        with self._lock:
+            self._assets.clear()
+            self._last_check = time.monotonic()
+            self._version += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "files": len(self._assets), "version": self._version}
+
+    def _read(self, path: Path) -> _Asset:
+        stamp = _stamp(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        asset = self._assets[path] = _Asset(data=data, stamp=stamp)
+        self._stats["loads"] += 1
+        logger.debug(f"[assets] Loaded {path.name}")
+        return asset
+
+
+_registry: Optional[AssetRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_asset_registry() -> AssetRegistry:
+    """Get the process-wide asset registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = AssetRegistry()
+    return _registry
@@ -0,0 +1,122 @@
+"""Shared invalidation version for persona caches.
+
+PersonalityManager caches the active persona name and every effective
+persona (base persona + canon overlays). Both depend on state other workers
+can change: a canon approval, or an operator editing the active persona in
+bot_settings (which is otherwise picked up after ACTIVE_PERSONA_TTL_SECONDS,
+see personality/manager.py). Whoever makes such a change calls
+bump_persona_version(), which increments a counter in
+bot_settings ({"_id": "persona_cache_version"}). Every worker polls that
+counter - one indexed point read at most every PERSONA_VERSION_POLL_SECONDS
+- and drops its persona caches when it moves, so turns read personas from
+memory while changes still show up everywhere within seconds.
+
+Bumps are applied locally at once, and still invalidate this worker's caches
+if the database is unreachable.
+
+Configuration (env):
+    PERSONA_VERSION_POLL_SECONDS   seconds between version reads (default 5)
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from abby_core.observability.logging import logging
+
+logger = logging.getLogger(__name__)
+
+VERSION_DOC_ID = "persona_cache_version"
+
+
+def _settings_collection():
+    from abby_core.database.mongodb import get_database
+
+    return get_database()["bot_settings"]
+
+
+class PersonaCacheVersion:
+    """Locally cached view of the shared persona cache version."""
+
+    def __init__(
+        self,
+        collection: Optional[Callable[[], Any]] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self._collection = collection or _settings_collection
+        self.poll_interval = (
+            float(os.getenv("PERSONA_VERSION_POLL_SECONDS", "5")) if poll_interval is None
+            else poll_interval
+        )
+        self._shared = 0
+        # Bumps the database did not take; still invalidate this worker
+        self._local = 0
+        self._next_poll = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"polls": 0, "changes": 0, "bumps": 0, "errors": 0}
+
+    def current(self) -> int:
+        """Current version; reads the database only when a poll is due."""
+        if time.monotonic() >= self._next_poll:
+            self._poll()
+        return self._shared + self._local
+
+    def bump(self, reason: str) -> int:
+        """Invalidate persona caches on every worker. Returns the new version."""
+        self._stats["bumps"] += 1
+        try:
+            doc = self._collection().find_one_and_update(
+                {"_id": VERSION_DOC_ID},
+                {"$inc": {"version": 1}, "$set": {"reason": reason, "updated_at": datetime.utcnow()}},
+                upsert=True,
+                return_document=True,
+            )
+            with self._lock:
+                self._shared = max(self._shared, int((doc or {}).get("version", self._shared + 1)))
+        except Exception as e:
+            self._stats["errors"] += 1
+            self._local += 1
+            logger.warning(f"[persona_version] Could not publish version bump ({reason}): {e}")
+        logger.info(f"[persona_version] Bumped to {self._shared + self._local} ({reason})")
+        return self._shared + self._local
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "version": self._shared + self._local}
+
+    def _poll(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return  # Another thread is already polling
+        try:
+            self._next_poll = time.monotonic() + self.poll_interval
+            self._stats["polls"] += 1
+            doc = self._collection().find_one({"_id": VERSION_DOC_ID}, {"version": 1})
+            version = int((doc or {}).get("version", 0))
+            if version != self._shared:
+                self._stats["changes"] += 1
+                self._shared = version
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.debug(f"[persona_version] Version poll failed: {e}")
+        finally:
+            self._lock.release()
+
+
+_instance: Optional[PersonaCacheVersion] = None
+_instance_lock = threading.Lock()
+
+
+def get_persona_cache_version() -> PersonaCacheVersion:
+    """Get the process-wide persona cache version."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = PersonaCacheVersion()
+    return _instance
+
+
+def bump_persona_version(reason: str) -> int:
+    """Invalidate persona caches everywhere (canon approval, active persona edit)."""
+    return get_persona_cache_version().bump(reason)
@@ -9,12 +9,14 @@ from __future__ import annotations
 
 import hashlib
 import re
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from abby_core.database import mongodb
 from abby_core.observability.logging import logging
+from abby_core.personality.cache_version import bump_persona_version, get_persona_cache_version
 from abby_core.personality.schema import (
     CanonArtifact,
     CanonCommit,
@@ -29,6 +31,10 @@ logger = logging.getLogger(__name__)
 
 MAX_CONTENT_LENGTH = 12000
 
+# Bumped on every approval; caches derived from canon (e.g. static prompt
+# prefixes) include it in their keys so new canon is picked up immediately.
+_canon_version = 0
+
 CANON_COLLECTION_BY_TYPE = {
     CanonType.BOOK: mongodb.get_canon_frontmatter_collection,
     CanonType.LORE: mongodb.get_canon_lore_collection,
@@ -37,6 +43,15 @@ CANON_COLLECTION_BY_TYPE = {
 }
 
 
+def get_canon_version() -> int:
+    """Changes whenever canon is approved, on this worker or any other.
+
+    Combines the local approval counter (immediate) with the shared persona
+    cache version, which approvals on other workers bump.
+    """
+    return _canon_version + get_persona_cache_version().current()
+
+
 def _slugify(text: str, max_length: int = 64) -> str:
     """Create a safe slug for canonical ids."""
     slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
@@ -148,6 +163,131 @@ def get_staging_document(staging_id: str) -> Optional[Dict]:
     return col.find_one({"_id": staging_id})
 
 
+# ==================== RESOLVED PERSONA OVERLAYS ====================
+# Approved persona overlays are materialized per persona key (the slug after
+# "persona." in canonical ids) into persona_overlays_resolved whenever persona
+# canon changes. Lookups fetch those small documents for all keys in one
+# query and reuse them until the persona cache version moves, instead of
+# regex-scanning persona_identity on every persona cache miss.
+
+OVERLAY_FIELDS = ("canonical_id", "version", "artifact", "content", "checksum")
+
+_resolved_cache: Dict[Tuple[str, ...], Tuple[int, List[Dict]]] = {}
+_seen_overlay_hashes: Dict[str, str] = {}
+_overlay_stats: Dict[str, Any] = {
+    "builds": 0,
+    "last_build_ms": None,
+    "fetches": 0,
+    "cache_hits": 0,
+    "last_visible_latency_ms": None,
+}
+
+
+def _persona_key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or name.lower()
+
+
+def _overlay_sort_key(overlay: Dict) -> Tuple[bool, str, int, str]:
+    # Same order the persona_identity query used: global (no domain) first,
+    # then domains ascending, latest version first within a domain. Ties
+    # (left to natural order by Mongo) are broken by canonical id so the
+    # merged prompt text is stable.
+    domain = (overlay.get("artifact") or {}).get("domain")
+    return domain is not None, domain or "", -(overlay.get("version") or 0), overlay.get("canonical_id") or ""
+
+
+def build_persona_overlays(persona_key: str, changed_at: Optional[datetime] = None) -> Dict:
+    """Materialize the approved overlays of one persona key.
+
+    Returns the stored resolved document.
+    """
+    started = time.perf_counter()
+    live = mongodb.get_canon_persona_identity_collection()
+    overlays = [
+        {field: doc[field] for field in OVERLAY_FIELDS if field in doc}
+        for doc in live.find({"canonical_id": {"$regex": f"^persona\\.{re.escape(persona_key)}\\.", "$options": "i"}})
+    ]
+    overlays.sort(key=_overlay_sort_key)
+    fingerprint = [
+        (o.get("canonical_id"), o.get("version"), o.get("checksum") or _compute_checksum(o.get("content", "")))
+        for o in overlays
+    ]
+    build_ms = (time.perf_counter() - started) * 1000
+    built_at = datetime.utcnow()
+
+    resolved = {
+        "_id": persona_key,
+        "overlays": overlays,
+        "version_hash": _compute_checksum(repr(fingerprint))[:16],
+        "built_at": built_at,
+        "changed_at": changed_at or built_at,
+        "build_ms": round(build_ms, 2),
+    }
+    mongodb.get_canon_persona_overlays_collection().replace_one({"_id": persona_key}, resolved, upsert=True)
+
+    _overlay_stats["builds"] += 1
+    _overlay_stats["last_build_ms"] = resolved["build_ms"]
+    logger.info(
+        f"[CANON] Resolved {len(overlays)} overlay(s) for persona key '{persona_key}' "
+        f"in {build_ms:.1f}ms (hash={resolved['version_hash']})"
+    )
+    return resolved
+
+
+def rebuild_persona_overlays(persona_key: Optional[str] = None) -> List[str]:
+    """Rebuild resolved overlays for one persona key, or all of them.
+
+    Call after any persona canon change made outside approve_document (edits,
+    revocations, manual fixes). Returns the rebuilt keys.
+    """
+    if persona_key:
+        keys = [_persona_key(persona_key)]
+    else:
+        live = mongodb.get_canon_persona_identity_collection()
+        canonical_ids = live.distinct("canonical_id", {"canonical_id": {"$regex": "^persona\\."}})
+        keys = sorted({_persona_key(cid.split(".")[1]) for cid in canonical_ids if cid.count(".") >= 2})
+    for key in keys:
+        build_persona_overlays(key)
+    bump_persona_version(f"persona overlays rebuilt: {', '.join(keys) or 'none'}")
+    return keys
+
+
+def get_overlay_stats() -> Dict[str, Any]:
+    """Overlay build time, cache reuse and approval-to-visible latency."""
+    return dict(_overlay_stats)
+
+
+def _load_resolved_overlays(persona_keys: List[str]) -> List[Dict]:
+    """All overlays of the given persona keys, in query order (cached per version)."""
+    version = get_persona_cache_version().current()
+    cache_key = tuple(sorted(persona_keys))
+    cached = _resolved_cache.get(cache_key)
+    if cached and cached[0] == version:
+        _overlay_stats["cache_hits"] += 1
+        return cached[1]
+
+    _overlay_stats["fetches"] += 1
+    collection = mongodb.get_canon_persona_overlays_collection()
+    resolved = {doc["_id"]: doc for doc in collection.find({"_id": {"$in": list(cache_key)}})}
+    for key in cache_key:
+        if key not in resolved:
+            # Never materialized (e.g. canon approved before this existed)
+            resolved[key] = build_persona_overlays(key)
+
+    now = datetime.utcnow()
+    for key, doc in resolved.items():
+        previous = _seen_overlay_hashes.get(key)
+        _seen_overlay_hashes[key] = doc["version_hash"]
+        if previous and previous != doc["version_hash"] and doc.get("changed_at"):
+            latency_ms = round((now - doc["changed_at"]).total_seconds() * 1000, 1)
+            _overlay_stats["last_visible_latency_ms"] = latency_ms
+            logger.info(f"[CANON] Overlay change for '{key}' visible after {latency_ms}ms")
+
+    overlays = sorted((o for key in cache_key for o in resolved[key].get("overlays", [])), key=_overlay_sort_key)
+    _resolved_cache[cache_key] = (version, overlays)
+    return overlays
+
+
 def get_persona_overlays(persona: str, domains: List[str], persona_aliases: Optional[List[str]] = None) -> List[Dict]:
     """Retrieve approved persona canon overlays for given domains.
     
@@ -163,71 +303,29 @@ def get_persona_overlays(persona: str, domains: List[str], persona_aliases: Opti
         overlays = get_persona_overlays('bunny', ['global', 'writing'], persona_aliases=['abby'])
         # Matches persona.abby.* and persona.bunny.*
     """
-    logger.info(f"[CANON] 🔍 Fetching persona overlays for '{persona}' with domains: {domains}")
+    logger.debug(f"[CANON] 🔍 Fetching persona overlays for '{persona}' with domains: {domains}")
     try:
-        collection = mongodb.get_canon_persona_identity_collection()
-
-        # Build set of slugged persona keys (lowercase, dash separated) to match canonical_id prefixes
+        # Slugged persona keys (lowercase, dash separated) match canonical_id prefixes
         raw_names = [persona] + (persona_aliases or [])
-        slugged_names = []
-        for name in raw_names:
-            if not name:
-                continue
-            slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or name.lower()
-            slugged_names.append(slug)
-        persona_keys = list({n for n in slugged_names if n}) or [persona.lower()]
-
-        # Regex that matches any of the persona keys, case-insensitive
-        if len(persona_keys) == 1:
-            persona_regex = f"^persona\\.{persona_keys[0]}\\."
-        else:
-            joined = "|".join(re.escape(k) for k in persona_keys)
-            persona_regex = f"^persona\\.(?:{joined})\\."
+        persona_keys = list({_persona_key(name) for name in raw_names if name}) or [persona.lower()]
+
+        overlays = _load_resolved_overlays(persona_keys)
 
-        domains_lower = [d.lower() for d in domains]
-        domain_filter_values = list({*domains_lower, *domains, *[d.title() for d in domains_lower]})
-        
-        # Build query: match persona name (case-insensitive) and domain in list (or null for global)
-        query: Dict[str, Any] = {
-            "canonical_id": {"$regex": persona_regex, "$options": "i"}
-        }
-        
-        # Filter by domains if provided
-        # Domain can be in canonical_id or in artifact.domain
         if domains:
-            # Match either: no domain (implicit global) or explicit domain in ID (case-insensitive list)
-            query["$or"] = [
-                {"artifact.domain": {"$in": domain_filter_values}},
-                {"artifact.domain": {"$exists": False}},  # Treat missing as global
-                {"artifact.domain": None},
+            # No domain (implicit global) or one of the requested domains, any casing variant
+            domains_lower = [d.lower() for d in domains]
+            domain_filter_values = {*domains_lower, *domains, *[d.title() for d in domains_lower]}
+            overlays = [
+                overlay for overlay in overlays
+                if (overlay.get("artifact") or {}).get("domain") in domain_filter_values
+                or (overlay.get("artifact") or {}).get("domain") is None
             ]
-        
-        logger.debug(f"[CANON] Query: {query}")
-        
-        # Get latest version of each slot
-        overlays = list(collection.find(query).sort([
-            ("artifact.domain", 1),  # global (None) first, then specific domains
-            ("version", -1),  # Latest version
-        ]))
-        total_for_persona = collection.count_documents({
-            "canonical_id": {"$regex": persona_regex, "$options": "i"}
-        })
-        
+
         if overlays:
-            logger.info(f"[CANON] ✅ Retrieved {len(overlays)} persona overlays (keys={persona_keys}):")
-            for overlay in overlays:
-                slot = overlay.get("artifact", {}).get("topic", "unknown")
-                domain = overlay.get("artifact", {}).get("domain", "global")
-                canonical_id = overlay.get("canonical_id", "unknown")
-                content_preview = overlay.get("content", "")[:50] + "..." if len(overlay.get("content", "")) > 50 else overlay.get("content", "")
-                logger.info(f"[CANON]   - {canonical_id} | slot={slot} domain={domain} | \"{content_preview}\"")
+            logger.info(f"[CANON] ✅ Retrieved {len(overlays)} persona overlays (keys={persona_keys})")
         else:
-            logger.info(
-                f"[CANON] ℹ️ No persona overlays found for keys={persona_keys} with domains {domains}. "
-                f"Total overlays for persona keys (any domain): {total_for_persona}"
-            )
-        
-        return overlays
+            logger.info(f"[CANON] ℹ️ No persona overlays found for keys={persona_keys} with domains {domains}")
+        return list(overlays)
     
     except Exception as e:
         logger.error(f"[CANON] Failed to get persona overlays: {e}", exc_info=True)
@@ -236,6 +334,7 @@ def get_persona_overlays(persona: str, domains: List[str], persona_aliases: Opti
 
 def approve_document(staging_id: str, approver_id: str, approval_notes: Optional[str] = None) -> Dict:
     """Approve and canonize a staged document. Immutable commit."""
+    global _canon_version
     col = mongodb.get_canon_staging_collection()
     staged = col.find_one({"_id": staging_id})
     if not staged:
@@ -300,6 +399,23 @@ def approve_document(staging_id: str, approver_id: str, approval_notes: Optional
         },
     )
 
+    _canon_version += 1
+    if canon_type == CanonType.PERSONA and canonical_id and canonical_id.count(".") >= 2:
+        persona_key = _persona_key(canonical_id.split(".")[1])
+        try:
+            build_persona_overlays(persona_key, changed_at=datetime.utcnow())
+        except Exception as e:
+            logger.error(f"[CANON] Approved {canonical_id} but could not rebuild resolved overlays: {e}")
+            # Drop the stale resolved document so the next lookup rebuilds it
+            try:
+                mongodb.get_canon_persona_overlays_collection().delete_one({"_id": persona_key})
+            except Exception as delete_error:
+                logger.error(
+                    f"[CANON] Stale resolved overlays for '{persona_key}' remain; "
+                    f"run rebuild_persona_overlays('{persona_key}'): {delete_error}"
+                )
+    bump_persona_version(f"canon approved: {canonical_id}")
+
     logger.info("[CANON] Approved %s -> %s v%s", staging_id, canonical_id, version)
     return {
         "canonical_id": canonical_id,
@@ -9,6 +9,7 @@ import random
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from abby_core.observability.logging import setup_logging, logging
+from abby_core.personality.assets import get_asset_registry
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -178,8 +179,7 @@ class PersonaFileConfig:
                 logger.warning(f"[⚠️] Config file not found: {file_path}, using defaults")
                 return default
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = get_asset_registry().load_json(file_path)
             
             # Extract specific key if provided
             if key:
@@ -221,6 +221,7 @@ class PersonaFileConfig:
     
     def reload(self):
         """Reload all configuration files from disk."""
+        get_asset_registry().refresh()
         self._summon_words = None
         self._dismiss_words = None
         self._response_patterns = None
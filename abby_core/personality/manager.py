@@ -15,10 +15,15 @@ Architecture:
 
 import json
 import logging
+import os
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from string import Formatter
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from pydantic import ValidationError
 
+from abby_core.personality.assets import get_asset_registry
+from abby_core.personality.cache_version import get_persona_cache_version
 from abby_core.personality.schema import PersonaSchema, PersonaRegistry, GuildPhrasesSchema
 from abby_core.observability.logging import setup_logging
 
@@ -37,6 +42,16 @@ EMOJI_FILE = PERSONALITY_DATA_DIR / "emoji.json"
 # This allows brand-wide canon (e.g., persona.abby.*) to apply to all persona variants
 GLOBAL_PERSONA_ROOT_ALIASES: List[str] = ["abby"]
 
+# Template fields that vary per user; sections using them are kept out of the
+# cached static prompt prefix.
+USER_PROMPT_FIELDS = {"user_mention", "user_level", "is_owner", "user_role", "chat_history"}
+
+# The cached active persona name is re-read at least this often. Nothing in
+# the bot writes bot_settings {_id: "active_persona"}; operators edit it
+# directly, and this TTL is how the switch reaches every worker (sooner if
+# they also call cache_version.bump_persona_version()).
+ACTIVE_PERSONA_TTL_SECONDS = float(os.getenv("ACTIVE_PERSONA_TTL_SECONDS", "60"))
+
 
 
 class PersonalityManager:
@@ -54,9 +69,28 @@ class PersonalityManager:
         self._guild_phrases: Optional[GuildPhrasesSchema] = None
         self._loaded = False
         self._dismiss_words: List[str] = []
+        # Bumped on every (re)load; part of the static prompt prefix cache key
+        self._config_version = 0
+        # Parsed files are shared through the asset registry; its version at
+        # the last load tells us when a file changed underneath us
+        self._assets = get_asset_registry()
+        self._assets_version = self._assets.version
+        # Effective personas and the active persona name are cached per
+        # shared persona version (bumped on canon approval); the name also
+        # expires after ACTIVE_PERSONA_TTL_SECONDS
+        self._persona_version = get_persona_cache_version()
+        self._effective_cache_version: Optional[int] = None
+        # (persona version, name, monotonic expiry)
+        self._active_persona: Optional[Tuple[int, str, float]] = None
+        self._active_persona_retry_at = 0.0
         
         self._load_all()
     
+    @property
+    def config_version(self) -> int:
+        """Bumped on every (re)load of persona data; used in cache keys."""
+        return self._config_version
+    
     def _load_all(self) -> None:
         """Load all persona definitions and registry data."""
         logger.debug("[Personality] 🎭 Initializing PersonalityManager...")
@@ -67,6 +101,8 @@ class PersonalityManager:
             self._load_active_personas()
             self._loaded = True
             self._effective_persona_cache.clear()
+            self._config_version += 1
+            self._assets_version = self._assets.version
             logger.debug(f"[Personality] PersonalityManager ready: {len(self._personas_cache)} personas, {len(self._dismiss_words)} dismiss words")
         except Exception as e:
             logger.error(f"[Personality] ❌ Failed to load personality data: {e}")
@@ -79,8 +115,7 @@ class PersonalityManager:
             return
         
         try:
-            with open(PERSONAS_REGISTRY_FILE, 'r', encoding='utf-8') as f:
-                registry_data = json.load(f)
+            registry_data = self._assets.load_json(PERSONAS_REGISTRY_FILE)
             
             # Validate registry against PersonaRegistry schema
             self._personas_registry = PersonaRegistry(**registry_data)
@@ -96,8 +131,7 @@ class PersonalityManager:
             return
         
         try:
-            with open(GUILD_PHRASES_FILE, 'r', encoding='utf-8') as f:
-                phrases_data = json.load(f)
+            phrases_data = self._assets.load_json(GUILD_PHRASES_FILE)
             
             # Validate against GuildPhrasesSchema
             self._guild_phrases = GuildPhrasesSchema(**phrases_data)
@@ -121,8 +155,7 @@ class PersonalityManager:
             return
         
         try:
-            with open(DISMISS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self._assets.load_json(DISMISS_FILE)
             
             words = data.get("dismiss_words", [])
             if isinstance(words, list) and len(words) > 0:
@@ -186,8 +219,7 @@ class PersonalityManager:
         if not persona_file.exists():
             raise FileNotFoundError(f"Persona file not found: {persona_file}")
         
-        with open(persona_file, 'r', encoding='utf-8') as f:
-            persona_data = json.load(f)
+        persona_data = self._assets.load_json(persona_file)
         
         # Validate against PersonaSchema
         persona = PersonaSchema(**persona_data)
@@ -202,8 +234,17 @@ class PersonalityManager:
         """Resolve the current active persona name.
 
         Reads the value from the shared bot_settings collection when available,
-        otherwise falls back to the registry default.
+        otherwise falls back to the registry default. The name is cached until
+        the persona version moves or ACTIVE_PERSONA_TTL_SECONDS pass, so turns
+        normally skip the database.
         """
+        version = self._persona_version.current()
+        cached = self._active_persona
+        if cached and cached[0] == version and time.monotonic() < cached[2]:
+            return cached[1]
+        if time.monotonic() < self._active_persona_retry_at:
+            return cached[1] if cached else self.get_default_persona()
+
         try:
             # Local import to avoid hard dependency if DB is unavailable
             from abby_core.database.mongodb import get_database
@@ -211,13 +252,18 @@ class PersonalityManager:
             db = get_database()
             collection = db["bot_settings"]
             active_doc = collection.find_one({"_id": "active_persona"})
-            if active_doc and isinstance(active_doc.get("persona"), str):
-                return active_doc["persona"]
         except Exception:
-            pass
+            # Serve the default (or last known) name; retry after a poll interval
+            self._active_persona_retry_at = time.monotonic() + self._persona_version.poll_interval
+            return cached[1] if cached else self.get_default_persona()
+
+        if active_doc and isinstance(active_doc.get("persona"), str):
+            name = active_doc["persona"]
+        else:
+            name = self.get_default_persona()
+        self._active_persona = (version, name, time.monotonic() + ACTIVE_PERSONA_TTL_SECONDS)
+        return name
 
-        return self.get_default_persona()
-    
     def _apply_memory_budget(self, memory_context: str, max_chars: int = 1200, session_domain: Optional[str] = None) -> str:
         """Apply memory budget with deterministic heuristics.
         
@@ -305,8 +351,14 @@ class PersonalityManager:
             point of truth for effective persona configuration.
         """
         logger.debug(f"[Personality] 🎭 get_persona('{persona_name}', intent={intent})")
+        self._sync_assets()
 
-        cache_key = f"{persona_name.lower()}::{intent or 'none'}"
+        version = self._persona_version.current()
+        if version != self._effective_cache_version:
+            # Canon was approved somewhere; drop stale overlays
+            self._effective_persona_cache.clear()
+            self._effective_cache_version = version
+        cache_key = f"{persona_name.lower()}::{intent or 'none'}::{version}"
         cached = self._effective_persona_cache.get(cache_key)
         if cached:
             logger.debug(f"[Personality] 🔁 Returning cached persona for {cache_key}")
@@ -750,6 +802,99 @@ class PersonalityManager:
         # Fallback
         return "Hold on a second!"
     
+    def _prompt_template_sections(self, persona: PersonaSchema) -> Tuple[str, str]:
+        """Split a persona's prompt template into (static, user) templates.
+
+        The template is split on blank lines; sections that reference a
+        per-user field (USER_PROMPT_FIELDS) form the user template, the rest
+        keep their original order in the static template.
+        """
+        template = persona.system_prompt_template or ""
+        static_sections: List[str] = []
+        user_sections: List[str] = []
+        for section in template.split("\n\n"):
+            fields = {field for _, field, _, _ in Formatter().parse(section) if field}
+            (user_sections if fields & USER_PROMPT_FIELDS else static_sections).append(section)
+        return "\n\n".join(static_sections), "\n\n".join(user_sections)
+
+    def _static_template_context(
+        self,
+        persona: PersonaSchema,
+        guild_name: str,
+        max_response_length: int,
+    ) -> Dict[str, Any]:
+        """Values of the user-independent template fields."""
+        boundaries = persona.personality_boundaries
+        return {
+            "persona_display_name": persona.display_name,
+            "description": persona.description,
+            "system_message_base": persona.system_message_base,
+            "style_hints": persona.style_hints or "Be natural and helpful.",
+            "guild_name": guild_name,
+            "max_response_length": max_response_length,
+            "personality_tone": (boundaries.personality_tone if boundaries else "friendly"),
+            "temperature": (boundaries.temperature if boundaries else 0.7),
+            "restricted_topics": ", ".join(boundaries.restricted_topics if boundaries else []),
+        }
+
+    def build_static_prefix(
+        self,
+        persona: PersonaSchema,
+        guild_name: str = "Breeze Club",
+        max_response_length: int = 500,
+    ) -> str:
+        """Build the user-independent prefix of the system prompt.
+
+        Covers persona core, style, behavioral boundaries and guild context.
+        Output depends only on the persona, guild and config, so it is cached
+        per guild (see abby_core/llm/prompt_cache.py).
+        """
+        if not persona.system_prompt_template:
+            return persona.system_message_base
+
+        static_template, _ = self._prompt_template_sections(persona)
+        context = self._static_template_context(persona, guild_name, max_response_length)
+
+        try:
+            return static_template.format(**context)
+        except KeyError as e:
+            logger.warning(f"⚠️  Missing context variable in template: {e}. Using base message.")
+            return persona.system_message_base
+
+    def build_user_context(
+        self,
+        persona: PersonaSchema,
+        user_level: str = "member",
+        is_owner: bool = False,
+        user_mention: str = "@user",
+        user_role: str = "member",
+        guild_name: str = "Breeze Club",
+        max_response_length: int = 500,
+    ) -> str:
+        """Render the per-user sections of the persona template (may be empty).
+
+        A section that mixes per-user and static fields lands here, so the
+        static fields are filled in too.
+        """
+        if not persona.system_prompt_template:
+            return ""
+
+        _, user_template = self._prompt_template_sections(persona)
+        context = {
+            **self._static_template_context(persona, guild_name, max_response_length),
+            "user_level": user_level,
+            "is_owner": "yes" if is_owner else "no",
+            "user_mention": user_mention,
+            "user_role": user_role,
+            "chat_history": "",  # Deprecated: history is sent as messages
+        }
+
+        try:
+            return user_template.format(**context)
+        except KeyError as e:
+            logger.warning(f"⚠️  Missing context variable in user template: {e}. Skipping user context.")
+            return ""
+
     def build_static_prompt(
         self,
         persona: PersonaSchema,
@@ -760,7 +905,7 @@ class PersonalityManager:
         max_response_length: int = 500,
         user_role: str = "member"
     ) -> str:
-        """Build static portion of system prompt (cached per session).
+        """Build static portion of system prompt for one user.
         
         Static parts include:
         - Persona core
@@ -768,6 +913,9 @@ class PersonalityManager:
         - Behavioral boundaries
         - User context (role, ownership)
         
+        Equivalent to build_static_prefix() followed by build_user_context();
+        build_system_prompt() uses those directly so the prefix can be shared.
+        
         Args:
             persona: PersonaSchema object
             guild_name: Name of the Discord guild
@@ -780,33 +928,11 @@ class PersonalityManager:
         Returns:
             Static system prompt string (no memory/RAG/dynamic content)
         """
-        if not persona.system_prompt_template:
-            return persona.system_message_base
-        
-        template = persona.system_prompt_template
-        boundaries = persona.personality_boundaries
-        
-        # Build static context only
-        context = {
-            "persona_display_name": persona.display_name,
-            "description": persona.description,
-            "system_message_base": persona.system_message_base,
-            "style_hints": persona.style_hints or "Be natural and helpful.",
-            "user_level": user_level,
-            "is_owner": "yes" if is_owner else "no",
-            "user_mention": user_mention,
-            "max_response_length": max_response_length,
-            "personality_tone": (boundaries.personality_tone if boundaries else "friendly"),
-            "restricted_topics": ", ".join(boundaries.restricted_topics if boundaries else [])
-        }
-        
-        try:
-            static_prompt = template.format(**context)
-        except KeyError as e:
-            logger.warning(f"⚠️  Missing context variable in template: {e}. Using base message.")
-            static_prompt = persona.system_message_base
-        
-        return static_prompt
+        prefix = self.build_static_prefix(persona, guild_name, max_response_length)
+        user_context = self.build_user_context(
+            persona, user_level, is_owner, user_mention, user_role, guild_name, max_response_length
+        )
+        return "\n\n".join(part for part in (prefix, user_context) if part)
     
     def build_system_prompt(
         self,
@@ -828,6 +954,9 @@ class PersonalityManager:
         turn_phase: Optional[str] = None,
         system_state: Optional[Dict[str, Any]] = None,
         devlog_context: Optional[str] = None,
+        guild_id: Optional[str] = None,
+        conversation_summary: Optional[str] = None,
+        fit_context: Optional[Callable[[str], Tuple[Optional[str], Optional[str], Optional[str]]]] = None,
     ) -> str:
         """
         Build a complete system prompt for LLM by combining static + dynamic parts.
@@ -835,6 +964,10 @@ class PersonalityManager:
         **Phase 2 Refactor:** Delegates to llm/prompt_builder.py for assembly logic.
         This keeps personality/ focused on persona loading, while llm/ handles prompt construction.
         
+        The static prefix is served from the prompt prefix cache, keyed by
+        (guild, persona, canon version, config version), and always leads the
+        prompt; user context and per-turn sections follow it.
+        
         Args:
             persona: PersonaSchema object
             guild_name: Name of the Discord guild
@@ -847,32 +980,51 @@ class PersonalityManager:
             is_final_turn: Whether this is the final allowed turn in the conversation
             user_role: User's role level ("owner", "admin", "moderator", "member")
             is_bot_creator: Whether user is the bot creator/developer
-            static_prompt: Pre-built static prompt (if cached), otherwise builds fresh
+            static_prompt: Pre-built static prompt (legacy per-session cache); bypasses the prefix cache
             turn_number: Current turn number in the session (1-indexed)
             turn_phase: Optional turn phase hint (greeting|question|answer|followup|closure)
             system_state: Optional system state dict with active states and merged effects
             devlog_context: Optional formatted changelog summary (injected only for meta questions)
+            guild_id: Guild ID for the prefix cache key (falls back to guild_name)
+            conversation_summary: Running summary of this session's older turns
+            fit_context: Optional callback choosing memory/RAG/summary once the
+                rest of the prompt is known (token budgeting; see
+                llm/prompt_builder.ContextFitter)
         
         Returns:
             Complete system prompt string
         """
-        # Build or use cached static prompt
+        from abby_core.llm.prompt_builder import get_prompt_builder
+        from abby_core.llm.prompt_cache import get_prompt_prefix_cache
+        
+        started = time.perf_counter()
+        prefix_cache = get_prompt_prefix_cache()
+        user_context = None
+        
         if static_prompt is None:
-            static_prompt = self.build_static_prompt(
-                persona=persona,
-                guild_name=guild_name,
-                user_level=user_level,
-                is_owner=is_owner,
-                user_mention=user_mention,
-                max_response_length=max_response_length,
-                user_role=user_role
+            try:
+                from abby_core.personality.canon_service import get_canon_version
+                canon_version = get_canon_version()
+            except Exception:
+                canon_version = 0
+            
+            key = prefix_cache.make_key(
+                guild_id or guild_name,
+                persona.name,
+                canon_version,
+                self.config_version,
+            )
+            static_prompt = prefix_cache.get_or_build(
+                key,
+                lambda: self.build_static_prefix(persona, guild_name, max_response_length),
+            )
+            user_context = self.build_user_context(
+                persona, user_level, is_owner, user_mention, user_role, guild_name, max_response_length
             )
         
         # Delegate to prompt_builder for assembly (Phase 2 architectural improvement)
-        from abby_core.llm.prompt_builder import get_prompt_builder
-        
         prompt_builder = get_prompt_builder()
-        return prompt_builder.build_system_prompt(
+        system_prompt = prompt_builder.build_system_prompt(
             persona=persona,
             static_prompt=static_prompt,
             guild_name=guild_name,
@@ -885,7 +1037,17 @@ class PersonalityManager:
             turn_phase=turn_phase,
             user_role=user_role,
             is_bot_creator=is_bot_creator,
+            user_context=user_context,
+            conversation_summary=conversation_summary,
+            fit_context=fit_context,
         )
+        
+        prefix_cache.record_assembly(
+            (time.perf_counter() - started) * 1000,
+            prefix_chars=len(static_prompt),
+            prompt_chars=len(system_prompt),
+        )
+        return system_prompt
 
     @staticmethod
     def _map_expected_behavior(turn_phase: str, is_final_turn: bool) -> str:
@@ -954,52 +1116,36 @@ class PersonalityManager:
         if not text:
             return text
         
-        import re
-        
-        # Load emoji data
-        emoji_data = {}
-        if EMOJI_FILE.exists():
-            try:
-                with open(EMOJI_FILE, 'r', encoding='utf-8') as f:
-                    emoji_data = json.load(f)
-                    logger.debug(f"[Personality] Loaded emoji.json with categories: {list(emoji_data.keys())}")
-            except Exception as e:
-                logger.warning(f"[Personality] Could not load emoji.json: {e}")
-                return text
-        else:
+        self._sync_assets()
+        try:
+            table = self._assets.emoji_table(EMOJI_FILE)
+        except FileNotFoundError:
             logger.warning(f"[Personality] emoji.json not found at {EMOJI_FILE}")
             return text
+        except Exception as e:
+            logger.warning(f"[Personality] Could not load emoji.json: {e}")
+            return text
         
-        # Pattern: {emoji:key} or {emoji:category.key}
-        pattern = r'\{emoji:([^}]+)\}'
-        
-        def replace_emoji(match):
-            key = match.group(1)
-            logger.debug(f"[Personality] Looking up emoji: {key}")
-            
-            # Try full path first (e.g., "animations.idle")
-            if '.' in key:
-                parts = key.split('.', 1)
-                category, subkey = parts[0], parts[1]
-                if category in emoji_data and isinstance(emoji_data[category], dict):
-                    result = emoji_data[category].get(subkey)
-                    if result:
-                        logger.debug(f"[Personality] Found {key} -> {result}")
-                        return result
-            
-            # Try quick lookup (search all categories)
-            for category in emoji_data:
-                if isinstance(emoji_data[category], dict) and key in emoji_data[category]:
-                    result = emoji_data[category][key]
-                    logger.debug(f"[Personality] Found {key} in {category} -> {result}")
-                    return result
-            
-            # Not found, return placeholder unchanged
-            logger.debug(f"[Personality] Emoji not found: {key}")
-            return match.group(0)
-        
-        result = re.sub(pattern, replace_emoji, text)
-        return result
+        return table.substitute(text)
+    
+    def _sync_assets(self) -> None:
+        """Rebuild persona data if the asset registry re-read a changed file.
+
+        No filesystem access unless a stamp check is due (see assets.py).
+        """
+        version = self._assets.poll()
+        if version != self._assets_version:
+            self._assets_version = version
+            logger.info("[Personality] Persona asset files changed, rebuilding persona data")
+            self._reset()
+    
+    def _reset(self) -> None:
+        self._personas_cache.clear()
+        self._effective_persona_cache.clear()
+        self._personas_registry = None
+        self._guild_phrases = None
+        self._dismiss_words = []
+        self._load_all()
     
     def reload(self) -> bool:
         """
@@ -1009,12 +1155,8 @@ class PersonalityManager:
             True if reload successful, False otherwise
         """
         logger.info("🔄 Reloading personality data...")
-        self._personas_cache.clear()
-        self._effective_persona_cache.clear()
-        self._personas_registry = None
-        self._guild_phrases = None
-        self._dismiss_words = []
-        self._load_all()
+        self._assets.reload()
+        self._reset()
         return self._loaded
 
 
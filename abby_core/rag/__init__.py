@@ -8,6 +8,8 @@ from abby_core.rag.handler import (
     sync_check,
 )
 from abby_core.rag.prepare import prepare_rag_text, validate_prepared_text
+from abby_core.rag.query_cache import get_query_cache
+from abby_core.rag.vector_store import VectorStore, VectorStoreUnavailable, get_vector_store
 
 __all__ = [
     "ingest",
@@ -18,4 +20,8 @@ __all__ = [
     "sync_check",
     "prepare_rag_text",
     "validate_prepared_text",
+    "VectorStore",
+    "VectorStoreUnavailable",
+    "get_vector_store",
+    "get_query_cache",
 ]
@@ -1,18 +1,30 @@
 import os
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+
+from abby_core.rag.vector_store import DEFAULT_COLLECTION, VectorStore, VectorStoreUnavailable
 
 logger = logging.getLogger(__name__)
 
 
-class ChromaUnavailable(RuntimeError):
+class ChromaUnavailable(VectorStoreUnavailable):
     """Raised when chromadb is not installed or unavailable."""
 
 
-class ChromaClient:
+def _where(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Translate equality filters into a Chroma where clause."""
+    clauses = [{key: value} for key, value in (filters or {}).items() if value is not None]
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+class ChromaClient(VectorStore):
     """Minimal ChromaDB client wrapper for persistence and search."""
 
-    def __init__(self, collection_name: str = "abby_rag") -> None:
+    provider = "chroma"
+
+    def __init__(self, collection_name: str = DEFAULT_COLLECTION) -> None:
         self.collection_name = collection_name
         self.persist_dir = os.getenv("CHROMA_PERSIST_DIR", "./chroma-data")
         try:
@@ -29,5 +41,43 @@ class ChromaClient:
     def add(self, ids: List[str], embeddings: List[List[float]], metadatas: List[Dict[str, Any]], documents: List[str]) -> None:
         self.collection.add(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
 
-    def query(self, query_embeddings: List[List[float]], top_k: int = 3) -> Dict[str, Any]:
-        return self.collection.query(query_embeddings=query_embeddings, n_results=top_k)
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 3,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        return self.collection.query(query_embeddings=query_embeddings, n_results=top_k, where=_where(filters))
+
+    def upsert(self, ids: List[str], embeddings: List[List[float]], metadatas: List[Dict[str, Any]], documents: List[str]) -> None:
+        self.collection.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+
+    def delete(self, ids: List[str]) -> None:
+        if ids:
+            self.collection.delete(ids=ids)
+
+    def count(self, where: Optional[Dict[str, Any]] = None) -> int:
+        if not _where(where):
+            return self.collection.count()
+        return sum(len(page) for page in self.iter_ids(where=where))
+
+    def iter_ids(self, page_size: int = 500, where: Optional[Dict[str, Any]] = None) -> Iterator[List[str]]:
+        offset = 0
+        while True:
+            page = self.collection.get(where=_where(where), limit=page_size, offset=offset, include=[])
+            ids = page.get("ids", [])
+            if not ids:
+                return
+            yield ids
+            if len(ids) < page_size:
+                return
+            offset += len(ids)
+
+    def get_checksums(self, ids: List[str]) -> Dict[str, Optional[str]]:
+        if not ids:
+            return {}
+        page = self.collection.get(ids=ids, include=["metadatas"])
+        return {
+            vector_id: (meta or {}).get("content_checksum")
+            for vector_id, meta in zip(page.get("ids", []), page.get("metadatas") or [])
+        }
@@ -1,35 +1,141 @@
 import os
 import logging
-from typing import Iterable, List
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from abby_core.rag.quantization import EmbeddingCache, dequantize, quantize
 
 logger = logging.getLogger(__name__)
 
+# EMBEDDING_RUNTIME values:
+#   torch  - float32 PyTorch inference (default)
+#   int8   - PyTorch dynamic int8 quantization of Linear layers (CPU only)
+#   onnx   - ONNX Runtime via sentence-transformers' onnx backend
+EMBEDDING_RUNTIMES = ("torch", "int8", "onnx")
+
+# Loaded models are shared across Embeddings() instances; the handler builds
+# one per call and reloading weights each time dominated ingest/query latency.
+_models: Dict[Tuple[str, str, str], Any] = {}
+_caches: Dict[Tuple[str, str, str], EmbeddingCache] = {}
+_models_lock = threading.Lock()
+
 
 class EmbeddingError(RuntimeError):
     """Raised when embedding model is unavailable or encoding fails."""
 
 
+def _load_model(model_name: str, device: str, runtime: str) -> Any:
+    try:
+        from sentence_transformers import SentenceTransformer  # type: ignore
+    except ImportError as exc:  # pragma: no cover - import-time dependency
+        raise EmbeddingError(
+            "sentence-transformers not installed. Add 'sentence-transformers' to requirements and reinstall."
+        ) from exc
+
+    if runtime == "onnx":
+        try:
+            # backend= is available from sentence-transformers 3.2 (needs onnxruntime)
+            return SentenceTransformer(model_name, device=device, backend="onnx")
+        except TypeError as exc:
+            raise EmbeddingError(
+                "EMBEDDING_RUNTIME=onnx requires sentence-transformers>=3.2 and onnxruntime."
+            ) from exc
+
+    model = SentenceTransformer(model_name, device=device)
+    if runtime == "int8":
+        if device != "cpu":
+            raise EmbeddingError("EMBEDDING_RUNTIME=int8 is only supported with EMBEDDING_DEVICE=cpu.")
+        import torch  # type: ignore
+
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
 class Embeddings:
-    """Thin wrapper around sentence-transformers for portable embeddings."""
+    """Thin wrapper around sentence-transformers for portable embeddings.
 
-    def __init__(self, model_name: str | None = None, device: str | None = None) -> None:
+    Configuration (env):
+        EMBEDDING_MODEL        model name (default all-MiniLM-L6-v2)
+        EMBEDDING_DEVICE       torch device (default cpu)
+        EMBEDDING_RUNTIME      torch | int8 | onnx (default torch)
+        EMBEDDING_CACHE_SIZE   LRU entries for repeated texts (default 1024, 0 disables)
+        EMBEDDING_CACHE_DTYPE  float32 | float16 | int8 cache storage (default float32)
+
+    With a float16/int8 cache, cached texts come back at that precision, and
+    so does the first encode of a text (the same vector on every call).
+    Ingest encodes with cache=False, so vectors written to the vector store
+    are always full float32. rag/handler queries the store with the cached
+    query vector directly; there is no float32 rerank on that path
+    (QuantizedVectorIndex is the reranking index, used by benchmarks).
+    """
+
+    def __init__(
+        self,
+        model_name: str | None = None,
+        device: str | None = None,
+        runtime: str | None = None,
+    ) -> None:
         self.model_name = model_name or os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
         self.device = device or os.getenv("EMBEDDING_DEVICE", "cpu")
-
-        try:
-            from sentence_transformers import SentenceTransformer  # type: ignore
-        except ImportError as exc:  # pragma: no cover - import-time dependency
+        self.runtime = (runtime or os.getenv("EMBEDDING_RUNTIME", "torch")).lower()
+        if self.runtime not in EMBEDDING_RUNTIMES:
             raise EmbeddingError(
-                "sentence-transformers not installed. Add 'sentence-transformers' to requirements and reinstall."
-            ) from exc
+                f"Unknown EMBEDDING_RUNTIME '{self.runtime}' (expected one of {EMBEDDING_RUNTIMES})"
+            )
 
-        try:
-            self.model = SentenceTransformer(self.model_name, device=self.device)
-        except Exception as exc:  # pragma: no cover
-            raise EmbeddingError(f"Failed to load embedding model {self.model_name}: {exc}") from exc
+        key = (self.model_name, self.device, self.runtime)
+        with _models_lock:
+            if key not in _models:
+                cache = EmbeddingCache(
+                    max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", "1024")),
+                    dtype=os.getenv("EMBEDDING_CACHE_DTYPE", "float32"),
+                )
+                try:
+                    _models[key] = _load_model(*key)
+                except EmbeddingError:
+                    raise
+                except Exception as exc:  # pragma: no cover
+                    raise EmbeddingError(f"Failed to load embedding model {self.model_name}: {exc}") from exc
+                _caches[key] = cache
+                logger.info("[RAG] Loaded embedding model %s (%s, %s)", *key)
+            self.model = _models[key]
+            self.cache = _caches[key]
+
+    def encode(self, texts: Iterable[str], cache: bool = True) -> np.ndarray:
+        """Encode texts to a (n, dim) float32 matrix.
+
+        cache=False skips the embedding cache entirely and returns exact
+        float32 vectors (used for vectors that get stored).
+        """
+        texts = list(texts)
+        if not cache:
+            return self._encode_model(texts)
+
+        cached = self.cache.get_many(texts)
+        missing = [idx for idx in range(len(texts)) if idx not in cached]
+        if missing or not texts:
+            fresh = self._encode_model([texts[idx] for idx in missing])
+            self.cache.put_many([texts[idx] for idx in missing], fresh)
+            if self.cache.max_entries and self.cache.dtype != "float32":
+                # Return what later hits will return, not the exact vector
+                fresh = dequantize(*quantize(fresh, self.cache.dtype))
+            if not cached:
+                return fresh
+
+        # Merge cache hits (dequantized to float32) with freshly encoded rows
+        dim = len(next(iter(cached.values())))
+        vectors = np.empty((len(texts), dim), dtype=np.float32)
+        for idx, vector in cached.items():
+            vectors[idx] = vector
+        for row, idx in enumerate(missing):
+            vectors[idx] = fresh[row]
+        return vectors
 
-    def encode(self, texts: Iterable[str]) -> List[List[float]]:
+    def _encode_model(self, texts: List[str]) -> np.ndarray:
         try:
-            return self.model.encode(list(texts), convert_to_numpy=True, show_progress_bar=False)  # type: ignore[arg-type]
+            vectors = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)  # type: ignore[arg-type]
         except Exception as exc:  # pragma: no cover
             raise EmbeddingError(f"Failed to encode texts: {exc}") from exc
+        return np.asarray(vectors, dtype=np.float32)
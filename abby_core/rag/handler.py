@@ -1,12 +1,15 @@
+import hashlib
 import logging
+import time
 import uuid
 import re
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 
 from abby_core.rag.embeddings import Embeddings, EmbeddingError
-from abby_core.rag.chroma_client import ChromaClient, ChromaUnavailable
+from abby_core.rag.vector_store import VectorStore, VectorStoreUnavailable, get_vector_store
 from abby_core.rag.prepare import prepare_rag_text, validate_prepared_text
+from abby_core.rag.query_cache import get_query_cache
 from abby_core.database.collections.rag_documents import (
     get_document_by_id,
     get_max_version_for_document,
@@ -14,6 +17,15 @@ from abby_core.database.collections.rag_documents import (
     list_documents_grouped,
     get_documents_for_query,
     delete_documents_by_id,
+    count_chunks,
+    iter_chunk_pages,
+    get_chunks_by_ids,
+    find_existing_chunk_ids,
+    mark_chunks_indexed,
+)
+from abby_core.database.collections.rag_metrics import (
+    get_sync_checkpoint,
+    save_sync_checkpoint,
 )
 from abby_core.observability.telemetry import emit_event
 
@@ -54,6 +66,11 @@ def extract_content_only(text: str) -> str:
     return text
 
 
+def content_checksum(text: str) -> str:
+    """Stable checksum of chunk content, stored on both Mongo and vector metadata."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
 def chunk_text(text: str, max_words: int = 200) -> List[str]:
     words = text.split()
     chunks = []
@@ -104,8 +121,8 @@ def ingest(
     
     try:
         embedder = Embeddings()
-        chroma = ChromaClient()
-    except (EmbeddingError, ChromaUnavailable) as exc:
+        store = get_vector_store()
+    except (EmbeddingError, VectorStoreUnavailable) as exc:
         logger.error("[RAG] Ingest failed: %s", exc)
         raise
 
@@ -127,10 +144,11 @@ def ingest(
     # Extract clean content (without TITLE:/SCOPE: headers) for embedding
     clean_content = extract_content_only(text)
     chunks = chunk_text(clean_content)
-    embeddings = embedder.encode(chunks)
+    embeddings = embedder.encode(chunks, cache=False)
 
     # Generate chunk IDs tied to document
     chunk_ids = [f"{document_id}::chunk_{idx}" for idx in range(len(chunks))]
+    checksums = [content_checksum(chunk) for chunk in chunks]
     
     # Build vector DB metadata (only what's needed for filtering/retrieval)
     metadatas = []
@@ -140,6 +158,7 @@ def ingest(
             "document_type": document_type,
             "chunk_index": str(idx),
             "scope": scope or "general",
+            "content_checksum": checksums[idx],
         }
         
         # Only include optional fields if they have values (ChromaDB rejects None)
@@ -150,7 +169,7 @@ def ingest(
         
         metadatas.append(meta)
 
-    chroma.add(ids=chunk_ids, embeddings=embeddings, metadatas=metadatas, documents=chunks)
+    store.add(ids=chunk_ids, embeddings=embeddings, metadatas=metadatas, documents=chunks)
 
     # MongoDB documents (source of truth)
     now = datetime.now(timezone.utc)
@@ -176,9 +195,13 @@ def ingest(
                 "created_by": user_id,
                 "created_at": now,
                 
+                # Sync reconciliation (see sync_check)
+                "content_checksum": checksums[idx],
+                "indexed_at": now,
+                
                 "embedding_ref": {
-                    "provider": "chroma",
-                    "collection": "abby_rag",
+                    "provider": store.provider,
+                    "collection": store.collection_name,
                     "vector_id": chunk_id
                 }
             }
@@ -186,6 +209,9 @@ def ingest(
     
     if rag_docs:
         insert_rag_chunks(rag_docs)
+    
+    # Cached answers for this guild (and unscoped queries) are now stale
+    get_query_cache().invalidate(guild_id)
 
     emit_event(
         "RAG.QUERY",  # Only valid RAG event type
@@ -229,16 +255,40 @@ def query(
     
     Returns:
         {"results": [{"id": str, "text": str, "metadata": dict}]}
+    
+    Results are served from the per-guild query cache when the same
+    normalized question was answered since the guild's last ingest/delete.
     """
+    cache = get_query_cache()
+    cache_key = cache.make_key(text, guild_id, document_type, scope, top_k)
+    generation = cache.generation(guild_id)
+    cached = cache.get(cache_key, guild_id)
+    if cached is not None:
+        emit_event(
+            "RAG.QUERY",
+            {
+                "action": "query",
+                "top_k": top_k,
+                "prompt_length": len(text),
+                "cache_hit": True,
+            },
+        )
+        return cached
+    
+    started = time.perf_counter()
     try:
         embedder = Embeddings()
-        chroma = ChromaClient()
-    except (EmbeddingError, ChromaUnavailable) as exc:
+        store = get_vector_store()
+    except (EmbeddingError, VectorStoreUnavailable) as exc:
         logger.error("[RAG] Query failed: %s", exc)
         raise
 
+    # Served from the embedding cache at EMBEDDING_CACHE_DTYPE precision; the
+    # store scores it as-is (no float32 rerank on this path)
     embedding = embedder.encode([text])
-    results = chroma.query(query_embeddings=embedding, top_k=top_k)
+    # Filters are pushed down so top_k is taken from matching chunks only
+    filters = {"guild_id": guild_id, "document_type": document_type, "scope": scope}
+    results = store.query(query_embeddings=embedding, top_k=top_k, filters=filters)
 
     emit_event(
         "RAG.QUERY",
@@ -246,10 +296,11 @@ def query(
             "action": "query",
             "top_k": top_k,
             "prompt_length": len(text),
+            "cache_hit": False,
         },
     )
 
-    # Filter by guild_id/document_type/scope in metadata
+    # Re-check filters in metadata (guild isolation must not depend on the backend)
     filtered = []
     metadatas = results.get("metadatas", [[]])[0]
     documents = results.get("documents", [[]])[0]
@@ -273,7 +324,13 @@ def query(
             "metadata": meta,
         })
 
-    return {"results": filtered}
+    result = {"results": filtered}
+    cache.put(
+        cache_key, guild_id, result,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        generation=generation,
+    )
+    return result
 
 
 def list_documents(
@@ -362,6 +419,7 @@ def delete_documents(
     
     chunk_ids = [doc["_id"] for doc in matching_docs if "_id" in doc]
     affected_doc_ids = list(set([doc["document_id"] for doc in matching_docs if "document_id" in doc]))
+    affected_guild_ids = {doc.get("guild_id") for doc in matching_docs}
     
     if not chunk_ids:
         logger.warning("[RAG] No documents matched deletion filter: %s", query_filter)
@@ -372,15 +430,19 @@ def delete_documents(
     for doc_id in affected_doc_ids:
         mongo_deleted_count += delete_documents_by_id(doc_id)
     
-    # Delete from Chroma
+    # Delete from vector store
     try:
-        chroma = ChromaClient()
-        chroma.collection.delete(ids=chunk_ids)
+        store = get_vector_store()
+        store.delete(chunk_ids)
         chroma_count = len(chunk_ids)
-    except ChromaUnavailable:
-        logger.warning("[RAG] Chroma unavailable, skipped vector deletion")
+    except VectorStoreUnavailable:
+        logger.warning("[RAG] Vector store unavailable, skipped vector deletion")
         chroma_count = 0
     
+    query_cache = get_query_cache()
+    for affected_guild_id in affected_guild_ids:
+        query_cache.invalidate(affected_guild_id)
+    
     emit_event(
         "RAG.QUERY",  # Only valid RAG event type
         {
@@ -400,14 +462,59 @@ def delete_documents(
         "document_ids": affected_doc_ids  # Return canonical document IDs
     }
 
-def rebuild_chroma_from_mongodb(guild_id: Optional[str] = None) -> Dict[str, Any]:
-    """Rebuild ChromaDB from MongoDB source of truth.
+def _vector_metadata(chunk_doc: Dict[str, Any], checksum: str) -> Dict[str, Any]:
+    """Build vector store metadata for a Mongo chunk document."""
+    meta = {
+        "document_id": chunk_doc["document_id"],
+        "document_type": chunk_doc["document_type"],
+        "chunk_index": str(chunk_doc.get("chunk_index", 0)),
+        "scope": chunk_doc.get("scope", "general"),
+        "content_checksum": checksum,
+    }
+    
+    if chunk_doc.get("guild_id"):
+        meta["guild_id"] = chunk_doc["guild_id"]
+    if chunk_doc.get("tags"):
+        tags = chunk_doc["tags"]
+        meta["tags"] = ",".join(tags) if isinstance(tags, list) else tags
+    
+    return meta
+
+
+def _reindex_chunks(store: VectorStore, embedder: Embeddings, chunk_docs: List[Dict[str, Any]]) -> int:
+    """Re-embed Mongo chunks, upsert them into the vector store and stamp checksums.
+    
+    Returns the number of chunks indexed.
+    """
+    ids, contents, metadatas = [], [], []
+    checksums: Dict[str, str] = {}
+    for chunk_doc in chunk_docs:
+        # Use clean content (without TITLE:/SCOPE: headers)
+        content = extract_content_only(chunk_doc["content"])
+        checksum = content_checksum(content)
+        ids.append(chunk_doc["_id"])
+        contents.append(content)
+        metadatas.append(_vector_metadata(chunk_doc, checksum))
+        checksums[chunk_doc["_id"]] = checksum
+    
+    if not ids:
+        return 0
+    
+    embeddings = embedder.encode(contents, cache=False)
+    store.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=contents)
+    mark_chunks_indexed(checksums)
+    return len(ids)
+
+
+def rebuild_chroma_from_mongodb(guild_id: Optional[str] = None, batch_size: int = 64) -> Dict[str, Any]:
+    """Rebuild the vector store (ChromaDB by default) from MongoDB source of truth.
     
-    Useful if ChromaDB is corrupted, deleted, or out of sync.
-    Pulls all documents from MongoDB and re-embeds them into ChromaDB.
+    Useful if the vector store is corrupted, deleted, or out of sync.
+    Pulls all documents from MongoDB and re-embeds them into the vector store.
     
     Args:
         guild_id: Optionally rebuild only for a specific guild
+        batch_size: Chunks embedded and upserted per batch
         
     Returns:
         {
@@ -418,9 +525,9 @@ def rebuild_chroma_from_mongodb(guild_id: Optional[str] = None) -> Dict[str, Any
         }
     """
     try:
-        chroma = ChromaClient()
+        store = get_vector_store()
         embedder = Embeddings()
-    except (ChromaUnavailable, EmbeddingError) as exc:
+    except (VectorStoreUnavailable, EmbeddingError) as exc:
         logger.error("[RAG] Rebuild failed: %s", exc)
         return {
             "documents_processed": 0,
@@ -445,93 +552,22 @@ def rebuild_chroma_from_mongodb(guild_id: Optional[str] = None) -> Dict[str, Any
     unique_docs = set(doc["document_id"] for doc in all_chunks)
     
     chunk_count = 0
-    for chunk_doc in all_chunks:
+    for start in range(0, len(all_chunks), batch_size):
+        batch = all_chunks[start : start + batch_size]
         try:
-            chunk_id = chunk_doc["_id"]
-            # Use clean content (without TITLE:/SCOPE: headers)
-            content = extract_content_only(chunk_doc["content"])
-            
-            embedding = embedder.encode([content])[0]
-            
-            meta = {
-                "document_id": chunk_doc["document_id"],
-                "document_type": chunk_doc["document_type"],
-                "chunk_index": str(chunk_doc.get("chunk_index", 0)),
-                "scope": chunk_doc.get("scope", "general"),
-            }
-            
-            if chunk_doc.get("guild_id"):
-                meta["guild_id"] = chunk_doc["guild_id"]
-            if chunk_doc.get("tags"):
-                meta["tags"] = chunk_doc["tags"]
-            
-            chroma.add(
-                ids=[chunk_id],
-                embeddings=[embedding],
-                metadatas=[meta],
-                documents=[content]
-            )
-            chunk_count += 1
+            chunk_count += _reindex_chunks(store, embedder, batch)
         except Exception as exc:
-            logger.error("[RAG] Failed to rebuild chunk %s: %s", chunk_doc.get("_id"), exc)
-            continue
-    
-    logger.info("[RAG] Rebuilt ChromaDB: %d unique documents → %d chunks indexed", 
-                len(unique_docs), chunk_count)
-    
-    return {
-        "documents_processed": len(unique_docs),
-        "chunks_indexed": chunk_count,
-        "status": "success",
-        "error": None
-    }
-    
-    if not all_chunks:
-        logger.info("[RAG] No documents found to rebuild")
-        return {
-            "documents_processed": 0,
-            "chunks_indexed": 0,
-            "status": "success",
-            "error": None
-        }
-    
-    # Group by document_id to count unique documents
-    unique_docs = set(doc["document_id"] for doc in all_chunks)
-    
-    chunk_count = 0
-    for chunk_doc in all_chunks:
-        try:
-            chunk_id = chunk_doc["_id"]
-            # Use clean content (without TITLE:/SCOPE: headers)
-            content = extract_content_only(chunk_doc["content"])
-            
-            embedding = embedder.encode([content])[0]
-            
-            meta = {
-                "document_id": chunk_doc["document_id"],
-                "document_type": chunk_doc["document_type"],
-                "chunk_index": str(chunk_doc.get("chunk_index", 0)),
-                "scope": chunk_doc.get("scope", "general"),
-            }
-            
-            if chunk_doc.get("guild_id"):
-                meta["guild_id"] = chunk_doc["guild_id"]
-            if chunk_doc.get("tags"):
-                meta["tags"] = chunk_doc["tags"]
-            
-            chroma.add(
-                ids=[chunk_id],
-                embeddings=[embedding],
-                metadatas=[meta],
-                documents=[content]
+            logger.error(
+                "[RAG] Failed to rebuild chunks %s..%s: %s",
+                batch[0].get("_id"), batch[-1].get("_id"), exc,
             )
-            chunk_count += 1
-        except Exception as exc:
-            logger.error("[RAG] Failed to rebuild chunk %s: %s", chunk_doc.get("_id"), exc)
             continue
     
-    logger.info("[RAG] Rebuilt ChromaDB: %d unique documents → %d chunks indexed", 
-                len(unique_docs), chunk_count)
+    # Rebuilt vectors may differ from what cached results were computed against
+    get_query_cache().invalidate(all_guilds=True)
+    
+    logger.info("[RAG] Rebuilt %s: %d unique documents → %d chunks indexed", 
+                store.provider, len(unique_docs), chunk_count)
     
     return {
         "documents_processed": len(unique_docs),
@@ -541,93 +577,177 @@ def rebuild_chroma_from_mongodb(guild_id: Optional[str] = None) -> Dict[str, Any
     }
 
 
-def sync_check(guild_id: Optional[str] = None) -> Dict[str, Any]:
-    """Check if MongoDB and ChromaDB are in sync.
+SYNC_SAMPLE_LIMIT = 20
+
+
+def sync_check(
+    guild_id: Optional[str] = None,
+    repair: bool = False,
+    full: bool = False,
+    page_size: int = 500,
+) -> Dict[str, Any]:
+    """Check (and optionally repair) drift between MongoDB and the vector store.
+    
+    The ``chromadb``/``*_in_chroma`` result keys refer to whichever vector
+    store backend is configured (kept for compatibility).
     
-    Compares document counts and chunk counts between the two databases.
-    Useful for debugging sync issues or corruption.
+    Chunk counts on both sides are compared first. When they agree and a
+    checkpoint exists, only chunks indexed since the last clean check are
+    verified against Chroma (existence + content checksum). A full paged scan
+    of both id sets runs when counts disagree, when no checkpoint exists yet,
+    or when ``full`` is set. Every scan is paged, so memory is bounded by ``page_size`` rather than
+    corpus size, and drift ids are reported as counts plus a small sample.
     
     Args:
         guild_id: Optionally check only for a specific guild
+        repair: Re-embed missing/stale chunks and delete orphaned vectors
+        full: Ignore the checkpoint and scan every chunk
+        page_size: Ids fetched per page from each store
         
     Returns:
         {
             "in_sync": bool,
-            "mongodb": {
-                "total_documents": int,
-                "total_chunks": int,
-                "unique_doc_ids": int
-            },
-            "chromadb": {
-                "total_chunks": int
+            "mode": "incremental" | "full",
+            "mongodb": {"total_chunks": int, "scanned_chunks": int},
+            "chromadb": {"provider": str, "total_chunks": int, "scanned_chunks": int},
+            "drift": {
+                "missing_in_chroma": int,
+                "orphaned_in_chroma": int,
+                "checksum_mismatch": int,
+                "samples": {<kind>: List[str]}
             },
+            "repaired": {"reindexed": int, "deleted": int},
             "discrepancies": List[str],
-            "status": "ok" | "warning" | "error"
+            "status": "ok" | "repaired" | "warning" | "error"
         }
     """
     try:
-        chroma = ChromaClient()
-    except ChromaUnavailable as exc:
+        store = get_vector_store()
+        embedder = Embeddings() if repair else None
+    except (VectorStoreUnavailable, EmbeddingError) as exc:
         logger.error("[RAG] Sync check failed: %s", exc)
         return {
             "in_sync": False,
             "mongodb": {},
             "chromadb": {},
-            "discrepancies": [f"ChromaDB unavailable: {exc}"],
+            "discrepancies": [f"Vector store unavailable: {exc}"],
             "status": "error"
         }
     
-    # MongoDB stats using collection helper
-    mongo_chunks = get_documents_for_query(guild_id=guild_id)
-    mongo_doc_ids = set(doc["document_id"] for doc in mongo_chunks)
-    
-    # ChromaDB stats
-    chroma_results = chroma.collection.get()
-    chroma_chunk_count = len(chroma_results.get("ids", []))
+    started_at = datetime.now(timezone.utc)
+    since = None if full else get_sync_checkpoint(guild_id)
+    where = {"guild_id": guild_id} if guild_id else None
+    
+    drift = {"missing_in_chroma": 0, "orphaned_in_chroma": 0, "checksum_mismatch": 0}
+    samples: Dict[str, List[str]] = {kind: [] for kind in drift}
+    repaired = {"reindexed": 0, "deleted": 0}
+    
+    def record(kind: str, ids: List[str]) -> None:
+        drift[kind] += len(ids)
+        room = SYNC_SAMPLE_LIMIT - len(samples[kind])
+        if room > 0:
+            samples[kind].extend(ids[:room])
+    
+    def check_mongo_pages(since_filter) -> int:
+        scanned = 0
+        for page in iter_chunk_pages(guild_id=guild_id, since=since_filter, page_size=page_size):
+            scanned += len(page)
+            page_ids = [str(doc["_id"]) for doc in page]
+            stored = store.get_checksums(page_ids)
+            missing, stale = [], []
+            for doc, chunk_id in zip(page, page_ids):
+                if chunk_id not in stored:
+                    missing.append(chunk_id)
+                elif not doc.get("content_checksum") or stored[chunk_id] != doc["content_checksum"]:
+                    stale.append(chunk_id)
+            record("missing_in_chroma", missing)
+            record("checksum_mismatch", stale)
+            if repair and (missing or stale):
+                repaired["reindexed"] += _reindex_chunks(
+                    store, embedder, get_chunks_by_ids(missing + stale)
+                )
+        return scanned
+    
+    # Cheap count comparison decides whether a full id diff is needed
+    mongo_total = count_chunks(guild_id)
+    chroma_total = store.count(where=where)
+    mode = "incremental" if since is not None and mongo_total == chroma_total else "full"
+    
+    # Mongo side: verify existence + checksum (only chunks changed since checkpoint)
+    mongo_scanned = check_mongo_pages(since if mode == "incremental" else None)
+    
+    # Chroma side: orphan detection needs every vector id, so only in full mode
+    chroma_scanned = 0
+    if mode == "full":
+        orphans: List[str] = []
+        for page in store.iter_ids(page_size=page_size, where=where):
+            chroma_scanned += len(page)
+            existing = find_existing_chunk_ids(page)
+            page_orphans = [vector_id for vector_id in page if vector_id not in existing]
+            record("orphaned_in_chroma", page_orphans)
+            if repair:
+                orphans.extend(page_orphans)
+        # Delete after paging so offsets stay stable during the scan
+        for start in range(0, len(orphans), page_size):
+            batch = orphans[start : start + page_size]
+            store.delete(batch)
+            repaired["deleted"] += len(batch)
     
-    # Analysis
     discrepancies = []
-    in_sync = True
+    if drift["missing_in_chroma"]:
+        discrepancies.append(f"{drift['missing_in_chroma']} MongoDB chunks missing from ChromaDB")
+    if drift["checksum_mismatch"]:
+        discrepancies.append(f"{drift['checksum_mismatch']} ChromaDB chunks stale (checksum mismatch)")
+    if drift["orphaned_in_chroma"]:
+        discrepancies.append(f"{drift['orphaned_in_chroma']} ChromaDB chunks missing from MongoDB (orphaned)")
+    
+    found_drift = any(drift.values())
+    fully_repaired = repair and (
+        repaired["reindexed"] == drift["missing_in_chroma"] + drift["checksum_mismatch"]
+        and repaired["deleted"] == drift["orphaned_in_chroma"]
+    )
+    in_sync = not found_drift or fully_repaired
     
-    if len(mongo_chunks) != chroma_chunk_count:
-        discrepancies.append(
-            f"Chunk count mismatch: MongoDB has {len(mongo_chunks)}, "
-            f"ChromaDB has {chroma_chunk_count}"
-        )
-        in_sync = False
+    if repaired["reindexed"] or repaired["deleted"]:
+        get_query_cache().invalidate(all_guilds=True)
     
-    # Check for MongoDB chunks missing from ChromaDB
-    if chroma_chunk_count > 0:
-        chroma_ids = set(chroma_results.get("ids", []))
-        mongo_ids = set(str(doc["_id"]) for doc in mongo_chunks)
-        
-        missing_in_chroma = mongo_ids - chroma_ids
-        missing_in_mongo = chroma_ids - mongo_ids
-        
-        if missing_in_chroma:
-            discrepancies.append(
-                f"{len(missing_in_chroma)} MongoDB chunks missing from ChromaDB"
-            )
-            in_sync = False
-        
-        if missing_in_mongo:
-            discrepancies.append(
-                f"{len(missing_in_mongo)} ChromaDB chunks missing from MongoDB (orphaned)"
-            )
-            in_sync = False
+    if in_sync:
+        # Next check only needs to look at chunks indexed after this one started
+        save_sync_checkpoint(started_at, guild_id=guild_id, stats=dict(drift))
+        status = "repaired" if found_drift else "ok"
+    else:
+        status = "error" if not chroma_total else "warning"
+    
+    emit_event(
+        "RAG.QUERY",  # Only valid RAG event type
+        {
+            "action": "sync_check",
+            "mode": mode,
+            "guild_id": guild_id,
+            "drift": dict(drift),
+            "repaired": dict(repaired),
+        },
+    )
     
-    status = "ok" if in_sync else ("error" if not chroma_chunk_count else "warning")
+    logger.info(
+        "[RAG] Sync check (%s): scanned %d Mongo / %d Chroma chunks, drift=%s, repaired=%s",
+        mode, mongo_scanned, chroma_scanned, drift, repaired,
+    )
     
     return {
         "in_sync": in_sync,
+        "mode": mode,
         "mongodb": {
-            "total_documents": len(mongo_chunks),
-            "total_chunks": len(mongo_chunks),
-            "unique_doc_ids": len(mongo_doc_ids)
+            "total_chunks": mongo_total,
+            "scanned_chunks": mongo_scanned,
         },
         "chromadb": {
-            "total_chunks": chroma_chunk_count
+            "provider": store.provider,
+            "total_chunks": chroma_total,
+            "scanned_chunks": chroma_scanned,
         },
+        "drift": {**drift, "samples": samples},
+        "repaired": repaired,
         "discrepancies": discrepancies,
         "status": status
-    }
\ No newline at end of file
+    }
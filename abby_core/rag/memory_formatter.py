@@ -8,9 +8,27 @@ Architecture Benefit:
 - RAG layer owns memory relevance logic
 - Context factory focuses on prompt assembly
 - Memory scoring reusable across different contexts
+
+Fact index:
+Each fact's scoring features (stopword-filtered keyword set, domain tags,
+sanitized text) are computed once per fact text and kept in an LRU, and a
+MemoryFactIndex with keyword/domain posting lists is built once per envelope
+fact list and kept until its facts change. A turn then only tokenizes the
+message, looks up the facts that share a keyword or domain with it, and keeps
+the top MAX_FACTS by score - instead of re-tokenizing, re-sanitizing and
+sorting every fact. Facts that
+already carry ``keywords``/``domains`` fields (see index_fact, applied on
+write by UserService.index_memory) skip keyword/domain extraction; only
+their sanitized text is computed, in its own LRU.
 """
 
-from typing import Dict, Optional, List, Any
+import heapq
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional, List, Any, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,22 +53,35 @@ STOPWORDS = {
 }
 
 
+# Facts included per turn even if the token budget allows more
+MAX_FACTS = 10
+
+# Scoring weights (see format_memory_for_llm)
+DOMAIN_MATCH_SCORE = 30
+KEYWORD_MATCH_SCORE = 10
+KEYWORD_MATCH_CAP = 30
+CONFIDENCE_WEIGHT = 15
+
+
 def _estimate_tokens(text: str) -> int:
-    """Estimate token count from character length.
+    """Count tokens with the shared prompt tokenizer.
     
-    Uses a conservative 4 chars/token ratio. Can be swapped with tiktoken later.
+    Delegates to abby_core/llm/token_budget.count_tokens (tiktoken when
+    available, otherwise a Unicode-aware estimate), so emoji and non-English
+    facts are budgeted by their real cost rather than len/4.
     
     Args:
-        text: Text to estimate
+        text: Text to count
         
     Returns:
-        Estimated token count
+        Token count
     """
-    import math
-    return math.ceil(len(text) / 4)
+    # Imported lazily: abby_core.llm imports this module via context_factory
+    from abby_core.llm.token_budget import count_tokens
+    return count_tokens(text)
 
 
-def _sanitize_rag_fact(fact_text: str) -> str:
+def _sanitize_rag_fact(fact_text: str, max_chars: int = 500) -> str:
     """Sanitize RAG fact content to prevent prompt injection attacks.
     
     Security boundary: RAG facts sourced from external ingestion (Discord messages,
@@ -65,6 +96,7 @@ def _sanitize_rag_fact(fact_text: str) -> str:
     
     Args:
         fact_text: Raw fact text from RAG ingestion
+        max_chars: Truncation limit (500 chars = ~125 tokens per fact)
         
     Returns:
         Sanitized fact text safe for LLM prompt injection
@@ -93,13 +125,214 @@ def _sanitize_rag_fact(fact_text: str) -> str:
     # Strip excessive whitespace
     sanitized = re.sub(r'\s+', ' ', sanitized).strip()
     
-    # Truncate to prevent overflow (500 chars = ~125 tokens max per fact)
-    if len(sanitized) > 500:
-        sanitized = sanitized[:497] + "..."
+    # Truncate to prevent overflow
+    if len(sanitized) > max_chars:
+        sanitized = sanitized[:max_chars - 3] + "..."
     
     return sanitized
 
 
+def _keywords(text_lower: str) -> FrozenSet[str]:
+    return frozenset(w for w in text_lower.split() if w and w not in STOPWORDS)
+
+
+def _domains(text_lower: str) -> FrozenSet[str]:
+    # Substring match, as keyword lists include stems ("draw" -> "drawing")
+    return frozenset(
+        domain for domain, keywords in DOMAIN_KEYWORDS.items()
+        if any(kw in text_lower for kw in keywords)
+    )
+
+
+@dataclass(frozen=True)
+class FactFeatures:
+    """Precomputed scoring features of one fact text."""
+    keywords: FrozenSet[str]
+    domains: FrozenSet[str]
+    sanitized_text: str
+
+
+_FEATURE_CACHE_SIZE = int(os.getenv("MEMORY_FACT_FEATURE_CACHE_SIZE", "8192"))
+
+
+@lru_cache(maxsize=_FEATURE_CACHE_SIZE)
+def _sanitized_fact_text(text: str) -> str:
+    # SECURITY: Sanitize fact text to prevent RAG injection attacks
+    return _sanitize_rag_fact(text)
+
+
+@lru_cache(maxsize=_FEATURE_CACHE_SIZE)
+def _text_features(text: str) -> FactFeatures:
+    text_lower = text.lower()
+    return FactFeatures(
+        keywords=_keywords(text_lower),
+        domains=_domains(text_lower),
+        sanitized_text=_sanitized_fact_text(text),
+    )
+
+
+def _fact_features(fact: Dict[str, Any]) -> FactFeatures:
+    if 'keywords' in fact and 'domains' in fact:
+        # Stored at write time (index_fact); only the sanitized text is needed
+        return FactFeatures(
+            frozenset(fact['keywords']),
+            frozenset(fact['domains']),
+            _sanitized_fact_text(fact.get('text', '')),
+        )
+    return _text_features(fact.get('text', ''))
+
+
+def index_fact(fact: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach scoring features to a fact document before it is stored.
+    
+    Adds sorted ``keywords`` and ``domains`` lists so formatting never has to
+    re-derive them from the text.
+    
+    Args:
+        fact: Memorable fact dict with at least a 'text' key
+        
+    Returns:
+        The same dict, with features added
+    """
+    text_lower = fact.get('text', '').lower()
+    fact['keywords'] = sorted(_keywords(text_lower))
+    fact['domains'] = sorted(_domains(text_lower))
+    return fact
+
+
+def _confidence_score(fact: Dict[str, Any]) -> int:
+    return int(fact.get('confidence', 0.5) * CONFIDENCE_WEIGHT)
+
+
+class MemoryFactIndex:
+    """Keyword/domain posting lists over one envelope's facts.
+    
+    Only facts sharing a keyword or domain with the message can score above
+    the confidence-only maximum, so when the relevance threshold is higher
+    than that, the rest are never looked at.
+    """
+
+    def __init__(self, facts: List[Dict[str, Any]]):
+        self.facts = facts
+        self.features = [_fact_features(fact) for fact in facts]
+        self.confidence_scores = [_confidence_score(fact) for fact in facts]
+        self.max_confidence_score = max(self.confidence_scores, default=0)
+        self.by_keyword: Dict[str, List[int]] = {}
+        self.by_domain: Dict[str, List[int]] = {}
+        for position, features in enumerate(self.features):
+            for keyword in features.keywords:
+                self.by_keyword.setdefault(keyword, []).append(position)
+            for domain in features.domains:
+                self.by_domain.setdefault(domain, []).append(position)
+
+    def _candidates(self, keywords: FrozenSet[str], domains: FrozenSet[str]) -> Iterable[int]:
+        positions = set()
+        for keyword in keywords:
+            positions.update(self.by_keyword.get(keyword, ()))
+        for domain in domains:
+            positions.update(self.by_domain.get(domain, ()))
+        return sorted(positions)
+
+    def _score(self, position: int, keywords: FrozenSet[str], domains: FrozenSet[str]) -> int:
+        features = self.features[position]
+        score = DOMAIN_MATCH_SCORE if features.domains & domains else 0
+        score += min(len(features.keywords & keywords) * KEYWORD_MATCH_SCORE, KEYWORD_MATCH_CAP)
+        return score + self.confidence_scores[position]
+
+    def select(
+        self,
+        message_lower: str,
+        min_score: int,
+        limit: int = MAX_FACTS,
+    ) -> Tuple[List[Tuple[int, Dict[str, Any], FactFeatures]], int, int]:
+        """Best-scoring facts for a message.
+        
+        Returns:
+            (top facts as (score, fact, features) in descending score order,
+            best score seen, number of facts at or above min_score)
+        """
+        keywords = _keywords(message_lower)
+        domains = _domains(message_lower)
+        if min_score > self.max_confidence_score:
+            positions = self._candidates(keywords, domains)
+        else:
+            positions = range(len(self.facts))
+
+        scored = [(self._score(position, keywords, domains), position) for position in positions]
+        best = max((score for score, _ in scored), default=0)
+        qualifying = [item for item in scored if item[0] >= min_score]
+        # nlargest is stable like sorted(): equal scores keep envelope order
+        top = heapq.nlargest(limit, qualifying, key=lambda item: item[0])
+        return (
+            [(score, self.facts[position], self.features[position]) for score, position in top],
+            best,
+            len(qualifying),
+        )
+
+
+_INDEX_CACHE_SIZE = 256
+_index_cache: "OrderedDict[Tuple[int, int], MemoryFactIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def _facts_fingerprint(facts: List[Dict[str, Any]]) -> int:
+    """Hash of everything the index derives from a fact list."""
+    return hash(tuple(
+        (
+            fact.get('text', ''),
+            fact.get('confidence', 0.5),
+            tuple(fact['keywords']) if 'keywords' in fact else None,
+            tuple(fact['domains']) if 'domains' in fact else None,
+        )
+        for fact in facts
+    ))
+
+
+def _get_fact_index(facts: List[Dict[str, Any]]) -> MemoryFactIndex:
+    """Index for an envelope's fact list, reused while its content is unchanged.
+    
+    Envelopes are cached by the memory service, so the same list object is
+    formatted on every turn of a conversation. The key includes a fingerprint
+    of the scored fields, so edits made to the list or its facts in place
+    get a fresh index. The cached index holds a reference to the list, so its
+    id cannot be reused while cached.
+    """
+    key = (id(facts), _facts_fingerprint(facts))
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None and index.facts is facts:
+            _index_cache.move_to_end(key)
+            return index
+    index = MemoryFactIndex(facts)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def _reference_scored_facts(facts: List[Dict[str, Any]], user_message: str) -> List[Tuple[int, Dict[str, Any]]]:
+    """Original per-turn scoring loop, kept as the parity oracle for the index."""
+    message_lower = user_message.lower()
+    message_keywords = {w for w in message_lower.split() if w and w not in STOPWORDS}
+    scored_facts = []
+    for fact in facts:
+        score = 0
+        fact_lower = fact.get('text', '').lower()
+        for domain, keywords in DOMAIN_KEYWORDS.items():
+            if any(kw in fact_lower for kw in keywords):
+                if any(kw in message_lower for kw in keywords):
+                    score += 30
+                    break
+        fact_words = {w for w in fact_lower.split() if w and w not in STOPWORDS}
+        score += min(len(message_keywords & fact_words) * 10, 30)
+        score += int(fact.get('confidence', 0.5) * 15)
+        scored_facts.append((score, fact))
+    scored_facts.sort(key=lambda x: x[0], reverse=True)
+    return scored_facts
+
+
 def format_memory_for_llm(
     envelope: Dict[str, Any],
     user_message: str,
@@ -119,7 +352,8 @@ def format_memory_for_llm(
     Args:
         envelope: Raw memory envelope from TDOS Memory
         user_message: Current user message for keyword matching
-        max_tokens: Token budget for memory (default 300 = ~1200 chars)
+        max_tokens: Token budget for memory (default 300), counted with the
+            shared tokenizer (see abby_core/llm/token_budget.py)
         intent: Optional intent classification
         min_relevance_score: Minimum score required for best fact (default 20)
             Scoring: domain match +30, keyword overlap +10/word (max 30), confidence +15
@@ -135,46 +369,16 @@ def format_memory_for_llm(
     if not facts:
         return None
     
-    # Normalize user message for keyword matching (stopword-filtered)
-    message_lower = user_message.lower()
-    message_keywords = {w for w in message_lower.split() if w and w not in STOPWORDS}
-    
-    # Score each fact for relevance
-    scored_facts = []
-    for fact in facts:
-        score = 0
-        fact_text = fact.get('text', '')
-        fact_lower = fact_text.lower()
-        
-        # Domain matching (+30 points)
-        for domain, keywords in DOMAIN_KEYWORDS.items():
-            if any(kw in fact_lower for kw in keywords):
-                if any(kw in message_lower for kw in keywords):
-                    score += 30
-                    break
-        
-        # Keyword overlap (+10 per matching word, max 30) with stopword filtering
-        fact_words = {w for w in fact_lower.split() if w and w not in STOPWORDS}
-        overlap = len(message_keywords & fact_words)
-        score += min(overlap * 10, 30)
-        
-        # Confidence boost (+5 to +15)
-        confidence = fact.get('confidence', 0.5)
-        score += int(confidence * 15)
-        
-        # Recency (newer facts slightly preferred, +0 to +10)
-        # TODO: Add timestamp-based recency when available
-        
-        scored_facts.append((score, fact))
-    
-    # Sort by score descending
-    scored_facts.sort(key=lambda x: x[0], reverse=True)
+    # Score facts that share a keyword or domain with the message (precomputed index)
+    selected, best_score, above_threshold = _get_fact_index(facts).select(
+        user_message.lower(), min_relevance_score
+    )
     
     # Check if best fact meets minimum relevance threshold
-    if not scored_facts or scored_facts[0][0] < min_relevance_score:
+    if not selected:
         logger.info(
             f"[memory_format] No relevant facts found "
-            f"(best_score={scored_facts[0][0] if scored_facts else 0}, "
+            f"(best_score={best_score}, "
             f"threshold={min_relevance_score})"
         )
         return None
@@ -186,17 +390,15 @@ def format_memory_for_llm(
             "preview": fact.get("text", "")[:80],
             "confidence": fact.get("confidence", 0.0),
         }
-        for score, fact in scored_facts[:5]
+        for score, fact, _ in selected[:5]
     ]
-    above_threshold = sum(1 for score, _ in scored_facts if score >= min_relevance_score)
     logger.info(
         f"[memory_format] Scored facts top5={top_samples} "
-        f"above_threshold={above_threshold}/{len(scored_facts)} "
+        f"above_threshold={above_threshold}/{len(facts)} "
         f"threshold={min_relevance_score}"
     )
     
     # Build memory string within token budget
-    max_chars = max_tokens * 4  # Conservative estimate
     
     # Start with identity and preferences
     memory_lines = []
@@ -212,42 +414,32 @@ def format_memory_for_llm(
         header += f"\nPreferences: {prefs_str}"
     
     memory_lines.append(header)
-    current_chars = len(header)
+    current_tokens = _estimate_tokens(header)
     
     # Add scored facts until budget exhausted
     memory_lines.append("Known facts:")
-    current_chars += 12
+    current_tokens += _estimate_tokens("\nKnown facts:")
     
     facts_added = 0
-    for score, fact in scored_facts:
-        # Skip facts below relevance threshold
-        if score < min_relevance_score:
-            logger.debug(
-                f"[memory_format] Skipping fact score={score} (below threshold={min_relevance_score})"
-            )
-            continue
-        
-        # SECURITY: Sanitize fact text to prevent RAG injection attacks
-        raw_fact_text = fact.get('text', '')
-        sanitized_text = _sanitize_rag_fact(raw_fact_text)
-        
-        fact_text = f"  ? {sanitized_text} (confidence: {int(fact.get('confidence', 0.5) * 100)}%)"
-        fact_chars = len(fact_text) + 1  # +1 for newline
+    for score, fact, features in selected:
+        # Text was sanitized (RAG injection protection) when the fact was indexed
+        fact_text = f"  ? {features.sanitized_text} (confidence: {int(fact.get('confidence', 0.5) * 100)}%)"
+        fact_tokens = _estimate_tokens(fact_text) + 1  # +1 for newline
         
-        if current_chars + fact_chars > max_chars:
+        if current_tokens + fact_tokens > max_tokens:
             break
         
         memory_lines.append(fact_text)
-        current_chars += fact_chars
+        current_tokens += fact_tokens
         facts_added += 1
 
         logger.debug(
             f"[memory_format] Added fact score={score} "
-            f"remaining_chars={max_chars - current_chars}"
+            f"remaining_tokens={max_tokens - current_tokens}"
         )
         
         # Cap at reasonable fact count even if budget allows more
-        if facts_added >= 10:
+        if facts_added >= MAX_FACTS:
             break
     
     if facts_added == 0:
@@ -256,6 +448,6 @@ def format_memory_for_llm(
         return None
     
     formatted = "\n".join(memory_lines)
-    logger.info(f"[memory_format] Formatted {facts_added} facts ({current_chars} chars, ~{_estimate_tokens(formatted)} tokens)")
+    logger.info(f"[memory_format] Formatted {facts_added} facts ({len(formatted)} chars, {current_tokens} tokens)")
     
     return formatted
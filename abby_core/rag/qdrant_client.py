@@ -1,38 +1,275 @@
 import os
-from typing import List, Optional, Dict, Any
+import uuid
+from typing import Iterator, List, Optional, Dict, Any
 from abby_core.observability.logging import setup_logging, logging
+from abby_core.rag.vector_store import (
+    DEFAULT_COLLECTION,
+    FILTER_FIELDS,
+    VectorStore,
+    VectorStoreUnavailable,
+)
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
 try:
     from qdrant_client import QdrantClient
-    from qdrant_client.models import Distance, VectorParams, PointStruct
+    from qdrant_client.models import (
+        Distance,
+        FieldCondition,
+        Filter,
+        HnswConfigDiff,
+        MatchValue,
+        PayloadSchemaType,
+        PointIdsList,
+        PointStruct,
+        SearchParams,
+        VectorParams,
+    )
 except Exception as e:
     QdrantClient = None  # type: ignore
     logger.warning("qdrant-client not installed; rag_qdrant will be unavailable.")
 
 
+# Payload keys reserved by QdrantVectorStore (everything else is chunk metadata)
+_CHUNK_ID_KEY = "chunk_id"
+_DOCUMENT_KEY = "document"
+
+
+def point_id(chunk_id: str) -> str:
+    """Qdrant only accepts UUID/int point ids; derive a stable UUID from the chunk id."""
+    try:
+        return str(uuid.UUID(chunk_id))
+    except ValueError:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, chunk_id))
+
+
+def _filter(filters: Optional[Dict[str, Any]]) -> Optional["Filter"]:
+    """Translate equality filters into a Qdrant payload filter."""
+    conditions = [
+        FieldCondition(key=key, match=MatchValue(value=value))
+        for key, value in (filters or {}).items()
+        if value is not None
+    ]
+    return Filter(must=conditions) if conditions else None
+
+
 class QdrantWrapper:
-    def __init__(self, host: Optional[str] = None, port: Optional[int] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        api_key: Optional[str] = None,
+        location: Optional[str] = None,
+        url: Optional[str] = None,
+        path: Optional[str] = None,
+    ):
+        """Connect to Qdrant.
+
+        Resolution order: ``location`` (e.g. ":memory:" for in-process mode),
+        ``path`` (local on-disk mode), ``url``, then ``host``/``port``. Each
+        falls back to its QDRANT_* environment variable.
+        """
         if QdrantClient is None:
-            raise RuntimeError("qdrant-client missing. Please install qdrant-client.")
-        host = host or os.getenv("QDRANT_HOST", "localhost")
-        port = port or int(os.getenv("QDRANT_PORT", "6333"))
+            raise VectorStoreUnavailable("qdrant-client missing. Please install qdrant-client.")
+        location = location or os.getenv("QDRANT_LOCATION")
+        path = path or os.getenv("QDRANT_PATH")
+        url = url or os.getenv("QDRANT_URL")
         api_key = api_key or os.getenv("QDRANT_API_KEY")
-        self.client = QdrantClient(host=host, port=port, api_key=api_key)
+        if location:
+            self.client = QdrantClient(location=location)
+        elif path:
+            self.client = QdrantClient(path=path)
+        elif url:
+            self.client = QdrantClient(url=url, api_key=api_key)
+        else:
+            host = host or os.getenv("QDRANT_HOST", "localhost")
+            port = port or int(os.getenv("QDRANT_PORT", "6333"))
+            self.client = QdrantClient(host=host, port=port, api_key=api_key)
 
-    def ensure_collection(self, name: str, vector_size: int, distance: str = "Cosine"):
-        collections = [c.name for c in self.client.get_collections().collections]
-        if name not in collections:
+    def ensure_collection(
+        self,
+        name: str,
+        vector_size: int,
+        distance: str = "Cosine",
+        hnsw_m: Optional[int] = None,
+        hnsw_ef_construct: Optional[int] = None,
+        payload_indexes: tuple = FILTER_FIELDS,
+    ):
+        if not self.client.collection_exists(name):
+            hnsw_config = None
+            if hnsw_m is not None or hnsw_ef_construct is not None:
+                hnsw_config = HnswConfigDiff(m=hnsw_m, ef_construct=hnsw_ef_construct)
             self.client.create_collection(
                 collection_name=name,
-                vectors_config=VectorParams(size=vector_size, distance=Distance[distance])
+                vectors_config=VectorParams(size=vector_size, distance=Distance[distance.upper()]),
+                hnsw_config=hnsw_config,
             )
+            # Keyword indexes keep guild/type/scope filtered searches from scanning
+            for field in payload_indexes:
+                self.client.create_payload_index(
+                    collection_name=name,
+                    field_name=field,
+                    field_schema=PayloadSchemaType.KEYWORD,
+                )
+
+    def upsert(self, collection: str, points: List[Dict[str, Any]], batch_size: int = 256):
+        for start in range(0, len(points), batch_size):
+            batch = [
+                PointStruct(id=point_id(str(p["id"])), vector=list(p["vector"]), payload=p.get("payload", {}))
+                for p in points[start : start + batch_size]
+            ]
+            self.client.upsert(collection_name=collection, points=batch, wait=True)
+
+    def query(
+        self,
+        collection: str,
+        vector: List[float],
+        top_k: int = 3,
+        filters: Optional[Dict[str, Any]] = None,
+        hnsw_ef: Optional[int] = None,
+    ):
+        return self.client.query_points(
+            collection_name=collection,
+            query=list(vector),
+            limit=top_k,
+            query_filter=_filter(filters),
+            search_params=SearchParams(hnsw_ef=hnsw_ef) if hnsw_ef else None,
+            with_payload=True,
+        ).points
+
+
+class QdrantVectorStore(VectorStore):
+    """Qdrant-backed VectorStore.
 
-    def upsert(self, collection: str, points: List[Dict[str, Any]]):
-        payloads = [PointStruct(id=p["id"], vector=p["vector"], payload=p.get("payload", {})) for p in points]
-        self.client.upsert(collection_name=collection, points=payloads)
+    Chunk ids are mapped to UUID point ids and kept in the payload alongside
+    the document text; metadata fields are stored flat so guild_id,
+    document_type and scope can be payload-indexed.
+
+    Tuning (env): QDRANT_HNSW_M, QDRANT_HNSW_EF_CONSTRUCT, QDRANT_HNSW_EF
+    (search-time ef) and QDRANT_UPSERT_BATCH.
+    """
+
+    provider = "qdrant"
+
+    def __init__(
+        self,
+        collection_name: str = DEFAULT_COLLECTION,
+        location: Optional[str] = None,
+        wrapper: Optional[QdrantWrapper] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
+        self.collection_name = collection_name
+        self.wrapper = wrapper or QdrantWrapper(location=location)
+        self.client = self.wrapper.client
+        self.batch_size = batch_size or int(os.getenv("QDRANT_UPSERT_BATCH", "256"))
+        self.hnsw_m = int(os.getenv("QDRANT_HNSW_M", "16"))
+        self.hnsw_ef_construct = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "128"))
+        self.search_ef = int(os.getenv("QDRANT_HNSW_EF", "64"))
+        self._ready = self.client.collection_exists(collection_name)
+        logger.info("[RAG] Qdrant vector store ready (collection=%s)", collection_name)
+
+    def _ensure(self, vector_size: int) -> None:
+        # Vector size is only known at first write, so create lazily
+        if self._ready:
+            return
+        self.wrapper.ensure_collection(
+            self.collection_name,
+            vector_size,
+            hnsw_m=self.hnsw_m,
+            hnsw_ef_construct=self.hnsw_ef_construct,
+        )
+        self._ready = True
+
+    def add(self, ids: List[str], embeddings: List[List[float]], metadatas: List[Dict[str, Any]], documents: List[str]) -> None:
+        # Qdrant has no insert-only write; ids are deterministic so upsert is idempotent
+        self.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+
+    def upsert(self, ids: List[str], embeddings: List[List[float]], metadatas: List[Dict[str, Any]], documents: List[str]) -> None:
+        if not ids:
+            return
+        self._ensure(len(embeddings[0]))
+        points = [
+            {
+                "id": chunk_id,
+                "vector": vector,
+                "payload": {**(meta or {}), _CHUNK_ID_KEY: chunk_id, _DOCUMENT_KEY: doc},
+            }
+            for chunk_id, vector, meta, doc in zip(ids, embeddings, metadatas, documents)
+        ]
+        self.wrapper.upsert(self.collection_name, points, batch_size=self.batch_size)
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 3,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        results: Dict[str, Any] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for vector in query_embeddings:
+            hits = []
+            if self._ready:
+                hits = self.wrapper.query(
+                    self.collection_name, vector, top_k=top_k, filters=filters, hnsw_ef=self.search_ef
+                )
+            ids, documents, metadatas, distances = [], [], [], []
+            for hit in hits:
+                payload = dict(hit.payload or {})
+                ids.append(payload.pop(_CHUNK_ID_KEY, str(hit.id)))
+                documents.append(payload.pop(_DOCUMENT_KEY, ""))
+                metadatas.append(payload)
+                # Cosine similarity -> Chroma-style distance (lower is closer)
+                distances.append(1.0 - hit.score)
+            results["ids"].append(ids)
+            results["documents"].append(documents)
+            results["metadatas"].append(metadatas)
+            results["distances"].append(distances)
+        return results
+
+    def delete(self, ids: List[str]) -> None:
+        if not ids or not self._ready:
+            return
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=PointIdsList(points=[point_id(chunk_id) for chunk_id in ids]),
+            wait=True,
+        )
+
+    def count(self, where: Optional[Dict[str, Any]] = None) -> int:
+        if not self._ready:
+            return 0
+        return self.client.count(
+            collection_name=self.collection_name, count_filter=_filter(where), exact=True
+        ).count
+
+    def iter_ids(self, page_size: int = 500, where: Optional[Dict[str, Any]] = None) -> Iterator[List[str]]:
+        if not self._ready:
+            return
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=_filter(where),
+                limit=page_size,
+                offset=offset,
+                with_payload=[_CHUNK_ID_KEY],
+                with_vectors=False,
+            )
+            if points:
+                yield [(p.payload or {}).get(_CHUNK_ID_KEY, str(p.id)) for p in points]
+            if offset is None:
+                return
 
-    def query(self, collection: str, vector: List[float], top_k: int = 3, filters: Optional[Dict[str, Any]] = None):
-        return self.client.search(collection_name=collection, query_vector=vector, limit=top_k, query_filter=filters)
+    def get_checksums(self, ids: List[str]) -> Dict[str, Optional[str]]:
+        if not ids or not self._ready:
+            return {}
+        points = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=[point_id(chunk_id) for chunk_id in ids],
+            with_payload=[_CHUNK_ID_KEY, "content_checksum"],
+            with_vectors=False,
+        )
+        return {
+            (p.payload or {}).get(_CHUNK_ID_KEY, str(p.id)): (p.payload or {}).get("content_checksum")
+            for p in points
+        }
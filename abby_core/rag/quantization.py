@@ -0,0 +1,185 @@
+"""Reduced-precision vector storage for embeddings.
+
+Embeddings from all-MiniLM-L6-v2 are 384 float32 values (1.5 KB each). Storing
+them as float16 halves that and int8 (symmetric, one float32 scale per vector)
+cuts it to ~25%. Scores from quantized vectors are only used to pick
+candidates; final cosine scores are recomputed in float32 after dequantizing
+the shortlisted vectors, which keeps ranking agreement with the float32
+baseline high.
+
+Used by the Embeddings cache and QuantizedVectorIndex (a small in-process
+index for benchmarks and local reranking).
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+_INT8_MAX = 127.0
+
+
+def _check_dtype(dtype: str) -> str:
+    if dtype not in VECTOR_DTYPES:
+        raise ValueError(f"Unsupported vector dtype '{dtype}' (expected one of {VECTOR_DTYPES})")
+    return dtype
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Convert a (n, dim) float matrix to ``dtype`` storage.
+
+    Returns (data, scales); scales is None except for int8, where each row is
+    stored as round(v / scale) with scale = max(|v|) / 127.
+    """
+    _check_dtype(dtype)
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    if dtype == "float32":
+        return vectors.copy(), None
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+
+    scales = np.abs(vectors).max(axis=1) / _INT8_MAX
+    scales[scales == 0] = 1.0
+    data = np.clip(np.rint(vectors / scales[:, None]), -_INT8_MAX, _INT8_MAX).astype(np.int8)
+    return data, scales.astype(np.float32)
+
+
+def dequantize(data: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """Inverse of quantize(); always returns float32."""
+    restored = np.asarray(data).astype(np.float32)
+    if scales is not None:
+        restored *= np.asarray(scales, dtype=np.float32)[:, None]
+    return restored
+
+
+def cosine_scores(query: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+    """Float32 cosine similarity between one query and each row of vectors."""
+    query = np.asarray(query, dtype=np.float32).ravel()
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1) * (np.linalg.norm(query) or 1.0)
+    norms[norms == 0] = 1.0
+    return (vectors @ query) / norms
+
+
+class QuantizedVectorIndex:
+    """Brute-force in-process index over reduced-precision vectors.
+
+    search() shortlists ``top_k * rerank_factor`` candidates using scores
+    computed on the stored (quantized) representation, then reranks the
+    shortlist with float32 cosine on dequantized vectors.
+    """
+
+    def __init__(self, dtype: str = "int8", rerank_factor: int = 4) -> None:
+        self.dtype = _check_dtype(dtype)
+        self.rerank_factor = max(1, rerank_factor)
+        self.ids: List[str] = []
+        self._data: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by stored vectors (and int8 scales)."""
+        if self._data is None:
+            return 0
+        return self._data.nbytes + (self._scales.nbytes if self._scales is not None else 0)
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        data, scales = quantize(vectors, self.dtype)
+        self.ids.extend(ids)
+        if self._data is None:
+            self._data, self._scales = data, scales
+            return
+        self._data = np.concatenate([self._data, data])
+        if scales is not None:
+            self._scales = np.concatenate([self._scales, scales])
+
+    def _coarse_scores(self, query: np.ndarray) -> np.ndarray:
+        if self.dtype == "int8":
+            # Integer dot products, rescaled per row; ranking only needs relative order
+            q_data, q_scale = quantize(query, "int8")
+            dots = self._data.astype(np.int32) @ q_data[0].astype(np.int32)
+            return dots.astype(np.float32) * self._scales * q_scale[0]
+        return (self._data @ query.astype(self._data.dtype)).astype(np.float32)
+
+    def search(self, query: np.ndarray, top_k: int = 3) -> List[Tuple[str, float]]:
+        if self._data is None or top_k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).ravel()
+
+        shortlist_size = min(len(self.ids), top_k * self.rerank_factor)
+        coarse = self._coarse_scores(query)
+        shortlist = np.argpartition(-coarse, shortlist_size - 1)[:shortlist_size]
+
+        scales = self._scales[shortlist] if self._scales is not None else None
+        exact = cosine_scores(query, dequantize(self._data[shortlist], scales))
+        order = np.argsort(-exact)[:top_k]
+        return [(self.ids[shortlist[i]], float(exact[i])) for i in order]
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of text -> embedding stored at reduced precision."""
+
+    def __init__(self, max_entries: int = 1024, dtype: str = "float32") -> None:
+        self.max_entries = max(0, max_entries)
+        self.dtype = _check_dtype(dtype)
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: Iterable[str]) -> Dict[int, np.ndarray]:
+        """Return {position: float32 vector} for cached texts."""
+        found: Dict[int, np.ndarray] = {}
+        if not self.max_entries:
+            return found
+        with self._lock:
+            for idx, text in enumerate(texts):
+                key = self._key(text)
+                entry = self._entries.get(key)
+                if entry is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                data, scale = entry
+                found[idx] = dequantize(data[None, :], None if scale is None else np.array([scale]))[0]
+        return found
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        if not self.max_entries or not len(texts):
+            return
+        data, scales = quantize(vectors, self.dtype)
+        with self._lock:
+            for idx, text in enumerate(texts):
+                key = self._key(text)
+                # copy() so an evicted row doesn't pin the whole batch array
+                self._entries[key] = (data[idx].copy(), None if scales is None else float(scales[idx]))
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(data.nbytes for data, _ in self._entries.values())
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "dtype": self.dtype,
+        }
@@ -0,0 +1,174 @@
+"""Per-guild result cache for rag/handler.query.
+
+Community members ask the same questions over and over; each one otherwise
+pays for an embedding plus a vector search. Results are cached in a bounded
+LRU keyed by (guild_id, normalized query, filters, top_k).
+
+Invalidation is generation based: every cached entry records the generation
+of the scope it was computed in, and ``ingest``/``delete_documents`` bump
+that generation, so stale entries are simply never matched again and age out
+of the LRU. Callers read the generation before computing a result and pass it
+to ``put``; a result computed while a write landed is not stored. Scopes:
+
+    guild G        -> bumped by writes to guild G
+    all guilds     -> bumped by every write (unscoped queries see everything)
+    epoch          -> bumped by writes whose guild is unknown (e.g. delete by
+                      document_type), invalidating every entry
+
+Generations are per process; RAG_QUERY_CACHE_TTL bounds how long another
+worker's writes can go unseen.
+
+Configuration (env):
+    RAG_QUERY_CACHE_SIZE   max entries (default 512, 0 disables)
+    RAG_QUERY_CACHE_TTL    seconds an entry stays valid (default 600)
+"""
+
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+_ALL_GUILDS = "__all__"
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Case/whitespace/trailing-punctuation insensitive form of a query."""
+    return _WHITESPACE.sub(" ", text.strip().lower()).rstrip("?!. ")
+
+
+class RAGQueryCache:
+    """Thread-safe LRU of query results with per-guild generation counters."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 600.0) -> None:
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[int, int], float, float, Dict[str, Any]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _scope(self, guild_id: Optional[str]) -> str:
+        return str(guild_id) if guild_id else _ALL_GUILDS
+
+    def _generation(self, guild_id: Optional[str]) -> Tuple[int, int]:
+        return (self._epoch, self._generations.get(self._scope(guild_id), 0))
+
+    def generation(self, guild_id: Optional[str]) -> Tuple[int, int]:
+        """Current generation of a guild's scope; read before computing a result for put()."""
+        with self._lock:
+            return self._generation(guild_id)
+
+    @staticmethod
+    def make_key(
+        text: str,
+        guild_id: Optional[str],
+        document_type: Optional[str],
+        scope: Optional[str],
+        top_k: int,
+    ) -> Hashable:
+        return (str(guild_id) if guild_id else None, normalize_query(text), document_type, scope, top_k)
+
+    def get(self, key: Hashable, guild_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None on miss/stale/expired."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generation, stored_at, latency_ms, result = entry
+                fresh = time.monotonic() - stored_at <= self.ttl_seconds
+                if fresh and generation == self._generation(guild_id):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.saved_ms += latency_ms
+                    return copy.deepcopy(result)
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        key: Hashable,
+        guild_id: Optional[str],
+        result: Dict[str, Any],
+        latency_ms: float,
+        generation: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """Cache a result along with how long it took to compute.
+
+        generation is the value of generation() before the result was
+        computed (default: current). If a write has bumped it since, the
+        result may predate the write and is dropped.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            current = self._generation(guild_id)
+            if generation is not None and generation != current:
+                return
+            self._entries[key] = (current, time.monotonic(), latency_ms, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, guild_id: Optional[str] = None, all_guilds: bool = False) -> None:
+        """Bump generations after a write.
+
+        guild_id set: that guild's entries and unscoped entries go stale.
+        guild_id None: only unscoped entries go stale, unless all_guilds is
+        set (write touched unknown guilds), which invalidates everything.
+        """
+        with self._lock:
+            if all_guilds:
+                self._epoch += 1
+                return
+            if guild_id:
+                scope = self._scope(guild_id)
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+            self._generations[_ALL_GUILDS] = self._generations.get(_ALL_GUILDS, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            self.saved_ms = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "saved_latency_ms": round(self.saved_ms, 1),
+            }
+
+
+_query_cache: Optional[RAGQueryCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> RAGQueryCache:
+    """Process-wide query cache (configured from env on first use)."""
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = RAGQueryCache(
+                    max_entries=int(os.getenv("RAG_QUERY_CACHE_SIZE", "512")),
+                    ttl_seconds=float(os.getenv("RAG_QUERY_CACHE_TTL", "600")),
+                )
+    return _query_cache
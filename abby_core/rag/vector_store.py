@@ -0,0 +1,108 @@
+"""Vector store interface and backend selection for RAG.
+
+The handler talks to a ``VectorStore`` instead of a concrete client so the
+single-file Chroma store can be swapped for Qdrant once the corpus outgrows it.
+
+Backend is chosen by ``VECTOR_STORE``:
+    chroma (default)  -> ChromaClient (CHROMA_PERSIST_DIR)
+    qdrant            -> QdrantVectorStore (QDRANT_URL / QDRANT_HOST / QDRANT_PATH)
+
+Query results use Chroma's nested-list shape for every backend:
+    {"ids": [[...]], "documents": [[...]], "metadatas": [[...]], "distances": [[...]]}
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+DEFAULT_COLLECTION = "abby_rag"
+
+# Metadata fields the handler filters on; backends index these where supported.
+FILTER_FIELDS = ("guild_id", "document_type", "scope")
+
+
+class VectorStoreUnavailable(RuntimeError):
+    """Raised when the configured vector store backend cannot be used."""
+
+
+class VectorStore(ABC):
+    """Contract for RAG vector store backends."""
+
+    provider: str = "unknown"
+    collection_name: str = DEFAULT_COLLECTION
+
+    @abstractmethod
+    def add(self, ids: List[str], embeddings: List[List[float]], metadatas: List[Dict[str, Any]], documents: List[str]) -> None:
+        """Insert new vectors."""
+
+    @abstractmethod
+    def upsert(self, ids: List[str], embeddings: List[List[float]], metadatas: List[Dict[str, Any]], documents: List[str]) -> None:
+        """Insert or overwrite vectors by id."""
+
+    @abstractmethod
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 3,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Nearest-neighbour search with optional equality filters on metadata."""
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Delete vectors by id (missing ids are ignored)."""
+
+    @abstractmethod
+    def count(self, where: Optional[Dict[str, Any]] = None) -> int:
+        """Count vectors, optionally matching equality filters."""
+
+    @abstractmethod
+    def iter_ids(self, page_size: int = 500, where: Optional[Dict[str, Any]] = None) -> Iterator[List[str]]:
+        """Yield pages of vector ids without loading embeddings or documents."""
+
+    @abstractmethod
+    def get_checksums(self, ids: List[str]) -> Dict[str, Optional[str]]:
+        """Map each stored id to its content_checksum metadata (None if unstamped)."""
+
+
+_stores: Dict[Tuple[str, str], VectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_vector_store(collection_name: str = DEFAULT_COLLECTION) -> VectorStore:
+    """Return the vector store selected by VECTOR_STORE.
+
+    Stores are shared per (backend, collection): reconnecting on every call
+    is wasted work, and Qdrant's in-process modes need a single client (an
+    in-memory store would lose its data, a path store is lock-exclusive).
+    """
+    backend = os.getenv("VECTOR_STORE", "chroma").strip().lower()
+    key = (backend, collection_name)
+
+    with _stores_lock:
+        if key in _stores:
+            return _stores[key]
+
+        if backend == "chroma":
+            from abby_core.rag.chroma_client import ChromaClient
+
+            store: VectorStore = ChromaClient(collection_name=collection_name)
+        elif backend == "qdrant":
+            from abby_core.rag.qdrant_client import QdrantVectorStore
+
+            store = QdrantVectorStore(collection_name=collection_name)
+        else:
+            raise VectorStoreUnavailable(
+                f"Unknown VECTOR_STORE '{backend}' (expected 'chroma' or 'qdrant')"
+            )
+
+        _stores[key] = store
+        return store
+
+
+def reset_vector_stores() -> None:
+    """Drop shared store instances (tests, benchmarks, config reloads)."""
+    with _stores_lock:
+        _stores.clear()
@@ -0,0 +1,127 @@
+"""Sliding-window burst limiter backed by per-session ring buffers.
+
+The burst gate used to scan the session's whole interactions array on every
+message, so its cost grew with session length and it needed the array
+loaded. BurstLimiter keeps, per session, a ring buffer of the last
+max_messages message times:
+
+    record_exchange   record(session_id, times)   ring.append(t)
+    usage gate        check(session_id, ...)      limit hit iff the ring is
+                                                  full and its oldest entry
+                                                  is inside the window
+
+Both are O(1) regardless of session length. The ring is sized from the
+guild's usage_limits.burst.max_messages and resized when the setting
+changes. A session the limiter has not seen (first check in this process,
+after a restart or LRU eviction) is seeded once from the session's recent
+message times, so the durable interactions remain the persistence layer.
+
+Configuration (env):
+    BURST_LIMITER_MAX_SESSIONS   ring buffers kept in memory (default 10000)
+"""
+
+import os
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, Iterable, Optional
+
+from abby_core.observability.logging import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BurstLimiter:
+    """LRU of per-session ring buffers of message times."""
+
+    def __init__(self, max_sessions: Optional[int] = None):
+        self.max_sessions = (
+            int(os.getenv("BURST_LIMITER_MAX_SESSIONS", "10000")) if max_sessions is None else max_sessions
+        )
+        self._rings: "OrderedDict[str, Deque[datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"checks": 0, "seeded": 0, "hits": 0, "evictions": 0}
+
+    def _ring(self, session_id: str, size: int) -> Optional[Deque[datetime]]:
+        """Existing ring for a session, resized to `size` (caller holds the lock)."""
+        ring = self._rings.get(session_id)
+        if ring is None:
+            return None
+        if ring.maxlen != size:
+            ring = deque(ring, maxlen=size)
+            self._rings[session_id] = ring
+        self._rings.move_to_end(session_id)
+        return ring
+
+    def _store(self, session_id: str, ring: Deque[datetime]) -> None:
+        self._rings[session_id] = ring
+        self._rings.move_to_end(session_id)
+        while len(self._rings) > self.max_sessions:
+            self._rings.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def check(
+        self,
+        session_id: str,
+        max_messages: int,
+        window_seconds: float,
+        now: datetime,
+        seed: Callable[[], Iterable[datetime]] = lambda: (),
+    ) -> Optional[int]:
+        """Messages in the window if the burst limit is hit, else None.
+
+        `seed` supplies the session's recent message times (oldest first) and
+        is only called for a session this limiter has not seen yet.
+        """
+        size = max(int(max_messages), 1)
+        with self._lock:
+            self._stats["checks"] += 1
+            ring = self._ring(session_id, size)
+        if ring is None:
+            # Seed outside the lock; it may parse timestamps from the session
+            seeded = deque(sorted(seed()), maxlen=size)
+            with self._lock:
+                ring = self._ring(session_id, size)
+                if ring is None:
+                    ring = seeded
+                    self._store(session_id, ring)
+                    self._stats["seeded"] += 1
+
+        with self._lock:
+            if len(ring) < size or ring[0] <= now - timedelta(seconds=window_seconds):
+                return None
+            self._stats["hits"] += 1
+            return len(ring)
+
+    def record(self, session_id: str, timestamps: Iterable[datetime]) -> None:
+        """Add message times for a session the limiter is tracking."""
+        with self._lock:
+            ring = self._rings.get(session_id)
+            if ring is not None:
+                ring.extend(timestamps)
+
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            self._rings.pop(session_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rings.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "sessions": len(self._rings)}
+
+
+_limiter: Optional[BurstLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_burst_limiter() -> BurstLimiter:
+    """Get the process-wide burst limiter."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = BurstLimiter()
+    return _limiter
@@ -49,6 +49,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
 
 from abby_core.database.mongodb import get_database
+from abby_core.database.collections.chat_session_interactions import INTERACTIONS_LAYOUT
 from abby_core.observability.logging import logging
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,7 @@ class ConversationAnalyticsService:
     def __init__(self):
         """Initialize the analytics service."""
         self.sessions_collection_name = "chat_sessions"
+        self.interactions_collection_name = "chat_session_interactions"
 
     def _get_sessions_collection(self):
         """Get the sessions collection."""
@@ -256,48 +258,41 @@ class ConversationAnalyticsService:
             # }
         """
         try:
-            collection = self._get_sessions_collection()
-            
-            # Build aggregation: unwind interactions, group by intent
-            pipeline = []
+            db = get_database()
             
-            # Filter by guild if provided
+            # Bucketed history: skip whole buckets that ended before `since`
+            bucket_match: Dict[str, Any] = {}
             if guild_id:
-                pipeline.append({"$match": {"guild_id": guild_id}})
-            
-            # Unwind interactions array
-            pipeline.append({"$unwind": "$interactions"})
-            
-            # Filter by timestamp if provided
+                bucket_match["guild_id"] = str(guild_id)
             if since:
-                pipeline.append({
-                    "$match": {
-                        "interactions.timestamp": {"$gte": since}
-                    }
-                })
+                bucket_match["last_at"] = {"$gte": since}
             
-            # Group by intent and count
-            pipeline.append({
-                "$group": {
-                    "_id": "$interactions.intent",
-                    "count": {"$sum": 1}
-                }
-            })
-            
-            # Sort by count descending
-            pipeline.append({
-                "$sort": {"count": -1}
-            })
+            # Sessions not migrated yet still carry their full interactions array
+            legacy_match: Dict[str, Any] = {"interactions_layout": {"$ne": INTERACTIONS_LAYOUT}}
+            if guild_id:
+                legacy_match["guild_id"] = guild_id
             
-            # Execute
-            results = list(collection.aggregate(pipeline))
+            results: List[Dict[str, Any]] = []
+            for collection, match, field in (
+                (db[self.interactions_collection_name], bucket_match, "messages"),
+                (self._get_sessions_collection(), legacy_match, "interactions"),
+            ):
+                pipeline: List[Dict[str, Any]] = [{"$match": match}, {"$unwind": f"${field}"}]
+                
+                # Filter by timestamp if provided
+                if since:
+                    pipeline.append({"$match": {f"{field}.timestamp": {"$gte": since}}})
+                
+                # Group by intent and count
+                pipeline.append({"$group": {"_id": f"${field}.intent", "count": {"$sum": 1}}})
+                results.extend(collection.aggregate(pipeline))
             
-            # Format results
-            intent_dist = {}
+            # Format results, most frequent first
+            intent_dist: Dict[str, int] = {}
             for result in results:
                 intent = result.get("_id") or "unknown"
-                count = result.get("count", 0)
-                intent_dist[intent] = count
+                intent_dist[intent] = intent_dist.get(intent, 0) + result.get("count", 0)
+            intent_dist = dict(sorted(intent_dist.items(), key=lambda item: -item[1]))
             
             logger.debug(
                 f"[📊 analytics] INTENT_DISTRIBUTION "
@@ -29,6 +29,17 @@ from abby_core.database.mongodb import (
     get_sessions_collection,
 )
 from abby_core.database import session_repository
+from abby_core.database.collections.chat_sessions import RELEASED_LEASE, SESSION_MAX_AGE_SECONDS
+from abby_core.database.collections.chat_session_interactions import (
+    INTERACTIONS_LAYOUT,
+    RECENT_INTERACTIONS,
+    append_exchange,
+    bucket_session,
+    get_interaction_page,
+    split_exchanges,
+)
+from abby_core.services.burst_limiter import get_burst_limiter
+from abby_core.services.session_state_cache import get_session_state_cache
 
 try:
     from tdos_intelligence.observability import logging as tdos_logging  # type: ignore
@@ -117,6 +128,9 @@ class ConversationService:
                 "session_id": session_id,
                 "channel_id": channel_id_str,
                 "interactions": [],
+                "interactions_layout": INTERACTIONS_LAYOUT,
+                "exchange_count": 0,
+                "message_count": 0,
                 "summary": None,
                 "status": "active",
                 "state": ConversationState.ACTIVE.value,
@@ -124,6 +138,7 @@ class ConversationService:
                 "last_message_at": None,
                 "cooldown_until": None,
                 "created_at": now,
+                "expires_at": now + timedelta(seconds=SESSION_MAX_AGE_SECONDS),
                 "closed_at": None,
             }
             
@@ -191,6 +206,9 @@ class ConversationService:
     ) -> Tuple[Dict[str, Any], None] | Tuple[None, str]:
         """Get the active conversation session for a user.
         
+        Sessions leased by this process are served from the session state
+        cache; otherwise the session is read and the lease claimed.
+        
         Args:
             user_id: User identifier
             guild_id: Optional guild filter
@@ -203,7 +221,12 @@ class ConversationService:
             user_id = str(user_id)
             guild_id_str = str(guild_id) if guild_id is not None else None
             
-            session = session_repository.get_active_session(user_id, guild_id_str)
+            cache = get_session_state_cache()
+            session = cache.lookup(user_id, guild_id_str)
+            if session is None:
+                session = session_repository.get_active_session(user_id, guild_id_str)
+                if session:
+                    cache.claim(session)
             
             if not session:
                 return None, "No active session found"
@@ -247,6 +270,8 @@ class ConversationService:
                 "state": ConversationState.CLOSED.value,
                 "status": reason,
                 "closed_at": now,
+                "expires_at": now,  # Retention countdown (TTL) starts at close
+                **RELEASED_LEASE,
             }
             
             if summary:
@@ -256,6 +281,8 @@ class ConversationService:
                 {"session_id": session_id, "user_id": user_id_str},
                 {"$set": update_doc}
             )
+            get_session_state_cache().forget(session_id, reason=reason)
+            get_burst_limiter().forget(session_id)
             
             if result.matched_count == 0:
                 return None, f"Session {session_id} not found for user {user_id_str}"
@@ -283,7 +310,9 @@ class ConversationService:
     ) -> Tuple[bool, None] | Tuple[None, str]:
         """Record a user/assistant exchange in the session.
         
-        Directly appends messages to MongoDB without legacy helpers.
+        The session keeps exchange/message counters and the last
+        RECENT_INTERACTIONS messages; the exchange itself is appended to its
+        bucket in chat_session_interactions.
         
         Args:
             user_id: User identifier
@@ -316,14 +345,36 @@ class ConversationService:
                     "timestamp": now,
                 })
             
-            # Append all messages in single operation
-            result = collection.update_one(
-                {"session_id": session_id, "user_id": user_id_str},
-                {"$push": {"interactions": {"$each": messages}}}
-            )
-            
-            if result.matched_count == 0:
-                return None, f"Session {session_id} not found for user {user_id_str}"
+            # Counters + recent tail on the session; full history goes to buckets
+            query = {
+                "session_id": session_id,
+                "user_id": user_id_str,
+                "interactions_layout": INTERACTIONS_LAYOUT,
+            }
+            update = {
+                "$push": {"interactions": {"$each": messages, "$slice": -RECENT_INTERACTIONS}},
+                "$inc": {"exchange_count": 1, "message_count": len(messages)},
+            }
+            projection = {"session_id": 1, "user_id": 1, "guild_id": 1, "created_at": 1, "exchange_count": 1}
+            session = collection.find_one_and_update(query, update, projection, return_document=True)
+            
+            for _ in range(3):
+                if session is not None:
+                    break
+                # Session written before bucketing: move its history once, then append
+                legacy = collection.find_one({"session_id": session_id, "user_id": user_id_str})
+                if legacy is None:
+                    return None, f"Session {session_id} not found for user {user_id_str}"
+                if legacy.get("interactions_layout") != INTERACTIONS_LAYOUT:
+                    bucket_session(legacy)
+                session = collection.find_one_and_update(query, update, projection, return_document=True)
+            if session is None:
+                return None, f"Session {session_id} changed while recording exchange"
+            
+            append_exchange(session, session["exchange_count"] - 1, messages)
+            timestamps = [m["timestamp"] for m in messages]
+            get_session_state_cache().record_messages(session_id, timestamps)
+            get_burst_limiter().record(session_id, timestamps)
             
             logger.debug(
                 "exchange_recorded",
@@ -335,6 +386,50 @@ class ConversationService:
             logger.error(f"[❌] Failed to record exchange: {e}")
             return None, f"Failed to record exchange: {str(e)}"
 
+    def save_running_summary(
+        self,
+        user_id: int | str,
+        session_id: str,
+        summary: str,
+        compacted_turns: int,
+    ) -> Tuple[bool, None] | Tuple[None, str]:
+        """Store the rolling summary of a long session's oldest turns.
+        
+        Written by the history compactor (llm/history_compaction.py) each time
+        it folds turns that fell out of the recent window into the summary.
+        
+        Args:
+            user_id: User identifier
+            session_id: Session identifier
+            summary: Running summary covering the first compacted_turns exchanges
+            compacted_turns: Number of exchanges the summary covers
+        
+        Returns:
+            (True, None) on success
+            (None, error_message) on failure
+        """
+        try:
+            user_id_str = str(user_id)
+            collection = get_sessions_collection()
+            
+            result = collection.update_one(
+                {"session_id": session_id, "user_id": user_id_str},
+                {"$set": {
+                    "running_summary": summary,
+                    "compacted_turns": compacted_turns,
+                    "running_summary_updated_at": datetime.now(timezone.utc),
+                }}
+            )
+            
+            if result.matched_count == 0:
+                return None, f"Session {session_id} not found for user {user_id_str}"
+            
+            return True, None
+
+        except Exception as e:
+            logger.error(f"[❌] Failed to save running summary: {e}")
+            return None, f"Failed to save running summary: {str(e)}"
+
     # ════════════════════════════════════════════════════════════════════════════════
     # SESSION EXPIRATION & CLEANUP
     # ════════════════════════════════════════════════════════════════════════════════
@@ -369,6 +464,7 @@ class ConversationService:
                 filter_doc["guild_id"] = str(guild_id)
             
             now = datetime.now(timezone.utc)
+            get_session_state_cache().forget_user(user_id, guild_id)
             result = collection.update_many(
                 filter_doc,
                 {
@@ -376,6 +472,8 @@ class ConversationService:
                         "status": "expired",
                         "state": ConversationState.EXPIRED.value,
                         "closed_at": now,
+                        "expires_at": now,
+                        **RELEASED_LEASE,
                     }
                 },
             )
@@ -394,49 +492,75 @@ class ConversationService:
             logger.error(f"[❌] Failed to expire sessions: {e}")
             return None, f"Failed to expire sessions: {str(e)}"
 
-    def expire_old_sessions(
+    async def finalize_expiring_sessions(
         self,
-        max_age_hours: int = 24,
+        *,
+        lead_seconds: float = 60,
+        limit: int = 50,
+        summarize: bool = True,
     ) -> Tuple[int, None] | Tuple[None, str]:
-        """Clean up sessions older than max_age_hours that are still open.
+        """Finalize sessions whose expires_at is (nearly) reached.
+        
+        Pops sessions off the expiry queue (session_repository.claim_expiring_session),
+        writes a summary for sessions that have none, and marks them expired.
+        The TTL index on expires_at deletes them after the retention period,
+        so no collection scan is ever needed. Run by the session_expiry job.
         
         Args:
-            max_age_hours: Sessions older than this are marked expired (default 24h)
+            lead_seconds: Finalize sessions expiring within this many seconds
+            limit: Maximum sessions finalized per call
+            summarize: Generate a summary from the recent exchanges
         
         Returns:
-            (count_expired, None) - number of sessions marked as expired
+            (count_finalized, None) on success
             (None, error_message) on failure
         """
         try:
             collection = get_sessions_collection()
-            now = datetime.now(timezone.utc)
-            cutoff = now - timedelta(hours=max_age_hours)
-            
-            result = collection.update_many(
-                {
-                    "status": {"$in": ["active", "open"]},
-                    "created_at": {"$lt": cutoff}
-                },
-                {
-                    "$set": {
-                        "status": "expired",
-                        "state": ConversationState.EXPIRED.value,
-                        "closed_at": now,
-                    }
-                },
-            )
-            
-            if result.modified_count:
-                logger.info(
-                    "old_sessions_expired",
-                    extra={"count": result.modified_count, "max_age_hours": max_age_hours}
-                )
-            
-            return result.modified_count, None
+            horizon = datetime.now(timezone.utc) + timedelta(seconds=lead_seconds)
+            finalized = 0
+            
+            while finalized < limit:
+                session = session_repository.claim_expiring_session(horizon)
+                if session is None:
+                    break
+                session_id = session["session_id"]
+                get_session_state_cache().forget(session_id, reason="expired")
+                get_burst_limiter().forget(session_id)
+                
+                update_doc: Dict[str, Any] = {
+                    "status": "expired",
+                    "state": ConversationState.EXPIRED.value,
+                    "closed_at": datetime.now(timezone.utc),
+                }
+                if summarize and not session.get("summary") and session.get("interactions"):
+                    # Older turns are already folded into the running summary
+                    history = [
+                        {
+                            "input": " ".join(m.get("content", "") for m in exchange if m.get("role") == "user"),
+                            "response": " ".join(m.get("content", "") for m in exchange if m.get("role") == "assistant"),
+                        }
+                        for exchange in split_exchanges(session["interactions"])
+                    ]
+                    if session.get("running_summary"):
+                        history.insert(0, {"input": "Earlier in this conversation", "response": session["running_summary"]})
+                    summary, error = await self.generate_summary(history)
+                    if summary:
+                        update_doc["summary"] = summary
+                    else:
+                        logger.warning(f"[session_expiry] No summary for {session_id[:8]}...: {error}")
+                
+                # expires_at is kept: the TTL index deletes the session after retention
+                collection.update_one({"session_id": session_id, "status": "expiring"}, {"$set": update_doc})
+                finalized += 1
+            
+            if finalized:
+                logger.info("sessions_finalized", extra={"count": finalized})
+            return finalized, None
 
         except Exception as e:
-            logger.error(f"[❌] Failed to expire old sessions: {e}")
-            return None, f"Failed to expire old sessions: {str(e)}"
+            logger.error(f"[❌] Failed to finalize expiring sessions: {e}")
+            return None, f"Failed to finalize expiring sessions: {str(e)}"
 
     # ════════════════════════════════════════════════════════════════════════════════
     # TURN TRACKING & COOLDOWN
@@ -467,10 +591,12 @@ class ConversationService:
                 },
                 {
                     "$inc": {"turn_count": 1},
-                    "$set": {"last_message_at": datetime.now(timezone.utc)}
+                    # Revokes any lease so the owner stops trusting its cached count
+                    "$set": {"last_message_at": datetime.now(timezone.utc), "lease_owner": None}
                 },
                 return_document=True
             )
+            get_session_state_cache().forget(session_id, reason="turn_count_written")
             
             if not result:
                 return None, f"Session {session_id} not found"
@@ -519,6 +645,7 @@ class ConversationService:
             
             if result.matched_count == 0:
                 return None, f"Session {session_id} not found"
+            get_session_state_cache().set_cooldown(session_id, cooldown_until)
             
             logger.debug(
                 "cooldown_set",
@@ -551,8 +678,9 @@ class ConversationService:
                 - active_sessions: Currently active sessions
                 - closed_sessions: Closed/completed sessions
                 - expired_sessions: Expired sessions
-                - total_exchanges: Total messages recorded
-                - avg_session_length: Average session duration
+                - total_exchanges: Total turns taken
+                - total_messages: Total messages recorded
+                - avg_session_length: Average turns per session
             (None, error_message) on failure
         """
         try:
@@ -563,23 +691,31 @@ class ConversationService:
             if guild_id is not None:
                 filter_doc["guild_id"] = str(guild_id)
             
-            # Count by status
-            total = collection.count_documents(filter_doc)
-            active = collection.count_documents({**filter_doc, "status": "active"})
-            closed = collection.count_documents({**filter_doc, "status": "completed"})
-            expired = collection.count_documents({**filter_doc, "status": "expired"})
+            # One grouped pass over counters; history buckets are never loaded
+            pipeline = [
+                {"$match": filter_doc},
+                {"$group": {
+                    "_id": "$status",
+                    "sessions": {"$sum": 1},
+                    "turns": {"$sum": {"$ifNull": ["$turn_count", 0]}},
+                    "messages": {"$sum": {"$ifNull": [
+                        "$message_count", {"$size": {"$ifNull": ["$interactions", []]}}
+                    ]}},
+                }},
+            ]
+            by_status = {row["_id"]: row for row in collection.aggregate(pipeline)}
             
-            # Approximate total exchanges (rough average)
-            sessions = list(collection.find(filter_doc, {"turn_count": 1}))
-            total_exchanges = sum(s.get("turn_count", 0) for s in sessions) if sessions else 0
-            avg_session_length = total_exchanges / len(sessions) if sessions else 0
+            total = sum(row["sessions"] for row in by_status.values())
+            total_exchanges = sum(row["turns"] for row in by_status.values())
+            avg_session_length = total_exchanges / total if total else 0
             
             stats = {
                 "total_sessions": total,
-                "active_sessions": active,
-                "closed_sessions": closed,
-                "expired_sessions": expired,
+                "active_sessions": by_status.get("active", {}).get("sessions", 0),
+                "closed_sessions": by_status.get("completed", {}).get("sessions", 0),
+                "expired_sessions": by_status.get("expired", {}).get("sessions", 0),
                 "total_exchanges": total_exchanges,
+                "total_messages": sum(row["messages"] for row in by_status.values()),
                 "avg_session_length": round(avg_session_length, 2),
             }
             
@@ -635,6 +771,45 @@ class ConversationService:
             logger.error(f"[❌] Failed to list sessions: {e}")
             return None, f"Failed to list sessions: {str(e)}"
 
+    def get_session_history(
+        self,
+        user_id: int | str,
+        session_id: str,
+        page: int = 0,
+    ) -> Tuple[Tuple[List[Dict[str, Any]], Optional[int]], None] | Tuple[None, str]:
+        """Read one page of a session's full history.
+
+        Pages are interaction buckets (INTERACTIONS_PER_BUCKET exchanges each),
+        so reading a long session never loads more than one bucket at a time.
+
+        Args:
+            user_id: User identifier
+            session_id: Session identifier
+            page: 0-based page (bucket) number
+
+        Returns:
+            ((messages, next_page), None) on success; next_page is None on the last page
+            (None, error_message) on failure
+        """
+        try:
+            collection = get_sessions_collection()
+            session = collection.find_one(
+                {"session_id": session_id, "user_id": str(user_id)},
+                {"interactions_layout": 1, "interactions": 1},
+            )
+            if not session:
+                return None, f"Session {session_id} not found"
+
+            if session.get("interactions_layout") != INTERACTIONS_LAYOUT:
+                # Not migrated yet: the whole history is still on the session
+                return ((session.get("interactions") or []) if page == 0 else [], None), None
+
+            return get_interaction_page(session_id, page), None
+
+        except Exception as e:
+            logger.error(f"[❌] Failed to read session history: {e}")
+            return None, f"Failed to read session history: {str(e)}"
+
     # ════════════════════════════════════════════════════════════════════════════════
     # LLM CONVERSATION GENERATION
     # ════════════════════════════════════════════════════════════════════════════════
@@ -16,14 +16,37 @@ Part of Phase 2 architectural improvements.
 - Performance monitoring
 - Debugging assistance (full request/response logs)
 - Capacity planning for long-term scaling
+
+**Write path:**
+log_generation is called on every LLM reply, so records are not inserted
+inline. They go to a bounded in-process queue drained by a background
+writer that batches them into ``insert_many`` every AUDIT_BATCH_SIZE
+records or AUDIT_FLUSH_INTERVAL_MS, whichever comes first. When Mongo is
+unavailable (or the queue is full) records are spilled to a local JSONL
+file and replayed after the next successful write. The unique audit_id
+index makes replays idempotent. The buffer is flushed on shutdown.
+
+Configuration (env):
+    AUDIT_BUFFERED_WRITES     false writes inline, as before (default true)
+    AUDIT_BATCH_SIZE          records per insert_many (default 50)
+    AUDIT_FLUSH_INTERVAL_MS   max time a record waits in the queue (default 1000)
+    AUDIT_QUEUE_SIZE          queued records before spilling (default 10000)
+    AUDIT_SPILL_PATH          JSONL spill file (default shared/logs/generation_audit_spill.jsonl)
 """
 
 from __future__ import annotations
 
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime, timezone
 from dataclasses import dataclass, asdict
+from pathlib import Path
+import atexit
+import json
 import logging
+import os
+import queue
+import threading
+import time
 
 from abby_core.database.mongodb import get_database
 
@@ -90,6 +113,252 @@ class GenerationAuditRecord:
         return asdict(self)
 
 
+# Mongo duplicate-key error: the record was already stored (replayed spill)
+_DUPLICATE_KEY_ERROR = 11000
+
+
+class AuditWriteBuffer:
+    """Bounded queue of audit documents drained in batches by a daemon thread.
+
+    ``write_batch`` receives a list of documents and must raise on failure.
+    Failed batches and overflow go to the JSONL spill file, so the only
+    records ever lost are ones that could not be spilled either (counted
+    in ``dropped``).
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict[str, Any]]], None],
+        spill_path: Path,
+        batch_size: int = 50,
+        flush_interval_ms: float = 1000,
+        max_queue: int = 10000,
+    ) -> None:
+        self._write_batch = write_batch
+        self.spill_path = Path(spill_path)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval_ms) / 1000
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max(1, max_queue))
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flush_requested = threading.Event()
+        self._idle = threading.Condition()
+        self._in_flight = 0
+        self.written = 0
+        self.batches = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.dropped = 0
+        self.last_error: Optional[str] = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="generation-audit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, document: Dict[str, Any]) -> None:
+        """Queue one document; never blocks the caller."""
+        if self._stop.is_set():
+            # Shutting down: nothing will drain the queue any more
+            self._spill([document])
+            return
+        self._ensure_started()
+        try:
+            with self._idle:
+                self._queue.put_nowait(document)
+                self._in_flight += 1
+        except queue.Full:
+            self._spill([document])
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        try:
+            # Bounded idle wait so close() is noticed without a sentinel
+            batch = [self._queue.get(timeout=0.25)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._flush_requested.is_set():
+                # Interval elapsed or a flush is waiting: take what is queued
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    break
+            try:
+                # Short waits so a flush request is noticed promptly
+                batch.append(self._queue.get(timeout=min(remaining, 0.05)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if not batch:
+                continue
+            self._write(batch)
+            with self._idle:
+                self._in_flight -= len(batch)
+                self._idle.notify_all()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self._write_batch(batch)
+        except Exception as exc:
+            failed = self._failed_documents(batch, exc)
+            self.written += len(batch) - len(failed)
+            self.last_error = str(exc)
+            logger.warning(
+                f"[GenerationAudit] Batch write failed ({exc}); spilling {len(failed)} record(s)"
+            )
+            self._spill(failed)
+            return
+        self.written += len(batch)
+        self.batches += 1
+        self.last_error = None
+        try:
+            self._replay_spill()
+        except Exception as exc:
+            logger.warning(f"[GenerationAudit] Spill replay failed: {exc}")
+
+    @staticmethod
+    def _failed_documents(batch: List[Dict[str, Any]], exc: Exception) -> List[Dict[str, Any]]:
+        """Documents of a failed batch that still need storing."""
+        details = getattr(exc, "details", None)
+        write_errors = (details or {}).get("writeErrors") if isinstance(details, dict) else None
+        if write_errors is None:
+            return batch
+        # Unordered bulk insert: only the listed documents failed
+        return [
+            batch[error["index"]]
+            for error in write_errors
+            if error.get("code") != _DUPLICATE_KEY_ERROR
+        ]
+
+    def _spill(self, documents: List[Dict[str, Any]]) -> None:
+        if not documents:
+            return
+        try:
+            with self._spill_lock:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with self.spill_path.open("a", encoding="utf-8") as handle:
+                    for document in documents:
+                        document = {k: v for k, v in document.items() if k != "_id"}
+                        handle.write(json.dumps(document, default=_json_default) + "\n")
+            self.spilled += len(documents)
+        except Exception as exc:
+            self.dropped += len(documents)
+            logger.error(f"[GenerationAudit] Could not spill {len(documents)} record(s), dropped: {exc}")
+
+    def spill_backlog(self) -> int:
+        """Number of records waiting in the spill file."""
+        try:
+            with self._spill_lock, self.spill_path.open("r", encoding="utf-8") as handle:
+                return sum(1 for line in handle if line.strip())
+        except OSError:
+            return 0
+
+    def _replay_spill(self) -> None:
+        """Re-insert spilled records once Mongo accepts writes again."""
+        with self._spill_lock:
+            if not self.spill_path.exists():
+                return
+            claimed = self.spill_path.with_suffix(self.spill_path.suffix + ".replay")
+            self.spill_path.replace(claimed)
+        documents = []
+        with claimed.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    documents.append(_restore_timestamp(json.loads(line)))
+        claimed.unlink()
+        for start in range(0, len(documents), self.batch_size):
+            chunk = documents[start:start + self.batch_size]
+            try:
+                self._write_batch(chunk)
+            except Exception as exc:
+                failed = self._failed_documents(chunk, exc)
+                self.replayed += len(chunk) - len(failed)
+                self._spill(failed + documents[start + self.batch_size:])
+                return
+            self.replayed += len(chunk)
+        if documents:
+            logger.info(f"[GenerationAudit] Replayed {len(documents)} spilled record(s)")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued record has been written or spilled."""
+        deadline = time.monotonic() + timeout
+        self._flush_requested.set()
+        try:
+            with self._idle:
+                while self._in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self._thread is None or not self._thread.is_alive():
+                        return False
+                    self._idle.wait(remaining)
+            return True
+        finally:
+            self._flush_requested.clear()
+
+    @property
+    def closed(self) -> bool:
+        return self._stop.is_set()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush and stop the writer; anything left is spilled to disk."""
+        if self.closed:
+            return
+        flushed = self.flush(timeout)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        if not flushed:
+            leftovers = []
+            while True:
+                try:
+                    leftovers.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._spill(leftovers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backlog": self._queue.qsize(),
+            "spill_backlog": self.spill_backlog(),
+            "written": self.written,
+            "batches": self.batches,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "dropped": self.dropped,
+            "last_error": self.last_error,
+        }
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _restore_timestamp(document: Dict[str, Any]) -> Dict[str, Any]:
+    timestamp = document.get("timestamp")
+    if isinstance(timestamp, str):
+        try:
+            document["timestamp"] = datetime.fromisoformat(timestamp)
+        except ValueError:
+            pass
+    return document
+
+
+
 class GenerationAuditService:
     """Tracks LLM generation calls for cost analysis and observability.
     
@@ -97,15 +366,55 @@ class GenerationAuditService:
     Provides aggregation queries for cost projection and capacity planning.
     """
     
-    def __init__(self):
-        """Initialize generation audit service."""
+    def __init__(self, buffered: Optional[bool] = None):
+        """Initialize generation audit service.
+        
+        Args:
+            buffered: Queue records for the background batch writer instead of
+                inserting inline (default: AUDIT_BUFFERED_WRITES, true)
+        """
         self.collection_name = "generation_audit"
+        if buffered is None:
+            buffered = os.getenv("AUDIT_BUFFERED_WRITES", "true").lower() not in ("0", "false", "no")
+        self._buffer: Optional[AuditWriteBuffer] = None
+        if buffered:
+            self._buffer = AuditWriteBuffer(
+                write_batch=self._insert_batch,
+                spill_path=Path(os.getenv("AUDIT_SPILL_PATH", "shared/logs/generation_audit_spill.jsonl")),
+                batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "50")),
+                flush_interval_ms=float(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "1000")),
+                max_queue=int(os.getenv("AUDIT_QUEUE_SIZE", "10000")),
+            )
     
     def _get_collection(self):
         """Get MongoDB collection for audit records."""
         db = get_database()
         return db[self.collection_name]
     
+    def _insert_batch(self, documents: List[Dict[str, Any]]) -> None:
+        self._get_collection().insert_many(documents, ordered=False)
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until queued audit records are written (or spilled)."""
+        return self._buffer.flush(timeout) if self._buffer else True
+    
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Flush queued records and stop the background writer."""
+        if self._buffer and not self._buffer.closed:
+            self._buffer.close(timeout)
+            stats = self._buffer.stats()
+            logger.info(
+                f"[GenerationAudit] Writer stopped: written={stats['written']} "
+                f"spilled={stats['spilled']} dropped={stats['dropped']} "
+                f"spill_backlog={stats['spill_backlog']}"
+            )
+    
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Backlog, spill and drop counts for the audit write path."""
+        if not self._buffer:
+            return {"buffered": False}
+        return {"buffered": True, **self._buffer.stats()}
+    
     def _estimate_cost(
         self,
         provider: str,
@@ -210,10 +519,13 @@ class GenerationAuditService:
             error_message=error_message,
         )
         
-        # Store in MongoDB
+        # Store in MongoDB (batched off the reply path when buffered)
         try:
-            collection = self._get_collection()
-            collection.insert_one(record.to_dict())
+            if self._buffer:
+                self._buffer.submit(record.to_dict())
+            else:
+                collection = self._get_collection()
+                collection.insert_one(record.to_dict())
             
             logger.info(
                 f"[GenerationAudit] Logged generation: "
@@ -373,4 +685,6 @@ def get_generation_audit_service() -> GenerationAuditService:
     global _audit_service
     if _audit_service is None:
         _audit_service = GenerationAuditService()
+        # Last-chance flush if the process exits without a clean shutdown
+        atexit.register(_audit_service.shutdown)
     return _audit_service
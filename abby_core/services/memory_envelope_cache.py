@@ -0,0 +1,146 @@
+"""Per-user cache of TDOS memory envelopes for chat turns.
+
+Every chat turn used to call MemoryService.get_memory_envelope, which
+re-reads the user's profile from MongoDB even though the envelope only
+changes when memory is written. MemoryEnvelopeCache keeps recent envelopes
+in an LRU with a TTL, and every memory write bumps a per-user version:
+
+    memory extraction / privacy forget / operator maintenance
+        -> invalidate(user_id)        version[user] += 1, entries dropped
+
+An envelope loaded while a write was in progress is returned but not
+stored, so a stale read can never outlive the write that raced it. The TTL
+bounds staleness for writes made by other processes.
+
+Configuration (env):
+    MEMORY_ENVELOPE_CACHE_ENABLED        true | false (default true)
+    MEMORY_ENVELOPE_CACHE_SIZE           max cached envelopes (default 1024)
+    MEMORY_ENVELOPE_CACHE_TTL_SECONDS    max envelope age (default 300)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from abby_core.observability.logging import logging
+
+logger = logging.getLogger(__name__)
+
+EnvelopeKey = Tuple[str, Optional[str]]
+
+
+class MemoryEnvelopeCache:
+    """LRU + TTL cache of memory envelopes, invalidated by write versions."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.max_entries = (
+            int(os.getenv("MEMORY_ENVELOPE_CACHE_SIZE", "1024")) if max_entries is None else max_entries
+        )
+        self.ttl_seconds = (
+            float(os.getenv("MEMORY_ENVELOPE_CACHE_TTL_SECONDS", "300")) if ttl_seconds is None else ttl_seconds
+        )
+        self.enabled = (
+            os.getenv("MEMORY_ENVELOPE_CACHE_ENABLED", "true").lower() == "true" if enabled is None else enabled
+        )
+        # key -> (envelope, version at load, loaded_at)
+        self._entries: "OrderedDict[EnvelopeKey, Tuple[Any, Tuple[int, int], float]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        # Bumped by clear(); invalidates every user at once
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0, "raced": 0}
+
+    @staticmethod
+    def _key(user_id: Any, guild_id: Any) -> EnvelopeKey:
+        return str(user_id), str(guild_id) if guild_id else None
+
+    def _version(self, user_key: str) -> Tuple[int, int]:
+        return self._epoch, self._versions.get(user_key, 0)
+
+    def get_or_load(self, user_id: Any, guild_id: Any, load: Callable[[], Any]) -> Any:
+        """Cached envelope for (user, guild), or load() it and cache the result.
+
+        Errors raised by load() propagate and nothing is cached.
+        """
+        if not self.enabled:
+            return load()
+        key = self._key(user_id, guild_id)
+        now = time.monotonic()
+        with self._lock:
+            version = self._version(key[0])
+            entry = self._entries.get(key)
+            if entry is not None:
+                envelope, entry_version, loaded_at = entry
+                if entry_version == version and now - loaded_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return envelope
+                del self._entries[key]
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+
+        envelope = load()
+
+        with self._lock:
+            if self._version(key[0]) != version:
+                # Memory was written while we were reading; don't keep this copy
+                self._stats["raced"] += 1
+                return envelope
+            self._entries[key] = (envelope, version, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return envelope
+
+    def invalidate(self, user_id: Any, reason: str = "memory_write") -> int:
+        """Bump the user's memory version; drops their envelopes in every guild.
+
+        Returns the new version.
+        """
+        user_key = str(user_id)
+        with self._lock:
+            version = self._versions[user_key] = self._versions.get(user_key, 0) + 1
+            for key in [k for k in self._entries if k[0] == user_key]:
+                del self._entries[key]
+            self._stats["invalidations"] += 1
+        logger.debug(f"[memory_envelope_cache] Invalidated user {user_key} v{version} ({reason})")
+        return version
+
+    def clear(self, reason: str = "bulk_memory_write") -> None:
+        """Invalidate every user (e.g. after memory maintenance)."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+        logger.info(f"[memory_envelope_cache] Cleared all envelopes ({reason})")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache: Optional[MemoryEnvelopeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_memory_envelope_cache() -> MemoryEnvelopeCache:
+    """Get the process-wide memory envelope cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = MemoryEnvelopeCache()
+    return _cache
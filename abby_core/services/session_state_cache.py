@@ -0,0 +1,277 @@
+"""Write-through cache of gate state for conversation sessions owned by this process.
+
+A user's conversation loop runs in one bot process, yet every turn re-read
+the active session (get_active_session) and the usage gate re-read it again
+for burst checks. SessionStateCache keeps the fields the gate needs
+(turn_count, created_at, cooldown_until, recent message times) in memory for
+sessions this process has leased:
+
+    first turn    get_active_session -> claim(): atomic find_one_and_update
+                  sets lease_owner/lease_until on the session document
+    next turns    lookup() served from memory, no reads
+    turn boundary increment_turn(): one conditional update_one
+                  ($inc turn_count, renew lease) - durable before the LLM call
+    close/expire  forget() drops the entry
+
+Multi-process safety: writes from the cache are conditioned on
+status == "active" and lease_owner == this process, and the non-cached turn
+increment and every close/expire write clear lease_owner (RELEASED_LEASE).
+A session touched, closed or expired by another process therefore fails the
+next cached write; the entry is dropped and the caller falls back to the
+plain database path. Leases expire after SESSION_LEASE_SECONDS without a turn, so
+a crashed owner never blocks a session.
+
+Configuration (env):
+    SESSION_STATE_CACHE_ENABLED   true | false (default true)
+    SESSION_LEASE_SECONDS         lease length, renewed every turn (default 120)
+"""
+
+import os
+import socket
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from abby_core.observability.logging import logging
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process in lease_owner
+OWNER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Session fields served from memory
+GATE_FIELDS = (
+    "session_id", "user_id", "guild_id", "channel_id", "status", "state",
+    "turn_count", "created_at", "last_message_at", "cooldown_until",
+)
+
+# Message timestamps kept per session for burst checks
+RECENT_MESSAGES = 64
+
+# Leases this close to expiry are renewed through the database instead of trusted
+LEASE_MARGIN = timedelta(seconds=5)
+
+
+def _sessions_collection():
+    from abby_core.database.mongodb import get_sessions_collection
+
+    return get_sessions_collection()
+
+
+def _user_key(user_id: Any, guild_id: Any) -> Tuple[str, Optional[str]]:
+    return str(user_id), str(guild_id) if guild_id is not None else None
+
+
+class _Entry:
+    __slots__ = ("session", "lease_until", "recent", "lock")
+
+    def __init__(self, session: Dict[str, Any], lease_until: datetime, recent: Deque[Any]):
+        self.session = session
+        self.lease_until = lease_until
+        self.recent = recent
+        self.lock = threading.Lock()
+
+
+class SessionStateCache:
+    """Leased, write-through session gate state."""
+
+    def __init__(
+        self,
+        lease_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+        collection: Optional[Callable[[], Any]] = None,
+        owner_id: str = OWNER_ID,
+    ):
+        self.lease = timedelta(seconds=(
+            float(os.getenv("SESSION_LEASE_SECONDS", "120")) if lease_seconds is None else lease_seconds
+        ))
+        self.enabled = (
+            os.getenv("SESSION_STATE_CACHE_ENABLED", "true").lower() == "true" if enabled is None else enabled
+        )
+        self.owner_id = owner_id
+        self._collection = collection or _sessions_collection
+        self._entries: Dict[str, _Entry] = {}
+        self._by_user: Dict[Tuple[str, Optional[str]], str] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "claims": 0, "claim_conflicts": 0, "writes": 0, "lost_leases": 0}
+
+    # ── Reads ──────────────────────────────────────────────────────────────
+
+    def lookup(self, user_id: Any, guild_id: Any = None) -> Optional[Dict[str, Any]]:
+        """Active session for (user, guild) if this process holds its lease."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            session_id = self._by_user.get(_user_key(user_id, guild_id))
+            entry = self._entries.get(session_id) if session_id else None
+        if entry is None:
+            return None
+        if entry.lease_until - LEASE_MARGIN <= datetime.now(timezone.utc):
+            self.forget(entry.session["session_id"], reason="lease_expired")
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+        return self._view(entry)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Cached session by id (owned sessions only)."""
+        entry = self._entries.get(session_id) if self.enabled else None
+        return self._view(entry) if entry is not None else None
+
+    @staticmethod
+    def _view(entry: _Entry) -> Dict[str, Any]:
+        with entry.lock:
+            return {**entry.session, "recent_message_times": list(entry.recent)}
+
+    # ── Ownership ──────────────────────────────────────────────────────────
+
+    def claim(self, session: Dict[str, Any]) -> bool:
+        """Take the lease on a freshly loaded active session; False if another process holds it."""
+        session_id = session.get("session_id") if self.enabled else None
+        if not session_id:
+            return False
+        now = datetime.now(timezone.utc)
+        try:
+            doc = self._collection().find_one_and_update(
+                {
+                    "session_id": session_id,
+                    "status": "active",
+                    "$or": [
+                        {"lease_owner": None},
+                        {"lease_owner": self.owner_id},
+                        {"lease_until": {"$lt": now}},
+                    ],
+                },
+                {"$set": {"lease_owner": self.owner_id, "lease_until": now + self.lease}},
+                return_document=True,
+            )
+        except Exception as exc:
+            logger.warning(f"[session_cache] Lease claim failed for {session_id[:8]}...: {exc}")
+            return False
+        if not doc:
+            with self._lock:
+                self._stats["claim_conflicts"] += 1
+            return False
+
+        recent: Deque[Any] = deque(
+            (i["timestamp"] for i in doc.get("interactions") or [] if isinstance(i, dict) and "timestamp" in i),
+            maxlen=RECENT_MESSAGES,
+        )
+        entry = _Entry({k: doc.get(k) for k in GATE_FIELDS}, now + self.lease, recent)
+        with self._lock:
+            self._entries[session_id] = entry
+            self._by_user[_user_key(doc.get("user_id"), doc.get("guild_id"))] = session_id
+            self._stats["claims"] += 1
+        logger.debug(f"[session_cache] Leased session {session_id[:8]}... to {self.owner_id}")
+        return True
+
+    def forget(self, session_id: str, reason: str = "closed") -> None:
+        """Drop a session from memory (close, expiry, lost lease)."""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                key = _user_key(entry.session.get("user_id"), entry.session.get("guild_id"))
+                if self._by_user.get(key) == session_id:
+                    del self._by_user[key]
+        if entry is not None:
+            logger.debug(f"[session_cache] Dropped session {session_id[:8]}... ({reason})")
+
+    def forget_user(self, user_id: Any, guild_id: Any = None) -> None:
+        """Drop a user's sessions (guild_id=None drops every guild)."""
+        user_id = str(user_id)
+        with self._lock:
+            session_ids = [
+                sid for (uid, gid), sid in self._by_user.items()
+                if uid == user_id and (guild_id is None or gid == str(guild_id))
+            ]
+        for session_id in session_ids:
+            self.forget(session_id, reason="user_sessions_expired")
+
+    def clear(self, reason: str = "bulk_session_update") -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+        logger.debug(f"[session_cache] Cleared ({reason})")
+
+    # ── Writes ─────────────────────────────────────────────────────────────
+
+    def increment_turn(self, session_id: str, max_turns: int) -> Optional[Tuple[bool, int, bool]]:
+        """Turn-boundary increment for an owned session.
+
+        Returns (allowed, turn_count, is_final_turn), or None when the session
+        is not owned here (caller uses the database path).
+        """
+        entry = self._entries.get(session_id) if self.enabled else None
+        if entry is None:
+            return None
+        with entry.lock:
+            count = entry.session.get("turn_count") or 0
+            if count >= max_turns:
+                return False, count, False
+            now = datetime.now(timezone.utc)
+            try:
+                result = self._collection().update_one(
+                    {
+                        "session_id": session_id,
+                        "status": "active",
+                        "lease_owner": self.owner_id,
+                        "turn_count": count,
+                    },
+                    {
+                        "$inc": {"turn_count": 1},
+                        "$set": {"last_message_at": now, "lease_until": now + self.lease},
+                        "$unset": {"cooldown_until": ""},
+                    },
+                )
+            except Exception as exc:
+                logger.warning(f"[session_cache] Turn write failed for {session_id[:8]}...: {exc}")
+                result = None
+            if result is None or result.matched_count == 0:
+                lost = True
+            else:
+                lost = False
+                entry.session.update(turn_count=count + 1, last_message_at=now, cooldown_until=None)
+                entry.lease_until = now + self.lease
+        with self._lock:
+            self._stats["lost_leases" if lost else "writes"] += 1
+        if lost:
+            # Another process wrote the session (or it closed); stop trusting memory
+            self.forget(session_id, reason="lease_lost")
+            return None
+        return True, count + 1, count + 1 == max_turns
+
+    def set_cooldown(self, session_id: str, cooldown_until: Optional[datetime]) -> None:
+        """Mirror a cooldown written to the database."""
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            with entry.lock:
+                entry.session["cooldown_until"] = cooldown_until
+                if cooldown_until is not None:
+                    entry.session["state"] = "cooldown"
+
+    def record_messages(self, session_id: str, timestamps: List[Any]) -> None:
+        """Mirror interactions appended to the database (burst window)."""
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            with entry.lock:
+                entry.recent.extend(timestamps)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "owned_sessions": len(self._entries)}
+
+
+_cache: Optional[SessionStateCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_session_state_cache() -> SessionStateCache:
+    """Get the process-wide session state cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SessionStateCache()
+    return _cache
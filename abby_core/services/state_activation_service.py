@@ -53,6 +53,7 @@ from abby_core.database.collections.system_operations import (
     mark_operation_failed,
 )
 from abby_core.database.mongodb import get_database
+from abby_core.system.state_cache import get_system_state_cache
 from abby_core.observability.logging import logging
 
 logger = logging.getLogger(__name__)
@@ -240,7 +241,8 @@ class StateActivationService:
         # Both deactivate and activate must succeed or both must fail
         try:
             db = get_database()
-            with db.client.start_session() as session:
+            with get_system_state_cache().transition(f"activate {state_id}"), \
+                    db.client.start_session() as session:
                 with session.start_transaction():
                     # Deactivate other states of the same type
                     deactivate_result = collection.update_many(
@@ -398,7 +400,8 @@ class StateActivationService:
         # Deactivate atomically
         try:
             db = get_database()
-            with db.client.start_session() as session:
+            with get_system_state_cache().transition(f"deactivate {state_id}"), \
+                    db.client.start_session() as session:
                 with session.start_transaction():
                     result = collection.update_one(
                         {"state_id": state_id},
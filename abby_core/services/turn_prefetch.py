@@ -0,0 +1,246 @@
+"""Turn Prefetch - speculative reads while the chatbot waits for a reply
+
+Between turns the chatbot sits in ``wait_for("message")``. When the reply
+arrives it used to fetch, one after another, the active session, the guild
+memory settings, the user's memory envelope, the global system state and the
+active persona before it could call the LLM. None of those reads depend on
+the message text, so TurnPrefetcher starts them (concurrently, in worker
+threads) as soon as the wait begins and parks the results in a per-
+conversation slot with a freshness deadline.
+
+The next turn takes the slot: fresh values are used as-is, a load still in
+flight is awaited briefly (its round-trips started before the message did),
+and anything missing, failed or stale falls back to the normal read. Slots
+are refreshed shortly before they expire so slow typists still get a fresh
+slot, and every exit path (dismiss, timeout, turn limit, error) cancels the
+background task.
+
+Writes are never prefetched - the atomic turn increment stays on the turn.
+
+**Does NOT:**
+- Decide what to do with the values (chatbot cog)
+- Cache across conversations (each slot is single-use)
+
+Configuration (env):
+    CHAT_PREFETCH_ENABLED        true | false (default true)
+    CHAT_PREFETCH_TTL_SECONDS    freshness deadline for a slot (default 30)
+    CHAT_PREFETCH_WAIT_MS        max wait for an in-flight load (default 1500)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Refresh a parked slot once this fraction of its TTL has elapsed
+REFRESH_FRACTION = 0.8
+
+# Loader signature: (user_id, guild_id) -> value, run in a worker thread
+Loader = Callable[[Optional[str], Optional[str]], Any]
+
+
+@dataclass
+class PrefetchedTurn:
+    """Values read ahead of a turn.
+
+    Attributes:
+        values: Loaded values by loader name (failed loads are absent)
+        load_ms: Time each load took, i.e. the round-trip the turn skips
+        fetched_at: time.monotonic() when the loads completed
+        expires_at: time.monotonic() deadline after which values are stale
+    """
+    values: Dict[str, Any] = field(default_factory=dict)
+    load_ms: Dict[str, float] = field(default_factory=dict)
+    fetched_at: float = 0.0
+    expires_at: float = 0.0
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() <= self.expires_at
+
+    def has(self, name: str) -> bool:
+        return name in self.values
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+    def get_or_load(self, name: str, load: Callable[[], Any]) -> Any:
+        """Prefetched value if present, otherwise the result of load()."""
+        if name in self.values:
+            return self.values[name]
+        return load()
+
+
+class TurnPrefetcher:
+    """Starts a conversation's next-turn reads while waiting for the reply.
+
+    Slots are keyed by conversation (the chatbot uses the user id, since a
+    user has at most one live conversation). All methods must be called from
+    the event loop thread.
+    """
+
+    def __init__(
+        self,
+        loaders: Dict[str, Loader],
+        ttl_seconds: Optional[float] = None,
+        wait_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ):
+        """Initialize prefetcher.
+
+        Args:
+            loaders: Blocking read functions by name, called as loader(user_id, guild_id)
+            ttl_seconds: Freshness deadline (default CHAT_PREFETCH_TTL_SECONDS)
+            wait_seconds: Max wait for an in-flight load (default CHAT_PREFETCH_WAIT_MS)
+            enabled: Override CHAT_PREFETCH_ENABLED
+        """
+        self._loaders = dict(loaders)
+        self.ttl_seconds = (
+            float(os.getenv("CHAT_PREFETCH_TTL_SECONDS", "30")) if ttl_seconds is None else ttl_seconds
+        )
+        self.wait_seconds = (
+            int(os.getenv("CHAT_PREFETCH_WAIT_MS", "1500")) / 1000 if wait_seconds is None else wait_seconds
+        )
+        self.enabled = (
+            os.getenv("CHAT_PREFETCH_ENABLED", "true").lower() == "true" if enabled is None else enabled
+        )
+        self._runners: Dict[str, asyncio.Task] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._slots: Dict[str, PrefetchedTurn] = {}
+        self._stats = {
+            "started": 0,
+            "hits": 0,
+            "stale": 0,
+            "misses": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "refreshes": 0,
+            "load_errors": 0,
+            "saved_ms": 0.0,
+        }
+
+    def start(self, key: str, user_id: Optional[str], guild_id: Optional[str]) -> None:
+        """Begin prefetching for the conversation's next turn (replaces any previous slot)."""
+        if not self.enabled or not self._loaders:
+            return
+        self._discard(key)
+        loop = asyncio.get_running_loop()
+        # The first load starts now, not when the runner is first scheduled
+        self._pending[key] = loop.create_task(self._load(user_id, guild_id))
+        self._runners[key] = loop.create_task(self._run(key, user_id, guild_id), name=f"turn-prefetch-{key}")
+        self._stats["started"] += 1
+
+    async def take(self, key: str) -> PrefetchedTurn:
+        """Consume the conversation's slot.
+
+        Returns the fresh slot, or the result of a load that finished before
+        the runner stored it, waiting up to wait_seconds for a load that is
+        still in flight. Returns an empty PrefetchedTurn when there is nothing
+        usable, so callers can always use get_or_load().
+        """
+        runner = self._runners.pop(key, None)
+        pending = self._pending.pop(key, None)
+        slot = self._slots.pop(key, None)
+        if runner is None:
+            self._stats["misses"] += 1
+            return PrefetchedTurn()
+
+        try:
+            if (slot is None or not slot.fresh) and pending is not None:
+                if pending.done():
+                    # Finished, but the runner has not stored it in the slot yet
+                    if not pending.cancelled() and pending.exception() is None:
+                        slot = pending.result()
+                else:
+                    try:
+                        # shield: a timeout here must not cancel the load mid-gather
+                        slot = await asyncio.wait_for(asyncio.shield(pending), self.wait_seconds)
+                    except asyncio.TimeoutError:
+                        self._stats["timeouts"] += 1
+                        return PrefetchedTurn()
+        finally:
+            runner.cancel()
+
+        if slot is None:
+            self._stats["misses"] += 1
+            return PrefetchedTurn()
+        if not slot.fresh:
+            self._stats["stale"] += 1
+            return PrefetchedTurn()
+
+        self._stats["hits"] += 1
+        saved_ms = sum(slot.load_ms.values())
+        self._stats["saved_ms"] += saved_ms
+        logger.debug(
+            f"[turn_prefetch] Slot hit for {key}: {sorted(slot.values)} "
+            f"({saved_ms:.1f}ms of reads off the turn)"
+        )
+        return slot
+
+    def cancel(self, key: str) -> None:
+        """Drop the conversation's slot and stop its background task."""
+        if self._discard(key):
+            self._stats["cancelled"] += 1
+
+    def cancel_all(self) -> None:
+        for key in list(self._runners):
+            self.cancel(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "saved_ms": round(self._stats["saved_ms"], 1),
+            "active": len(self._runners),
+            "ttl_seconds": self.ttl_seconds,
+            "enabled": self.enabled,
+        }
+
+    def _discard(self, key: str) -> bool:
+        runner = self._runners.pop(key, None)
+        pending = self._pending.pop(key, None)
+        self._slots.pop(key, None)
+        if pending is not None and not pending.done():
+            pending.cancel()
+        if runner is not None and not runner.done():
+            runner.cancel()
+            return True
+        return False
+
+    async def _run(self, key: str, user_id: Optional[str], guild_id: Optional[str]) -> None:
+        while True:
+            self._slots[key] = await self._pending[key]
+            self._pending.pop(key, None)
+            if self.ttl_seconds <= 0:
+                return
+            await asyncio.sleep(self.ttl_seconds * REFRESH_FRACTION)
+            self._pending[key] = asyncio.ensure_future(self._load(user_id, guild_id))
+            self._stats["refreshes"] += 1
+
+    async def _load(self, user_id: Optional[str], guild_id: Optional[str]) -> PrefetchedTurn:
+        async def load_one(name: str, loader: Loader):
+            started = time.perf_counter()
+            try:
+                value = await asyncio.to_thread(loader, user_id, guild_id)
+            except Exception as exc:
+                logger.debug(f"[turn_prefetch] {name} prefetch failed: {exc}")
+                return name, None, None
+            return name, value, (time.perf_counter() - started) * 1000
+
+        results = await asyncio.gather(*(load_one(name, loader) for name, loader in self._loaders.items()))
+
+        turn = PrefetchedTurn()
+        for name, value, elapsed_ms in results:
+            if elapsed_ms is None:
+                self._stats["load_errors"] += 1
+                continue
+            turn.values[name] = value
+            turn.load_ms[name] = elapsed_ms
+        turn.fetched_at = time.monotonic()
+        turn.expires_at = turn.fetched_at + self.ttl_seconds
+        return turn
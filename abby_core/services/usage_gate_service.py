@@ -32,6 +32,9 @@ import logging
 
 from abby_core.database.mongodb import get_database
 from abby_core.database.collections.guild_configuration import get_memory_settings
+from abby_core.database.collections.chat_sessions import RELEASED_LEASE
+from abby_core.services.burst_limiter import get_burst_limiter
+from abby_core.services.session_state_cache import get_session_state_cache
 
 try:
     from tdos_intelligence.observability import logging as tdos_logging  # type: ignore
@@ -150,7 +153,9 @@ class UsageGateService:
             usage_limits = guild_config.get("usage_limits", {})
             conv_limits = usage_limits.get("conversation", {})
             
-            # Get or load session
+            # Get or load session (leased sessions come from memory)
+            if session is None:
+                session = get_session_state_cache().lookup(user_id, guild_id)
             if session is None:
                 from abby_core.database.session_repository import get_active_session
                 session = get_active_session(user_id, guild_id)
@@ -268,6 +273,8 @@ class UsageGateService:
         
         Uses MongoDB's findOneAndUpdate to ensure turn increment and limit
         check happen atomically, preventing race conditions from parallel requests.
+        Sessions leased by this process are checked in memory and written with
+        a single conditional $inc (see session_state_cache).
         
         Args:
             session_id: Session identifier
@@ -282,6 +289,21 @@ class UsageGateService:
             - is_final_turn: True if this was the last allowed turn
         """
         try:
+            cached = get_session_state_cache().increment_turn(session_id, max_turns)
+            if cached is not None:
+                allowed, new_count, is_final = cached
+                if not allowed:
+                    logger.info(
+                        f"[🛑] Turn limit exceeded for leased session {session_id} "
+                        f"({new_count}/{max_turns})"
+                    )
+                else:
+                    logger.info(
+                        f"[usage_gate] ✓ Leased increment: session={session_id[:8]}... "
+                        f"turn={new_count}/{max_turns} final={is_final}"
+                    )
+                return cached
+
             db = get_database()
             collection = db["chat_sessions"]
             now = datetime.now(timezone.utc)
@@ -294,7 +316,8 @@ class UsageGateService:
                 },
                 {
                     "$inc": {"turn_count": 1},
-                    "$set": {"last_message_at": now},
+                    # Revokes another process's lease so it stops trusting its cached count
+                    "$set": {"last_message_at": now, "lease_owner": None},
                     "$unset": {"cooldown_until": ""}
                 },
                 return_document=True  # Return updated document
@@ -370,6 +393,7 @@ class UsageGateService:
                 {"session_id": session_id},
                 update_doc
             )
+            get_session_state_cache().forget(session_id, reason="turn_count_written")
             
             if result.matched_count == 0:
                 return None, f"Session {session_id} not found"
@@ -424,6 +448,7 @@ class UsageGateService:
             
             if result.matched_count == 0:
                 return None, f"Session {session_id} not found"
+            get_session_state_cache().set_cooldown(session_id, cooldown_until)
             
             logger.debug(
                 f"[⏱️] Set {cooldown_seconds}s cooldown on session {session_id}"
@@ -461,6 +486,8 @@ class UsageGateService:
             collection = db["chat_sessions"]
             
             now = datetime.now(timezone.utc)
+            get_session_state_cache().forget(session_id, reason=reason)
+            get_burst_limiter().forget(session_id)
             
             result = collection.update_one(
                 {
@@ -471,7 +498,9 @@ class UsageGateService:
                     "$set": {
                         "status": reason,
                         "state": "closed",
-                        "closed_at": now
+                        "closed_at": now,
+                        "expires_at": now,  # Retention countdown (TTL) starts at close
+                        **RELEASED_LEASE,
                     }
                 }
             )
@@ -573,45 +602,43 @@ class UsageGateService:
             burst_max = burst_limits.get("max_messages", 10)
             burst_window = burst_limits.get("window_seconds", 60)
             
-            # Count messages in the last N seconds
-            recent_interactions = [
-                i for i in session.get("interactions", [])
-                if isinstance(i, dict) and "timestamp" in i
-            ]
-            
-            if not recent_interactions:
+            session_id = session.get("session_id")
+            if not session_id:
                 return None
             
-            last_message_time = recent_interactions[-1].get("timestamp")
-            last_message_time = self._parse_datetime(last_message_time)
-            
-            if not last_message_time:
-                return None
-            
-            burst_age = (now - last_message_time).total_seconds()
+            def recent_message_times():
+                # Only read when the limiter has not seen this session yet
+                # (leased sessions carry recent_message_times instead of the
+                # interactions array)
+                if "recent_message_times" in session:
+                    raw = session["recent_message_times"]
+                else:
+                    raw = [
+                        i.get("timestamp") for i in session.get("interactions", [])
+                        if isinstance(i, dict) and "timestamp" in i
+                    ]
+                return [t for t in map(self._parse_datetime, raw[-burst_max:]) if t is not None]
+            
+            # O(1): the limit is hit iff the last burst_max messages all fall in the window
+            burst_messages = get_burst_limiter().check(
+                session_id, burst_max, burst_window, now, seed=recent_message_times
+            )
             
-            if burst_age < burst_window:
-                # Count messages in window
-                burst_messages = sum(
-                    1 for i in recent_interactions
-                    if self._parse_datetime(i.get("timestamp")) is not None
+            if burst_messages is not None:
+                response_text = self._get_gate_message(
+                    personality_manager,
+                    "burst_limit_hit",
+                    f"You're sending messages too quickly. Please slow down."
+                )
+                logger.warning(
+                    f"[⚡] Burst limit hit ({burst_messages}/{burst_max} in {burst_window}s)"
+                )
+                return UsageGateResult(
+                    allowed=False,
+                    reason=GateFailureReason.BURST_LIMIT_HIT.value,
+                    response_text=response_text,
+                    burst_limit_hit=True,
                 )
-                
-                if burst_messages >= burst_max:
-                    response_text = self._get_gate_message(
-                        personality_manager,
-                        "burst_limit_hit",
-                        f"You're sending messages too quickly. Please slow down."
-                    )
-                    logger.warning(
-                        f"[⚡] Burst limit hit ({burst_messages}/{burst_max} in {burst_window}s)"
-                    )
-                    return UsageGateResult(
-                        allowed=False,
-                        reason=GateFailureReason.BURST_LIMIT_HIT.value,
-                        response_text=response_text,
-                        burst_limit_hit=True,
-                    )
             
             return None
 
@@ -18,6 +18,8 @@ import json
 from io import BytesIO
 
 from abby_core.database import mongodb as mongo_db
+from abby_core.services.memory_envelope_cache import get_memory_envelope_cache
+from abby_core.database.collections.chat_session_interactions import INTERACTIONS_LAYOUT
 from abby_core.database.collections.guild_configuration import (
     get_guild_setting,
     set_guild_setting,
@@ -246,6 +248,7 @@ class UserService:
                 f"user_opted_out_{user_id_str}",
                 new_status
             )
+            get_memory_envelope_cache().invalidate(user_id_str, reason="privacy_optout")
             
             self._log_audit(
                 user_id_str,
@@ -355,6 +358,7 @@ class UserService:
             )
             
             if result.modified_count > 0:
+                get_memory_envelope_cache().invalidate(user_id_str, reason="privacy_forget")
                 self._log_audit(
                     user_id_str,
                     UserAuditAction.FORGET_MEMORY,
@@ -371,6 +375,62 @@ class UserService:
             logger.error(f"[❌] {error}")
             return False, error
     
+    def index_memory(
+        self,
+        user_id: int | str,
+        memory_text: str,
+        guild_id: Optional[int | str] = None
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Store scoring features (keywords/domains) on a newly written memory.
+        
+        Facts are written by MemoryService.add_fact, which knows nothing about
+        prompt scoring; tagging them here means memory formatting never has to
+        re-derive features from the text (see rag.memory_formatter.index_fact).
+        
+        Args:
+            user_id: User ID
+            memory_text: Exact text of the stored memory
+            guild_id: Guild ID (optional)
+        
+        Returns:
+            (success, error): True if a memory was tagged, error or None
+        """
+        try:
+            from abby_core.database.collections.users import Users
+            from abby_core.rag.memory_formatter import index_fact
+            
+            user_id_str = str(user_id)
+            guild_id_str = str(guild_id) if guild_id else None
+            
+            profiles_col = Users.get_collection()
+            
+            query: Dict[str, str] = {"user_id": user_id_str}
+            if guild_id_str:
+                query["guild_id"] = guild_id_str
+            
+            features = index_fact({"text": memory_text})
+            result = profiles_col.update_one(
+                query,
+                {
+                    "$set": {
+                        "creative_profile.memorable_facts.$[fact].keywords": features["keywords"],
+                        "creative_profile.memorable_facts.$[fact].domains": features["domains"],
+                    }
+                },
+                array_filters=[{"fact.text": memory_text, "fact.keywords": {"$exists": False}}]
+            )
+            
+            if result.modified_count > 0:
+                get_memory_envelope_cache().invalidate(user_id_str, reason="memory_indexed")
+                return True, None
+            return False, "Memory not found"
+        
+        except Exception as e:
+            error = f"Failed to index memory: {e}"
+            logger.error(f"[❌] {error}")
+            return False, error
+    
     # ═══════════════════════════════════════════════════════════════════════
     # CONVERSATION MANAGEMENT
     # ═══════════════════════════════════════════════════════════════════════
@@ -441,6 +501,10 @@ class UserService:
                 query["guild_id"] = guild_id_str
             
             result = sessions_col.delete_many(query)
+            # Bucketed history carries the same user_id/guild_id
+            self.db["chat_session_interactions"].delete_many(query)
+            # Envelopes carry recent session context
+            get_memory_envelope_cache().invalidate(user_id_str, reason="privacy_clear_conversations")
             
             self._log_audit(
                 user_id_str,
@@ -563,9 +627,19 @@ class UserService:
                 return None, "No conversation data found"
             
             # Remove MongoDB _id and convert dates
+            buckets_col = self.db["chat_session_interactions"]
             for session in sessions:
                 if "_id" in session:
                     del session["_id"]
+                if session.get("interactions_layout") == INTERACTIONS_LAYOUT:
+                    # Full history lives in buckets; the session only keeps a tail
+                    session["interactions"] = [
+                        message
+                        for bucket in buckets_col.find(
+                            {"session_id": session.get("session_id")}, {"messages": 1}
+                        ).sort("bucket", 1)
+                        for message in bucket.get("messages", [])
+                    ]
                 for date_field in ["created_at", "updated_at"]:
                     if date_field in session and hasattr(session[date_field], "isoformat"):
                         session[date_field] = session[date_field].isoformat()
@@ -4,7 +4,7 @@ Effect Checker Helper
 Simple utilities for job handlers to check if effects are active.
 """
 
-from typing import Any, Optional
+from typing import Any, Mapping, Optional
 from abby_core.llm.system_state_resolver import resolve_system_state
 
 try:
@@ -14,6 +14,12 @@ except ImportError:
     logger = None
 
 
+def _active_effects() -> Mapping[str, Any]:
+    """Compiled effects table for the current system state (one dict lookup per effect)."""
+    state = resolve_system_state()
+    return state.get("effects_table") or state.get("effects", {})
+
+
 def is_effect_active(effect_key: str) -> bool:
     """
     Check if a specific effect is currently active.
@@ -31,9 +37,7 @@ def is_effect_active(effect_key: str) -> bool:
         True if effect is active, False otherwise
     """
     try:
-        state = resolve_system_state()
-        effects = state.get("effects", {})
-        return bool(effects.get(effect_key, False))
+        return bool(_active_effects().get(effect_key, False))
     except Exception as exc:
         if logger:
             logger.warning(f"[effect] Error checking effect '{effect_key}': {exc}")
@@ -58,9 +62,7 @@ def get_active_effect_value(effect_key: str, default: Any = None) -> Any:
         Effect value or default
     """
     try:
-        state = resolve_system_state()
-        effects = state.get("effects", {})
-        return effects.get(effect_key, default)
+        return _active_effects().get(effect_key, default)
     except Exception as exc:
         if logger:
             logger.warning(f"[effect] Error getting effect value '{effect_key}': {exc}")
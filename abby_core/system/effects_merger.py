@@ -8,12 +8,23 @@ Architecture Benefit:
 - Effects merge logic isolated and testable
 - Reusable for validation, testing, simulation
 - State resolver focuses on fetching/normalization
+
+Compiled Tables:
+compile_effects() memoizes the merge by a hash of the active states'
+(state_id, version) pairs and returns an EffectsTable: a flat, read-only
+lookup of every registry effect (merged value, or the registry identity when
+no state sets it). The active state set changes only on transitions, so
+callers on hot paths (XP grants, content generation) do one dict lookup
+instead of re-merging.
 """
 
 from __future__ import annotations
 
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Mapping, Optional
 import logging
 
 from abby_core.system.effects_registry import EFFECT_REGISTRY
@@ -167,3 +178,105 @@ def merge_effects(
         )
     
     return merged
+
+
+# ==================== COMPILED EFFECTS TABLES ====================
+
+_TABLE_CACHE_SIZE = 64
+
+
+class EffectsTable(Mapping[str, Any]):
+    """Read-only flat lookup of merged effects for one active state set."""
+
+    def __init__(self, merged: Dict[str, Any], fingerprint: str):
+        self._merged = dict(merged)
+        self.fingerprint = fingerprint
+        # Effective value of every known effect, merged or identity
+        self._effective = {
+            key: schema.get("identity") for key, schema in EFFECT_REGISTRY.items()
+        }
+        self._effective.update(self._merged)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._merged[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._merged)
+
+    def __len__(self) -> int:
+        return len(self._merged)
+
+    def __repr__(self) -> str:
+        return f"EffectsTable({self._merged!r})"
+
+    def effective(self, key: str) -> Any:
+        """Merged value, or the registry identity when no active state sets it."""
+        return self._effective.get(key)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Mutable copy of the merged effects (same shape as merge_effects())."""
+        return dict(self._merged)
+
+
+def state_version(state: Dict[str, Any]) -> str:
+    """Digest of the fields merge_effects() reads from a state."""
+    effects = state.get("effects") or {}
+    payload = repr((
+        state.get("priority", 0),
+        state.get("start_at"),
+        sorted(effects.items()),
+    ))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def effects_fingerprint(states: List[Dict[str, Any]]) -> str:
+    """Hash of the (state_id, version) pairs, in input order.
+
+    Order is kept because states tied on (priority, start_at) merge in input
+    order.
+    """
+    pairs = repr([(state.get("state_id"), state_version(state)) for state in states])
+    return hashlib.sha1(pairs.encode("utf-8")).hexdigest()
+
+
+_tables: "OrderedDict[str, EffectsTable]" = OrderedDict()
+_tables_lock = threading.Lock()
+_table_stats = {"hits": 0, "compiles": 0}
+
+
+def compile_effects(
+    states: List[Dict[str, Any]],
+    operator_id: Optional[str] = None,
+) -> EffectsTable:
+    """Memoized merge_effects() as an EffectsTable.
+
+    Raises:
+        ValueError: If effect type mismatches merge strategy (nothing is cached)
+    """
+    fingerprint = effects_fingerprint(states)
+    with _tables_lock:
+        table = _tables.get(fingerprint)
+        if table is not None:
+            _tables.move_to_end(fingerprint)
+            _table_stats["hits"] += 1
+            return table
+
+    table = EffectsTable(merge_effects(states, operator_id=operator_id), fingerprint)
+    with _tables_lock:
+        _tables[fingerprint] = table
+        while len(_tables) > _TABLE_CACHE_SIZE:
+            _tables.popitem(last=False)
+        _table_stats["compiles"] += 1
+    return table
+
+
+def get_effects_table_stats() -> Dict[str, int]:
+    """Compile/hit counters for compiled effects tables."""
+    with _tables_lock:
+        return {**_table_stats, "size": len(_tables)}
+
+
+def clear_effects_tables() -> None:
+    """Drop compiled tables (e.g. after the effects registry changes)."""
+    with _tables_lock:
+        _tables.clear()
@@ -0,0 +1,165 @@
+"""Process-local cache of resolved system state.
+
+Active seasons and events only change at known instants: a state's start_at
+or end_at boundary, or an operator activation. Chat turns, XP awards and job
+handlers used to re-read system_state (and open a snapshot transaction) every
+time anyway. SystemStateCache stores each resolved value together with the
+instant it stops being valid:
+
+    resolve_system_state()      -> valid until the next start_at/end_at
+    get_active_state(type)      -> valid until the next transition
+
+and a version that every state transition bumps. Transitions wrap their
+writes in transition(), which bumps after the transaction has committed, so
+a read racing the write can never be cached under the new version.
+
+SYSTEM_STATE_CACHE_MAX_SECONDS caps how long any entry lives, which bounds
+staleness for edits made outside this process (other workers, manual DB
+edits).
+
+Configuration (env):
+    SYSTEM_STATE_CACHE_ENABLED       true | false (default true)
+    SYSTEM_STATE_CACHE_MAX_SECONDS   max entry age in seconds (default 300)
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from abby_core.observability.logging import logging
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class SystemStateCache:
+    """Resolved state values keyed by lookup, valid until the next transition."""
+
+    def __init__(
+        self,
+        max_age_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.max_age = timedelta(seconds=(
+            float(os.getenv("SYSTEM_STATE_CACHE_MAX_SECONDS", "300")) if max_age_seconds is None
+            else max_age_seconds
+        ))
+        self.enabled = (
+            os.getenv("SYSTEM_STATE_CACHE_ENABLED", "true").lower() == "true" if enabled is None else enabled
+        )
+        self.clock = clock
+        # key -> (value, version at load, expires_at)
+        self._entries: Dict[Hashable, Tuple[Any, int, datetime]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "invalidations": 0, "raced": 0}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: Hashable, now: datetime) -> Any:
+        """Cached value for key at `now`, or _MISSING."""
+        if not self.enabled:
+            return _MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, version, expires_at = entry
+                if version == self._version and now < expires_at:
+                    self._stats["hits"] += 1
+                    return value
+                del self._entries[key]
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+        return _MISSING
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        version: int,
+        now: datetime,
+        next_transition: Optional[datetime] = None,
+    ) -> None:
+        """Store value loaded under `version`; valid until next_transition (capped by max age)."""
+        if not self.enabled:
+            return
+        expires_at = now + self.max_age
+        if next_transition is not None and next_transition < expires_at:
+            expires_at = next_transition
+        with self._lock:
+            if version != self._version:
+                # A transition committed while we were reading
+                self._stats["raced"] += 1
+                return
+            self._entries[key] = (value, version, expires_at)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[datetime], Tuple[Any, Optional[datetime]]],
+    ) -> Any:
+        """Cached value for key, or load(now) -> (value, next_transition) and cache it.
+
+        Errors raised by load() propagate and nothing is cached.
+        """
+        now = self.clock()
+        value = self.get(key, now)
+        if value is not _MISSING:
+            return value
+        version = self._version
+        value, next_transition = load(now)
+        self.put(key, value, version, now, next_transition)
+        return value
+
+    def invalidate(self, reason: str = "state_transition") -> int:
+        """Drop every entry; returns the new version."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+            version = self._version
+        logger.debug(f"[system_state_cache] Invalidated v{version} ({reason})")
+        return version
+
+    @contextmanager
+    def transition(self, reason: str) -> Iterator[None]:
+        """Wrap a state write; invalidates once the write has finished (committed or not)."""
+        try:
+            yield
+        finally:
+            self.invalidate(reason)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "version": self._version,
+                "size": len(self._entries),
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache: Optional[SystemStateCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_system_state_cache() -> SystemStateCache:
+    """Get the process-wide system state cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SystemStateCache()
+    return _cache
+
+
+def invalidate_system_state_cache(reason: str = "state_transition") -> int:
+    """Invalidate cached system state after a transition outside transition()."""
+    return get_system_state_cache().invalidate(reason)
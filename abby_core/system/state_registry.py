@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
@@ -99,6 +102,16 @@ APPROVED_EVENT_TEMPLATES: Dict[str, Dict[str, Any]] = {
 }
 
 
+# Canonical season boundaries (aligned with system_state.initialize_predefined_seasons).
+# A season's state year is the year it ends in: winter-2026 runs Dec 21 2025 - Mar 19 2026.
+SEASON_TEMPLATES: Dict[str, Dict[str, int]] = {
+    "winter": {"start_month": 12, "start_day": 21, "end_month": 3, "end_day": 19},
+    "spring": {"start_month": 3, "start_day": 20, "end_month": 6, "end_day": 20},
+    "summer": {"start_month": 6, "start_day": 21, "end_month": 9, "end_day": 21},
+    "fall": {"start_month": 9, "start_day": 22, "end_month": 12, "end_day": 20},
+}
+
+
 # ==================== DATE HELPERS ====================
 
 
@@ -186,6 +199,123 @@ def get_event_schedule(
     return _compute_event_window(event_key, year, start_at_override, end_at_override)
 
 
+# ==================== EVENT CALENDAR ====================
+
+
+@dataclass(frozen=True)
+class CalendarWindow:
+    """Default window of one season or templated event."""
+
+    state_id: str
+    state_type: str
+    key: str
+    start_at: datetime
+    end_at: datetime  # Inclusive, like system_state end_at
+
+
+def _season_window(key: str, year: int) -> CalendarWindow:
+    template = SEASON_TEMPLATES[key]
+    start_year = year - 1 if template["start_month"] > template["end_month"] else year
+    return CalendarWindow(
+        state_id=f"{key}-{year}",
+        state_type=StateCategory.SEASON.value,
+        key=key,
+        start_at=datetime(start_year, template["start_month"], template["start_day"]),
+        end_at=datetime(year, template["end_month"], template["end_day"], 23, 59, 59),
+    )
+
+
+class EventCalendar:
+    """Precomputed season and event windows for one year and the next.
+
+    Window boundaries (start_at, and the instant after end_at) split time into
+    segments with a fixed active set, so both queries are one bisect:
+
+        active_at(t)        -> windows covering t
+        next_transition(t)  -> first boundary after t (cache expiry)
+    """
+
+    def __init__(self, year: int, registry_version: int = 0):
+        self.year = year
+        self.registry_version = registry_version
+        self.windows = self._build_windows(year)
+
+        boundaries = sorted(
+            {w.start_at for w in self.windows}
+            | {w.end_at + timedelta(microseconds=1) for w in self.windows}
+        )
+        self._boundaries = boundaries
+        # _segments[i] is the active set on [boundaries[i], boundaries[i + 1])
+        self._segments: List[Tuple[CalendarWindow, ...]] = [
+            tuple(w for w in self.windows if w.start_at <= b <= w.end_at) for b in boundaries
+        ]
+
+    @staticmethod
+    def _build_windows(year: int) -> List[CalendarWindow]:
+        # Seasons overlapping [year, year + 1], including winter spilling in from December
+        windows = [
+            window
+            for season_year in (year, year + 1, year + 2)
+            for window in (_season_window(key, season_year) for key in SEASON_TEMPLATES)
+            if window.start_at.year <= year + 1
+        ]
+        for event_year in (year, year + 1):
+            for event_key, template in APPROVED_EVENT_TEMPLATES.items():
+                ok, error, schedule = _compute_event_window(event_key, event_year)
+                if not ok:
+                    if logger:
+                        logger.warning(f"[registry] Calendar skipped {event_key}-{event_year}: {error}")
+                    continue
+                windows.append(CalendarWindow(
+                    state_id=f"{event_key}-{event_year}",
+                    state_type=template["state_type"],
+                    key=template["key"],
+                    start_at=schedule["start_at"],
+                    end_at=schedule["end_at"],
+                ))
+        return sorted(windows, key=lambda w: (w.start_at, w.state_id))
+
+    def active_at(self, when: datetime) -> List[CalendarWindow]:
+        """Windows covering `when` (start_at <= when <= end_at)."""
+        index = bisect_right(self._boundaries, when) - 1
+        return list(self._segments[index]) if index >= 0 else []
+
+    def next_transition(self, after: datetime) -> Optional[datetime]:
+        """First instant after `after` at which active_at() changes."""
+        index = bisect_right(self._boundaries, after)
+        return self._boundaries[index] if index < len(self._boundaries) else None
+
+
+_calendar: Optional[EventCalendar] = None
+_calendar_lock = threading.Lock()
+_registry_version = 0
+
+
+def get_event_calendar(now: Optional[datetime] = None) -> EventCalendar:
+    """Calendar for the year of `now`; rebuilt at year rollover or after registry edits."""
+    global _calendar
+    year = (now or datetime.utcnow()).year
+    calendar = _calendar
+    if calendar is None or calendar.year != year or calendar.registry_version != _registry_version:
+        with _calendar_lock:
+            calendar = _calendar
+            if calendar is None or calendar.year != year or calendar.registry_version != _registry_version:
+                calendar = _calendar = EventCalendar(year, _registry_version)
+                if logger:
+                    logger.debug(
+                        f"[registry] Built event calendar {year}-{year + 1}: "
+                        f"{len(calendar.windows)} windows"
+                    )
+    return calendar
+
+
+def invalidate_event_calendar() -> None:
+    """Rebuild the calendar on next use (call after editing event/season templates)."""
+    global _registry_version
+    with _calendar_lock:
+        _registry_version += 1
+
+
 # ==================== VALIDATION HELPERS ====================
 
 
@@ -24,6 +24,7 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List
 from abby_core.database.mongodb import get_database
 from abby_core.observability.logging import logging
+from abby_core.system.state_cache import get_system_state_cache
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +70,8 @@ def get_system_state_collection():
 def get_active_state(state_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """Get the currently active system state.
     
+    Served from the system state cache between state transitions.
+    
     Args:
         state_type: If provided, filter to this type (e.g., "season", "era")
     
@@ -83,12 +86,16 @@ def get_active_state(state_type: Optional[str] = None) -> Optional[Dict[str, Any
         #     ...
         # }
     """
-    collection = get_system_state_collection()
-    query: Dict[str, Any] = {"active": True}
-    if state_type:
-        query["state_type"] = state_type
-    
-    return collection.find_one(query)
+    def load(now: datetime):
+        collection = get_system_state_collection()
+        query: Dict[str, Any] = {"active": True}
+        if state_type:
+            query["state_type"] = state_type
+        # The active flag only moves on transitions, which invalidate the cache
+        return collection.find_one(query), None
+
+    state = get_system_state_cache().get_or_load(("active", state_type), load)
+    return dict(state) if state else None
 
 
 def get_state_by_id(state_id: str) -> Optional[Dict[str, Any]]:
@@ -219,7 +226,8 @@ def activate_state(state_id: str, operator_id: Optional[str] = None) -> bool:
     # Both deactivate and activate must succeed or both must fail
     try:
         db = get_database()
-        with db.client.start_session() as session:
+        with get_system_state_cache().transition(f"activate {state_id}"), \
+                db.client.start_session() as session:
             with session.start_transaction():
                 # Deactivate other states of the same type
                 deactivate_result = collection.update_many(
@@ -309,16 +317,17 @@ def deactivate_state(state_id: str, operator_id: Optional[str] = None) -> bool:
         return True  # Success (idempotent)
     
     try:
-        result = collection.update_one(
-            {"state_id": state_id},
-            {
-                "$set": {
-                    "active": False,
-                    "deactivated_at": datetime.utcnow(),
-                    "deactivated_by": operator_id,
+        with get_system_state_cache().transition(f"deactivate {state_id}"):
+            result = collection.update_one(
+                {"state_id": state_id},
+                {
+                    "$set": {
+                        "active": False,
+                        "deactivated_at": datetime.utcnow(),
+                        "deactivated_by": operator_id,
+                    }
                 }
-            }
-        )
+            )
         
         if result.modified_count > 0:
             logger.info(
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Embedding runtime benchmark - float32 baseline vs int8/ONNX runtimes and
+reduced-precision vector storage.
+
+For each EMBEDDING_RUNTIME it reports encode throughput and model memory
+(RSS delta after load). For each runtime x storage dtype it reports vector
+storage bytes and retrieval agreement with the float32 baseline (overlap@k
+and top-1 match, after float32 rerank of the quantized shortlist).
+
+Corpus is read from MongoDB rag_documents (--from-mongo) or a file
+(--corpus: .txt one chunk per line, or .jsonl with "content"/"text").
+
+Usage:
+    python scripts/bench_embeddings.py --from-mongo --guild 123
+    python scripts/bench_embeddings.py --corpus corpus.jsonl --runtimes torch,int8 --output bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Measure the model, not the cache
+os.environ["EMBEDDING_CACHE_SIZE"] = "0"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from abby_core.rag.embeddings import EmbeddingError, Embeddings  # noqa: E402
+from abby_core.rag.quantization import VECTOR_DTYPES, QuantizedVectorIndex  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (Linux /proc, falls back to peak RSS)."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_corpus(path: Optional[str], from_mongo: bool, guild_id: Optional[str]) -> List[str]:
+    if from_mongo:
+        from abby_core.database.collections.rag_documents import get_documents_for_query
+
+        return [doc["content"] for doc in get_documents_for_query(guild_id=guild_id) if doc.get("content")]
+
+    corpus_path = Path(path)
+    if corpus_path.suffix == ".jsonl":
+        texts = []
+        for line in corpus_path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                record = json.loads(line)
+                texts.append(record.get("content") or record.get("text") or "")
+        return [text for text in texts if text]
+    return [line.strip() for line in corpus_path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def make_queries(corpus: List[str], count: int, seed: int) -> List[str]:
+    """Build queries from the leading words of sampled chunks."""
+    rng = random.Random(seed)
+    sample = rng.sample(corpus, min(count, len(corpus)))
+    return [" ".join(text.split()[:12]) for text in sample]
+
+
+def encode_timed(embedder: Embeddings, texts: List[str], batch_size: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    batches = [embedder.encode(texts[i : i + batch_size]) for i in range(0, len(texts), batch_size)]
+    elapsed = time.perf_counter() - start
+    return {
+        "vectors": np.concatenate(batches) if batches else np.zeros((0, 0), dtype=np.float32),
+        "seconds": elapsed,
+        "texts_per_second": len(texts) / elapsed if elapsed else 0.0,
+    }
+
+
+def retrieval_agreement(
+    baseline: List[List[str]],
+    corpus_vectors: np.ndarray,
+    query_vectors: np.ndarray,
+    dtype: str,
+    top_k: int,
+) -> Dict[str, Any]:
+    ids = [str(i) for i in range(len(corpus_vectors))]
+    index = QuantizedVectorIndex(dtype=dtype)
+    index.add(ids, corpus_vectors)
+
+    overlaps, top1 = [], []
+    for query, expected in zip(query_vectors, baseline):
+        got = [vector_id for vector_id, _ in index.search(query, top_k)]
+        overlaps.append(len(set(got) & set(expected)) / max(len(expected), 1))
+        top1.append(bool(got) and bool(expected) and got[0] == expected[0])
+
+    return {
+        "storage_bytes": index.nbytes,
+        "bytes_per_vector": index.nbytes / max(len(index), 1),
+        f"overlap_at_{top_k}": float(np.mean(overlaps)) if overlaps else 0.0,
+        "top1_agreement": float(np.mean(top1)) if top1 else 0.0,
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    corpus = load_corpus(args.corpus, args.from_mongo, args.guild)
+    if not corpus:
+        raise SystemExit("Corpus is empty")
+    queries = make_queries(corpus, args.queries, args.seed)
+    logger.info(f"[Bench] Corpus: {len(corpus)} chunks, {len(queries)} queries")
+
+    report: Dict[str, Any] = {
+        "corpus_size": len(corpus),
+        "queries": len(queries),
+        "top_k": args.top_k,
+        "runtimes": {},
+    }
+    baseline_ids: Optional[List[List[str]]] = None
+
+    for runtime in args.runtimes:
+        rss_before = _rss_mb()
+        try:
+            embedder = Embeddings(runtime=runtime)
+        except EmbeddingError as exc:
+            logger.warning(f"[Bench] Skipping runtime {runtime}: {exc}")
+            report["runtimes"][runtime] = {"error": str(exc)}
+            continue
+        model_mb = _rss_mb() - rss_before
+
+        embedder.encode(corpus[: args.batch_size])  # warm-up
+        corpus_run = encode_timed(embedder, corpus, args.batch_size)
+        query_run = encode_timed(embedder, queries, args.batch_size)
+
+        if baseline_ids is None:
+            # First runtime (torch by default) with exact float32 search is the reference
+            exact = QuantizedVectorIndex(dtype="float32", rerank_factor=1)
+            exact.add([str(i) for i in range(len(corpus))], corpus_run["vectors"])
+            baseline_ids = [[vid for vid, _ in exact.search(q, args.top_k)] for q in query_run["vectors"]]
+            report["baseline_runtime"] = runtime
+
+        report["runtimes"][runtime] = {
+            "model_rss_mb": round(model_mb, 1),
+            "encode_texts_per_second": round(corpus_run["texts_per_second"], 1),
+            "query_texts_per_second": round(query_run["texts_per_second"], 1),
+            "storage": {
+                dtype: retrieval_agreement(
+                    baseline_ids, corpus_run["vectors"], query_run["vectors"], dtype, args.top_k
+                )
+                for dtype in args.dtypes
+            },
+        }
+        logger.info(f"[Bench] {runtime}: {report['runtimes'][runtime]}")
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark embedding runtimes and quantized vector storage",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--corpus", type=str, help="Corpus file (.txt lines or .jsonl)")
+    source.add_argument("--from-mongo", action="store_true", help="Read chunks from rag_documents")
+    parser.add_argument("--guild", type=str, help="Restrict --from-mongo corpus to a guild")
+    parser.add_argument("--runtimes", type=lambda v: v.split(","), default=["torch", "int8", "onnx"],
+                        help="Comma-separated runtimes; the first is the baseline (default torch,int8,onnx)")
+    parser.add_argument("--dtypes", type=lambda v: v.split(","), default=list(VECTOR_DTYPES),
+                        help="Comma-separated storage dtypes (default float32,float16,int8)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--output", type=str, help="Write JSON report to this path")
+
+    args = parser.parse_args()
+    report = run(args)
+
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(rendered, encoding="utf-8")
+        logger.info(f"[Bench] Report written to {args.output}")
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Intent classifier micro-benchmark - compiled single-pass matcher vs the
+original search-every-pattern loop, over a fixed corpus of chat messages.
+
+Every message is labeled by both implementations; any disagreement is
+reported and the run exits 1. Timings are per-message means over
+``--repeats`` passes for:
+
+    reference   re.search over every INTENT_PATTERNS entry (old algorithm)
+    compiled    keyword table + residual compiled regexes, memo bypassed
+    memoized    classify_intent as called by the bot (repeat turns hit the LRU)
+
+Usage:
+    python scripts/bench_intent.py
+    python scripts/bench_intent.py --repeats 200 --output bench_intent.json
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from abby_core.llm import intent as intent_module  # noqa: E402
+from abby_core.llm.intent import classify_intent  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+CORPUS = [
+    "hey abby!",
+    "hi",
+    "Good morning everyone ☀️",
+    "what's up bunny",
+    "whats up",
+    "how are you doing today?",
+    "thanks so much, that was awesome 🙏",
+    "Thank you!!",
+    "cool cool",
+    "what color is the sky on your planet lol",
+    "can you help me finish the chorus of my song? it's in A minor",
+    "I'm working on a lofi track and the kick is too muddy, any EQ tips?",
+    "mixing question: should I put compression before or after eq on vocals",
+    "drew a sketch of the server mascot, what do you think of the design",
+    "I want to paint something cozy for winter, ideas?",
+    "help me write a short poem about rain on a tin roof",
+    "chapter 3 of my novel feels slow, how do I fix the pacing",
+    "my python script keeps throwing a KeyError, can you debug this function",
+    "what's a good algorithm for matchmaking in a small game",
+    "we're planning a game night, which co-op games are fun for 6 people?",
+    "what level am I?",
+    "how much xp do I have",
+    "show me my exp please",
+    "what's my rank on the leaderboard",
+    "remind me to stream at 8pm",
+    "can you schedule the movie night for friday",
+    "please organize the event channels",
+    "could you look up the rules for the tournament",
+    "find the pinned message about art prompts",
+    "set your status to playing lofi beats",
+    "change the bot presence to watching the stars",
+    "status to listening spotify",
+    "enable welcome messages",
+    "turn off the nudges for this channel",
+    "open the config settings for economy",
+    "how do I manage permissions for moderators",
+    "what's new with you?",
+    "what changed in the last update",
+    "show me the devlog",
+    "any recent changes to the bot?",
+    "how were you built? what's under the hood",
+    "how do you work exactly",
+    "what did you improve this week",
+    "can you summarize the discussion in general chat",
+    "analyze the trends in our server metrics this month",
+    "extract the key insight from this data please",
+    "ok",
+    "lol",
+    "👀👀👀",
+    "nice!!! 🎉🎉",
+    "¿cómo estás hoy?",
+    "今日はいい天気ですね",
+    "I just finished my first track!!! it's called Neon Rain, took me like three weeks",
+    "honestly today was rough, work was a lot and I didn't get to practice guitar",
+    "Do you remember what I told you about my sketchbook project?",
+    "WHAT IS THE BEST DAW FOR BEGINNERS",
+    "Could you build me a playlist for studying?",
+    "set up a reminder for the art challenge deadline",
+    "generate a character backstory for my D&D rogue",
+    "tell me a story about a bunny astronaut",
+]
+
+
+def reference_classify(message: str):
+    return intent_module._pick_intent(intent_module._reference_scores(message.lower().strip()))
+
+
+def compiled_classify(message: str):
+    # Bypass the memo to time the matcher itself
+    return intent_module._classify_normalized.__wrapped__(message.lower().strip())
+
+
+def time_per_message(classify: Callable[[str], Any], messages: List[str], repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for message in messages:
+            classify(message)
+    return (time.perf_counter() - started) / (repeats * len(messages)) * 1e6
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    mismatches = []
+    for message in CORPUS:
+        expected = reference_classify(message)
+        actual = compiled_classify(message)
+        if expected != actual:
+            mismatches.append({"message": message, "reference": expected.value, "compiled": actual.value})
+
+    intent_module._classify_normalized.cache_clear()
+    timings = {
+        "reference_us": time_per_message(reference_classify, CORPUS, args.repeats),
+        "compiled_us": time_per_message(compiled_classify, CORPUS, args.repeats),
+        "memoized_us": time_per_message(classify_intent, CORPUS, args.repeats),
+    }
+    labels: Dict[str, int] = {}
+    for message in CORPUS:
+        label = classify_intent(message).value
+        labels[label] = labels.get(label, 0) + 1
+
+    return {
+        "config": {"messages": len(CORPUS), "repeats": args.repeats},
+        "timings": {name: round(value, 3) for name, value in timings.items()},
+        "speedup": {
+            "compiled": round(timings["reference_us"] / timings["compiled_us"], 2),
+            "memoized": round(timings["reference_us"] / timings["memoized_us"], 2),
+        },
+        "labels": labels,
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the compiled intent classifier against the reference loop",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--repeats", type=int, default=100, help="Passes over the corpus per timing")
+    parser.add_argument("--output", type=str, help="Write JSON report to this path")
+
+    args = parser.parse_args()
+    report = run(args)
+
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(rendered, encoding="utf-8")
+        logger.info(f"[Bench] Report written to {args.output}")
+    else:
+        print(rendered)
+
+    if report["mismatches"]:
+        logger.error(f"[Bench] {len(report['mismatches'])} message(s) labeled differently")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
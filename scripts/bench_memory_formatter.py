@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Memory formatter micro-benchmark - precomputed fact index vs the original
+score-every-fact loop, over synthetic envelopes of ``--facts`` facts.
+
+Every message selects the same facts, in the same order, under both
+implementations; any disagreement is reported and the run exits 1. Timings
+are per-turn means over ``--turns`` messages for:
+
+    reference   tokenize + score + sort every fact (old algorithm)
+    index_cold  build the envelope's index, then select (first turn)
+    index_warm  select from the cached index (every later turn)
+    format      format_memory_for_llm end to end, as called per turn
+
+Usage:
+    python scripts/bench_memory_formatter.py
+    python scripts/bench_memory_formatter.py --facts 5000 --turns 200 --output bench_memory.json
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from abby_core.rag import memory_formatter  # noqa: E402
+from abby_core.rag.memory_formatter import (  # noqa: E402
+    MAX_FACTS,
+    MemoryFactIndex,
+    _reference_scored_facts,
+    format_memory_for_llm,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+# format_memory_for_llm logs at INFO on every call
+logging.getLogger(memory_formatter.__name__).setLevel(logging.WARNING)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+TOPICS = [
+    "makes lofi music with heavy beats", "is mixing an album in Ableton", "paints watercolor landscapes",
+    "sketches characters for a comic", "is writing a fantasy novel", "edits the third chapter every night",
+    "debugs a python discord bot", "is learning rust for a game engine", "streams speedruns on weekends",
+    "plays co-op games with friends", "has a cat named Miso", "drinks oat milk coffee",
+    "works night shifts at a hospital", "is studying for a chemistry exam", "collects vinyl records",
+    "runs a small art commission shop", "practices guitar scales daily", "designs posters for local bands",
+]
+
+MESSAGES = [
+    "can you help me with my music mix?", "what should I draw today", "my chapter feels slow",
+    "any tips to debug this function", "what game should we play tonight", "good morning!",
+    "I finished a new track, listen", "how do I price art commissions", "coffee or tea?",
+    "my cat knocked over my paint again", "help me plan a stream schedule", "lol",
+]
+
+
+def make_facts(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "text": f"alice {rng.choice(TOPICS)} since {rng.randint(2010, 2025)}",
+            "confidence": rng.choice([0.4, 0.6, 0.8, 0.95]),
+        }
+        for _ in range(count)
+    ]
+
+
+def reference_select(facts, message: str, min_score: int):
+    return [(score, fact) for score, fact in _reference_scored_facts(facts, message) if score >= min_score][:MAX_FACTS]
+
+
+def mean_us(fn, messages: List[str]) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        fn(message)
+    return (time.perf_counter() - started) / len(messages) * 1e6
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    facts = make_facts(rng, args.facts)
+    envelope = {"identity": {"username": "alice"}, "relational": {"memorable_facts": facts}}
+    messages = [rng.choice(MESSAGES) for _ in range(args.turns)]
+
+    mismatches = []
+    index = MemoryFactIndex(facts)
+    for message in MESSAGES:
+        expected = [id(fact) for _, fact in reference_select(facts, message, args.min_score)]
+        selected, _, _ = index.select(message.lower(), args.min_score)
+        if [id(fact) for _, fact, _ in selected] != expected:
+            mismatches.append(message)
+
+    def cold(message):
+        memory_formatter._text_features.cache_clear()
+        MemoryFactIndex(facts).select(message.lower(), args.min_score)
+
+    cold_messages = messages[: max(1, args.turns // 10)]
+    timings = {
+        "reference_us": mean_us(lambda m: reference_select(facts, m, args.min_score), messages),
+        "index_cold_us": mean_us(cold, cold_messages),
+        "index_warm_us": mean_us(lambda m: index.select(m.lower(), args.min_score), messages),
+        "format_us": mean_us(lambda m: format_memory_for_llm(envelope, m, min_relevance_score=args.min_score), messages),
+    }
+
+    return {
+        "config": {"facts": args.facts, "turns": args.turns, "min_score": args.min_score, "seed": args.seed},
+        "timings": {name: round(value, 1) for name, value in timings.items()},
+        "speedup": {"index_warm": round(timings["reference_us"] / timings["index_warm_us"], 1)},
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the memory fact index against the reference scoring loop",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--facts", type=int, default=1000, help="Facts per envelope")
+    parser.add_argument("--turns", type=int, default=100, help="Messages to format")
+    parser.add_argument("--min-score", type=int, default=20, help="Relevance threshold")
+    parser.add_argument("--seed", type=int, default=7, help="RNG seed for the synthetic envelope")
+    parser.add_argument("--output", type=str, help="Write JSON report to this path")
+
+    args = parser.parse_args()
+    report = run(args)
+
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(rendered, encoding="utf-8")
+        logger.info(f"[Bench] Report written to {args.output}")
+    else:
+        print(rendered)
+
+    if report["mismatches"]:
+        logger.error(f"[Bench] {len(report['mismatches'])} message(s) selected different facts")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""RAG retrieval benchmark - recall@k, MRR, query latency, ingest throughput
+and memory over a fixed synthetic multi-guild corpus.
+
+The corpus and labeled queries are defined below, so runs are comparable
+across commits. Documents go through rag/handler.ingest (prepare_rag_text,
+chunking, embedding, vector store) and queries through rag/handler.query
+with guild filters, exactly as the bot uses them. Everything lives in a
+temp directory and MongoDB is replaced by an in-memory stand-in, so the
+benchmark needs no services. The query cache is disabled to time cold
+queries.
+
+Offline CPU runs: the default embedder is the configured sentence-transformers
+model (needs its weights in the local HF cache). ``--embedder hashing`` swaps
+in a deterministic hashed bag-of-words embedder that needs nothing, useful
+for measuring store/pipeline changes in CI.
+
+Regression gates: pass ``--baseline`` with a previous JSON report; the run
+exits 1 if recall/MRR drop or p95 latency / ingest throughput regress past
+the given tolerances.
+
+Usage:
+    python scripts/bench_rag.py --output bench_rag.json
+    python scripts/bench_rag.py --store qdrant --embedder hashing --filler 200
+    python scripts/bench_rag.py --baseline bench_rag.json --max-latency-increase 0.3
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Time the retrieval path, not the caches
+os.environ["RAG_QUERY_CACHE_SIZE"] = "0"
+os.environ["EMBEDDING_CACHE_SIZE"] = "0"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from abby_core.rag import handler  # noqa: E402
+from abby_core.rag.vector_store import reset_vector_stores  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+GUILDS: Dict[str, Dict[str, str]] = {
+    "1001": {
+        "name": "Breeze Club",
+        "currency": "Breeze Coins",
+        "mod_channel": "#mod-mail",
+        "art_channel": "#art-gallery",
+        "event_day": "Friday",
+        "starter_role": "Seedling",
+        "top_role": "Storm Chaser",
+        "weekly_limit": "three",
+        "appeal": "the appeal form pinned in #appeals",
+        "highlight": "the spring remix contest",
+    },
+    "1002": {
+        "name": "Pixel Harbor",
+        "currency": "Harbor Shells",
+        "mod_channel": "#ask-the-crew",
+        "art_channel": "#showcase",
+        "event_day": "Wednesday",
+        "starter_role": "Deckhand",
+        "top_role": "Captain",
+        "weekly_limit": "five",
+        "appeal": "a direct message to the Harbor Master bot",
+        "highlight": "the pixel art speedrun",
+    },
+    "1003": {
+        "name": "Lofi Lounge",
+        "currency": "Vinyl Points",
+        "mod_channel": "#support-desk",
+        "art_channel": "#cover-art",
+        "event_day": "Sunday",
+        "starter_role": "Listener",
+        "top_role": "Resident DJ",
+        "weekly_limit": "two",
+        "appeal": "an email to the lounge staff",
+        "highlight": "the late night beat tape",
+    },
+}
+
+# (document_type, scope, title, body template, query templates)
+TOPICS: List[Tuple[str, str, str, str, List[str]]] = [
+    (
+        "guidelines", "rules", "Community Rules",
+        "# Community Rules 📜\n"
+        "Welcome to {name}! Please follow these rules.\n"
+        "- Be kind and respectful to every member.\n"
+        "- **No spam**, no unsolicited advertising and no self promotion outside the promo channel.\n"
+        "- NSFW content is not allowed anywhere in the server.\n"
+        "- Report anyone breaking the rules in {mod_channel} so moderators can help.",
+        ["Where do I report someone breaking the rules?", "Is spam or advertising allowed here?"],
+    ),
+    (
+        "faq", "roles", "Roles and Levels",
+        "## Roles and Levels ⭐\n"
+        "Everyone starts with the {starter_role} role after verifying.\n"
+        "- Chatting earns XP and every ten levels unlocks a new role.\n"
+        "- The highest level role is {top_role}, reached at level fifty.\n"
+        "- Roles unlock extra channels, custom colors and voice permissions.",
+        ["How do I get the {top_role} role?", "What role do new members start with?"],
+    ),
+    (
+        "policy", "submissions", "Art Submissions",
+        "# Art Submissions 🎨\n"
+        "Share your artwork in {art_channel}.\n"
+        "- You may post {weekly_limit} submissions per week.\n"
+        "- Accepted formats are PNG, JPG and GIF up to eight megabytes.\n"
+        "- Always credit collaborators and never repost art made by others.",
+        ["How many art submissions can I post each week?", "Which channel do I submit my artwork to?"],
+    ),
+    (
+        "faq", "economy", "Server Economy",
+        "## Server Economy 💰\n"
+        "Our currency is {currency}.\n"
+        "- Claim a daily bonus once every day to earn {currency}.\n"
+        "- You can tip other members to thank them for help.\n"
+        "- Savings in the bank earn a small amount of interest each week.",
+        ["How do I earn {currency}?", "Can I tip other members?"],
+    ),
+    (
+        "guidelines", "events", "Weekly Events",
+        "# Weekly Events 🎉\n"
+        "Game night runs every {event_day} evening in the stage channel.\n"
+        "- Movie watch parties happen once a month.\n"
+        "- Event winners receive bonus {currency} and a temporary badge.\n"
+        "- Suggest new event ideas in the suggestions channel.",
+        ["When is game night?", "What do event winners receive?"],
+    ),
+    (
+        "policy", "moderation", "Warnings and Appeals",
+        "# Warnings and Appeals ⚖️\n"
+        "Moderators issue warnings for rule violations.\n"
+        "- Three warnings lead to a one day timeout.\n"
+        "- Serious violations can result in an immediate ban.\n"
+        "- To appeal a ban or timeout, send {appeal}.",
+        ["How do I appeal a ban?", "What happens after three warnings?"],
+    ),
+    (
+        "faq", "music", "Music and Voice",
+        "## Music and Voice 🎧\n"
+        "Join any voice lounge and use the play command to queue a song.\n"
+        "- The skip command needs votes from half of the listeners.\n"
+        "- Playlists are limited to fifty tracks per request.\n"
+        "- Please keep microphones muted during listening parties.",
+        ["How do I play music in voice chat?", "How does skipping a song work?"],
+    ),
+    (
+        "weekly_summary", "community", "Weekly Recap",
+        "# Weekly Recap 📰\n"
+        "This week in {name} the highlight was {highlight}.\n"
+        "- Over two hundred messages were shared in the art channels.\n"
+        "- New members were welcomed by the greeter team.\n"
+        "- Next week brings another round of community events.",
+        ["What was the highlight of last week?", "What happened in the community this week?"],
+    ),
+]
+
+_FILLER_WORDS = (
+    "garden lantern river puzzle orbit velvet harbor meadow signal canvas "
+    "ember quartz willow beacon summit thistle compass glacier marble cedar "
+    "falcon prism tundra saffron echo lagoon nimbus copper ripple aurora"
+).split()
+
+
+def build_corpus(filler_per_guild: int = 0) -> List[Dict[str, Any]]:
+    """Deterministic documents: every topic for every guild plus filler notes."""
+    documents = []
+    for guild_id, profile in GUILDS.items():
+        for document_type, scope, title, template, _ in TOPICS:
+            documents.append({
+                "guild_id": guild_id,
+                "document_type": document_type,
+                "scope": scope,
+                "title": title,
+                "text": template.format(**profile),
+            })
+        for idx in range(filler_per_guild):
+            words = [
+                _FILLER_WORDS[(idx * 7 + offset * 3 + int(guild_id)) % len(_FILLER_WORDS)]
+                for offset in range(60)
+            ]
+            documents.append({
+                "guild_id": guild_id,
+                "document_type": "notes",
+                "scope": "general",
+                "title": f"Archive Note {idx}",
+                "text": " ".join(words).capitalize() + ".",
+            })
+    return documents
+
+
+def build_queries() -> List[Dict[str, str]]:
+    """Labeled queries: each has exactly one relevant (guild, title) document."""
+    queries = []
+    for guild_id, profile in GUILDS.items():
+        for _, _, title, _, templates in TOPICS:
+            for template in templates:
+                queries.append({"guild_id": guild_id, "title": title, "text": template.format(**profile)})
+    return queries
+
+
+# ---------------------------------------------------------------------------
+# Offline stand-ins
+# ---------------------------------------------------------------------------
+
+class InMemoryRagDocuments:
+    """The rag_documents helpers ingest uses, backed by a dict."""
+
+    def __init__(self) -> None:
+        self.chunks: Dict[str, Dict[str, Any]] = {}
+
+    def get_document_by_id(self, document_id: str) -> Optional[Dict[str, Any]]:
+        return next((doc for doc in self.chunks.values() if doc["document_id"] == document_id), None)
+
+    def get_max_version_for_document(self, document_type: str, title: str) -> int:
+        versions = [
+            doc["version"] for doc in self.chunks.values()
+            if doc["document_type"] == document_type and doc["title"] == title
+        ]
+        return max(versions, default=0)
+
+    def insert_rag_chunks(self, chunks: List[Dict[str, Any]]) -> bool:
+        for chunk in chunks:
+            self.chunks[chunk["_id"]] = chunk
+        return True
+
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbeddings:
+    """Deterministic hashed bag-of-words (unigrams + bigrams), L2-normalized.
+
+    Not a semantic model; it only needs to be stable and cheap so pipeline
+    and store changes can be measured without model weights.
+    """
+
+    dimension = 384
+
+    def encode(self, texts: List[str], cache: bool = True) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN.findall(text.lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dimension
+                vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (Linux /proc, falls back to peak RSS)."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _configure_store(store: str, workdir: str) -> None:
+    os.environ["VECTOR_STORE"] = store
+    os.environ["CHROMA_PERSIST_DIR"] = os.path.join(workdir, "chroma")
+    os.environ["QDRANT_PATH"] = os.path.join(workdir, "qdrant")
+    # QDRANT_LOCATION / QDRANT_URL would point the run at a real deployment
+    os.environ.pop("QDRANT_LOCATION", None)
+    os.environ.pop("QDRANT_URL", None)
+    reset_vector_stores()
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+def first_relevant_rank(results: List[Dict[str, Any]], relevant_document_id: str) -> Optional[int]:
+    """1-based rank of the first chunk from the relevant document, if retrieved."""
+    for rank, result in enumerate(results, start=1):
+        if result["metadata"].get("document_id") == relevant_document_id:
+            return rank
+    return None
+
+
+def retrieval_metrics(ranks: List[Optional[int]], ks: List[int]) -> Dict[str, float]:
+    total = len(ranks) or 1
+    metrics = {f"recall@{k}": sum(1 for r in ranks if r is not None and r <= k) / total for k in ks}
+    metrics["mrr"] = sum(1.0 / r for r in ranks if r) / total
+    return {name: round(value, 4) for name, value in metrics.items()}
+
+
+def latency_summary(samples_ms: List[float]) -> Dict[str, float]:
+    if not samples_ms:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+    values = np.asarray(samples_ms)
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], args: argparse.Namespace) -> List[str]:
+    """Human-readable regressions of report vs baseline (empty if within tolerance)."""
+    regressions = []
+    for name, value in baseline.get("retrieval", {}).items():
+        current = report["retrieval"].get(name)
+        if current is not None and value - current > args.max_recall_drop:
+            regressions.append(f"{name} dropped {value:.4f} -> {current:.4f}")
+
+    base_p95 = baseline.get("query_latency", {}).get("p95_ms")
+    p95 = report["query_latency"]["p95_ms"]
+    if base_p95 and p95 > base_p95 * (1 + args.max_latency_increase):
+        regressions.append(f"p95 query latency rose {base_p95:.2f}ms -> {p95:.2f}ms")
+
+    base_rate = baseline.get("ingest", {}).get("chunks_per_second")
+    rate = report["ingest"]["chunks_per_second"]
+    if base_rate and rate < base_rate * (1 - args.max_throughput_drop):
+        regressions.append(f"ingest throughput fell {base_rate:.1f} -> {rate:.1f} chunks/s")
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Run
+# ---------------------------------------------------------------------------
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    documents = build_corpus(args.filler)
+    queries = build_queries()
+    ks = sorted({k for k in (1, 3, args.top_k) if k <= args.top_k})
+
+    mongo = InMemoryRagDocuments()
+    handler.get_document_by_id = mongo.get_document_by_id
+    handler.get_max_version_for_document = mongo.get_max_version_for_document
+    handler.insert_rag_chunks = mongo.insert_rag_chunks
+    # Telemetry would append one event per call to the shared events log
+    handler.emit_event = lambda *a, **kw: None
+    if args.embedder == "hashing":
+        handler.Embeddings = HashingEmbeddings
+
+    with tempfile.TemporaryDirectory(prefix="bench_rag_") as workdir:
+        _configure_store(args.store, workdir)
+        # Load the model / open the store outside the timed sections
+        handler.Embeddings().encode(["warm up"])
+        handler.get_vector_store()
+
+        rss_before = _rss_mb()
+        expected: Dict[Tuple[str, str], str] = {}
+        chunks = words = 0
+        started = time.perf_counter()
+        for doc in documents:
+            result = handler.ingest(
+                doc["document_type"], doc["title"], doc["text"],
+                guild_id=doc["guild_id"], scope=doc["scope"],
+            )
+            expected[(doc["guild_id"], doc["title"])] = result["document_id"]
+            chunks += result["ingested_chunks"]
+            words += len(doc["text"].split())
+        ingest_seconds = time.perf_counter() - started
+        rss_after_ingest = _rss_mb()
+        logger.info(f"[Bench] Ingested {len(documents)} documents ({chunks} chunks) in {ingest_seconds:.2f}s")
+
+        ranks: List[Optional[int]] = []
+        latencies: List[float] = []
+        leaks = 0
+        for repeat in range(args.repeats):
+            for item in queries:
+                started = time.perf_counter()
+                results = handler.query(item["text"], guild_id=item["guild_id"], top_k=args.top_k)["results"]
+                latencies.append((time.perf_counter() - started) * 1000)
+                if repeat == 0:
+                    ranks.append(first_relevant_rank(results, expected[(item["guild_id"], item["title"])]))
+                    leaks += sum(1 for r in results if r["metadata"].get("guild_id") != item["guild_id"])
+        rss_after_queries = _rss_mb()
+        reset_vector_stores()
+
+    misses = [q["text"] for q, rank in zip(queries, ranks) if rank is None]
+    return {
+        "config": {
+            "store": args.store,
+            "embedder": args.embedder,
+            "embedding_model": os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2") if args.embedder == "model" else None,
+            "top_k": args.top_k,
+            "repeats": args.repeats,
+            "filler_per_guild": args.filler,
+        },
+        "corpus": {
+            "guilds": len(GUILDS),
+            "documents": len(documents),
+            "chunks": chunks,
+            "queries": len(queries),
+        },
+        "retrieval": retrieval_metrics(ranks, ks),
+        "query_latency": latency_summary(latencies),
+        "ingest": {
+            "seconds": round(ingest_seconds, 3),
+            "documents_per_second": round(len(documents) / ingest_seconds, 1) if ingest_seconds else 0.0,
+            "chunks_per_second": round(chunks / ingest_seconds, 1) if ingest_seconds else 0.0,
+            "words_per_second": round(words / ingest_seconds, 1) if ingest_seconds else 0.0,
+        },
+        "memory": {
+            "rss_start_mb": round(rss_before, 1),
+            "ingest_rss_delta_mb": round(rss_after_ingest - rss_before, 1),
+            "query_rss_delta_mb": round(rss_after_queries - rss_after_ingest, 1),
+        },
+        "guild_leaks": leaks,
+        "missed_queries": misses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark RAG retrieval quality, latency, ingest throughput and memory",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--store", choices=["chroma", "qdrant"], default="chroma",
+                        help="Vector store backend, created in a temp dir (default chroma)")
+    parser.add_argument("--embedder", choices=["model", "hashing"], default="model",
+                        help="model = EMBEDDING_MODEL via Embeddings; hashing = offline, no weights")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3, help="Query passes used for latency percentiles")
+    parser.add_argument("--filler", type=int, default=0, help="Extra distractor documents per guild")
+    parser.add_argument("--output", type=str, help="Write JSON report to this path")
+    parser.add_argument("--baseline", type=str, help="Previous JSON report to gate against")
+    parser.add_argument("--max-recall-drop", type=float, default=0.02,
+                        help="Allowed absolute drop in recall@k / MRR (default 0.02)")
+    parser.add_argument("--max-latency-increase", type=float, default=0.25,
+                        help="Allowed relative p95 latency increase (default 0.25)")
+    parser.add_argument("--max-throughput-drop", type=float, default=0.25,
+                        help="Allowed relative ingest throughput drop (default 0.25)")
+
+    args = parser.parse_args()
+    report = run(args)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("config") != report["config"]:
+            logger.warning("[Bench] Baseline was run with a different config; comparison may not be meaningful")
+        report["regressions"] = compare_to_baseline(report, baseline, args)
+
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(rendered, encoding="utf-8")
+        logger.info(f"[Bench] Report written to {args.output}")
+    else:
+        print(rendered)
+
+    if report.get("regressions"):
+        for regression in report["regressions"]:
+            logger.error(f"[Bench] Regression: {regression}")
+        sys.exit(1)
+    if report["guild_leaks"]:
+        logger.error(f"[Bench] {report['guild_leaks']} results crossed guild boundaries")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Burst Limiter Tests
+
+Validates the ring-buffer burst limiter: decisions match a linear scan of
+message times for random traffic, sessions are seeded once from their
+recent messages and never rescanned, windows follow each guild's
+usage_limits.burst settings, and the usage gate rejects bursts through it.
+
+Run with: pytest tests/test_burst_limiter.py -v
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from abby_core.services import usage_gate_service as usage_gate_module
+from abby_core.services.burst_limiter import BurstLimiter
+from abby_core.services.usage_gate_service import UsageGateService
+
+T0 = datetime(2026, 3, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class TestSlidingWindow:
+    """Ring buffer decisions against the reference scan."""
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(48)
+        for trial in range(50):
+            limiter = BurstLimiter()
+            max_messages, window = rng.randint(1, 8), rng.choice([5, 30, 60])
+            now, history = T0, []
+            limiter.check("s", max_messages, window, now)
+
+            for _ in range(200):
+                now += timedelta(seconds=rng.choice([0, 0.5, 1, 3, 10, 61]))
+                in_window = sum(1 for t in history if t > now - timedelta(seconds=window))
+                expected = in_window if in_window >= max_messages else None
+
+                result = limiter.check("s", max_messages, window, now)
+
+                assert (result is not None) == (expected is not None), (trial, now)
+                if rng.random() < 0.7:
+                    history.append(now)
+                    limiter.record("s", [now])
+
+    def test_boundary_is_exclusive(self):
+        limiter = BurstLimiter()
+        limiter.check("s", 2, 60, T0)
+        limiter.record("s", [T0, T0 + timedelta(seconds=1)])
+
+        assert limiter.check("s", 2, 60, T0 + timedelta(seconds=59)) == 2
+        assert limiter.check("s", 2, 60, T0 + timedelta(seconds=60)) is None
+
+
+class TestSeeding:
+    """Sessions are read once, then served from the ring."""
+
+    def test_seed_called_once(self):
+        limiter = BurstLimiter()
+        calls = []
+
+        def seed():
+            calls.append(1)
+            return [T0 + timedelta(seconds=i) for i in range(3)]
+
+        assert limiter.check("s", 3, 60, T0 + timedelta(seconds=5), seed=seed) == 3
+        limiter.record("s", [T0 + timedelta(seconds=6)])
+        assert limiter.check("s", 3, 60, T0 + timedelta(seconds=61.5), seed=seed) is None
+
+        assert calls == [1]
+        assert limiter.stats()["seeded"] == 1
+
+    def test_resized_when_guild_limit_changes(self):
+        limiter = BurstLimiter()
+        limiter.check("s", 4, 60, T0, seed=lambda: [T0] * 4)
+
+        assert limiter.check("s", 2, 60, T0) == 2  # Shrunk to the newest 2
+        assert limiter.check("s", 6, 60, T0) is None
+
+    def test_lru_bounds_memory(self):
+        limiter = BurstLimiter(max_sessions=2)
+        for session_id in ("a", "b", "c"):
+            limiter.check(session_id, 1, 60, T0)
+
+        assert limiter.stats()["sessions"] == 2
+        assert limiter.stats()["evictions"] == 1
+
+
+class TestUsageGate:
+    """check_usage_gate's burst gate uses per-guild windows."""
+
+    LIMITS = {
+        1: {"max_messages": 4, "window_seconds": 60},
+        2: {"max_messages": 10, "window_seconds": 60},
+    }
+
+    @pytest.fixture
+    def limiter(self, monkeypatch):
+        limiter = BurstLimiter()
+        monkeypatch.setattr(usage_gate_module, "get_burst_limiter", lambda: limiter)
+        monkeypatch.setattr(usage_gate_module, "get_memory_settings", lambda guild_id: {
+            "usage_limits": {
+                "conversation": {"max_turns_per_session": 100, "session_timeout_seconds": 600},
+                "burst": self.LIMITS[guild_id],
+            }
+        })
+        return limiter
+
+    def session(self, session_id, messages):
+        now = datetime.now(timezone.utc)
+        return {
+            "session_id": session_id,
+            "created_at": now,
+            "turn_count": 0,
+            "interactions": [
+                {"role": "user", "content": "hi", "timestamp": (now - timedelta(seconds=i)).isoformat()}
+                for i in reversed(range(messages))
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_window_per_guild(self, limiter):
+        gate = UsageGateService()
+
+        strict = await gate.check_usage_gate(1, 7, session=self.session("s-1", 6))
+        relaxed = await gate.check_usage_gate(2, 7, session=self.session("s-2", 6))
+
+        assert strict.burst_limit_hit
+        assert relaxed.allowed
+
+    @pytest.mark.asyncio
+    async def test_long_history_is_not_rescanned(self, limiter):
+        class ScanCountingList(list):
+            scans = 0
+
+            def __iter__(self):
+                ScanCountingList.scans += 1
+                return super().__iter__()
+
+        gate = UsageGateService()
+        session = self.session("s-1", 2)
+        session["interactions"] = ScanCountingList([{"timestamp": T0}] * 5000 + session["interactions"])
+
+        for _ in range(5):
+            assert (await gate.check_usage_gate(1, 7, session=session)).allowed
+
+        assert ScanCountingList.scans == 1
+        assert limiter.stats()["seeded"] == 1
@@ -0,0 +1,226 @@
+"""
+Canon Overlay Resolution Tests
+
+Validates precomputed persona overlays: lookups match the original
+persona_identity query, resolved documents are reused instead of re-queried,
+approvals rebuild the resolved document with a new version hash (or drop
+it for the next lookup to rebuild when that fails), and build
+time / approval-to-visible latency are reported.
+
+Run with: pytest tests/test_canon_overlay_resolution.py -v
+"""
+
+import random
+import re
+
+import pytest
+
+from abby_core.database import mongodb
+from abby_core.personality import canon_service
+from abby_core.personality.schema import CanonArtifact, CanonOriginType, CanonType
+
+
+class FakeCollection:
+    """In-memory collection covering the queries canon_service issues."""
+
+    def __init__(self):
+        self.docs = []
+        self.queries = 0
+
+    @staticmethod
+    def _matches(doc, query):
+        for field, cond in query.items():
+            value = doc.get(field)
+            if isinstance(cond, dict) and "$regex" in cond:
+                flags = re.IGNORECASE if "i" in cond.get("$options", "") else 0
+                if not (isinstance(value, str) and re.search(cond["$regex"], value, flags)):
+                    return False
+            elif isinstance(cond, dict) and "$in" in cond:
+                if value not in cond["$in"]:
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    def find(self, query=None):
+        self.queries += 1
+        return [dict(doc) for doc in self.docs if self._matches(doc, query or {})]
+
+    def find_one(self, query):
+        found = self.find(query)
+        return found[0] if found else None
+
+    def count_documents(self, query):
+        return len(self.find(query))
+
+    def distinct(self, field, query=None):
+        return list(dict.fromkeys(doc.get(field) for doc in self.find(query)))
+
+    def insert_one(self, doc):
+        self.docs.append(dict(doc))
+
+    def update_one(self, query, update):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                doc.update(update.get("$set", {}))
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs = [d for d in self.docs if not self._matches(d, query)]
+        self.docs.append(dict(doc))
+
+    def delete_one(self, query):
+        self.docs = [d for d in self.docs if not self._matches(d, query)]
+
+
+class FakeVersion:
+    def __init__(self):
+        self.value = 0
+
+    def current(self):
+        return self.value
+
+
+@pytest.fixture
+def canon(monkeypatch):
+    """Fresh overlay state backed by in-memory collections."""
+    collections = {name: FakeCollection() for name in ("identity", "resolved", "staging", "commits")}
+    version = FakeVersion()
+
+    def bump(reason):
+        version.value += 1
+        return version.value
+
+    monkeypatch.setattr(mongodb, "get_canon_persona_identity_collection", lambda: collections["identity"])
+    monkeypatch.setattr(mongodb, "get_canon_persona_overlays_collection", lambda: collections["resolved"])
+    monkeypatch.setattr(mongodb, "get_canon_staging_collection", lambda: collections["staging"])
+    monkeypatch.setattr(mongodb, "get_canon_commits_collection", lambda: collections["commits"])
+    monkeypatch.setitem(canon_service.CANON_COLLECTION_BY_TYPE, CanonType.PERSONA, lambda: collections["identity"])
+    monkeypatch.setattr(canon_service, "get_persona_cache_version", lambda: version)
+    monkeypatch.setattr(canon_service, "bump_persona_version", bump)
+    monkeypatch.setattr(canon_service, "_resolved_cache", {})
+    monkeypatch.setattr(canon_service, "_seen_overlay_hashes", {})
+    monkeypatch.setattr(canon_service, "_overlay_stats", dict(canon_service._overlay_stats))
+    return collections
+
+
+def overlay_doc(persona, topic, domain, version, content):
+    suffix = f".{domain}" if domain else ""
+    doc = {
+        "canonical_id": f"persona.{persona}.{topic}{suffix}.v1",
+        "version": version,
+        "artifact": {"artifact_type": "persona", "name": persona, "topic": topic},
+        "content": content,
+    }
+    if domain is not None:
+        doc["artifact"]["domain"] = domain
+    return doc
+
+
+def reference_overlays(docs, persona, domains, aliases):
+    """What the original persona_identity query returned."""
+    keys = {re.sub(r"[^a-z0-9]+", "-", n.lower()).strip("-") or n.lower() for n in [persona] + aliases if n}
+    regex = re.compile(r"^persona\.(?:%s)\." % "|".join(re.escape(k) for k in keys), re.IGNORECASE)
+    lowered = [d.lower() for d in domains]
+    allowed = {*lowered, *domains, *[d.title() for d in lowered]}
+    matched = [
+        d for d in docs
+        if regex.search(d["canonical_id"])
+        and (not domains or d["artifact"].get("domain") is None or d["artifact"].get("domain") in allowed)
+    ]
+    # Ties, in natural order for Mongo, are ordered by canonical id
+    return sorted(matched, key=lambda d: (d["artifact"].get("domain") is not None,
+                                          d["artifact"].get("domain") or "", -d["version"], d["canonical_id"]))
+
+
+def stage_persona(topic, content, name="Abby"):
+    return canon_service.stage_document(
+        title=f"{name} {topic}",
+        canon_type=CanonType.PERSONA,
+        artifact=CanonArtifact(artifact_type="persona", name=name, topic=topic),
+        content=content,
+        submitted_by="42",
+        origin_type=CanonOriginType.DISCORD,
+    )
+
+
+class TestResolvedOverlays:
+    """Lookups served from the materialized documents."""
+
+    def test_matches_original_query(self, canon):
+        rng = random.Random(3)
+        for i in range(60):
+            canon["identity"].insert_one(overlay_doc(
+                rng.choice(["abby", "bunny", "kiki"]),
+                rng.choice(["voice", "values", "boundaries"]),
+                rng.choice([None, "writing", "Music", "moderation"]),
+                rng.randint(1, 4),
+                f"content {i}",
+            ))
+
+        for domains in (["global"], ["global", "writing"], ["global", "music"], []):
+            for persona, aliases in (("bunny", ["Abby"]), ("kiki", []), ("nobody", [])):
+                got = canon_service.get_persona_overlays(persona, domains, persona_aliases=aliases)
+                expected = reference_overlays(canon["identity"].docs, persona, domains, aliases)
+                assert [(o["canonical_id"], o["content"]) for o in got] == \
+                       [(o["canonical_id"], o["content"]) for o in expected]
+
+    def test_resolved_documents_are_reused(self, canon):
+        canon["identity"].insert_one(overlay_doc("abby", "voice", None, 1, "Speak softly."))
+
+        for intent in ("writing", "music", "writing", "moderation"):
+            canon_service.get_persona_overlays("bunny", ["global", intent], persona_aliases=["abby"])
+
+        stats = canon_service.get_overlay_stats()
+        assert canon["identity"].queries == 2  # One build per key (abby, bunny), then never again
+        assert canon["resolved"].queries == 1
+        assert stats["cache_hits"] == 3
+        assert stats["last_build_ms"] is not None
+
+    def test_stored_documents_survive_restart(self, canon):
+        canon["identity"].insert_one(overlay_doc("abby", "voice", None, 1, "Speak softly."))
+        canon_service.get_persona_overlays("abby", ["global"])
+        canon_service._resolved_cache.clear()  # New worker process
+        queries = canon["identity"].queries
+
+        assert len(canon_service.get_persona_overlays("abby", ["global"])) == 1
+        assert canon["identity"].queries == queries
+
+
+class TestApproval:
+    """Approvals rebuild the resolved document and reach readers."""
+
+    def test_approval_rebuilds_and_is_visible(self, canon):
+        assert canon_service.get_persona_overlays("abby", ["global"]) == []
+        first_hash = canon["resolved"].find_one({"_id": "abby"})["version_hash"]
+
+        staged = stage_persona("voice", "Speak softly and kindly.")
+        canon_service.approve_document(staged["_id"], approver_id="7")
+
+        resolved = canon["resolved"].find_one({"_id": "abby"})
+        assert resolved["version_hash"] != first_hash
+        overlays = canon_service.get_persona_overlays("abby", ["global"])
+        assert [o["content"] for o in overlays] == ["Speak softly and kindly."]
+        assert canon_service.get_overlay_stats()["last_visible_latency_ms"] is not None
+
+    def test_failed_rebuild_is_retried_on_next_lookup(self, canon, monkeypatch):
+        assert canon_service.get_persona_overlays("abby", ["global"]) == []
+        build = canon_service.build_persona_overlays
+
+        def fail(*args, **kwargs):
+            raise ConnectionError("mongo blip")
+
+        monkeypatch.setattr(canon_service, "build_persona_overlays", fail)
+        staged = stage_persona("voice", "Speak softly and kindly.")
+        canon_service.approve_document(staged["_id"], approver_id="7")
+        monkeypatch.setattr(canon_service, "build_persona_overlays", build)
+
+        assert canon["resolved"].find_one({"_id": "abby"}) is None
+        overlays = canon_service.get_persona_overlays("abby", ["global"])
+        assert [o["content"] for o in overlays] == ["Speak softly and kindly."]
+
+    def test_rebuild_all_keys(self, canon):
+        for persona in ("abby", "kiki"):
+            canon["identity"].insert_one(overlay_doc(persona, "voice", None, 1, f"{persona} voice"))
+
+        assert canon_service.rebuild_persona_overlays() == ["abby", "kiki"]
+        assert {doc["_id"] for doc in canon["resolved"].docs} == {"abby", "kiki"}
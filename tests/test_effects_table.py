@@ -0,0 +1,124 @@
+"""
+Compiled Effects Table Tests
+
+Validates memoized effect merging: compiled tables match merge_effects()
+for randomly generated state stacks, tables are reused for the same
+(state_id, version) set and rebuilt when a state's effects change, and
+type mismatches still raise without being cached.
+
+Run with: pytest tests/test_effects_table.py -v
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from abby_core.system import effects_merger
+from abby_core.system.effects_merger import compile_effects, merge_effects
+from abby_core.system.effects_registry import EFFECT_REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def fresh_tables():
+    effects_merger.clear_effects_tables()
+    yield
+    effects_merger.clear_effects_tables()
+
+
+def random_value(rng, schema):
+    if schema["type"] == "bool":
+        return rng.random() < 0.5
+    if schema["type"] == "number":
+        return rng.choice(schema.get("choices") or [schema["min"], schema["max"]])
+    return rng.choice(schema["options"])
+
+
+def random_states(rng):
+    """A stack of 0-5 states with frequent priority/start_at ties."""
+    base = datetime(2026, 1, 1)
+    states = []
+    for i in range(rng.randint(0, 5)):
+        keys = rng.sample(sorted(EFFECT_REGISTRY), rng.randint(0, 4))
+        states.append({
+            "state_id": f"state-{i}",
+            "priority": rng.choice([0, 10, 15]),
+            "start_at": rng.choice([None, base, base + timedelta(days=rng.randint(1, 3))]),
+            "effects": {key: random_value(rng, EFFECT_REGISTRY[key]) for key in keys},
+        })
+    return states
+
+
+class TestEquivalence:
+    """Compiled tables agree with the reference merge."""
+
+    def test_matches_merge_effects(self):
+        rng = random.Random(1234)
+        for _ in range(500):
+            states = random_states(rng)
+            expected = merge_effects(states)
+
+            table = compile_effects(states)
+
+            assert table.as_dict() == expected
+            for key, schema in EFFECT_REGISTRY.items():
+                assert table.get(key, "unset") == expected.get(key, "unset")
+                assert table.effective(key) == expected.get(key, schema.get("identity"))
+
+    def test_memoized_table_matches_after_reuse(self):
+        rng = random.Random(99)
+        stacks = [random_states(rng) for _ in range(20)]
+        for states in stacks + stacks:
+            assert compile_effects(states).as_dict() == merge_effects(states)
+
+        assert effects_merger.get_effects_table_stats()["hits"] >= 20
+
+
+class TestMemoization:
+    """Tables are keyed by the (state_id, version) set."""
+
+    def states(self):
+        return [
+            {"state_id": "winter-2026", "priority": 10, "start_at": datetime(2025, 12, 21),
+             "effects": {"affinity_modifier": 1.25}},
+            {"state_id": "valentines-2026", "priority": 15, "start_at": datetime(2026, 2, 1),
+             "effects": {"crush_system_enabled": True, "affinity_modifier": 1.5}},
+        ]
+
+    def test_same_state_set_reuses_table(self, monkeypatch):
+        calls = []
+        original = effects_merger.merge_effects
+        monkeypatch.setattr(effects_merger, "merge_effects", lambda s, **kw: calls.append(1) or original(s, **kw))
+
+        first = compile_effects(self.states())
+        second = compile_effects(self.states())
+
+        assert second is first
+        assert len(calls) == 1
+        assert first["affinity_modifier"] == pytest.approx(1.875)
+
+    def test_changed_effects_get_a_new_table(self):
+        states = self.states()
+        first = compile_effects(states)
+        states[1]["effects"]["affinity_modifier"] = 1.0
+
+        second = compile_effects(states)
+
+        assert second.fingerprint != first.fingerprint
+        assert second["affinity_modifier"] == pytest.approx(1.25)
+
+    def test_type_mismatch_raises_and_is_not_cached(self):
+        states = [{"state_id": "bad", "priority": 1, "effects": {"crush_system_enabled": "yes"}}]
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                compile_effects(states)
+        assert effects_merger.get_effects_table_stats()["size"] == 0
+
+    def test_table_is_read_only(self):
+        table = compile_effects(self.states())
+
+        with pytest.raises(TypeError):
+            table["crush_system_enabled"] = False
+        table.as_dict()["crush_system_enabled"] = False
+        assert table["crush_system_enabled"] is True
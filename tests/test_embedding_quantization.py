@@ -0,0 +1,182 @@
+"""
+Embedding Quantization Tests
+
+Validates reduced-precision vector storage (float16/int8), float32 rerank in
+QuantizedVectorIndex, the embedding LRU cache (stable across calls, bypassed
+for stored vectors), and shared model loading in Embeddings (with a fake
+model so no weights are downloaded).
+
+Run with: pytest tests/test_embedding_quantization.py -v
+"""
+
+import numpy as np
+import pytest
+
+from abby_core.rag import embeddings as embeddings_module
+from abby_core.rag.embeddings import EmbeddingError, Embeddings
+from abby_core.rag.quantization import (
+    EmbeddingCache,
+    QuantizedVectorIndex,
+    dequantize,
+    quantize,
+)
+
+
+@pytest.fixture
+def unit_vectors():
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(500, 64)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestQuantize:
+    """Round-trip precision per storage dtype."""
+
+    def test_float16_round_trip(self, unit_vectors):
+        data, scales = quantize(unit_vectors, "float16")
+
+        assert data.dtype == np.float16
+        assert scales is None
+        assert np.allclose(dequantize(data), unit_vectors, atol=1e-3)
+
+    def test_int8_round_trip(self, unit_vectors):
+        data, scales = quantize(unit_vectors, "int8")
+
+        assert data.dtype == np.int8
+        assert scales.shape == (500,)
+        restored = dequantize(data, scales)
+        assert restored.dtype == np.float32
+        assert np.abs(restored - unit_vectors).max() <= scales.max() / 2 + 1e-6
+
+    def test_zero_vector_is_safe(self):
+        data, scales = quantize(np.zeros((1, 8)), "int8")
+
+        assert not np.isnan(dequantize(data, scales)).any()
+
+    def test_unknown_dtype_rejected(self, unit_vectors):
+        with pytest.raises(ValueError):
+            quantize(unit_vectors, "int4")
+
+
+class TestQuantizedVectorIndex:
+    """Quantized shortlist + float32 rerank keeps agreement with exact search."""
+
+    @pytest.mark.parametrize("dtype", ["float16", "int8"])
+    def test_agreement_with_float32(self, unit_vectors, dtype):
+        ids = [str(i) for i in range(len(unit_vectors))]
+        exact = QuantizedVectorIndex(dtype="float32", rerank_factor=1)
+        exact.add(ids, unit_vectors)
+        quantized = QuantizedVectorIndex(dtype=dtype)
+        quantized.add(ids, unit_vectors)
+
+        queries = unit_vectors[:25] + 0.05
+        overlap = np.mean([
+            len({i for i, _ in exact.search(q, 5)} & {i for i, _ in quantized.search(q, 5)}) / 5
+            for q in queries
+        ])
+
+        assert overlap >= 0.95
+        assert quantized.nbytes < exact.nbytes
+
+    def test_scores_are_float32_cosine(self, unit_vectors):
+        index = QuantizedVectorIndex(dtype="int8")
+        index.add(["a", "b"], unit_vectors[:2])
+
+        top_id, score = index.search(unit_vectors[0], top_k=1)[0]
+
+        assert top_id == "a"
+        assert score == pytest.approx(1.0, abs=1e-2)
+
+    def test_empty_index(self):
+        assert QuantizedVectorIndex().search(np.ones(4), top_k=3) == []
+
+
+class TestEmbeddingCache:
+    """LRU bound and hit accounting."""
+
+    def test_lru_eviction_and_stats(self, unit_vectors):
+        cache = EmbeddingCache(max_entries=2, dtype="int8")
+        cache.put_many(["a", "b", "c"], unit_vectors[:3])
+
+        found = cache.get_many(["a", "b", "c"])
+
+        assert set(found) == {1, 2}
+        assert found[1].dtype == np.float32
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_disabled_cache(self, unit_vectors):
+        cache = EmbeddingCache(max_entries=0)
+        cache.put_many(["a"], unit_vectors[:1])
+
+        assert cache.get_many(["a"]) == {}
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = FakeModel()
+    loads = []
+
+    def load(model_name, device, runtime):
+        loads.append((model_name, device, runtime))
+        return model
+
+    monkeypatch.setattr(embeddings_module, "_models", {})
+    monkeypatch.setattr(embeddings_module, "_caches", {})
+    monkeypatch.setattr(embeddings_module, "_load_model", load)
+    return {"model": model, "loads": loads}
+
+
+class TestEmbeddings:
+    """Shared model loading and cache-merged encoding."""
+
+    def test_model_loaded_once_per_runtime(self, fake_model):
+        Embeddings(model_name="m", runtime="torch")
+        Embeddings(model_name="m", runtime="torch")
+        Embeddings(model_name="m", runtime="int8")
+
+        assert fake_model["loads"] == [("m", "cpu", "torch"), ("m", "cpu", "int8")]
+
+    def test_encode_only_misses(self, fake_model):
+        embedder = Embeddings(model_name="m", runtime="torch")
+        embedder.encode(["hi"])
+
+        vectors = embedder.encode(["hello", "hi"])
+
+        assert fake_model["model"].calls == [["hi"], ["hello"]]
+        assert vectors.tolist() == [[5.0, 1.0], [2.0, 1.0]]
+
+    def test_quantized_cache_returns_same_vector_every_call(self, fake_model, monkeypatch):
+        monkeypatch.setenv("EMBEDDING_CACHE_DTYPE", "int8")
+        embedder = Embeddings(model_name="m", runtime="torch")
+
+        first = embedder.encode(["hello there"])
+        second = embedder.encode(["hello there"])
+
+        assert fake_model["model"].calls == [["hello there"]]
+        assert first.tolist() == second.tolist()
+        assert first.tolist() != [[11.0, 1.0]]
+
+    def test_uncached_encode_is_exact_float32(self, fake_model, monkeypatch):
+        monkeypatch.setenv("EMBEDDING_CACHE_DTYPE", "int8")
+        embedder = Embeddings(model_name="m", runtime="torch")
+        embedder.encode(["hello there"])
+
+        vectors = embedder.encode(["hello there"], cache=False)
+
+        assert vectors.dtype == np.float32
+        assert vectors.tolist() == [[11.0, 1.0]]
+        assert embedder.cache.stats()["entries"] == 1
+
+    def test_unknown_runtime(self, fake_model):
+        with pytest.raises(EmbeddingError):
+            Embeddings(model_name="m", runtime="tensorrt")
@@ -0,0 +1,116 @@
+"""
+Event Calendar Tests
+
+Validates the precomputed season/event calendar: bisect lookups agree with
+a linear scan of the windows, Easter windows move with the year, the
+calendar is rebuilt at year rollover and after template edits, and the
+resolver uses it for cache expiry.
+
+Run with: pytest tests/test_event_calendar.py -v
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from abby_core.llm import system_state_resolver as resolver
+from abby_core.system import state_registry
+from abby_core.system.state_registry import EventCalendar, get_event_calendar, invalidate_event_calendar
+
+
+@pytest.fixture(autouse=True)
+def fresh_calendar(monkeypatch):
+    monkeypatch.setattr(state_registry, "_calendar", None)
+
+
+def random_times(year, count, seed):
+    rng = random.Random(seed)
+    start = datetime(year, 1, 1)
+    span = int((datetime(year + 2, 1, 1) - start).total_seconds())
+    times = [start + timedelta(seconds=rng.randrange(span)) for _ in range(count)]
+    # Exact boundaries are where off-by-one errors live
+    calendar = EventCalendar(year)
+    for window in calendar.windows:
+        times += [window.start_at, window.end_at, window.end_at + timedelta(microseconds=1)]
+    return times
+
+
+class TestEventCalendar:
+    """Bisect lookups over the precomputed windows."""
+
+    def test_active_at_matches_linear_scan(self):
+        calendar = EventCalendar(2026)
+        for when in random_times(2026, 2000, seed=7):
+            expected = {w.state_id for w in calendar.windows if w.start_at <= when <= w.end_at}
+            assert {w.state_id for w in calendar.active_at(when)} == expected
+
+    def test_next_transition_matches_linear_scan(self):
+        calendar = EventCalendar(2026)
+        boundaries = [w.start_at for w in calendar.windows] + \
+                     [w.end_at + timedelta(microseconds=1) for w in calendar.windows]
+        for when in random_times(2026, 2000, seed=8):
+            later = [b for b in boundaries if b > when]
+            assert calendar.next_transition(when) == (min(later) if later else None)
+
+    def test_covers_current_and_next_year(self):
+        calendar = EventCalendar(2026)
+        ids = {w.state_id for w in calendar.windows}
+
+        assert {"valentines-2026", "valentines-2027", "easter-2027", "21_days_breeze-2027"} <= ids
+        assert "winter-2026" in ids and "winter-2028" in ids  # Both year edges are covered
+        assert [w.state_id for w in calendar.active_at(datetime(2026, 1, 1))] == ["winter-2026"]
+        assert "spring-2028" not in ids
+
+    def test_easter_moves_with_the_year(self):
+        calendar = EventCalendar(2026)
+        easter = {w.state_id: w for w in calendar.windows if w.key == "easter"}
+
+        assert easter["easter-2026"].start_at == datetime(2026, 4, 3)  # Good Friday
+        assert easter["easter-2027"].start_at == datetime(2027, 3, 26)
+        assert easter["easter-2027"].end_at == datetime(2027, 3, 28, 23, 59, 59)
+
+
+class TestCalendarRebuild:
+    """Lazy rebuilds at year rollover and on template edits."""
+
+    def test_reused_within_a_year(self):
+        assert get_event_calendar(datetime(2026, 2, 1)) is get_event_calendar(datetime(2026, 11, 30))
+
+    def test_rebuilt_at_year_rollover(self):
+        old = get_event_calendar(datetime(2026, 12, 31, 23, 59))
+        new = get_event_calendar(datetime(2027, 1, 1))
+
+        assert new is not old
+        assert new.year == 2027
+        assert "valentines-2028" in {w.state_id for w in new.windows}
+
+    def test_rebuilt_after_template_edit(self, monkeypatch):
+        before = get_event_calendar(datetime(2026, 5, 1))
+        monkeypatch.setitem(state_registry.APPROVED_EVENT_TEMPLATES, "midsummer", {
+            "state_type": "event", "key": "midsummer", "label_template": "Midsummer {year}",
+            "canon_ref": "lore.events.midsummer.v1", "duration_days": 2, "start_month": 6,
+            "start_day": 23, "effects": {}, "priority": 15,
+        })
+        assert get_event_calendar(datetime(2026, 5, 1)) is before
+
+        invalidate_event_calendar()
+        calendar = get_event_calendar(datetime(2026, 5, 1))
+
+        assert calendar.next_transition(datetime(2026, 6, 22)) == datetime(2026, 6, 23)
+
+
+class TestResolverExpiry:
+    """Calendar boundaries expire cached resolutions."""
+
+    def test_calendar_boundary_before_database_boundary(self, monkeypatch):
+        monkeypatch.setattr(resolver, "query_next_transition", lambda now, scope: datetime(2026, 6, 21))
+
+        # Easter starts before the active season's recorded end
+        assert resolver._fetch_next_transition(datetime(2026, 3, 25), "global") == datetime(2026, 4, 3)
+
+    def test_database_boundary_before_calendar_boundary(self, monkeypatch):
+        override_end = datetime(2026, 3, 28)
+        monkeypatch.setattr(resolver, "query_next_transition", lambda now, scope: override_end)
+
+        assert resolver._fetch_next_transition(datetime(2026, 3, 25), "global") == override_end
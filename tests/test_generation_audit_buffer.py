@@ -0,0 +1,165 @@
+"""
+Generation Audit Write Buffer Tests
+
+Validates the batched audit write path used by GenerationAuditService:
+batching by size and interval, flush on shutdown, JSONL spill when Mongo is
+unavailable, replay once writes succeed again, and backlog/drop counts.
+
+Run with: pytest tests/test_generation_audit_buffer.py -v
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from abby_core.services.generation_audit_service import (
+    AuditWriteBuffer,
+    GenerationAuditService,
+)
+
+
+class FakeCollection:
+    """Stand-in for the generation_audit collection."""
+
+    def __init__(self):
+        self.batches = []
+        self.available = True
+
+    def insert_many(self, documents, ordered=True):
+        if not self.available:
+            raise ConnectionError("mongo down")
+        self.batches.append(list(documents))
+
+    @property
+    def documents(self):
+        return [doc for batch in self.batches for doc in batch]
+
+
+@pytest.fixture
+def collection():
+    return FakeCollection()
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return tmp_path / "audit_spill.jsonl"
+
+
+def make_buffer(collection, spill_path, **kwargs):
+    kwargs.setdefault("batch_size", 10)
+    kwargs.setdefault("flush_interval_ms", 20)
+    return AuditWriteBuffer(
+        write_batch=lambda docs: collection.insert_many(docs, ordered=False),
+        spill_path=spill_path,
+        **kwargs,
+    )
+
+
+def doc(i):
+    return {"audit_id": f"a{i}", "timestamp": datetime(2026, 1, 1, tzinfo=timezone.utc)}
+
+
+class TestAuditWriteBuffer:
+    """Batching, flushing and spill behaviour."""
+
+    def test_batches_by_size(self, collection, spill_path):
+        buffer = make_buffer(collection, spill_path, batch_size=5, flush_interval_ms=1000)
+        for i in range(10):
+            buffer.submit(doc(i))
+
+        assert buffer.flush(timeout=5)
+        assert [len(b) for b in collection.batches] == [5, 5]
+        buffer.close()
+
+    def test_partial_batch_flushed_by_interval(self, collection, spill_path):
+        buffer = make_buffer(collection, spill_path, batch_size=100)
+        for i in range(3):
+            buffer.submit(doc(i))
+
+        assert buffer.flush(timeout=5)
+        assert len(collection.documents) == 3
+        buffer.close()
+
+    def test_spills_when_mongo_down_and_replays(self, collection, spill_path):
+        buffer = make_buffer(collection, spill_path)
+        collection.available = False
+        buffer.submit(doc(1))
+        buffer.flush(timeout=5)
+
+        assert buffer.stats()["spill_backlog"] == 1
+        spilled = json.loads(spill_path.read_text().strip())
+        assert spilled["audit_id"] == "a1"
+
+        collection.available = True
+        buffer.submit(doc(2))
+        buffer.flush(timeout=5)
+
+        ids = sorted(d["audit_id"] for d in collection.documents)
+        assert ids == ["a1", "a2"]
+        assert isinstance(collection.documents[-1]["timestamp"], datetime)
+        assert buffer.stats()["spill_backlog"] == 0
+        assert buffer.stats()["replayed"] == 1
+        buffer.close()
+
+    def test_full_queue_spills_instead_of_dropping(self, collection, spill_path):
+        buffer = make_buffer(collection, spill_path, max_queue=1)
+        buffer._ensure_started = lambda: None  # Writer never drains
+        buffer.submit(doc(1))
+        buffer.submit(doc(2))
+
+        stats = buffer.stats()
+        assert stats["backlog"] == 1
+        assert stats["spilled"] == 1
+        assert stats["dropped"] == 0
+
+    def test_unwritable_spill_counts_drops(self, collection, tmp_path):
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        buffer = make_buffer(collection, blocker / "spill.jsonl", max_queue=1)
+        buffer._ensure_started = lambda: None
+        buffer.submit(doc(1))
+        buffer.submit(doc(2))
+
+        assert buffer.stats()["dropped"] == 1
+
+    def test_duplicate_key_errors_are_not_respilled(self):
+        class BulkError(Exception):
+            details = {"writeErrors": [{"index": 0, "code": 11000}, {"index": 1, "code": 2}]}
+
+        failed = AuditWriteBuffer._failed_documents([doc(0), doc(1)], BulkError())
+        assert [d["audit_id"] for d in failed] == ["a1"]
+
+
+class TestServiceWritePath:
+    """GenerationAuditService takes the insert off the caller's path."""
+
+    def test_log_generation_is_buffered_and_flushed_on_shutdown(self, collection, spill_path, monkeypatch):
+        monkeypatch.setenv("AUDIT_SPILL_PATH", str(spill_path))
+        monkeypatch.setenv("AUDIT_FLUSH_INTERVAL_MS", "5000")
+        service = GenerationAuditService(buffered=True)
+        monkeypatch.setattr(service, "_get_collection", lambda: collection)
+
+        service.log_generation(
+            audit_id="a1", provider="openai", model="gpt-4", input_tokens=10, output_tokens=5, latency_ms=12.0
+        )
+        service.shutdown()
+
+        assert [d["audit_id"] for d in collection.documents] == ["a1"]
+        assert service.get_write_stats()["written"] == 1
+
+    def test_unbuffered_inserts_inline(self, monkeypatch):
+        inserted = []
+
+        class InlineCollection:
+            def insert_one(self, document):
+                inserted.append(document)
+
+        service = GenerationAuditService(buffered=False)
+        monkeypatch.setattr(service, "_get_collection", lambda: InlineCollection())
+        service.log_generation(
+            audit_id="a1", provider="ollama", model="llama3", input_tokens=1, output_tokens=1, latency_ms=1.0
+        )
+
+        assert len(inserted) == 1
+        assert service.get_write_stats() == {"buffered": False}
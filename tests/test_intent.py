@@ -1,7 +1,71 @@
 """
 Test suite for intent detection.
+
+Run with: pytest tests/test_intent.py -v
 """
 import pytest
 
+from abby_core.llm import intent as intent_module
+from abby_core.llm.intent import Intent, classify_intent
+
+
 def test_intent():
     pass
+
+
+# Messages that exercise every pattern shape: literal keywords, multi-word
+# phrases, optional characters, anchored length check and residual regexes
+PARITY_MESSAGES = [
+    "hey abby!",
+    "whats up",
+    "what's up bunny, how are you",
+    "thank you!! 🙏",
+    "help me write a poem about my track",
+    "set your status to playing lofi beats",
+    "status listening to music",
+    "how were you built? what's under the hood",
+    "show me the dev log and recent changes",
+    "any updates?",
+    "what level am I",
+    "my xp",
+    "myxp is low",
+    "levelling up my character in the quest",
+    "enable_nudges",
+    "good  morning",
+    "please analyze these metrics and trends",
+    "今日はいい天気ですね",
+    "",
+]
+
+
+class TestCompiledMatcher:
+    """The single-pass matcher labels exactly like searching every pattern."""
+
+    @pytest.mark.parametrize("message", PARITY_MESSAGES)
+    def test_matches_reference(self, message):
+        message_lower = message.lower().strip()
+        expected = intent_module._pick_intent(intent_module._reference_scores(message_lower))
+
+        assert intent_module._classify_normalized.__wrapped__(message_lower) == expected
+
+    @pytest.mark.parametrize("message", PARITY_MESSAGES)
+    def test_pattern_hits_match_reference(self, message):
+        message_lower = message.lower().strip()
+        reference = {
+            index
+            for index, (_, pattern) in enumerate(intent_module._PATTERN_LIST)
+            if intent_module.re.search(pattern, message_lower, intent_module.re.IGNORECASE)
+        }
+
+        assert intent_module._matched_patterns(message_lower) == reference
+
+    def test_repeat_classification_is_memoized(self):
+        intent_module._classify_normalized.cache_clear()
+        classify_intent("Set your status to playing music")
+        classify_intent("  set your STATUS to playing music ")
+
+        assert intent_module._classify_normalized.cache_info().hits == 1
+
+    def test_config_admin_examples(self):
+        assert classify_intent("manage server settings") == Intent.CONFIG_ADMIN
+        assert classify_intent("set my status to playing music") == Intent.CONFIG_ADMIN
@@ -0,0 +1,135 @@
+"""
+Memory Envelope Cache Tests
+
+Validates the per-user envelope cache used by chat turns: hits between
+memory writes, write-side invalidation across guilds, TTL expiry, LRU
+bound, races with concurrent writes, and hit-rate reporting.
+
+Run with: pytest tests/test_memory_envelope_cache.py -v
+"""
+
+import time
+
+import pytest
+
+from abby_core.services.memory_envelope_cache import MemoryEnvelopeCache
+
+
+class FakeMemoryService:
+    """Counts profile reads; returns a new envelope object per read."""
+
+    def __init__(self):
+        self.reads = []
+
+    def get_memory_envelope(self, user_id, guild_id, force_refresh=False):
+        self.reads.append((user_id, guild_id))
+        return {"identity": {"user_id": user_id}, "read": len(self.reads)}
+
+
+@pytest.fixture
+def service():
+    return FakeMemoryService()
+
+
+def load(cache, service, user_id="1", guild_id="10"):
+    return cache.get_or_load(user_id, guild_id, lambda: service.get_memory_envelope(user_id, guild_id))
+
+
+class TestMemoryEnvelopeCache:
+    """Caching and invalidation."""
+
+    def test_mid_conversation_turns_do_not_reread(self, service):
+        cache = MemoryEnvelopeCache(max_entries=10, ttl_seconds=60, enabled=True)
+
+        envelopes = [load(cache, service) for _ in range(8)]
+
+        assert service.reads == [("1", "10")]
+        assert all(envelope is envelopes[0] for envelope in envelopes)
+        assert cache.stats()["hit_rate"] == pytest.approx(7 / 8, abs=0.001)
+
+    def test_write_invalidates_user_in_every_guild(self, service):
+        cache = MemoryEnvelopeCache(max_entries=10, ttl_seconds=60, enabled=True)
+        load(cache, service, guild_id="10")
+        load(cache, service, guild_id="20")
+        load(cache, service, user_id="2")
+
+        cache.invalidate("1", reason="memory_extraction")
+        load(cache, service, guild_id="10")
+        load(cache, service, guild_id="20")
+        load(cache, service, user_id="2")
+
+        assert service.reads.count(("1", "10")) == 2
+        assert service.reads.count(("1", "20")) == 2
+        assert service.reads.count(("2", "10")) == 1
+
+    def test_int_and_str_ids_share_entries(self, service):
+        cache = MemoryEnvelopeCache(max_entries=10, ttl_seconds=60, enabled=True)
+        cache.get_or_load("1", "10", lambda: service.get_memory_envelope("1", "10"))
+
+        cache.get_or_load(1, 10, lambda: service.get_memory_envelope(1, 10))
+
+        assert len(service.reads) == 1
+
+    def test_entries_expire_after_ttl(self, service):
+        cache = MemoryEnvelopeCache(max_entries=10, ttl_seconds=0.05, enabled=True)
+        load(cache, service)
+        time.sleep(0.08)
+        load(cache, service)
+
+        assert len(service.reads) == 2
+        assert cache.stats()["expired"] == 1
+
+    def test_lru_bound(self, service):
+        cache = MemoryEnvelopeCache(max_entries=2, ttl_seconds=60, enabled=True)
+        for user_id in ("1", "2", "1", "3"):
+            load(cache, service, user_id=user_id)
+        load(cache, service, user_id="1")  # Recently used, still cached
+        load(cache, service, user_id="2")  # Evicted by user 3
+
+        assert [user for user, _ in service.reads] == ["1", "2", "3", "2"]
+        assert cache.stats()["evictions"] >= 1
+        assert cache.stats()["size"] == 2
+
+    def test_read_racing_a_write_is_not_cached(self, service):
+        cache = MemoryEnvelopeCache(max_entries=10, ttl_seconds=60, enabled=True)
+
+        def read_during_write():
+            envelope = service.get_memory_envelope("1", "10")
+            cache.invalidate("1", reason="memory_extraction")  # Write lands mid-read
+            return envelope
+
+        cache.get_or_load("1", "10", read_during_write)
+        load(cache, service)
+
+        assert len(service.reads) == 2
+        assert cache.stats()["raced"] == 1
+
+    def test_clear_invalidates_everyone(self, service):
+        cache = MemoryEnvelopeCache(max_entries=10, ttl_seconds=60, enabled=True)
+        load(cache, service, user_id="1")
+        load(cache, service, user_id="2")
+
+        cache.clear(reason="operator_memory_maintenance")
+        load(cache, service, user_id="1")
+
+        assert len(service.reads) == 3
+        assert cache.stats()["size"] == 1
+
+    def test_load_errors_are_not_cached(self, service):
+        cache = MemoryEnvelopeCache(max_entries=10, ttl_seconds=60, enabled=True)
+
+        def unavailable():
+            raise ConnectionError("mongo down")
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_load("1", "10", unavailable)
+        load(cache, service)
+
+        assert len(service.reads) == 1
+
+    def test_disabled_cache_always_loads(self, service):
+        cache = MemoryEnvelopeCache(enabled=False)
+        load(cache, service)
+        load(cache, service)
+
+        assert len(service.reads) == 2
@@ -0,0 +1,162 @@
+"""
+Memory Fact Index Tests
+
+Validates the precomputed fact index behind format_memory_for_llm: selection
+parity with the original per-turn scoring loop, posting-list pruning, index
+reuse across turns (rebuilt on edits), write-time features (index_fact via
+UserService.index_memory), and sanitization.
+
+Run with: pytest tests/test_memory_fact_index.py -v
+"""
+
+import random
+from collections import defaultdict
+
+import pytest
+
+from abby_core.database.collections.users import Users
+from abby_core.rag import memory_formatter
+from abby_core.rag.memory_formatter import (
+    MAX_FACTS,
+    MemoryFactIndex,
+    _reference_scored_facts,
+    format_memory_for_llm,
+    index_fact,
+)
+
+WORDS = [
+    "alice", "makes", "music", "beats", "paints", "sketch", "novel", "chapter", "python", "debug",
+    "stream", "quest", "cat", "coffee", "morning", "the", "and", "guitar", "startup", "party", "artwork",
+]
+
+
+def random_facts(rng, count):
+    return [
+        {"text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 9))),
+         "confidence": rng.choice([0.2, 0.5, 0.7, 0.9, 1.0])}
+        for _ in range(count)
+    ]
+
+
+def envelope(facts):
+    return {"identity": {"username": "alice"}, "relational": {"memorable_facts": facts}}
+
+
+def reference_selection(facts, message, min_score):
+    return [
+        (score, fact) for score, fact in _reference_scored_facts(facts, message) if score >= min_score
+    ][:MAX_FACTS]
+
+
+class TestSelectionParity:
+    """The index picks exactly what the original loop picked, in the same order."""
+
+    @pytest.mark.parametrize("min_score", [0, 10, 15, 20, 40])
+    def test_matches_reference_loop(self, min_score):
+        rng = random.Random(min_score)
+        for _ in range(50):
+            facts = random_facts(rng, rng.randint(1, 60))
+            message = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 6)))
+
+            selected, _, _ = MemoryFactIndex(facts).select(message.lower(), min_score)
+
+            expected = reference_selection(facts, message, min_score)
+            assert [(score, id(fact)) for score, fact, _ in selected] == [(s, id(f)) for s, f in expected]
+
+    def test_substring_domain_semantics_preserved(self):
+        # "art" matches inside "party", exactly as the original substring test did
+        facts = [{"text": "went to a party", "confidence": 0.5}]
+        selected, _, _ = MemoryFactIndex(facts).select("help with my artwork", 20)
+
+        assert [score for score, _, _ in selected] == [37]
+
+
+class TestFactIndex:
+    """Posting lists, reuse and write-time features."""
+
+    def test_unrelated_facts_are_not_scored(self, monkeypatch):
+        facts = [{"text": f"likes coffee number {i}", "confidence": 0.9} for i in range(100)]
+        facts.append({"text": "makes music with beats", "confidence": 0.9})
+        index = MemoryFactIndex(facts)
+        scored = []
+        original = index._score
+        monkeypatch.setattr(index, "_score", lambda *args: scored.append(args[0]) or original(*args))
+
+        selected, _, _ = index.select("can you help with my music", 20)
+
+        assert scored == [100]
+        assert selected[0][1]["text"] == "makes music with beats"
+
+    def test_index_reused_while_list_unchanged(self):
+        facts = [{"text": "alice makes music", "confidence": 0.9}]
+        first = memory_formatter._get_fact_index(facts)
+
+        assert memory_formatter._get_fact_index(facts) is first
+        facts.append({"text": "alice paints", "confidence": 0.9})
+        assert memory_formatter._get_fact_index(facts) is not first
+
+    def test_in_place_edit_rebuilds_index(self):
+        facts = [{"text": "alice makes music", "confidence": 0.9}]
+        first = memory_formatter._get_fact_index(facts)
+
+        facts[0] = {"text": "alice paints", "confidence": 0.9}
+        index = memory_formatter._get_fact_index(facts)
+
+        assert index is not first
+        selected, _, _ = index.select("any art tips?", 20)
+        assert [fact["text"] for _, fact, _ in selected] == ["alice paints"]
+
+    def test_index_fact_stores_features(self):
+        fact = index_fact({"text": "Alice makes music on the guitar", "confidence": 0.9})
+
+        assert fact["domains"] == ["music"]
+        assert "the" not in fact["keywords"]
+        assert "guitar" in fact["keywords"]
+
+    def test_index_memory_tags_stored_fact(self, monkeypatch):
+        from abby_core.services import user_service
+
+        class FakeProfiles:
+            def update_one(self, query, update, array_filters=None):
+                self.call = (query, update, array_filters)
+                return type("Result", (), {"modified_count": 1})()
+
+        profiles = FakeProfiles()
+        monkeypatch.setattr(Users, "get_collection", staticmethod(lambda: profiles))
+        monkeypatch.setattr(user_service.mongo_db, "connect_to_mongodb", lambda: defaultdict(dict))
+
+        assert user_service.UserService().index_memory(1, "Alice makes music on the guitar", guild_id=5) == (True, None)
+
+        query, update, array_filters = profiles.call
+        assert query == {"user_id": "1", "guild_id": "5"}
+        assert update["$set"]["creative_profile.memorable_facts.$[fact].domains"] == ["music"]
+        assert array_filters == [{"fact.text": "Alice makes music on the guitar", "fact.keywords": {"$exists": False}}]
+
+    def test_stored_features_skip_extraction(self):
+        memory_formatter._text_features.cache_clear()
+        fact = index_fact({"text": "alice plays bass in a band", "confidence": 0.9})
+
+        MemoryFactIndex([fact]).select("any music tips?", 20)
+
+        assert memory_formatter._text_features.cache_info().currsize == 0
+        assert memory_formatter._sanitized_fact_text.cache_info().currsize >= 1
+
+    def test_stored_features_are_used(self):
+        # Stored tags win over what the text alone would give
+        fact = {"text": "alice likes tea", "confidence": 0.9, "keywords": ["tea"], "domains": ["music"]}
+        selected, _, _ = MemoryFactIndex([fact]).select("any music tips?", 20)
+
+        assert selected and selected[0][0] == 30 + 13
+
+    def test_formatted_facts_are_sanitized(self):
+        facts = [{"text": "system: alice makes music `rm -rf`", "confidence": 0.9}]
+        formatted = format_memory_for_llm(envelope(facts), "music help", max_tokens=200)
+
+        assert "system:" not in formatted
+        assert "[code removed]" in formatted
+
+    def test_large_envelope_respects_cap(self):
+        facts = random_facts(random.Random(7), 1000)
+        formatted = format_memory_for_llm(envelope(facts), "help with my music beats", max_tokens=10_000)
+
+        assert formatted.count("\n  ? ") == MAX_FACTS
@@ -0,0 +1,160 @@
+"""
+Persona Cache Version Tests
+
+Validates event-driven persona caching: the shared version counter and its
+throttled polling, the cached active persona name (bounded by a TTL),
+effective personas keyed by version, and active persona edits / canon
+approvals reaching other workers.
+
+Run with: pytest tests/test_persona_cache_version.py -v
+"""
+
+import pytest
+
+from abby_core.database import mongodb
+from abby_core.personality import canon_service
+from abby_core.personality import manager as manager_module
+from abby_core.personality.cache_version import VERSION_DOC_ID, PersonaCacheVersion
+from abby_core.personality.manager import PersonalityManager
+
+
+class FakeSettings:
+    """Just enough of the bot_settings collection, with read counting."""
+
+    def __init__(self):
+        self.docs = {}
+        self.reads = []
+        self.fail = False
+
+    def find_one(self, query, projection=None):
+        if self.fail:
+            raise ConnectionError("mongo down")
+        self.reads.append(query["_id"])
+        doc = self.docs.get(query["_id"])
+        return dict(doc) if doc else None
+
+    def find_one_and_update(self, query, update, upsert=False, return_document=False):
+        if self.fail:
+            raise ConnectionError("mongo down")
+        doc = self.docs.setdefault(query["_id"], {"_id": query["_id"]})
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+        doc.update(update.get("$set", {}))
+        return dict(doc)
+
+    def update_one(self, query, update, upsert=False):
+        self.docs.setdefault(query["_id"], {"_id": query["_id"]}).update(update["$set"])
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    fake = FakeSettings()
+    monkeypatch.setattr(mongodb, "get_database", lambda: {"bot_settings": fake})
+    return fake
+
+
+@pytest.fixture
+def make_worker(settings, monkeypatch):
+    """A PersonalityManager with its own version view, as one bot process would have."""
+    def make(poll_interval=3600):
+        version = PersonaCacheVersion(collection=lambda: settings, poll_interval=poll_interval)
+        monkeypatch.setattr(manager_module, "get_persona_cache_version", lambda: version)
+        return PersonalityManager()
+
+    return make
+
+
+class TestPersonaCacheVersion:
+    """Shared counter and polling."""
+
+    def test_polls_at_most_once_per_interval(self, settings):
+        version = PersonaCacheVersion(collection=lambda: settings, poll_interval=3600)
+
+        for _ in range(50):
+            version.current()
+
+        assert settings.reads == [VERSION_DOC_ID]
+
+    def test_bump_reaches_other_workers_on_next_poll(self, settings):
+        writer = PersonaCacheVersion(collection=lambda: settings, poll_interval=3600)
+        reader = PersonaCacheVersion(collection=lambda: settings, poll_interval=0)
+        before = reader.current()
+
+        assert writer.bump("test") == 1
+        assert writer.current() == 1
+        assert reader.current() != before
+
+    def test_bump_without_database_still_invalidates_locally(self, settings):
+        version = PersonaCacheVersion(collection=lambda: settings, poll_interval=3600)
+        before = version.current()
+        settings.fail = True
+
+        assert version.bump("offline") != before
+        assert version.stats()["errors"] == 1
+
+
+class TestPersonalityManagerCaching:
+    """Turns read the persona without a database round-trip."""
+
+    def test_active_persona_name_is_cached(self, settings, make_worker):
+        settings.docs["active_persona"] = {"_id": "active_persona", "persona": "bunny"}
+        manager = make_worker()
+
+        names = {manager.get_active_persona_name() for _ in range(20)}
+
+        assert names == {"bunny"}
+        assert settings.reads.count("active_persona") == 1
+
+    def test_direct_settings_edit_seen_after_ttl(self, settings, make_worker, monkeypatch):
+        settings.docs["active_persona"] = {"_id": "active_persona", "persona": "bunny"}
+        manager = make_worker()
+        clock = [1000.0]
+        monkeypatch.setattr(manager_module.time, "monotonic", lambda: clock[0])
+        assert manager.get_active_persona_name() == "bunny"
+
+        # Operator edits bot_settings by hand: no version bump
+        settings.docs["active_persona"]["persona"] = "kiki"
+        assert manager.get_active_persona_name() == "bunny"
+
+        clock[0] += manager_module.ACTIVE_PERSONA_TTL_SECONDS
+        assert manager.get_active_persona_name() == "kiki"
+        assert settings.reads.count("active_persona") == 2
+
+    def test_edit_with_version_bump_reaches_other_worker(self, settings, make_worker):
+        settings.docs["active_persona"] = {"_id": "active_persona", "persona": "bunny"}
+        other = make_worker(poll_interval=0)
+        assert other.get_active_persona_name() == "bunny"
+
+        settings.docs["active_persona"]["persona"] = "kiki"
+        PersonaCacheVersion(collection=lambda: settings).bump("active persona -> kiki")
+
+        assert other.get_active_persona_name() == "kiki"
+
+    def test_effective_persona_cached_until_canon_approval(self, settings, make_worker, monkeypatch):
+        lookups = []
+        monkeypatch.setattr(
+            canon_service, "get_persona_overlays", lambda **kwargs: lookups.append(kwargs["persona"]) or []
+        )
+        manager = make_worker(poll_interval=0)
+        name = manager.get_default_persona()
+
+        for _ in range(5):
+            manager.get_persona(name, intent="music")
+        assert lookups == [name]
+
+        # Approval on another worker bumps the shared version
+        PersonaCacheVersion(collection=lambda: settings).bump("canon approved: persona.abby.tone")
+
+        manager.get_persona(name, intent="music")
+        assert lookups == [name, name]
+
+    def test_unreachable_database_falls_back_to_default(self, settings, make_worker):
+        settings.fail = True
+        manager = make_worker()
+
+        assert manager.get_active_persona_name() == manager.get_default_persona()
+        settings.fail = False
+        settings.docs["active_persona"] = {"_id": "active_persona", "persona": "bunny"}
+        # Retry waits for the poll interval instead of hitting the database every turn
+        assert manager.get_active_persona_name() == manager.get_default_persona()
+        assert "active_persona" not in settings.reads
@@ -0,0 +1,179 @@
+"""
+Personality Asset Registry Tests
+
+Validates the load-once asset registry behind the personality system: files
+parsed once, emoji substitution parity with the original per-call lookup,
+zero file access when replying, and reloading on file change or explicit
+reload.
+
+Run with: pytest tests/test_personality_assets.py -v
+"""
+
+import builtins
+import json
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+from abby_core.personality import manager as manager_module
+from abby_core.personality.assets import AssetRegistry, EmojiTable
+from abby_core.personality.manager import EMOJI_FILE, PersonalityManager
+
+
+def reference_inject(emoji_data, text):
+    """The per-call lookup inject_emojis used before the registry."""
+    def replace_emoji(match):
+        key = match.group(1)
+        if '.' in key:
+            category, subkey = key.split('.', 1)
+            if category in emoji_data and isinstance(emoji_data[category], dict):
+                result = emoji_data[category].get(subkey)
+                if result:
+                    return result
+        for category in emoji_data:
+            if isinstance(emoji_data[category], dict) and key in emoji_data[category]:
+                return emoji_data[category][key]
+        return match.group(0)
+
+    return re.sub(r'\{emoji:([^}]+)\}', replace_emoji, text)
+
+
+def write_json(path, data, bump_ns=0):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if bump_ns:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+
+@pytest.fixture
+def no_file_access(monkeypatch):
+    """Fail the test on any open() or stat() while active."""
+    def forbidden(*args, **kwargs):
+        raise AssertionError("filesystem access on the reply path")
+
+    def activate():
+        monkeypatch.setattr(builtins, "open", forbidden)
+        monkeypatch.setattr(Path, "stat", forbidden)
+
+    return activate
+
+
+class TestEmojiTable:
+    """Substitution matches the original lookup exactly."""
+
+    def test_parity_with_shipped_emoji_file(self):
+        emoji_data = json.loads(EMOJI_FILE.read_text(encoding="utf-8"))
+        table = EmojiTable(emoji_data)
+        keys = [f"{c}.{k}" for c, v in emoji_data.items() if isinstance(v, dict) for k in v]
+        keys += [k.split(".", 1)[1] for k in keys] + ["missing", "unicode.missing", "nope.wave"]
+
+        for key in keys:
+            text = f"hi {{emoji:{key}}} there"
+            assert table.substitute(text) == reference_inject(emoji_data, text)
+
+    def test_collisions_and_empty_values(self):
+        emoji_data = {
+            "first": {"wave": "W1", "blank": ""},
+            "second": {"wave": "W2", "blank": "B2", "a.b": "dotted"},
+            "flat": "not a category",
+        }
+        table = EmojiTable(emoji_data)
+        text = "{emoji:wave} {emoji:second.wave} {emoji:first.blank} {emoji:a.b} {emoji:flat} {emoji:}"
+
+        assert table.substitute(text) == reference_inject(emoji_data, text)
+        assert table.substitute(text) == "W1 W2 {emoji:first.blank} dotted {emoji:flat} {emoji:}"
+
+
+class TestAssetRegistry:
+    """Load-once caching and change detection."""
+
+    def test_file_is_parsed_once(self, tmp_path, monkeypatch):
+        path = tmp_path / "emoji.json"
+        write_json(path, {"unicode": {"leaf": "L"}})
+        registry = AssetRegistry(check_interval=3600)
+        opened = []
+        real_open = builtins.open
+        monkeypatch.setattr(builtins, "open", lambda *a, **k: opened.append(a[0]) or real_open(*a, **k))
+
+        for _ in range(5):
+            registry.load_json(path)
+            registry.emoji_table(path)
+
+        assert opened == [path]
+
+    def test_refresh_rereads_changed_file(self, tmp_path):
+        path = tmp_path / "emoji.json"
+        write_json(path, {"unicode": {"leaf": "old"}})
+        registry = AssetRegistry(check_interval=3600)
+        assert registry.emoji_table(path).substitute("{emoji:leaf}") == "old"
+
+        assert registry.refresh() == []
+        write_json(path, {"unicode": {"leaf": "new"}}, bump_ns=1_000_000)
+        assert registry.refresh() == [path]
+
+        assert registry.emoji_table(path).substitute("{emoji:leaf}") == "new"
+        assert registry.version == 1
+
+    def test_poll_checks_only_when_due(self, tmp_path, no_file_access):
+        path = tmp_path / "dismiss.json"
+        write_json(path, {"dismiss_words": ["bye"]})
+        registry = AssetRegistry(check_interval=3600)
+        registry.load_json(path)
+        no_file_access()
+
+        assert registry.poll() == 0
+        assert registry.stats()["checks"] == 0
+
+    def test_broken_edit_keeps_last_good_copy(self, tmp_path):
+        path = tmp_path / "emoji.json"
+        write_json(path, {"unicode": {"leaf": "L"}})
+        registry = AssetRegistry(check_interval=3600)
+        registry.load_json(path)
+
+        path.write_text("{not json", encoding="utf-8")
+        assert registry.refresh() == []
+        assert registry.load_json(path) == {"unicode": {"leaf": "L"}}
+
+
+class TestPersonalityManagerAssets:
+    """PersonalityManager serves replies from the registry."""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        fresh = AssetRegistry(check_interval=3600)
+        monkeypatch.setattr(manager_module, "get_asset_registry", lambda: fresh)
+        return fresh
+
+    def test_reply_path_does_no_file_access(self, registry, no_file_access):
+        manager = PersonalityManager()
+        persona_name = manager.get_default_persona()
+        expected = manager.inject_emojis("brb {emoji:wave}")
+        no_file_access()
+
+        for _ in range(3):
+            assert manager.inject_emojis("brb {emoji:wave}") == expected
+            assert manager.get_persona(persona_name) is not None
+        assert "{emoji:" not in expected
+
+    def test_changed_file_rebuilds_persona_data(self, registry, tmp_path, monkeypatch):
+        emoji_file = tmp_path / "emoji.json"
+        write_json(emoji_file, {"unicode": {"leaf": "old"}})
+        monkeypatch.setattr(manager_module, "EMOJI_FILE", emoji_file)
+        manager = PersonalityManager()
+        version = manager.config_version
+        assert manager.inject_emojis("{emoji:leaf}") == "old"
+
+        write_json(emoji_file, {"unicode": {"leaf": "new"}}, bump_ns=1_000_000)
+        registry.check_interval = 0.000001
+
+        assert manager.inject_emojis("{emoji:leaf}") == "new"
+        assert manager.config_version == version + 1
+
+    def test_explicit_reload_rereads_files(self, registry):
+        manager = PersonalityManager()
+        loads = registry.stats()["loads"]
+
+        assert manager.reload()
+        assert registry.stats()["loads"] == 2 * loads
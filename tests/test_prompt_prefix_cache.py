@@ -0,0 +1,142 @@
+"""
+Prompt Prefix Cache Tests
+
+Validates the static/dynamic split of the system prompt: the persona prefix
+is user-independent, shared across users and turns in a guild, leads every
+prompt (sections mixing user and static fields render in the user part), and
+is re-rendered when the canon or persona config version changes.
+
+Run with: pytest tests/test_prompt_prefix_cache.py -v
+"""
+
+import pytest
+
+from abby_core.llm import prompt_cache
+from abby_core.llm.prompt_cache import PromptPrefixCache
+from abby_core.personality import canon_service
+from abby_core.personality.manager import PersonalityManager
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = PromptPrefixCache()
+    monkeypatch.setattr(prompt_cache, "_prefix_cache", fresh)
+    return fresh
+
+
+@pytest.fixture
+def manager():
+    return PersonalityManager()
+
+
+@pytest.fixture
+def persona(manager):
+    persona = manager.get_persona(manager.get_default_persona())
+    assert persona is not None and persona.system_prompt_template
+    return persona
+
+
+def _prompt(manager, persona, user_mention, guild_id="1", turn_number=2):
+    return manager.build_system_prompt(
+        persona=persona,
+        guild_name="Breeze Club",
+        guild_id=guild_id,
+        user_mention=user_mention,
+        turn_number=turn_number,
+    )
+
+
+class TestPromptPrefixCache:
+    """Cache semantics independent of the persona manager."""
+
+    def test_builds_once_per_key(self):
+        cache = PromptPrefixCache()
+        builds = []
+        key = cache.make_key("1", "bunny", 0, 1)
+
+        for _ in range(3):
+            cache.get_or_build(key, lambda: builds.append(1) or "prefix")
+
+        assert len(builds) == 1
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["reused_chars"] == 2 * len("prefix")
+
+    def test_lru_bound(self):
+        cache = PromptPrefixCache(max_entries=1)
+        cache.get_or_build(cache.make_key("1", "bunny", 0, 1), lambda: "a")
+        cache.get_or_build(cache.make_key("2", "bunny", 0, 1), lambda: "b")
+
+        assert cache.stats()["entries"] == 1
+
+    def test_assembly_metrics(self):
+        cache = PromptPrefixCache()
+        cache.record_assembly(2.0, prefix_chars=75, prompt_chars=100)
+        cache.record_assembly(4.0, prefix_chars=75, prompt_chars=100)
+
+        stats = cache.stats()
+        assert stats["assemblies"] == 2
+        assert stats["avg_assembly_ms"] == 3.0
+        assert stats["max_assembly_ms"] == 4.0
+        assert stats["prefix_share"] == 0.75
+
+
+class TestStaticPrefix:
+    """PersonalityManager builds prompts as cached prefix + per-user suffix."""
+
+    def test_prefix_is_user_independent(self, manager, persona):
+        prefix = manager.build_static_prefix(persona, guild_name="Breeze Club")
+        user_context = manager.build_user_context(persona, user_mention="@alice")
+
+        assert "@alice" not in prefix
+        assert "@alice" in user_context
+        assert "{" not in prefix
+
+    def test_mixed_section_renders_static_and_user_fields(self, manager, persona):
+        mixed = persona.model_copy(update={
+            "system_prompt_template": "You are {persona_display_name}.\n\n"
+                                      "{user_mention} is a {user_role} of {guild_name}.",
+        })
+
+        prefix = manager.build_static_prefix(mixed, guild_name="Breeze Club")
+        user_context = manager.build_user_context(mixed, user_mention="@alice", guild_name="Breeze Club")
+
+        assert prefix == f"You are {persona.display_name}."
+        assert user_context == "@alice is a member of Breeze Club."
+
+    def test_prefix_shared_across_users_and_leads_prompt(self, cache, manager, persona):
+        alice = _prompt(manager, persona, "@alice")
+        bob = _prompt(manager, persona, "@bob")
+        prefix = manager.build_static_prefix(persona, guild_name="Breeze Club")
+
+        assert alice.startswith(prefix)
+        assert bob.startswith(prefix)
+        assert "@alice" in alice and "@bob" in bob
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_prefix_cached_per_guild(self, cache, manager, persona):
+        _prompt(manager, persona, "@alice", guild_id="1")
+        _prompt(manager, persona, "@alice", guild_id="2")
+
+        assert cache.stats()["misses"] == 2
+
+    def test_canon_approval_invalidates(self, cache, manager, persona, monkeypatch):
+        _prompt(manager, persona, "@alice")
+        monkeypatch.setattr(canon_service, "_canon_version", canon_service.get_canon_version() + 1)
+        _prompt(manager, persona, "@alice")
+
+        assert cache.stats()["misses"] == 2
+
+    def test_reload_invalidates(self, cache, manager, persona):
+        _prompt(manager, persona, "@alice")
+        manager.reload()
+        _prompt(manager, persona, "@alice")
+
+        assert cache.stats()["misses"] == 2
+
+    def test_legacy_static_prompt_bypasses_cache(self, cache, manager, persona):
+        prompt = manager.build_system_prompt(persona=persona, static_prompt="LEGACY")
+
+        assert prompt.startswith("LEGACY")
+        assert cache.stats()["misses"] == 0
+        assert cache.stats()["assemblies"] == 1
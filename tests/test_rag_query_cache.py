@@ -0,0 +1,195 @@
+"""
+RAG Query Cache Tests
+
+Validates the per-guild query result cache: key normalization, generation
+based invalidation on ingest/delete (including writes racing a search),
+TTL/LRU bounds, stats, and its wiring into rag/handler.query.
+
+Run with: pytest tests/test_rag_query_cache.py -v
+"""
+
+import pytest
+
+from abby_core.rag import handler
+from abby_core.rag.query_cache import RAGQueryCache, normalize_query
+
+
+def _key(cache, text, guild_id="1", top_k=3):
+    return cache.make_key(text, guild_id, None, None, top_k)
+
+
+class TestRAGQueryCache:
+    """Cache semantics independent of the handler."""
+
+    def test_normalization_shares_entries(self):
+        cache = RAGQueryCache()
+        cache.put(_key(cache, "What are the rules?"), "1", {"results": [1]}, latency_ms=40)
+
+        assert normalize_query("  what   ARE the rules ") == "what are the rules"
+        assert cache.get(_key(cache, "what are the rules"), "1") == {"results": [1]}
+
+    def test_key_includes_filters_and_top_k(self):
+        cache = RAGQueryCache()
+        cache.put(_key(cache, "rules", top_k=3), "1", {"results": [1]}, latency_ms=1)
+
+        assert cache.get(_key(cache, "rules", top_k=5), "1") is None
+        assert cache.get(cache.make_key("rules", "1", "faq", None, 3), "1") is None
+
+    def test_guild_invalidation_is_scoped(self):
+        cache = RAGQueryCache()
+        cache.put(_key(cache, "rules", "1"), "1", {"results": ["g1"]}, latency_ms=1)
+        cache.put(_key(cache, "rules", "2"), "2", {"results": ["g2"]}, latency_ms=1)
+        cache.put(_key(cache, "rules", None), None, {"results": ["all"]}, latency_ms=1)
+
+        cache.invalidate("1")
+
+        assert cache.get(_key(cache, "rules", "1"), "1") is None
+        assert cache.get(_key(cache, "rules", "2"), "2") == {"results": ["g2"]}
+        # Unscoped queries see every guild, so they go stale too
+        assert cache.get(_key(cache, "rules", None), None) is None
+
+    def test_all_guilds_invalidation(self):
+        cache = RAGQueryCache()
+        cache.put(_key(cache, "rules", "2"), "2", {"results": ["g2"]}, latency_ms=1)
+
+        cache.invalidate(all_guilds=True)
+
+        assert cache.get(_key(cache, "rules", "2"), "2") is None
+
+    def test_ttl_expiry(self):
+        cache = RAGQueryCache(ttl_seconds=0)
+        cache.put(_key(cache, "rules"), "1", {"results": []}, latency_ms=1)
+
+        assert cache.get(_key(cache, "rules"), "1") is None
+
+    def test_lru_bound(self):
+        cache = RAGQueryCache(max_entries=2)
+        for text in ("a", "b", "c"):
+            cache.put(_key(cache, text), "1", {"results": [text]}, latency_ms=1)
+
+        assert cache.stats()["entries"] == 2
+        assert cache.get(_key(cache, "a"), "1") is None
+
+    def test_returned_results_are_copies(self):
+        cache = RAGQueryCache()
+        cache.put(_key(cache, "rules"), "1", {"results": [{"id": "x"}]}, latency_ms=1)
+
+        cache.get(_key(cache, "rules"), "1")["results"].clear()
+
+        assert cache.get(_key(cache, "rules"), "1") == {"results": [{"id": "x"}]}
+
+    def test_stats_report_hit_rate_and_saved_latency(self):
+        cache = RAGQueryCache()
+        cache.get(_key(cache, "rules"), "1")
+        cache.put(_key(cache, "rules"), "1", {"results": []}, latency_ms=25)
+        cache.get(_key(cache, "rules"), "1")
+        cache.get(_key(cache, "rules"), "1")
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+        assert stats["saved_latency_ms"] == 50
+
+    def test_put_drops_result_computed_across_a_write(self):
+        cache = RAGQueryCache()
+        generation = cache.generation("1")
+        cache.invalidate("1")
+        cache.put(_key(cache, "rules"), "1", {"results": ["old"]}, latency_ms=1, generation=generation)
+
+        assert cache.get(_key(cache, "rules"), "1") is None
+
+    def test_disabled_cache(self):
+        cache = RAGQueryCache(max_entries=0)
+        cache.put(_key(cache, "rules"), "1", {"results": []}, latency_ms=1)
+
+        assert cache.get(_key(cache, "rules"), "1") is None
+
+
+class FakeStore:
+    provider = "fake"
+    collection_name = "abby_rag"
+
+    def __init__(self):
+        self.queries = 0
+        self.deleted = []
+
+    def query(self, query_embeddings, top_k=3, filters=None):
+        self.queries += 1
+        return {
+            "ids": [["faq::rules::v1::chunk_0"]],
+            "documents": [["be kind"]],
+            "metadatas": [[{"guild_id": "1", "document_type": "faq", "scope": "rules"}]],
+        }
+
+    def add(self, **kwargs):
+        pass
+
+    def delete(self, ids):
+        self.deleted.extend(ids)
+
+
+class FakeEmbeddings:
+    def encode(self, texts, cache=True):
+        return [[0.0] for _ in texts]
+
+
+@pytest.fixture
+def wired_handler(monkeypatch):
+    store = FakeStore()
+    cache = RAGQueryCache()
+    monkeypatch.setattr(handler, "get_query_cache", lambda: cache)
+    monkeypatch.setattr(handler, "get_vector_store", lambda: store)
+    monkeypatch.setattr(handler, "Embeddings", FakeEmbeddings)
+    monkeypatch.setattr(handler, "emit_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(handler, "get_document_by_id", lambda document_id: None)
+    monkeypatch.setattr(handler, "insert_rag_chunks", lambda chunks: True)
+    monkeypatch.setattr(
+        handler,
+        "get_documents_for_query",
+        lambda **kwargs: [{"_id": "faq::rules::v1::chunk_0", "document_id": "faq::rules::v1", "guild_id": "1"}],
+    )
+    monkeypatch.setattr(handler, "delete_documents_by_id", lambda document_id: 1)
+    return {"store": store, "cache": cache}
+
+
+class TestHandlerIntegration:
+    """rag/handler.query serves repeats from cache until a write bumps the guild."""
+
+    def test_repeat_query_skips_vector_search(self, wired_handler):
+        first = handler.query("What are the rules?", guild_id="1")
+        second = handler.query("what are the rules", guild_id="1")
+
+        assert first == second
+        assert wired_handler["store"].queries == 1
+        assert wired_handler["cache"].stats()["hits"] == 1
+
+    def test_ingest_invalidates_guild(self, wired_handler):
+        handler.query("rules", guild_id="1")
+        handler.ingest("faq", "Rules", "Be kind.", guild_id="1", auto_prepare=False)
+        handler.query("rules", guild_id="1")
+
+        assert wired_handler["store"].queries == 2
+
+    def test_delete_invalidates_affected_guilds(self, wired_handler):
+        handler.query("rules", guild_id="1")
+        handler.delete_documents(document_id="faq::rules::v1")
+        handler.query("rules", guild_id="1")
+
+        assert wired_handler["store"].queries == 2
+
+    def test_write_during_search_is_not_cached(self, wired_handler, monkeypatch):
+        store = wired_handler["store"]
+        search = store.query
+
+        def query_racing_ingest(**kwargs):
+            # Ingest for the same guild lands while the search is running
+            wired_handler["cache"].invalidate("1")
+            return search(**kwargs)
+
+        monkeypatch.setattr(store, "query", query_racing_ingest)
+        handler.query("rules", guild_id="1")
+        monkeypatch.setattr(store, "query", search)
+        handler.query("rules", guild_id="1")
+
+        assert store.queries == 2
@@ -0,0 +1,177 @@
+"""
+RAG Sync Check Tests
+
+Validates incremental Mongo/Chroma reconciliation in rag/handler.sync_check:
+drift classification (missing, orphaned, stale checksum), checkpoint-driven
+incremental scans, and repair.
+
+Both stores are replaced with in-memory fakes so the test exercises only the
+reconciliation logic.
+
+Run with: pytest tests/test_rag_sync_check.py -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from abby_core.rag import handler
+
+
+class FakeChroma:
+    """In-memory stand-in for the VectorStore paging API."""
+
+    provider = "fake"
+
+    def __init__(self, store: Dict[str, Dict[str, Any]]):
+        self.store = store
+
+    def get_checksums(self, ids: List[str]) -> Dict[str, Optional[str]]:
+        return {i: self.store[i].get("content_checksum") for i in ids if i in self.store}
+
+    def count(self, where=None) -> int:
+        return len(self.store)
+
+    def iter_ids(self, page_size: int = 500, where=None):
+        ids = sorted(self.store)
+        for start in range(0, len(ids), page_size):
+            yield ids[start : start + page_size]
+
+    def upsert(self, ids, embeddings, metadatas, documents) -> None:
+        for vector_id, meta in zip(ids, metadatas):
+            self.store[vector_id] = dict(meta)
+
+    def delete(self, ids: List[str]) -> None:
+        for vector_id in ids:
+            self.store.pop(vector_id, None)
+
+
+class FakeEmbeddings:
+    def encode(self, texts, cache=True):
+        return [[0.0] for _ in texts]
+
+
+@pytest.fixture
+def stores(monkeypatch):
+    """Wire sync_check to fake Mongo chunks and a fake Chroma store."""
+    now = datetime.now(timezone.utc)
+    mongo: Dict[str, Dict[str, Any]] = {}
+    chroma_store: Dict[str, Dict[str, Any]] = {}
+    state: Dict[str, Any] = {"checkpoint": None, "mongo_pages_requested": []}
+
+    def add_chunk(chunk_id: str, content: str, indexed_at: datetime, in_chroma: bool = True):
+        checksum = handler.content_checksum(content)
+        mongo[chunk_id] = {
+            "_id": chunk_id,
+            "document_id": chunk_id.rsplit("::", 1)[0],
+            "document_type": "faq",
+            "content": content,
+            "content_checksum": checksum,
+            "indexed_at": indexed_at,
+        }
+        if in_chroma:
+            chroma_store[chunk_id] = {"content_checksum": checksum}
+
+    def iter_chunk_pages(guild_id=None, since=None, page_size=500):
+        state["mongo_pages_requested"].append(since)
+        docs = sorted(mongo.values(), key=lambda d: d["_id"])
+        if since is not None:
+            docs = [d for d in docs if d.get("indexed_at") is None or d["indexed_at"] > since]
+        for start in range(0, len(docs), page_size):
+            yield docs[start : start + page_size]
+
+    def mark_chunks_indexed(checksums, indexed_at=None):
+        for chunk_id, checksum in checksums.items():
+            mongo[chunk_id]["content_checksum"] = checksum
+            mongo[chunk_id]["indexed_at"] = indexed_at or datetime.now(timezone.utc)
+        return len(checksums)
+
+    def save_sync_checkpoint(checked_at, guild_id=None, stats=None):
+        state["checkpoint"] = checked_at
+        return True
+
+    monkeypatch.setattr(handler, "get_vector_store", lambda: FakeChroma(chroma_store))
+    monkeypatch.setattr(handler, "Embeddings", FakeEmbeddings)
+    monkeypatch.setattr(handler, "count_chunks", lambda guild_id=None: len(mongo))
+    monkeypatch.setattr(handler, "iter_chunk_pages", iter_chunk_pages)
+    monkeypatch.setattr(handler, "get_chunks_by_ids", lambda ids: [mongo[i] for i in ids if i in mongo])
+    monkeypatch.setattr(handler, "find_existing_chunk_ids", lambda ids: {i for i in ids if i in mongo})
+    monkeypatch.setattr(handler, "mark_chunks_indexed", mark_chunks_indexed)
+    monkeypatch.setattr(handler, "get_sync_checkpoint", lambda guild_id=None: state["checkpoint"])
+    monkeypatch.setattr(handler, "save_sync_checkpoint", save_sync_checkpoint)
+    monkeypatch.setattr(handler, "emit_event", lambda *args, **kwargs: None)
+
+    return {"mongo": mongo, "chroma": chroma_store, "state": state, "add": add_chunk, "now": now}
+
+
+class TestSyncCheckDrift:
+    """Drift classification on a full scan."""
+
+    def test_in_sync_saves_checkpoint(self, stores):
+        stores["add"]("faq::rules::v1::chunk_0", "be kind", stores["now"])
+
+        result = handler.sync_check(page_size=2)
+
+        assert result["in_sync"] is True
+        assert result["mode"] == "full"
+        assert result["status"] == "ok"
+        assert stores["state"]["checkpoint"] is not None
+
+    def test_detects_each_drift_kind(self, stores):
+        now = stores["now"]
+        stores["add"]("faq::a::v1::chunk_0", "alpha", now)
+        stores["add"]("faq::b::v1::chunk_0", "bravo", now, in_chroma=False)
+        stores["add"]("faq::c::v1::chunk_0", "charlie", now)
+        stores["chroma"]["faq::c::v1::chunk_0"]["content_checksum"] = "stale"
+        stores["chroma"]["faq::gone::v1::chunk_0"] = {"content_checksum": "x"}
+
+        result = handler.sync_check(page_size=2)
+
+        assert result["in_sync"] is False
+        assert result["drift"]["missing_in_chroma"] == 1
+        assert result["drift"]["checksum_mismatch"] == 1
+        assert result["drift"]["orphaned_in_chroma"] == 1
+        assert result["drift"]["samples"]["orphaned_in_chroma"] == ["faq::gone::v1::chunk_0"]
+        assert stores["state"]["checkpoint"] is None
+
+    def test_repair_fixes_drift(self, stores):
+        now = stores["now"]
+        stores["add"]("faq::b::v1::chunk_0", "bravo", now, in_chroma=False)
+        stores["chroma"]["faq::gone::v1::chunk_0"] = {"content_checksum": "x"}
+
+        result = handler.sync_check(repair=True, page_size=2)
+
+        assert result["status"] == "repaired"
+        assert result["repaired"] == {"reindexed": 1, "deleted": 1}
+        assert set(stores["chroma"]) == {"faq::b::v1::chunk_0"}
+        assert handler.sync_check()["in_sync"] is True
+
+
+class TestSyncCheckIncremental:
+    """Checkpoint-driven incremental scans."""
+
+    def test_only_scans_chunks_indexed_since_checkpoint(self, stores):
+        old = stores["now"] - timedelta(days=1)
+        for idx in range(5):
+            stores["add"](f"faq::old::v1::chunk_{idx}", f"old {idx}", old)
+        stores["state"]["checkpoint"] = stores["now"] - timedelta(hours=1)
+        stores["add"]("faq::new::v1::chunk_0", "new", stores["now"])
+
+        result = handler.sync_check()
+
+        assert result["mode"] == "incremental"
+        assert result["mongodb"]["scanned_chunks"] == 1
+        assert result["chromadb"]["scanned_chunks"] == 0
+        assert result["in_sync"] is True
+
+    def test_count_mismatch_escalates_to_full_scan(self, stores):
+        old = stores["now"] - timedelta(days=1)
+        stores["add"]("faq::old::v1::chunk_0", "old", old, in_chroma=False)
+        stores["state"]["checkpoint"] = stores["now"] - timedelta(hours=1)
+
+        result = handler.sync_check()
+
+        assert result["mode"] == "full"
+        assert result["drift"]["missing_in_chroma"] == 1
+        assert result["in_sync"] is False
@@ -0,0 +1,240 @@
+"""
+Semantic Response Cache Tests
+
+Validates the per-guild response cache used by llm/conversation.respond:
+informational-intent gating, similarity threshold, persona/state version
+invalidation, TTL, shadow (evaluation) mode, per-user identity in cached
+answers, and the respond() wiring (off-loop lookup, audit of hits).
+
+Run with: pytest tests/test_response_cache.py -v
+"""
+
+import asyncio
+import re
+import threading
+
+import numpy as np
+import pytest
+
+from abby_core.llm import conversation
+from abby_core.llm.context import (
+    ConversationContext,
+    PersonaConfig,
+    PersonalityConfig,
+    UserProfile,
+)
+from abby_core.llm.intent import Intent, is_informational
+from abby_core.llm.response_cache import SemanticResponseCache
+
+VOCAB = ["movie", "night", "when", "is", "rules", "the", "what", "are", "server", "how", "earn", "coins"]
+
+
+def bag_of_words(texts):
+    """Deterministic stand-in for the sentence-transformers model."""
+    vectors = np.zeros((len(texts), len(VOCAB)), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in re.findall(r"[a-z]+", text.lower()):
+            if token in VOCAB:
+                vectors[row, VOCAB.index(token)] += 1.0
+    return vectors
+
+
+def make_context(guild_id="1", persona="bunny", system_state=None, chat_history=None, intent=None,
+                 user_id="42", name="alice"):
+    return ConversationContext(
+        user_id=user_id,
+        user_profile=UserProfile(user_id=user_id, name=name),
+        persona=PersonaConfig(name=persona, system_message="You are Abby."),
+        personality=PersonalityConfig(persona_name=persona),
+        chat_history=chat_history or [],
+        guild_id=guild_id,
+        system_state=system_state,
+        intent_info={"intent": intent} if intent else None,
+    )
+
+
+@pytest.fixture
+def cache():
+    return SemanticResponseCache(threshold=0.9, embed=bag_of_words, guild_mode=lambda guild_id: "on")
+
+
+def _ask(cache, text, context, answer="Movie night is Friday."):
+    check = cache.check(text, context)
+    if check.response is None:
+        cache.record(check, answer)
+    return check
+
+
+class TestInformationalGate:
+    """Only informational, non-personal questions are cacheable."""
+
+    @pytest.mark.parametrize(
+        "message,intent,expected",
+        [
+            ("When is movie night?", Intent.CASUAL_CHAT, True),
+            ("When is game night?", Intent.CREATIVE_ASSIST, False),
+            ("How do you work?", Intent.META_SYSTEM, True),
+            ("hello how are you?", Intent.CASUAL_CHAT, False),
+            ("what's my level?", Intent.CASUAL_CHAT, False),
+            ("write me a song about rain?", Intent.CREATIVE_ASSIST, False),
+        ],
+    )
+    def test_is_informational(self, message, intent, expected):
+        assert is_informational(message, intent) is expected
+
+
+class TestSemanticResponseCache:
+    """Lookup, thresholds and invalidation."""
+
+    def test_similar_question_hits(self, cache):
+        _ask(cache, "When is movie night?", make_context())
+        check = cache.check("when is movie night tonight?", make_context())
+
+        assert check.response == "Movie night is Friday."
+        assert check.similarity >= 0.9
+        assert cache.stats()["hits"] == 1
+
+    def test_dissimilar_question_misses(self, cache):
+        _ask(cache, "When is movie night?", make_context())
+
+        assert cache.check("What are the server rules?", make_context()).response is None
+
+    def test_guilds_are_isolated(self, cache):
+        _ask(cache, "When is movie night?", make_context(guild_id="1"))
+
+        assert cache.check("When is movie night?", make_context(guild_id="2")).response is None
+
+    def test_follow_up_turns_are_not_cached(self, cache):
+        history = [{"input": "hi", "response": "hello!"}]
+        check = _ask(cache, "When is movie night?", make_context(chat_history=history))
+
+        assert not check.eligible
+        assert cache.stats()["entries"] == 0
+
+    def test_non_informational_intent_is_not_cached(self, cache):
+        check = _ask(cache, "When is movie night?", make_context(intent="creative_assist"))
+
+        assert not check.eligible
+
+    def test_persona_change_invalidates(self, cache):
+        _ask(cache, "When is movie night?", make_context(persona="bunny"))
+
+        assert cache.check("When is movie night?", make_context(persona="kiki")).response is None
+
+    def test_system_state_change_invalidates(self, cache):
+        _ask(cache, "When is movie night?", make_context())
+        state = {"scope": "global", "active_states": [{"state_type": "season", "key": "winter"}], "effects": {}}
+
+        assert cache.check("When is movie night?", make_context(system_state=state)).response is None
+
+    def test_ttl_expiry(self):
+        cache = SemanticResponseCache(ttl_seconds=0, embed=bag_of_words, guild_mode=lambda g: "on")
+        _ask(cache, "When is movie night?", make_context())
+
+        assert cache.check("When is movie night?", make_context()).response is None
+
+    def test_off_mode_skips_lookup(self):
+        calls = []
+        cache = SemanticResponseCache(embed=lambda texts: calls.append(texts) or bag_of_words(texts),
+                                      guild_mode=lambda g: "off")
+        _ask(cache, "When is movie night?", make_context())
+
+        assert calls == []
+
+    def test_shadow_mode_never_serves(self, caplog):
+        cache = SemanticResponseCache(threshold=0.9, embed=bag_of_words, guild_mode=lambda g: "shadow")
+        _ask(cache, "When is movie night?", make_context())
+        check = cache.check("when is movie night", make_context())
+        cache.record(check, "Fresh answer")
+
+        assert check.response is None
+        assert check.shadow_response == "Movie night is Friday."
+        assert cache.stats()["shadow_hits"] == 1
+
+    def test_embedder_failure_disables_cache(self):
+        def broken(texts):
+            raise RuntimeError("no weights")
+
+        cache = SemanticResponseCache(embed=broken, guild_mode=lambda g: "on")
+
+        assert not _ask(cache, "When is movie night?", make_context()).eligible
+        assert not _ask(cache, "When is movie night?", make_context()).eligible
+
+
+class TestUserIdentity:
+    """Cached answers never replay another user's name or mention."""
+
+    def test_name_and_mention_are_replaced(self, cache):
+        _ask(cache, "When is movie night?", make_context(), answer="Hi Alice (<@42>)! Movie night is Friday.")
+
+        check = cache.check("When is movie night?", make_context(user_id="7", name="bob"))
+
+        assert check.response == "Hi bob (<@7>)! Movie night is Friday."
+
+    def test_name_inside_other_words_is_kept(self, cache):
+        _ask(cache, "When is movie night?", make_context(name="al"), answer="Movie night is in the hall, al.")
+
+        check = cache.check("When is movie night?", make_context(user_id="7", name="bob"))
+
+        assert check.response == "Movie night is in the hall, bob."
+
+    def test_user_without_name_misses_personal_answer(self, cache):
+        _ask(cache, "When is movie night?", make_context(), answer="alice, it's Friday.")
+
+        assert cache.check("When is movie night?", make_context(user_id="7", name=None)).response is None
+
+
+class FakeLLM:
+    openai_model = "fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    def chat(self, messages, temperature=0.7):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+class TestRespondIntegration:
+    """conversation.respond serves hits without calling the LLM."""
+
+    def test_repeat_question_skips_llm(self, cache, monkeypatch):
+        llm = FakeLLM()
+        monkeypatch.setattr(conversation, "get_llm_client", lambda: llm)
+        monkeypatch.setattr(conversation, "get_response_cache", lambda: cache)
+        monkeypatch.setattr(conversation, "get_generation_audit_service", lambda: None)
+
+        first = asyncio.run(conversation.respond("When is movie night?", make_context()))
+        second = asyncio.run(conversation.respond("when is movie night", make_context()))
+
+        assert first == second == "answer 1"
+        assert llm.calls == 1
+
+    def test_lookup_runs_off_loop_and_hits_are_audited(self, monkeypatch):
+        lookup_threads = []
+
+        def guild_mode(guild_id):
+            lookup_threads.append(threading.get_ident())
+            return "on"
+
+        class Audit:
+            records = []
+
+            def log_generation(self, **record):
+                self.records.append(record)
+
+        cache = SemanticResponseCache(threshold=0.9, embed=bag_of_words, guild_mode=guild_mode)
+        monkeypatch.setattr(conversation, "get_llm_client", lambda: FakeLLM())
+        monkeypatch.setattr(conversation, "get_response_cache", lambda: cache)
+        monkeypatch.setattr(conversation, "get_generation_audit_service", lambda: Audit())
+
+        async def ask_twice():
+            await conversation.respond("When is movie night?", make_context())
+            await conversation.respond("when is movie night", make_context())
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(ask_twice())
+
+        assert lookup_threads and loop_thread not in lookup_threads
+        assert [r["provider"] for r in Audit.records] == ["openai", "response_cache"]
+        assert Audit.records[1]["response"] == "answer 1"
@@ -0,0 +1,271 @@
+"""
+Session Expiry Tests
+
+Validates expires_at based session expiry: sessions get expires_at on
+creation and close, the expiry queue hands each due session to exactly
+one worker (earliest first, stale claims retried), finalization writes a
+summary and marks sessions expired, update_session is a single
+conditional update returning the new document, and the backfill
+migration is re-runnable.
+
+Run with: pytest tests/test_session_expiry.py -v
+"""
+
+import copy
+import itertools
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from abby_core.database import session_repository
+from abby_core.database.collections.chat_sessions import SESSION_MAX_AGE_SECONDS
+from abby_core.database.collections.migrations import add_session_expires_at as migration
+from abby_core.services import conversation_service as conversation_module
+from abby_core.services.conversation_service import ConversationService
+
+NOW = datetime.now(timezone.utc)
+
+
+class Result:
+    def __init__(self, matched):
+        self.matched_count = matched
+        self.modified_count = matched
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction=1):
+        self.docs = sorted(self.docs, key=lambda d: d[field], reverse=direction == -1)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class FakeSessions:
+    """In-memory sessions collection with the operators used by expiry code."""
+
+    def __init__(self):
+        self.docs = []
+        self._ids = itertools.count(1)
+        self.calls = []
+
+    @classmethod
+    def _matches(cls, doc, query):
+        for field, cond in query.items():
+            if field == "$or":
+                if not any(cls._matches(doc, sub) for sub in cond):
+                    return False
+                continue
+            value = doc.get(field)
+            if isinstance(cond, dict):
+                if "$exists" in cond and (field in doc) != cond["$exists"]:
+                    return False
+                if "$lte" in cond and not (value is not None and value <= cond["$lte"]):
+                    return False
+                if "$lt" in cond and not (value is not None and value < cond["$lt"]):
+                    return False
+                if "$gt" in cond and not (value is not None and value > cond["$gt"]):
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    def insert(self, doc):
+        self.docs.append({"_id": next(self._ids), **copy.deepcopy(doc)})
+
+    def insert_one(self, doc):
+        self.insert(doc)
+
+    def find_one(self, query, projection=None):
+        self.calls.append("find_one")
+        doc = next((d for d in self.docs if self._matches(d, query)), None)
+        return copy.deepcopy(doc)
+
+    def find(self, query, projection=None):
+        return Cursor([copy.deepcopy(d) for d in self.docs if self._matches(d, query)])
+
+    def find_one_and_update(self, query, update, sort=None, projection=None, return_document=False):
+        self.calls.append("find_one_and_update")
+        matches = [d for d in self.docs if self._matches(d, query)]
+        for field, direction in reversed(sort or []):
+            matches.sort(key=lambda d: d[field], reverse=direction == -1)
+        if not matches:
+            return None
+        matches[0].update(copy.deepcopy(update["$set"]))
+        return copy.deepcopy(matches[0])
+
+    def update_one(self, query, update, upsert=False):
+        self.calls.append("update_one")
+        doc = next((d for d in self.docs if self._matches(d, query)), None)
+        if doc is not None:
+            doc.update(copy.deepcopy(update["$set"]))
+        return Result(1 if doc is not None else 0)
+
+    def count_documents(self, query):
+        return sum(1 for d in self.docs if self._matches(d, query))
+
+    def by_id(self, session_id):
+        return next(d for d in self.docs if d["session_id"] == session_id)
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    sessions = FakeSessions()
+    monkeypatch.setattr(session_repository, "get_sessions_collection", lambda: sessions)
+    monkeypatch.setattr(conversation_module, "get_sessions_collection", lambda: sessions)
+    monkeypatch.setattr(migration, "get_sessions_collection", lambda: sessions)
+    return sessions
+
+
+def session_doc(session_id, expires_in, status="active", **extra):
+    return {
+        "session_id": session_id, "user_id": "1", "guild_id": "10", "status": status,
+        "created_at": NOW - timedelta(hours=1), "expires_at": NOW + timedelta(seconds=expires_in),
+        **extra,
+    }
+
+
+class TestExpiresAt:
+    """Sessions carry their expiry from creation to close."""
+
+    def test_created_with_max_age(self, sessions):
+        ConversationService().create_session(1, "s-1", guild_id=10)
+        session = sessions.by_id("s-1")
+
+        assert session["expires_at"] - session["created_at"] == timedelta(seconds=SESSION_MAX_AGE_SECONDS)
+
+    def test_repository_default(self, sessions):
+        assert session_repository.create_session({"session_id": "s-1", "created_at": NOW})
+
+        assert sessions.by_id("s-1")["expires_at"] == NOW + timedelta(seconds=SESSION_MAX_AGE_SECONDS)
+
+    def test_close_starts_retention(self, sessions):
+        sessions.insert(session_doc("s-1", 3600))
+
+        assert session_repository.close_session("s-1")
+
+        session = sessions.by_id("s-1")
+        assert session["status"] == "closed"
+        assert session["expires_at"] <= datetime.now(timezone.utc)
+
+
+class TestExpiryQueue:
+    """claim_expiring_session pops due sessions off the index."""
+
+    def test_claims_earliest_due_once(self, sessions):
+        sessions.insert(session_doc("later", -10))
+        sessions.insert(session_doc("first", -60))
+        sessions.insert(session_doc("not-due", 3600))
+        sessions.insert(session_doc("closed", -120, status="closed"))
+
+        claimed = [session_repository.claim_expiring_session(NOW) for _ in range(3)]
+
+        assert [s and s["session_id"] for s in claimed] == ["first", "later", None]
+        assert sessions.by_id("first")["status"] == "expiring"
+        assert sessions.by_id("not-due")["status"] == "active"
+
+    def test_claim_revokes_lease(self, sessions):
+        sessions.insert(session_doc("s-1", -10, lease_owner="worker-a"))
+
+        assert session_repository.claim_expiring_session(NOW)["lease_owner"] is None
+
+    def test_stale_claim_is_retried(self, sessions):
+        sessions.insert(session_doc("crashed", -600, status="expiring",
+                                    expiring_since=NOW - timedelta(minutes=30)))
+        sessions.insert(session_doc("in-progress", -600, status="expiring",
+                                    expiring_since=NOW - timedelta(seconds=5)))
+
+        claimed = session_repository.claim_expiring_session(NOW)
+
+        assert claimed["session_id"] == "crashed"
+        assert session_repository.claim_expiring_session(NOW) is None
+
+
+class TestFinalize:
+    """finalize_expiring_sessions summarizes and marks sessions expired."""
+
+    @pytest.mark.asyncio
+    async def test_summarizes_and_expires(self, sessions, monkeypatch):
+        histories = []
+
+        async def generate_summary(self, history):
+            histories.append(history)
+            return "talked about synths", None
+
+        monkeypatch.setattr(ConversationService, "generate_summary", generate_summary)
+        interactions = [
+            {"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"},
+            {"role": "user", "content": "synths?"}, {"role": "assistant", "content": "yes"},
+        ]
+        sessions.insert(session_doc("chatty", -5, interactions=interactions, running_summary="met"))
+        sessions.insert(session_doc("quiet", -5, interactions=[]))
+        sessions.insert(session_doc("fresh", 3600, interactions=interactions))
+
+        count, error = await ConversationService().finalize_expiring_sessions()
+
+        assert (count, error) == (2, None)
+        assert sessions.by_id("chatty")["status"] == "expired"
+        assert sessions.by_id("chatty")["summary"] == "talked about synths"
+        assert "summary" not in sessions.by_id("quiet")
+        assert sessions.by_id("fresh")["status"] == "active"
+        assert histories == [[
+            {"input": "Earlier in this conversation", "response": "met"},
+            {"input": "hi", "response": "hello"},
+            {"input": "synths?", "response": "yes"},
+        ]]
+
+    @pytest.mark.asyncio
+    async def test_limit_leaves_rest_queued(self, sessions):
+        for i in range(5):
+            sessions.insert(session_doc(f"s-{i}", -5 - i))
+
+        count, _ = await ConversationService().finalize_expiring_sessions(limit=3, summarize=False)
+
+        assert count == 3
+        assert sum(1 for d in sessions.docs if d["status"] == "active") == 2
+
+
+class TestUpdateSession:
+    """update_session is one conditional round-trip."""
+
+    def test_returns_updated_document(self, sessions):
+        sessions.insert(session_doc("s-1", 3600))
+
+        session = session_repository.update_session("s-1", {"turn_count": 3})
+
+        assert session["turn_count"] == 3
+        assert sessions.calls == ["find_one_and_update"]
+
+    def test_expected_mismatch_returns_none(self, sessions):
+        sessions.insert(session_doc("s-1", 3600, status="closed"))
+
+        assert session_repository.update_session("s-1", {"turn_count": 3}, expected={"status": "active"}) is None
+        assert "turn_count" not in sessions.by_id("s-1")
+
+
+class TestMigration:
+    """Backfill of sessions written before expires_at."""
+
+    def test_backfill_is_rerunnable(self, sessions):
+        closed_at = NOW - timedelta(days=2)
+        sessions.insert({"session_id": "open", "status": "active", "created_at": NOW})
+        sessions.insert({"session_id": "closed", "status": "closed", "created_at": NOW, "closed_at": closed_at})
+        sessions.insert({"session_id": "bare", "status": "expired"})
+        sessions.insert(session_doc("current", 60))
+
+        report = migration.run_migration(batch_size=2)
+
+        assert report["status"] == "success"
+        assert report["sessions_updated"] == 3
+        assert report["sessions_without_timestamps"] == 1
+        assert sessions.by_id("open")["expires_at"] == NOW + timedelta(seconds=SESSION_MAX_AGE_SECONDS)
+        assert sessions.by_id("closed")["expires_at"] == closed_at
+        assert migration.verify_migration()["missing_expires_at"] == 0
+        assert migration.run_migration()["sessions_updated"] == 0
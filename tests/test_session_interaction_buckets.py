@@ -0,0 +1,254 @@
+"""
+Session Interaction Bucket Tests
+
+Validates bucketed session history: exchanges land in 50-exchange bucket
+documents while the session keeps only counters and a short tail, history
+pages read back in order, sessions written before bucketing are converted
+on their next exchange, and the bulk migration is batched and re-runnable.
+
+Run with: pytest tests/test_session_interaction_buckets.py -v
+"""
+
+import copy
+import itertools
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from abby_core.database.collections import chat_session_interactions as buckets_module
+from abby_core.database.collections.chat_session_interactions import (
+    INTERACTIONS_PER_BUCKET,
+    RECENT_INTERACTIONS,
+    bucket_session,
+    split_exchanges,
+)
+from abby_core.database.collections.migrations import bucket_session_interactions as migration
+from abby_core.services import conversation_service as conversation_module
+from abby_core.services.conversation_service import ConversationService
+
+T0 = datetime(2026, 4, 1, 9, 0, 0, tzinfo=timezone.utc)
+
+
+class Result:
+    def __init__(self, matched):
+        self.matched_count = matched
+        self.modified_count = matched
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction=1):
+        self.docs = sorted(self.docs, key=lambda d: d[field], reverse=direction == -1)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class FakeCollection:
+    """In-memory collection with the operators used by session history code."""
+
+    def __init__(self):
+        self.docs = []
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def _matches(cls, doc, query):
+        for field, cond in query.items():
+            value = doc.get(field)
+            if isinstance(cond, dict):
+                if "$ne" in cond and value == cond["$ne"]:
+                    return False
+                if "$gt" in cond and not (value is not None and value > cond["$gt"]):
+                    return False
+                if "$size" in cond and len(value or []) != cond["$size"]:
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    @staticmethod
+    def _apply(doc, update):
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+        doc.update(copy.deepcopy(update.get("$set", {})))
+        for key, spec in update.get("$push", {}).items():
+            doc.setdefault(key, []).extend(copy.deepcopy(spec["$each"]))
+            if "$slice" in spec:
+                doc[key] = doc[key][spec["$slice"]:]
+
+    def insert(self, doc):
+        self.docs.append({"_id": next(self._ids), **copy.deepcopy(doc)})
+
+    def insert_one(self, doc):
+        self.insert(doc)
+
+        class Inserted:
+            acknowledged = True
+
+        return Inserted()
+
+    def find_one(self, query, projection=None):
+        doc = next((d for d in self.docs if self._matches(d, query)), None)
+        return copy.deepcopy(doc)
+
+    def find(self, query, projection=None):
+        return Cursor([copy.deepcopy(d) for d in self.docs if self._matches(d, query)])
+
+    def find_one_and_update(self, query, update, projection=None, return_document=False):
+        doc = next((d for d in self.docs if self._matches(d, query)), None)
+        if doc is None:
+            return None
+        self._apply(doc, update)
+        return copy.deepcopy(doc)
+
+    def update_one(self, query, update, upsert=False):
+        doc = next((d for d in self.docs if self._matches(d, query)), None)
+        if doc is None and upsert:
+            self.insert({**query, **update.get("$setOnInsert", {})})
+            self._apply(self.docs[-1], update)
+            return Result(0)
+        if doc is not None:
+            self._apply(doc, update)
+        return Result(1 if doc is not None else 0)
+
+    def count_documents(self, query):
+        return sum(1 for d in self.docs if self._matches(d, query))
+
+
+@pytest.fixture
+def db(monkeypatch):
+    sessions, buckets = FakeCollection(), FakeCollection()
+    monkeypatch.setattr(conversation_module, "get_sessions_collection", lambda: sessions)
+    monkeypatch.setattr(buckets_module, "get_sessions_collection", lambda: sessions)
+    monkeypatch.setattr(migration, "get_sessions_collection", lambda: sessions)
+    monkeypatch.setattr(buckets_module, "get_collection", lambda: buckets)
+    return sessions, buckets
+
+
+def legacy_session(session_id, exchanges):
+    interactions = []
+    for i in range(exchanges):
+        at = T0 + timedelta(minutes=i)
+        interactions.append({"role": "user", "content": f"q{i}", "timestamp": at})
+        interactions.append({"role": "assistant", "content": f"a{i}", "timestamp": at})
+    return {
+        "session_id": session_id, "user_id": "1", "guild_id": "10", "status": "closed",
+        "created_at": T0, "turn_count": exchanges, "interactions": interactions,
+    }
+
+
+def full_history(service, session_id):
+    messages, page = [], 0
+    while page is not None:
+        (chunk, page), error = service.get_session_history(1, session_id, page)
+        assert error is None
+        messages.extend(chunk)
+    return messages
+
+
+class TestBucketedWrites:
+    """record_exchange keeps the session small."""
+
+    def test_exchanges_fill_buckets(self, db):
+        sessions, buckets = db
+        service = ConversationService()
+        service.create_session(1, "s-1", guild_id=10)
+
+        for i in range(120):
+            assert service.record_exchange(1, "s-1", f"q{i}", f"a{i}") == (True, None)
+
+        session = sessions.find_one({"session_id": "s-1"})
+        assert session["exchange_count"] == 120
+        assert session["message_count"] == 240
+        assert len(session["interactions"]) == RECENT_INTERACTIONS
+        assert session["interactions"][-1]["content"] == "a119"
+        assert [(b["bucket"], b["exchange_count"]) for b in Cursor(buckets.docs).sort("bucket")] == \
+            [(0, INTERACTIONS_PER_BUCKET), (1, INTERACTIONS_PER_BUCKET), (2, 20)]
+        assert buckets.docs[0]["guild_id"] == "10"
+
+    def test_history_pages_in_order(self, db):
+        service = ConversationService()
+        service.create_session(1, "s-1", guild_id=10)
+        for i in range(60):
+            service.record_exchange(1, "s-1", f"q{i}", None if i % 7 == 0 else f"a{i}")
+
+        (first, next_page), _ = service.get_session_history(1, "s-1", 0)
+        history = full_history(service, "s-1")
+
+        assert next_page == 1
+        assert len(first) == sum(1 if i % 7 == 0 else 2 for i in range(50))
+        assert [m["content"] for m in history if m["role"] == "user"] == [f"q{i}" for i in range(60)]
+
+    def test_unknown_session_is_an_error(self, db):
+        assert ConversationService().record_exchange(1, "missing", "hi")[0] is None
+
+
+class TestLegacySessions:
+    """Sessions written before bucketing."""
+
+    def test_converted_on_next_exchange(self, db):
+        sessions, buckets = db
+        sessions.insert({**legacy_session("old", 75), "status": "active"})
+        service = ConversationService()
+
+        assert service.record_exchange(1, "old", "q75", "a75") == (True, None)
+
+        session = sessions.find_one({"session_id": "old"})
+        assert session["interactions_layout"] == "bucketed"
+        assert session["exchange_count"] == 76
+        assert len(session["interactions"]) == RECENT_INTERACTIONS
+        history = full_history(service, "old")
+        assert [m["content"] for m in history[-4:]] == ["q74", "a74", "q75", "a75"]
+        assert len(history) == 152
+
+    def test_unmigrated_history_is_readable(self, db):
+        sessions, _ = db
+        sessions.insert(legacy_session("old", 3))
+
+        assert len(full_history(ConversationService(), "old")) == 6
+
+    def test_concurrent_append_aborts_conversion(self, db):
+        sessions, _ = db
+        sessions.insert(legacy_session("old", 3))
+        snapshot = sessions.find_one({"session_id": "old"})
+        sessions.docs[0]["interactions"].append({"role": "user", "content": "late", "timestamp": T0})
+
+        assert bucket_session(snapshot) is None
+        assert "interactions_layout" not in sessions.docs[0]
+        assert len(sessions.docs[0]["interactions"]) == 7
+
+    def test_split_exchanges(self):
+        messages = [{"role": "assistant"}, {"role": "user"}, {"role": "assistant"}, {"role": "user"}]
+
+        assert [len(e) for e in split_exchanges(messages)] == [1, 2, 1]
+
+
+class TestMigration:
+    """Bulk conversion of the remaining sessions."""
+
+    def test_batched_and_rerunnable(self, db):
+        sessions, buckets = db
+        for i, size in enumerate([0, 1, 50, 51, 130]):
+            sessions.insert(legacy_session(f"old-{i}", size))
+
+        report = migration.run_migration(batch_size=2)
+
+        assert report["status"] == "success"
+        assert report["sessions_migrated"] == 5
+        assert report["exchanges_moved"] == 232
+        assert len(buckets.docs) == 0 + 1 + 1 + 2 + 3
+        assert migration.verify_migration()["unmigrated_sessions"] == 0
+
+        again = migration.run_migration(batch_size=2)
+        assert again["sessions_migrated"] == 0
+        assert len(buckets.docs) == 7
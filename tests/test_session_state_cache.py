@@ -0,0 +1,272 @@
+"""
+Session State Cache Tests
+
+Validates the leased, write-through session cache used by the usage gate:
+turns after the first read no session documents, every turn is still
+persisted with one atomic $inc, limits hold under concurrent turns, and
+leases keep multi-process deployments correct (conflicting claims, lease
+expiry, and writes or closes from other processes revoking the lease).
+
+Run with: pytest tests/test_session_state_cache.py -v
+"""
+
+import copy
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from abby_core.database import session_repository
+from abby_core.database.collections import chat_session_interactions
+from abby_core.services import conversation_service as conversation_module
+from abby_core.services import usage_gate_service as usage_gate_module
+from abby_core.services.burst_limiter import BurstLimiter
+from abby_core.services.conversation_service import ConversationService
+from abby_core.services.session_state_cache import SessionStateCache
+from abby_core.services.usage_gate_service import UsageGateService
+
+
+class Result:
+    def __init__(self, matched):
+        self.matched_count = matched
+        self.modified_count = matched
+        self.acknowledged = True
+
+
+class FakeSessions:
+    """Thread-safe in-memory chat_sessions collection with operation counting."""
+
+    def __init__(self):
+        self.docs = []
+        self.reads = 0
+        self.writes = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def _matches(cls, doc, query):
+        for field, cond in query.items():
+            if field == "$or":
+                if not any(cls._matches(doc, sub) for sub in cond):
+                    return False
+                continue
+            value = doc.get(field)
+            if isinstance(cond, dict):
+                if "$lt" in cond and not (value is not None and value < cond["$lt"]):
+                    return False
+                if "$ne" in cond and value == cond["$ne"]:
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    @staticmethod
+    def _apply(doc, update):
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+        doc.update(update.get("$set", {}))
+        for key in update.get("$unset", {}):
+            doc.pop(key, None)
+        for key, spec in update.get("$push", {}).items():
+            doc.setdefault(key, []).extend(spec["$each"])
+            if "$slice" in spec:
+                doc[key] = doc[key][spec["$slice"]:]
+
+    def find_one(self, query):
+        with self.lock:
+            self.reads += 1
+            doc = next((d for d in self.docs if self._matches(d, query)), None)
+            return copy.deepcopy(doc)
+
+    def find_one_and_update(self, query, update, projection=None, return_document=False):
+        with self.lock:
+            self.writes += 1
+            doc = next((d for d in self.docs if self._matches(d, query)), None)
+            if doc is None:
+                return None
+            self._apply(doc, update)
+            return copy.deepcopy(doc)
+
+    def update_one(self, query, update, upsert=False):
+        with self.lock:
+            self.writes += 1
+            doc = next((d for d in self.docs if self._matches(d, query)), None)
+            if doc is None and upsert:
+                self.docs.append({**query, **update.get("$setOnInsert", {})})
+                self._apply(self.docs[-1], update)
+                return Result(0)
+            if doc is not None:
+                self._apply(doc, update)
+            return Result(1 if doc is not None else 0)
+
+    def update_many(self, query, update):
+        with self.lock:
+            matched = [d for d in self.docs if self._matches(d, query)]
+            for doc in matched:
+                self._apply(doc, update)
+            return Result(len(matched))
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    fake = FakeSessions()
+    fake.docs.append({
+        "session_id": "session-1",
+        "user_id": "1",
+        "guild_id": "10",
+        "status": "active",
+        "turn_count": 0,
+        "created_at": datetime.now(timezone.utc),
+        "interactions": [],
+        "interactions_layout": "bucketed",
+    })
+    monkeypatch.setattr(session_repository, "get_sessions_collection", lambda: fake)
+    monkeypatch.setattr(conversation_module, "get_sessions_collection", lambda: fake)
+    monkeypatch.setattr(usage_gate_module, "get_database", lambda: {"chat_sessions": fake})
+    buckets = FakeSessions()
+    monkeypatch.setattr(chat_session_interactions, "get_collection", lambda: buckets)
+    limiter = BurstLimiter()
+    monkeypatch.setattr(conversation_module, "get_burst_limiter", lambda: limiter)
+    monkeypatch.setattr(usage_gate_module, "get_burst_limiter", lambda: limiter)
+    monkeypatch.setattr(usage_gate_module, "get_memory_settings", lambda guild_id: {
+        "usage_limits": {
+            "conversation": {"max_turns_per_session": 3, "session_timeout_seconds": 600},
+            "burst": {"max_messages": 4, "window_seconds": 60},
+        }
+    })
+    return fake
+
+
+@pytest.fixture
+def cache(sessions, monkeypatch):
+    """This process's cache."""
+    local = SessionStateCache(lease_seconds=120, enabled=True, collection=lambda: sessions, owner_id="proc-a")
+    monkeypatch.setattr(conversation_module, "get_session_state_cache", lambda: local)
+    monkeypatch.setattr(usage_gate_module, "get_session_state_cache", lambda: local)
+    return local
+
+
+class TestLeasedTurns:
+    """Steady-state turns for a session owned by this process."""
+
+    def test_turns_after_claim_read_nothing(self, sessions, cache):
+        conversations = ConversationService()
+        gate = UsageGateService()
+        conversations.get_active_session(1, 10)
+        reads = sessions.reads
+
+        for _ in range(3):
+            session, _ = conversations.get_active_session(1, 10)
+            assert gate.increment_and_check_turn_limit(session["session_id"], max_turns=3)[0] is True
+
+        assert sessions.reads == reads
+        assert sessions.docs[0]["turn_count"] == 3  # Durable at every turn boundary
+        assert sessions.docs[0]["lease_owner"] == "proc-a"
+
+    def test_limit_enforced_in_memory(self, sessions, cache):
+        ConversationService().get_active_session(1, 10)
+        gate = UsageGateService()
+        results = [gate.increment_and_check_turn_limit("session-1", max_turns=2) for _ in range(2)]
+        writes = sessions.writes
+
+        assert results == [(True, 1, False), (True, 2, True)]
+        assert gate.increment_and_check_turn_limit("session-1", max_turns=2) == (False, 2, False)
+        assert sessions.writes == writes
+
+    def test_concurrent_turns_respect_limit(self, sessions, cache):
+        ConversationService().get_active_session(1, 10)
+        gate = UsageGateService()
+        results = []
+
+        def attempt():
+            results.append(gate.increment_and_check_turn_limit("session-1", max_turns=3))
+
+        threads = [threading.Thread(target=attempt) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(1 for r in results if r[0] is True) == 3
+        assert sessions.docs[0]["turn_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_burst_window_served_from_memory(self, sessions, cache):
+        conversations = ConversationService()
+        conversations.get_active_session(1, 10)
+        for i in range(2):
+            conversations.record_exchange(1, "session-1", f"hi {i}", "hello")
+        reads = sessions.reads
+
+        result = await UsageGateService().check_usage_gate(10, 1)
+
+        assert result.burst_limit_hit
+        assert sessions.reads == reads
+
+    @pytest.mark.asyncio
+    async def test_close_drops_the_session(self, sessions, cache):
+        conversations = ConversationService()
+        conversations.get_active_session(1, 10)
+
+        await UsageGateService().close_session_gracefully(1, "session-1")
+
+        assert cache.lookup(1, 10) is None
+        assert conversations.get_active_session(1, 10)[0] is None
+
+
+class TestLeases:
+    """Multi-process correctness."""
+
+    def test_second_process_cannot_claim_a_live_lease(self, sessions, cache):
+        other = SessionStateCache(lease_seconds=120, enabled=True, collection=lambda: sessions, owner_id="proc-b")
+        session, _ = ConversationService().get_active_session(1, 10)
+
+        assert not other.claim(session)
+        assert other.increment_turn("session-1", max_turns=3) is None  # Uses the database path
+        assert other.stats()["claim_conflicts"] == 1
+
+    def test_expired_lease_can_be_taken_over(self, sessions, cache):
+        ConversationService().get_active_session(1, 10)
+        sessions.docs[0]["lease_until"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+        other = SessionStateCache(lease_seconds=120, enabled=True, collection=lambda: sessions, owner_id="proc-b")
+
+        assert other.claim(sessions.find_one({"session_id": "session-1"}))
+        assert sessions.docs[0]["lease_owner"] == "proc-b"
+
+    def test_write_from_another_process_revokes_the_lease(self, sessions, cache, monkeypatch):
+        ConversationService().get_active_session(1, 10)
+        gate = UsageGateService()
+        assert gate.increment_and_check_turn_limit("session-1", max_turns=3) == (True, 1, False)
+
+        # Another process increments through the database path
+        other = SessionStateCache(enabled=False)
+        monkeypatch.setattr(usage_gate_module, "get_session_state_cache", lambda: other)
+        assert gate.increment_and_check_turn_limit("session-1", max_turns=3) == (True, 2, False)
+        monkeypatch.setattr(usage_gate_module, "get_session_state_cache", lambda: cache)
+
+        # Owner's cached count is stale: the conditional write misses and it falls back
+        assert gate.increment_and_check_turn_limit("session-1", max_turns=3) == (True, 3, True)
+        assert cache.stats()["lost_leases"] == 1
+        assert cache.lookup(1, 10) is None
+
+    def test_close_from_another_process_revokes_the_lease(self, sessions, cache, monkeypatch):
+        ConversationService().get_active_session(1, 10)
+        assert cache.increment_turn("session-1", max_turns=3) == (True, 1, False)
+
+        # Another process closes the session; its forget() cannot reach this cache
+        other = SessionStateCache(lease_seconds=120, enabled=True, collection=lambda: sessions, owner_id="proc-b")
+        monkeypatch.setattr(conversation_module, "get_session_state_cache", lambda: other)
+        assert ConversationService().close_session(1, "session-1") == (True, None)
+        assert sessions.docs[0]["lease_owner"] is None
+
+        # The owner's next cached write misses instead of bumping the closed session
+        assert cache.increment_turn("session-1", max_turns=3) is None
+        assert sessions.docs[0]["turn_count"] == 1
+        assert cache.lookup(1, 10) is None
+        assert cache.stats()["lost_leases"] == 1
+
+    def test_closed_session_with_lease_is_not_written(self, sessions, cache):
+        ConversationService().get_active_session(1, 10)
+        sessions.docs[0]["status"] = "expired"  # Written without releasing the lease
+
+        assert cache.increment_turn("session-1", max_turns=3) is None
+        assert sessions.docs[0]["turn_count"] == 0
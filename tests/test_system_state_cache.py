@@ -0,0 +1,243 @@
+"""
+System State Cache Tests
+
+Validates the resolved system state cache: steady-state turns open no
+transactions, entries expire at the next start/end boundary, operator
+transitions invalidate, reads racing a transition are not kept, and
+get_active_state (used by add_xp) is served from memory.
+
+Run with: pytest tests/test_system_state_cache.py -v
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from abby_core.database.collections import system_state as state_collection
+from abby_core.llm import system_state_resolver as resolver
+from abby_core.system import system_state
+from abby_core.system.state_cache import SystemStateCache
+
+T0 = datetime(2026, 2, 10, 12, 0, 0)
+
+
+class Clock:
+    def __init__(self, now=T0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSession:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def start_transaction(self, **kwargs):
+        self.db.transactions += 1
+
+    def commit_transaction(self):
+        pass
+
+    def abort_transaction(self):
+        pass
+
+
+class FakeDatabase:
+    """Counts snapshot transactions opened by the resolver."""
+
+    def __init__(self):
+        self.transactions = 0
+        self.client = self
+
+    def start_session(self):
+        return FakeSession(self)
+
+
+class FakeStateCollection:
+    """In-memory system_state collection with read counting."""
+
+    def __init__(self, docs=()):
+        self.docs = [dict(doc) for doc in docs]
+        self.reads = 0
+
+    @staticmethod
+    def _matches(doc, query):
+        for field, cond in query.items():
+            value = doc.get(field)
+            if isinstance(cond, dict):
+                if "$gte" in cond and not (value is not None and value >= cond["$gte"]):
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    def find_one(self, query):
+        self.reads += 1
+        return next((dict(d) for d in self.docs if self._matches(d, query)), None)
+
+    def find(self, query, projection=None):
+        self.reads += 1
+        return [dict(d) for d in self.docs if self._matches(d, query)]
+
+    def update_one(self, query, update):
+        class Result:
+            modified_count = 0
+
+        for doc in self.docs:
+            if self._matches(doc, query):
+                doc.update(update["$set"])
+                Result.modified_count = 1
+        return Result()
+
+
+def season(state_id, start_at, end_at, active=True):
+    return {
+        "state_id": state_id,
+        "state_type": "season",
+        "scope": "global",
+        "priority": 10,
+        "active": active,
+        "start_at": start_at,
+        "end_at": end_at,
+        "effects": {"affinity_modifier": 0.5},
+    }
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock):
+    return SystemStateCache(max_age_seconds=3600, enabled=True, clock=clock)
+
+
+@pytest.fixture
+def db(monkeypatch, cache):
+    """Resolver backed by a fixed set of active states."""
+    fake = FakeDatabase()
+    fake.states = [season("winter-2026", T0 - timedelta(days=30), T0 + timedelta(minutes=10))]
+    fake.next_transition = T0 + timedelta(minutes=10)
+    monkeypatch.setattr(resolver, "get_database", lambda: fake)
+    monkeypatch.setattr(resolver, "get_system_state_cache", lambda: cache)
+    monkeypatch.setattr(resolver, "_fetch_active_instances", lambda ts, scope: [dict(s) for s in fake.states])
+    monkeypatch.setattr(resolver, "_fetch_state_definitions",
+                        lambda ids: {s["state_id"]: s for s in fake.states if s["state_id"] in ids})
+    monkeypatch.setattr(resolver, "_fetch_next_transition", lambda ts, scope: fake.next_transition)
+    return fake
+
+
+class TestResolverCache:
+    """resolve_system_state served from memory between transitions."""
+
+    def test_steady_state_opens_no_transactions(self, db, cache, clock):
+        first = resolver.resolve_system_state()
+        for _ in range(20):
+            clock.now += timedelta(seconds=5)
+            result = resolver.resolve_system_state()
+
+        assert db.transactions == 1
+        assert result["effects"] == first["effects"]
+        assert result["timestamp"] == clock.now
+        assert cache.stats()["hits"] == 20
+
+    def test_expires_at_next_boundary(self, db, clock):
+        resolver.resolve_system_state()
+        clock.now = db.next_transition - timedelta(microseconds=1)
+        resolver.resolve_system_state()
+        assert db.transactions == 1
+
+        clock.now = db.next_transition
+        db.states = []
+        assert resolver.resolve_system_state()["active_states"] == []
+        assert db.transactions == 2
+
+    def test_transition_invalidates(self, db, cache):
+        resolver.resolve_system_state()
+
+        with cache.transition("activate spring-2026"):
+            db.states = [season("spring-2026", T0, T0 + timedelta(days=90))]
+
+        assert resolver.resolve_system_state()["active_states"][0]["state_id"] == "spring-2026"
+        assert db.transactions == 2
+
+    def test_explicit_timestamp_bypasses_cache(self, db, cache):
+        resolver.resolve_system_state(now=T0)
+        resolver.resolve_system_state(now=T0)
+
+        assert db.transactions == 2
+        assert cache.stats()["size"] == 0
+
+    def test_boundary_lookup_failure_is_not_cached(self, db, monkeypatch):
+        def unavailable(ts, scope):
+            raise ConnectionError("mongo down")
+
+        monkeypatch.setattr(resolver, "_fetch_next_transition", unavailable)
+        resolver.resolve_system_state()
+        resolver.resolve_system_state()
+
+        assert db.transactions == 2
+
+    def test_read_racing_a_transition_is_not_cached(self, cache):
+        def load(now):
+            cache.invalidate("activate spring-2026")  # Commits mid-read
+            return "winter", None
+
+        cache.get_or_load("season", load)
+
+        assert cache.stats()["raced"] == 1
+        assert cache.get_or_load("season", lambda now: ("spring", None)) == "spring"
+
+
+class TestActiveStateCache:
+    """get_active_state (add_xp's season lookup) between transitions."""
+
+    @pytest.fixture
+    def states(self, monkeypatch, cache):
+        collection = FakeStateCollection([season("winter-2026", T0 - timedelta(days=30), T0 + timedelta(days=30))])
+        monkeypatch.setattr(system_state, "get_system_state_collection", lambda: collection)
+        monkeypatch.setattr(system_state, "get_system_state_cache", lambda: cache)
+        return collection
+
+    def test_repeated_lookups_read_once(self, states):
+        for _ in range(10):
+            assert system_state.get_active_state("season")["state_id"] == "winter-2026"
+
+        assert states.reads == 1
+
+    def test_returned_document_is_a_copy(self, states):
+        system_state.get_active_state("season")["state_id"] = "mutated"
+
+        assert system_state.get_active_state("season")["state_id"] == "winter-2026"
+
+    def test_deactivation_invalidates(self, states):
+        system_state.get_active_state("season")
+
+        assert system_state.deactivate_state("winter-2026", operator_id="42")
+        assert system_state.get_active_state("season") is None
+
+
+class TestNextTransition:
+    """Boundary lookup used as the cache expiry."""
+
+    def test_earliest_start_or_end(self, monkeypatch):
+        collection = FakeStateCollection([
+            season("winter-2026", T0 - timedelta(days=30), T0 + timedelta(days=30)),
+            season("valentines-2026", T0 + timedelta(days=2), T0 + timedelta(days=4)),
+            season("ended", T0 - timedelta(days=60), T0 - timedelta(days=31)),
+            season("inactive", T0 + timedelta(hours=1), T0 + timedelta(days=1), active=False),
+        ])
+        monkeypatch.setattr(state_collection, "get_collection", lambda: collection)
+
+        assert state_collection.get_next_transition(T0) == T0 + timedelta(days=2)
+        end = T0 + timedelta(days=30)
+        assert state_collection.get_next_transition(T0 + timedelta(days=10)) == end + timedelta(microseconds=1)
+        assert state_collection.get_next_transition(end + timedelta(seconds=1)) is None
@@ -0,0 +1,227 @@
+"""
+Token Budget Tests
+
+Validates tokenizer-based context budgeting: tiktoken backend selection and
+the offline token estimate for emoji/CJK/long-word text, per-text count
+memoization, priority allocation across prompt sections, the memory
+formatter's token budget, and single-pass prompt assembly under a budget.
+
+Run with: pytest tests/test_token_budget.py -v
+"""
+
+import sys
+import types
+
+import pytest
+
+from abby_core.llm import prompt_cache, token_budget
+from abby_core.llm.context_factory import build_conversation_context
+from abby_core.llm.prompt_cache import PromptPrefixCache
+from abby_core.llm.token_budget import (
+    TokenBudget,
+    count_exchange_tokens,
+    count_tokens,
+    estimate_tokens,
+)
+from abby_core.rag.memory_formatter import format_memory_for_llm
+
+
+def words(text):
+    """Predictable counter for allocation tests: one token per word."""
+    return len(text.split())
+
+
+class TestEstimate:
+    """The offline estimate tracks BPE far better than len/4."""
+
+    def test_plain_english_close_to_len_over_4(self):
+        text = "Hello there, how are you doing today?"
+        assert abs(estimate_tokens(text) - len(text) // 4) <= 1
+
+    def test_emoji_not_undercounted(self):
+        text = "😀😀😀🎉🎉"
+        assert estimate_tokens(text) >= len(text)
+        assert estimate_tokens(text) > len(text) // 4
+
+    def test_cjk_about_one_token_per_char(self):
+        text = "今天过得怎么样"
+        assert estimate_tokens(text) == len(text)
+
+    def test_long_words_not_overcounted(self):
+        assert estimate_tokens("internationalization") < len("internationalization") // 4
+
+    def test_empty(self):
+        assert estimate_tokens("") == 0
+        assert count_tokens("") == 0
+        assert count_tokens(None) == 0
+
+
+class TestBackend:
+    """tiktoken (a pinned requirement) is used whenever its encoding loads."""
+
+    @pytest.fixture
+    def fresh_backend(self, monkeypatch):
+        monkeypatch.setattr(token_budget, "_backend", None)
+        monkeypatch.setattr(token_budget, "_encoder", None)
+        token_budget._count_cached.cache_clear()
+        yield
+        token_budget._count_cached.cache_clear()
+
+    def test_tiktoken_preferred(self, fresh_backend, monkeypatch):
+        class Encoding:
+            def encode_ordinary(self, text):
+                return list(range(len(text.split()) * 3))
+
+        fake = types.ModuleType("tiktoken")
+        fake.get_encoding = lambda name: Encoding()
+        monkeypatch.setitem(sys.modules, "tiktoken", fake)
+        monkeypatch.delenv("TOKENIZER_BACKEND", raising=False)
+
+        assert token_budget.get_tokenizer_backend() == "tiktoken"
+        assert count_tokens("three word text") == 9
+
+    def test_falls_back_when_vocab_cannot_load(self, fresh_backend, monkeypatch):
+        def get_encoding(name):
+            raise OSError("no network to fetch cl100k_base")
+
+        fake = types.ModuleType("tiktoken")
+        fake.get_encoding = get_encoding
+        monkeypatch.setitem(sys.modules, "tiktoken", fake)
+
+        assert token_budget.get_tokenizer_backend() == "estimate"
+        assert count_tokens("hello there") == estimate_tokens("hello there")
+
+
+class TestCountCache:
+    """count_tokens memoizes counts per text."""
+
+    def test_repeat_counts_hit_cache(self):
+        token_budget._count_cached.cache_clear()
+        count_tokens("a message counted twice")
+        count_tokens("a message counted twice")
+
+        stats = token_budget.token_count_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["backend"] in ("tiktoken", "estimate")
+
+    def test_exchange_includes_framing(self):
+        exchange = {"input": "hi", "response": "hello"}
+        assert count_exchange_tokens(exchange) == (
+            count_tokens("hi") + count_tokens("hello") + 2 * token_budget.MESSAGE_OVERHEAD_TOKENS
+        )
+
+
+class TestTokenBudget:
+    """Sections are funded in call (priority) order from one budget."""
+
+    def test_required_sections_may_overdraw(self):
+        budget = TokenBudget(3, counter=words)
+        budget.reserve("system", "one two three four")
+
+        assert budget.remaining == 0
+        assert budget.fit_text("memory", "five") is None
+
+    def test_fit_text_keeps_leading_lines(self):
+        budget = TokenBudget(10, counter=words)
+        budget.reserve("system", "a b c d e")
+        kept = budget.fit_text("rag", "best doc here\nsecond doc here\nthird")
+
+        assert kept == "best doc here"
+        assert budget.used["rag"] == 3
+        assert budget.dropped["rag"] == 4
+
+    def test_max_tokens_caps_section(self):
+        budget = TokenBudget(100, counter=words)
+        assert budget.fit_text("memory", "a b c\nd e f", max_tokens=4) == "a b c"
+
+    def test_history_keeps_newest(self):
+        budget = TokenBudget(5, counter=words)
+        history = ["oldest a b", "middle c", "newest d"]
+        kept = budget.take("history", history, cost=words, newest_first=True)
+
+        assert kept == ["middle c", "newest d"]
+        assert budget.dropped["history"] == 3
+
+    def test_priority_order_funds_memory_before_history(self):
+        budget = TokenBudget(9, counter=words)
+        budget.reserve("system", "persona prompt")
+        budget.reserve("user", "question")
+        memory = budget.fit_text("memory", "fact one\nfact two")
+        history = budget.take("history", ["old turn", "recent turn"], cost=words, newest_first=True)
+
+        assert memory == "fact one\nfact two"
+        assert history == ["recent turn"]
+        assert budget.summary()["spent"] == 9
+
+
+def _envelope(facts):
+    return {
+        "identity": {"username": "alice"},
+        "relational": {"memorable_facts": [{"text": f, "confidence": 0.9} for f in facts]},
+    }
+
+
+class TestMemoryFormatterBudget:
+    """format_memory_for_llm packs facts by token count, not characters."""
+
+    def test_respects_token_budget(self):
+        facts = [f"alice makes music track number {i} with heavy beat" for i in range(10)]
+        formatted = format_memory_for_llm(_envelope(facts), "help with my music track", max_tokens=60)
+
+        assert formatted is not None
+        assert count_tokens(formatted) <= 60
+        assert formatted.count("\n  ? ") < len(facts)
+
+    def test_emoji_fact_budgeted_by_real_cost(self, monkeypatch):
+        monkeypatch.setattr(token_budget, "_count_cached", estimate_tokens)
+        emoji_fact = "alice music " + "🎵" * 40
+        envelope = _envelope([emoji_fact])
+
+        # ~60 chars fits a len/4 budget of 40 tokens, but costs ~90 tokens
+        assert format_memory_for_llm(envelope, "music", max_tokens=40) is None
+        assert format_memory_for_llm(envelope, "music", max_tokens=200) is not None
+
+
+class TestBudgetedPromptAssembly:
+    """build_conversation_context assembles a budgeted prompt once."""
+
+    def test_system_prompt_built_once(self, monkeypatch):
+        cache = PromptPrefixCache()
+        monkeypatch.setattr(prompt_cache, "_prefix_cache", cache)
+
+        ctx = build_conversation_context(
+            user_id="1",
+            guild_id=5,
+            guild_name="Breeze Club",
+            user_name="alice",
+            chat_history=[{"input": "hi", "response": "hello!"}],
+            rag_context="Rule 1: be kind\nRule 2: no spam",
+            system_state={},
+            max_context_tokens=2000,
+            user_message="what are the rules?",
+            conversation_summary="They talked about the server rules.",
+        )
+
+        assert cache.stats()["assemblies"] == 1
+        assert "Rule 2: no spam" in ctx.persona.system_message
+        assert "## Earlier in This Conversation" in ctx.persona.system_message
+        assert ctx.chat_history == [{"input": "hi", "response": "hello!"}]
+
+    def test_sections_trimmed_to_budget(self, monkeypatch):
+        monkeypatch.setattr(prompt_cache, "_prefix_cache", PromptPrefixCache())
+        rag = "\n".join(f"Rule {i}: " + "be kind to everyone here " * 5 for i in range(50))
+
+        ctx = build_conversation_context(
+            user_id="1",
+            guild_id=5,
+            user_name="alice",
+            rag_context=rag,
+            system_state={},
+            max_context_tokens=600,
+            user_message="what are the rules?",
+        )
+
+        assert ctx.rag_context.startswith("Rule 0:")
+        assert ctx.rag_context in ctx.persona.system_message
+        assert count_tokens(ctx.persona.system_message) <= 600
@@ -0,0 +1,179 @@
+"""
+Turn Prefetch Tests
+
+Validates the chatbot's next-turn prefetcher: concurrent loads while waiting,
+single-use slots, freshness deadline and refresh, waiting on an in-flight
+load (or using one that finished before it was stored), failed loads falling back, and cancellation on conversation exit.
+
+Run with: pytest tests/test_turn_prefetch.py -v
+"""
+
+import asyncio
+import time
+
+from abby_core.services.turn_prefetch import PrefetchedTurn, TurnPrefetcher
+
+
+def slow(value, delay=0.05, calls=None):
+    """Blocking loader that sleeps like a Mongo round-trip."""
+    def load(user_id, guild_id):
+        if calls is not None:
+            calls.append((user_id, guild_id))
+        time.sleep(delay)
+        return value
+    return load
+
+
+def failing(user_id, guild_id):
+    raise ConnectionError("mongo down")
+
+
+def make_prefetcher(loaders, **kwargs):
+    kwargs.setdefault("ttl_seconds", 30)
+    kwargs.setdefault("wait_seconds", 1.0)
+    return TurnPrefetcher(loaders, enabled=True, **kwargs)
+
+
+class TestPrefetchedTurn:
+    """Slot accessors used by the chatbot."""
+
+    def test_get_or_load_prefers_prefetched(self):
+        turn = PrefetchedTurn(values={"guild_config": {"a": 1}})
+
+        assert turn.get_or_load("guild_config", lambda: {"a": 2}) == {"a": 1}
+        assert turn.get_or_load("session", lambda: "live") == "live"
+
+    def test_empty_slot_is_not_fresh(self):
+        assert not PrefetchedTurn().fresh
+
+
+class TestTurnPrefetcher:
+    """Loads, consumption and cancellation."""
+
+    def test_loads_run_concurrently_while_waiting(self):
+        calls = []
+        prefetcher = make_prefetcher({
+            name: slow(name, delay=0.1, calls=calls)
+            for name in ("session", "guild_config", "memory_envelope", "system_state", "persona_name")
+        })
+
+        async def turn():
+            prefetcher.start("42", "42", "7")
+            await asyncio.sleep(0.2)  # User typing
+            started = time.perf_counter()
+            slot = await prefetcher.take("42")
+            return slot, time.perf_counter() - started
+
+        slot, take_seconds = asyncio.run(turn())
+
+        assert slot.values["memory_envelope"] == "memory_envelope"
+        assert len(slot.values) == 5
+        assert set(calls) == {("42", "7")}
+        assert take_seconds < 0.05  # Nothing left on the turn's critical path
+        assert prefetcher.stats()["hits"] == 1
+        assert prefetcher.stats()["saved_ms"] >= 400
+
+    def test_slot_is_single_use(self):
+        prefetcher = make_prefetcher({"session": slow("s", delay=0)})
+
+        async def turn():
+            prefetcher.start("42", "42", None)
+            await asyncio.sleep(0.05)
+            first = await prefetcher.take("42")
+            second = await prefetcher.take("42")
+            return first, second
+
+        first, second = asyncio.run(turn())
+
+        assert first.has("session")
+        assert not second.has("session")
+        assert prefetcher.stats()["misses"] == 1
+
+    def test_in_flight_load_is_awaited(self):
+        prefetcher = make_prefetcher({"session": slow("s", delay=0.1)})
+
+        async def turn():
+            prefetcher.start("42", "42", None)
+            await asyncio.sleep(0)  # Message arrives almost immediately
+            return await prefetcher.take("42")
+
+        assert asyncio.run(turn()).get("session") == "s"
+
+    def test_finished_load_not_yet_stored_is_used(self):
+        prefetcher = make_prefetcher({"session": slow("s", delay=0)})
+
+        async def turn():
+            prefetcher.start("42", "42", None)
+            # Resume as soon as the load finishes, before the runner stores it
+            await prefetcher._pending["42"]
+            assert "42" not in prefetcher._slots
+            return await prefetcher.take("42")
+
+        assert asyncio.run(turn()).get("session") == "s"
+        assert prefetcher.stats()["hits"] == 1
+
+    def test_slow_load_times_out_to_fallback(self):
+        prefetcher = make_prefetcher({"session": slow("s", delay=0.3)}, wait_seconds=0.01)
+
+        async def turn():
+            prefetcher.start("42", "42", None)
+            return await prefetcher.take("42")
+
+        assert not asyncio.run(turn()).has("session")
+        assert prefetcher.stats()["timeouts"] == 1
+
+    def test_stale_slot_is_refreshed_before_take(self):
+        calls = []
+        prefetcher = make_prefetcher({"session": slow("s", delay=0, calls=calls)}, ttl_seconds=0.1)
+
+        async def turn():
+            prefetcher.start("42", "42", None)
+            await asyncio.sleep(0.35)  # Longer than the TTL
+            return await prefetcher.take("42")
+
+        slot = asyncio.run(turn())
+
+        assert slot.fresh
+        assert len(calls) >= 2
+        assert prefetcher.stats()["refreshes"] >= 1
+
+    def test_failed_load_is_absent(self):
+        prefetcher = make_prefetcher({"session": slow("s", delay=0), "memory_envelope": failing})
+
+        async def turn():
+            prefetcher.start("42", "42", None)
+            await asyncio.sleep(0.05)
+            return await prefetcher.take("42")
+
+        slot = asyncio.run(turn())
+
+        assert slot.has("session")
+        assert slot.get_or_load("memory_envelope", lambda: "fallback") == "fallback"
+        assert prefetcher.stats()["load_errors"] == 1
+
+    def test_cancel_stops_background_task(self):
+        prefetcher = make_prefetcher({"session": slow("s", delay=0)})
+
+        async def dismiss():
+            prefetcher.start("42", "42", None)
+            task = prefetcher._runners["42"]
+            await asyncio.sleep(0.05)
+            prefetcher.cancel("42")
+            await asyncio.sleep(0)
+            return task
+
+        task = asyncio.run(dismiss())
+
+        assert task.cancelled()
+        assert prefetcher.stats()["active"] == 0
+        assert prefetcher.stats()["cancelled"] == 1
+
+    def test_disabled_prefetcher_is_a_no_op(self):
+        prefetcher = TurnPrefetcher({"session": slow("s", delay=0)}, enabled=False)
+
+        async def turn():
+            prefetcher.start("42", "42", None)
+            return await prefetcher.take("42")
+
+        assert asyncio.run(turn()).values == {}
+        assert prefetcher.stats()["started"] == 0
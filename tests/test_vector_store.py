@@ -0,0 +1,143 @@
+"""
+Vector Store Backend Tests
+
+Validates the VectorStore contract on the Qdrant backend using Qdrant's local
+in-process mode (no server needed), plus env-based backend selection.
+
+Run with: pytest tests/test_vector_store.py -v
+"""
+
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from abby_core.rag.qdrant_client import QdrantVectorStore
+from abby_core.rag.vector_store import (
+    VectorStore,
+    VectorStoreUnavailable,
+    get_vector_store,
+    reset_vector_stores,
+)
+
+
+def _vector(*components):
+    """Pad a few leading components into a 4-dim vector."""
+    return list(components) + [0.0] * (4 - len(components))
+
+
+@pytest.fixture
+def store():
+    """Fresh in-memory Qdrant store with three chunks across two guilds."""
+    qdrant = QdrantVectorStore(collection_name="test_rag", location=":memory:", batch_size=2)
+    qdrant.add(
+        ids=["faq::rules::v1::chunk_0", "faq::rules::v1::chunk_1", "guidelines::art::v1::chunk_0"],
+        embeddings=[_vector(1.0), _vector(0.9, 0.1), _vector(1.0)],
+        metadatas=[
+            {"document_type": "faq", "scope": "rules", "guild_id": "1", "content_checksum": "a"},
+            {"document_type": "faq", "scope": "rules", "guild_id": "1", "content_checksum": "b"},
+            {"document_type": "guidelines", "scope": "art", "guild_id": "2", "content_checksum": "c"},
+        ],
+        documents=["be kind", "no spam", "credit artists"],
+    )
+    return qdrant
+
+
+class TestQdrantVectorStore:
+    """VectorStore contract against local in-process Qdrant."""
+
+    def test_implements_interface(self, store):
+        assert isinstance(store, VectorStore)
+        assert store.provider == "qdrant"
+
+    def test_query_returns_chroma_shaped_results(self, store):
+        results = store.query(query_embeddings=[_vector(1.0)], top_k=2)
+
+        assert len(results["ids"]) == 1
+        assert len(results["ids"][0]) == 2
+        top_id = results["ids"][0][0]
+        assert top_id in {"faq::rules::v1::chunk_0", "guidelines::art::v1::chunk_0"}
+        assert results["documents"][0][0] in {"be kind", "credit artists"}
+        assert "chunk_id" not in results["metadatas"][0][0]
+
+    def test_query_filters_are_pushed_down(self, store):
+        results = store.query(query_embeddings=[_vector(1.0)], top_k=3, filters={"guild_id": "2"})
+
+        assert results["ids"][0] == ["guidelines::art::v1::chunk_0"]
+        assert results["metadatas"][0][0]["guild_id"] == "2"
+
+    def test_none_filters_are_ignored(self, store):
+        results = store.query(
+            query_embeddings=[_vector(1.0)], top_k=3, filters={"guild_id": None, "scope": "rules"}
+        )
+
+        assert set(results["ids"][0]) == {"faq::rules::v1::chunk_0", "faq::rules::v1::chunk_1"}
+
+    def test_count_and_iter_ids(self, store):
+        assert store.count() == 3
+        assert store.count(where={"guild_id": "1"}) == 2
+
+        pages = list(store.iter_ids(page_size=2))
+        assert [len(page) for page in pages] == [2, 1]
+        assert {vector_id for page in pages for vector_id in page} == {
+            "faq::rules::v1::chunk_0",
+            "faq::rules::v1::chunk_1",
+            "guidelines::art::v1::chunk_0",
+        }
+
+    def test_upsert_overwrites_and_get_checksums(self, store):
+        store.upsert(
+            ids=["faq::rules::v1::chunk_0"],
+            embeddings=[_vector(1.0)],
+            metadatas=[{"document_type": "faq", "scope": "rules", "guild_id": "1", "content_checksum": "z"}],
+            documents=["be very kind"],
+        )
+
+        assert store.count() == 3
+        assert store.get_checksums(["faq::rules::v1::chunk_0", "missing"]) == {
+            "faq::rules::v1::chunk_0": "z"
+        }
+
+    def test_delete_by_ids(self, store):
+        store.delete(["faq::rules::v1::chunk_1", "does-not-exist"])
+
+        assert store.count() == 2
+        assert store.get_checksums(["faq::rules::v1::chunk_1"]) == {}
+
+    def test_empty_store_before_first_write(self):
+        empty = QdrantVectorStore(collection_name="empty_rag", location=":memory:")
+
+        assert empty.count() == 0
+        assert list(empty.iter_ids()) == []
+        assert empty.query(query_embeddings=[_vector(1.0)])["ids"] == [[]]
+
+
+class TestBackendSelection:
+    """VECTOR_STORE env selection."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_stores(self):
+        reset_vector_stores()
+        yield
+        reset_vector_stores()
+
+    def test_selects_qdrant(self, monkeypatch):
+        monkeypatch.setenv("VECTOR_STORE", "qdrant")
+        monkeypatch.setenv("QDRANT_LOCATION", ":memory:")
+
+        assert isinstance(get_vector_store(), QdrantVectorStore)
+
+    def test_store_is_shared_across_calls(self, monkeypatch):
+        monkeypatch.setenv("VECTOR_STORE", "qdrant")
+        monkeypatch.setenv("QDRANT_LOCATION", ":memory:")
+
+        first = get_vector_store()
+        first.add(ids=["a"], embeddings=[_vector(1.0)], metadatas=[{}], documents=["x"])
+
+        assert get_vector_store() is first
+        assert get_vector_store().count() == 1
+
+    def test_unknown_backend_raises(self, monkeypatch):
+        monkeypatch.setenv("VECTOR_STORE", "pinecone")
+
+        with pytest.raises(VectorStoreUnavailable):
+            get_vector_store()